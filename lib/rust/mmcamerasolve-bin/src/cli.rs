@@ -56,6 +56,7 @@ const ARG_THREADS: &str = "--threads";
 const ARG_OUTPUT_DIR: &str = "--output-dir";
 const ARG_PREFIX: &str = "--prefix";
 const ARG_INTERMEDIATE_OUTPUT: &str = "--intermediate-output";
+const ARG_PROGRESS: &str = "--progress";
 const ARG_NUKE_LENS: &str = "--nuke-lens";
 
 /// Solver type for focal length adjustment.
@@ -157,6 +158,8 @@ pub struct CliArgs {
     pub log_level: LogVerbosity,
     /// Write intermediate results during solve.
     pub intermediate_output: bool,
+    /// Write machine-readable progress lines to stdout.
+    pub progress: bool,
     pub nuke_lens_file: Option<String>,
 }
 
@@ -182,6 +185,7 @@ impl Default for CliArgs {
             console_level: LogVerbosity::Progress,
             log_level: LogVerbosity::Info,
             intermediate_output: false,
+            progress: false,
             nuke_lens_file: None,
         }
     }
@@ -252,6 +256,7 @@ OUTPUT:
     --output-dir <PATH>       Output directory for Kuper file [default: ./output]
     --prefix <NAME>           Custom prefix for output files
     --intermediate-output     Write intermediate results during solve
+    --progress                Write progress lines (JSON) to stdout
     --console-level <LEVEL>   Set console (stdout) log verbosity [default: progress]
                               error    = errors only
                               warn     = warnings and errors only
@@ -339,6 +344,10 @@ pub fn parse_args() -> ParseResult {
                 cli.intermediate_output = true;
                 i += 1;
             }
+            ARG_PROGRESS => {
+                cli.progress = true;
+                i += 1;
+            }
             ARG_MMCAMERA => {
                 cli.mmcamera_file = Some(try_parse!(parser::parse_string_arg(
                     &args,
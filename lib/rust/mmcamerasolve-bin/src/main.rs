@@ -23,6 +23,7 @@
 mod cli;
 mod defaults;
 mod parser;
+mod progress;
 mod undistort;
 mod write_data;
 
@@ -81,6 +82,7 @@ const ENABLE_VISUALIZATIONS: bool = false;
 use cli::{
     parse_args, print_help, print_version, CliArgs, ParseResult, SolverType,
 };
+use progress::{write_progress, ProgressEvent, ProgressStage};
 use undistort::undistort_markers_with_lens;
 use write_data::{
     write_bundle_output, write_kuper_output, write_mmcamera_output,
@@ -218,8 +220,13 @@ fn setup_thread_pool<L: Logger + Clone + Send + Sync>(
     Ok(())
 }
 
-/// Writes intermediate solver results to disk during a solve.
+/// Writes intermediate solver results to disk during a solve, and/or
+/// reports them as progress lines.
 struct FileIntermediateResultWriter {
+    /// Write the intermediate results to files?
+    write_files: bool,
+    /// Write a progress line for each intermediate result?
+    progress: bool,
     output_dir: String,
     prefix: Option<String>,
     focal_length_mm: f64,
@@ -246,66 +253,83 @@ impl IntermediateResultWriter for FileIntermediateResultWriter {
             .map(|p| format!("{}{}", p, suffix))
             .unwrap_or(suffix.clone());
 
-        // Write Kuper file.
-        let kuper_path =
-            format!("{}/{}_camera.kuper", self.output_dir, prefix_str);
-        if let Err(e) =
-            write_kuper_output(&kuper_path, &camera_poses, self.focal_length_mm)
-        {
-            eprintln!(
-                "Warning: failed to write intermediate Kuper file: {}",
-                e
-            );
-        }
+        if self.write_files {
+            // Write Kuper file.
+            let kuper_path =
+                format!("{}/{}_camera.kuper", self.output_dir, prefix_str);
+            if let Err(e) = write_kuper_output(
+                &kuper_path,
+                &camera_poses,
+                self.focal_length_mm,
+            ) {
+                eprintln!(
+                    "Warning: failed to write intermediate Kuper file: {}",
+                    e
+                );
+            }
 
-        // Write bundle file.
-        let bundle_path =
-            format!("{}/{}_bundles.mmbundles", self.output_dir, prefix_str);
-        if let Err(e) =
-            write_bundle_output(&bundle_path, &self.markers, &bundle_positions)
-        {
-            eprintln!(
-                "Warning: failed to write intermediate bundle file: {}",
-                e
-            );
-        }
+            // Write bundle file.
+            let bundle_path =
+                format!("{}/{}_bundles.mmbundles", self.output_dir, prefix_str);
+            if let Err(e) = write_bundle_output(
+                &bundle_path,
+                &self.markers,
+                &bundle_positions,
+            ) {
+                eprintln!(
+                    "Warning: failed to write intermediate bundle file: {}",
+                    e
+                );
+            }
 
-        // Write mmcamera file.
-        let mmcamera_path =
-            format!("{}/{}_camera.mmcamera", self.output_dir, prefix_str);
-        let intrinsics = CameraIntrinsics::from_centered_lens(
-            MillimeterUnit::new(self.focal_length_mm),
-            self.film_back,
-        );
-        if let Err(e) = write_mmcamera_output_raw(
-            &mmcamera_path,
-            &camera_poses,
-            &intrinsics,
-            &self.film_back,
-            &self.frame_range,
-        ) {
-            eprintln!(
-                "Warning: failed to write intermediate mmcamera file: {}",
-                e
+            // Write mmcamera file.
+            let mmcamera_path =
+                format!("{}/{}_camera.mmcamera", self.output_dir, prefix_str);
+            let intrinsics = CameraIntrinsics::from_centered_lens(
+                MillimeterUnit::new(self.focal_length_mm),
+                self.film_back,
             );
-        }
-
-        // Write nuke lens file.
-        if let Some(ref lens_data) = self.nuke_lens {
-            let lens_path =
-                format!("{}/{}_lens.nk", self.output_dir, prefix_str);
-            if let Err(e) = write_nuke_lens_file(&lens_path, lens_data) {
+            if let Err(e) = write_mmcamera_output_raw(
+                &mmcamera_path,
+                &camera_poses,
+                &intrinsics,
+                &self.film_back,
+                &self.frame_range,
+            ) {
                 eprintln!(
-                    "Warning: failed to write intermediate Nuke lens file: {}",
+                    "Warning: failed to write intermediate mmcamera file: {}",
                     e
                 );
             }
+
+            // Write nuke lens file.
+            if let Some(ref lens_data) = self.nuke_lens {
+                let lens_path =
+                    format!("{}/{}_lens.nk", self.output_dir, prefix_str);
+                if let Err(e) = write_nuke_lens_file(&lens_path, lens_data) {
+                    eprintln!(
+                        "Warning: failed to write intermediate Nuke lens file: {}",
+                        e
+                    );
+                }
+            }
         }
 
         eprintln!(
             "  Intermediate result #{}: mean={:.4}px median={:.4}px cameras={} bundles={}",
             n, stats.mean, stats.median, camera_poses.len(), bundle_positions.len()
         );
+
+        let mut event = ProgressEvent::new(ProgressStage::Intermediate);
+        event.iteration = Some(n);
+        event.mean_error = Some(stats.mean);
+        event.median_error = Some(stats.median);
+        event.camera_count = Some(camera_poses.len());
+        event.bundle_count = Some(bundle_positions.len());
+        if self.write_files {
+            event.prefix = Some(prefix_str);
+        }
+        write_progress(self.progress, &event);
     }
 }
 
@@ -525,6 +549,7 @@ fn run_camera_solve<L: Logger + Clone + Send + Sync>(
     logger: &L,
 ) -> Result<()> {
     let total_start = Instant::now();
+    write_progress(args.progress, &ProgressEvent::new(ProgressStage::Load));
 
     let settings = determine_settings(logger, args)?;
     let nuke_lens_data = determine_nuke_lens_data(logger, args)?;
@@ -654,10 +679,12 @@ fn run_camera_solve<L: Logger + Clone + Send + Sync>(
     let mut quality_metrics = SolveQualityMetrics::default();
 
     mm_log_info!(logger, "Running camera solve...");
+    write_progress(args.progress, &ProgressEvent::new(ProgressStage::Solve));
 
     // Create intermediate result writer if enabled.
     let intermediate_writer: Option<Arc<dyn IntermediateResultWriter>> = if args
         .intermediate_output
+        || args.progress
     {
         let (focal_length_mm_init, _, _) =
             camera_intrinsics.to_physical_parameters();
@@ -669,6 +696,8 @@ fn run_camera_solve<L: Logger + Clone + Send + Sync>(
         })?;
 
         Some(Arc::new(FileIntermediateResultWriter {
+            write_files: args.intermediate_output,
+            progress: args.progress,
             output_dir: args.output_dir.clone(),
             prefix: args.prefix.clone(),
             focal_length_mm: focal_length_mm_init.value(),
@@ -761,6 +790,7 @@ fn run_camera_solve<L: Logger + Clone + Send + Sync>(
     let viz_duration = std::time::Duration::ZERO;
 
     let io_start = Instant::now();
+    write_progress(args.progress, &ProgressEvent::new(ProgressStage::Write));
     let kuper_filename = match &args.prefix {
         Some(prefix) => format!("{}_camera.kuper", prefix),
         None => "camera.kuper".to_string(),
@@ -983,6 +1013,13 @@ fn run_camera_solve<L: Logger + Clone + Send + Sync>(
 
     mm_log_progress!(logger, "Done! Total time: {:.2}s", total_time_secs);
 
+    let mut event = ProgressEvent::new(ProgressStage::Done);
+    event.mean_error = Some(residual_stats.mean);
+    event.median_error = Some(residual_stats.median);
+    event.camera_count = Some(camera_poses.len());
+    event.bundle_count = Some(bundle_positions.len());
+    write_progress(args.progress, &event);
+
     Ok(())
 }
 
@@ -0,0 +1,190 @@
+//
+// Copyright (C) 2025, 2026 David Cattermole.
+//
+// This file is part of mmSolver.
+//
+// mmSolver is free software: you can redistribute it and/or modify it
+// under the terms of the GNU Lesser General Public License as
+// published by the Free Software Foundation, either version 3 of the
+// License, or (at your option) any later version.
+//
+// mmSolver is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU Lesser General Public License for more details.
+//
+// You should have received a copy of the GNU Lesser General Public License
+// along with mmSolver.  If not, see <https://www.gnu.org/licenses/>.
+// ====================================================================
+//
+
+//! Machine-readable progress messages, written to stdout.
+//!
+//! Each message is a single line; the PROGRESS_LINE_PREFIX followed by
+//! a JSON object, for example:
+//!
+//! MMCAMERASOLVE_PROGRESS {"stage":"intermediate","iteration":3,...}
+//!
+//! The prefix lets a reader find the messages among the (plain text)
+//! log lines written to stdout.
+
+use std::io::Write;
+
+/// The start of every progress line.
+pub const PROGRESS_LINE_PREFIX: &str = "MMCAMERASOLVE_PROGRESS ";
+
+/// The stages of a camera solve, in the order they happen.
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub enum ProgressStage {
+    /// Reading the input files.
+    Load,
+    /// The camera solve has started.
+    Solve,
+    /// An intermediate result of the camera solve.
+    Intermediate,
+    /// Writing the output files.
+    Write,
+    /// The camera solve is finished and all files are written.
+    Done,
+}
+
+impl ProgressStage {
+    pub fn as_str(&self) -> &'static str {
+        match self {
+            ProgressStage::Load => "load",
+            ProgressStage::Solve => "solve",
+            ProgressStage::Intermediate => "intermediate",
+            ProgressStage::Write => "write",
+            ProgressStage::Done => "done",
+        }
+    }
+}
+
+/// A single progress message. Values that are not known for a stage
+/// are None, and written as JSON 'null'.
+#[derive(Debug, Clone)]
+pub struct ProgressEvent {
+    pub stage: ProgressStage,
+    pub iteration: Option<usize>,
+    pub mean_error: Option<f64>,
+    pub median_error: Option<f64>,
+    pub camera_count: Option<usize>,
+    pub bundle_count: Option<usize>,
+    /// The file name prefix of the intermediate output files, if
+    /// they were written.
+    pub prefix: Option<String>,
+}
+
+impl ProgressEvent {
+    pub fn new(stage: ProgressStage) -> Self {
+        Self {
+            stage,
+            iteration: None,
+            mean_error: None,
+            median_error: None,
+            camera_count: None,
+            bundle_count: None,
+            prefix: None,
+        }
+    }
+}
+
+fn json_usize(value: Option<usize>) -> String {
+    match value {
+        Some(v) => v.to_string(),
+        None => "null".to_string(),
+    }
+}
+
+fn json_f64(value: Option<f64>) -> String {
+    match value {
+        // JSON has no representation of NaN or infinity.
+        Some(v) if v.is_finite() => format!("{:?}", v),
+        _ => "null".to_string(),
+    }
+}
+
+fn json_string(value: Option<&str>) -> String {
+    let value = match value {
+        Some(v) => v,
+        None => return "null".to_string(),
+    };
+    let mut result = String::with_capacity(value.len() + 2);
+    result.push('"');
+    for c in value.chars() {
+        match c {
+            '"' => result.push_str("\\\""),
+            '\\' => result.push_str("\\\\"),
+            '\n' => result.push_str("\\n"),
+            '\r' => result.push_str("\\r"),
+            '\t' => result.push_str("\\t"),
+            c if (c as u32) < 0x20 => {
+                result.push_str(&format!("\\u{:04x}", c as u32))
+            }
+            c => result.push(c),
+        }
+    }
+    result.push('"');
+    result
+}
+
+/// Format the progress message as a single line (without a newline).
+pub fn format_progress_line(event: &ProgressEvent) -> String {
+    format!(
+        "{}{{\"stage\":\"{}\",\"iteration\":{},\"mean_error\":{},\"median_error\":{},\"camera_count\":{},\"bundle_count\":{},\"prefix\":{}}}",
+        PROGRESS_LINE_PREFIX,
+        event.stage.as_str(),
+        json_usize(event.iteration),
+        json_f64(event.mean_error),
+        json_f64(event.median_error),
+        json_usize(event.camera_count),
+        json_usize(event.bundle_count),
+        json_string(event.prefix.as_deref()),
+    )
+}
+
+/// Write the progress message to stdout, if enabled.
+///
+/// The line is written and flushed while holding the stdout lock, so
+/// messages from different threads are not interleaved.
+pub fn write_progress(enabled: bool, event: &ProgressEvent) {
+    if !enabled {
+        return;
+    }
+    let line = format_progress_line(event);
+    let stdout = std::io::stdout();
+    let mut handle = stdout.lock();
+    // Progress is only informational, so a closed stdout is not an
+    // error.
+    let _ = writeln!(handle, "{}", line);
+    let _ = handle.flush();
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_format_progress_line_stage_only() {
+        let event = ProgressEvent::new(ProgressStage::Load);
+        assert_eq!(
+            format_progress_line(&event),
+            "MMCAMERASOLVE_PROGRESS {\"stage\":\"load\",\"iteration\":null,\"mean_error\":null,\"median_error\":null,\"camera_count\":null,\"bundle_count\":null,\"prefix\":null}"
+        );
+    }
+
+    #[test]
+    fn test_format_progress_line_intermediate() {
+        let mut event = ProgressEvent::new(ProgressStage::Intermediate);
+        event.iteration = Some(3);
+        event.mean_error = Some(0.5);
+        event.median_error = Some(f64::NAN);
+        event.camera_count = Some(10);
+        event.bundle_count = Some(42);
+        event.prefix = Some("shot\"01\\cam".to_string());
+        assert_eq!(
+            format_progress_line(&event),
+            "MMCAMERASOLVE_PROGRESS {\"stage\":\"intermediate\",\"iteration\":3,\"mean_error\":0.5,\"median_error\":null,\"camera_count\":10,\"bundle_count\":42,\"prefix\":\"shot\\\"01\\\\cam\"}"
+        );
+    }
+}
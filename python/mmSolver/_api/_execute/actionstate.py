@@ -233,24 +233,61 @@ def run_validate_action(vaction):
     raise NotImplementedError
 
 
-def run_validate_action_list(vaction_list):
+def get_validate_action_key(vaction):
+    """
+    Get a hashable key for a validate action.
+
+    Validate actions with the same function and arguments have the
+    same key, and will give the same ActionState (while the scene is
+    unchanged).
+
+    :param vaction: Validation action object.
+    :type vaction: Action or None
+
+    :rtype: tuple or None
+    """
+    if not isinstance(vaction, api_action.Action):
+        return None
+    vkwargs = vaction.kwargs or {}
+    key = (repr(vaction.func), repr(vaction.args), repr(sorted(vkwargs.items())))
+    return key
+
+
+def run_validate_action_list(vaction_list, cache=None):
     """
     Calls the validation functions attached to the Action list.
 
+    Identical validate actions (for example the actions re-used for
+    many frames by 'compile_solver_with_cache') are only run once.
+
     See :py:func:`_run_validate_action` for more details.
 
     :param vaction_list: List of validate actions to call.
     :type vaction_list: [Action, ..]
 
+    :param cache: ActionStates of previously run validate actions,
+        keyed with 'get_validate_action_key'. New ActionStates are
+        added to the cache. The cache must only be re-used while the
+        scene is unchanged.
+    :type cache: dict or None
+
     :return:
         A list of validations, with a single valid boolean (did the
         validation succeed?).
     :rtype: (bool, [str, ..], [(int, int, int), ..])
     """
     assert len(vaction_list) > 0
+    if cache is None:
+        cache = {}
+    assert isinstance(cache, dict)
     state_list = []
     for vaction in vaction_list:
-        state = run_validate_action(vaction)
+        key = get_validate_action_key(vaction)
+        state = cache.get(key)
+        if state is None:
+            state = run_validate_action(vaction)
+            if key is not None:
+                cache[key] = state
         state_list.append(state)
     assert len(vaction_list) == len(state_list)
     return state_list
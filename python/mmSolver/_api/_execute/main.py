@@ -314,8 +314,11 @@ def execute(
         sol_list = col.get_solver_list()
         mkr_list = col.get_marker_list()
         attr_list = col.get_attribute_list()
+        compile_func = api_compile.collection_compile
+        if options.use_compile_cache is True:
+            compile_func = api_compile.collection_compile_with_cache
         try:
-            action_list, vaction_list = api_compile.collection_compile(
+            action_list, vaction_list = compile_func(
                 col,
                 sol_list,
                 mkr_list,
@@ -363,9 +366,19 @@ def execute(
             col, action_list, vaction_list
         )
 
+        # Validation results are re-used while the compiled actions
+        # are re-used.
+        validate_cache = None
+        if options.use_compile_cache is True:
+            validate_cache = api_compile.get_collection_validate_cache(col)
+        if validate_cache is None:
+            validate_cache = {}
+
         vaction_state_list = []
         if validate_before is True:
-            vaction_state_list = actionstate.run_validate_action_list(vaction_list)
+            vaction_state_list = actionstate.run_validate_action_list(
+                vaction_list, cache=validate_cache
+            )
             assert len(vaction_list) == len(vaction_state_list)
 
         # Run Solver Actions...
@@ -381,7 +394,11 @@ def execute(
                 state = vaction_state_list[i]
             if isinstance(vaction, api_action.Action) and validate_runtime:
                 # We will calculate the state just-in-time.
-                state = actionstate.run_validate_action(vaction)
+                key = actionstate.get_validate_action_key(vaction)
+                state = validate_cache.get(key)
+                if state is None:
+                    state = actionstate.run_validate_action(vaction)
+                    validate_cache[key] = state
             if state is not None:
                 if state.status != const.ACTION_STATUS_SUCCESS:
                     assert isinstance(state, actionstate.ActionState)
@@ -38,6 +38,7 @@ ExecuteOptions = collections.namedtuple(
         'display_grid',
         'display_node_types',
         'use_minimal_ui',
+        'use_compile_cache',
     ),
 )
 
@@ -52,6 +53,7 @@ def create_execute_options(
     display_grid=True,
     display_node_types=None,
     use_minimal_ui=None,
+    use_compile_cache=None,
 ):
     """
     Create :py:class:`ExecuteOptions` object.
@@ -96,11 +98,20 @@ def create_execute_options(
     :param use_minimal_ui: Change the Solver UI to be "minimal", the
                            revert after a solve completes (or fails).
     :type use_minimal_ui: bool
+
+    :param use_compile_cache: Re-use the compiled solver actions of a
+                              previous solve, if the Collection has
+                              not changed. Only enable this when
+                              changes to the scene clear the cache
+                              (see 'clear_collection_compile_cache').
+    :type use_compile_cache: bool
     """
     if display_node_types is None:
         display_node_types = dict()
     if use_minimal_ui is None:
         use_minimal_ui = False
+    if use_compile_cache is None:
+        use_compile_cache = False
     options = ExecuteOptions(
         verbose=verbose,
         refresh=refresh,
@@ -111,5 +122,6 @@ def create_execute_options(
         display_grid=display_grid,
         display_node_types=display_node_types,
         use_minimal_ui=use_minimal_ui,
+        use_compile_cache=use_compile_cache,
     )
     return options
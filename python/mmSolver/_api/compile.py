@@ -36,16 +36,22 @@ import maya.mel
 
 import mmSolver.logger
 import mmSolver.utils.python_compat as pycompat
+import mmSolver.utils.nodeaffects as affects_utils
 import mmSolver._api.constant as const
 import mmSolver._api.excep as excep
 import mmSolver._api.utils as api_utils
 import mmSolver._api.action as api_action
 import mmSolver._api.solverbase as solverbase
 import mmSolver._api.marker as marker
+import mmSolver._api.markerutils as markerutils
 import mmSolver._api.attribute as attribute
 
 LOG = mmSolver.logger.get_logger()
 
+# module level cache, stores the compiled actions of each Collection
+# node UUID, see 'collection_compile_with_cache'.
+__collection_compile_cache = {}
+
 
 class DictGetOrCall(dict):
 
@@ -150,6 +156,40 @@ def get_markers_static_values(mkr_list):
     return dict(cache)
 
 
+def _get_solvers_frame_numbers(sol_list):
+    frame_numbers = set()
+    for sol in sol_list:
+        for method_name in ['get_frame_list', 'get_root_frame_list']:
+            method = getattr(sol, method_name, None)
+            if method is None:
+                continue
+            frame_numbers |= set(frm.get_number() for frm in method())
+    return frame_numbers
+
+
+def get_markers_enable_matrix(sol_list, mkr_list):
+    """
+    Get the (markers x frames) enabled state matrix for all frames
+    used by the given solvers.
+
+    This is intended to be used as cached values for future functions.
+
+    :param sol_list: List of Solvers, the frames of each solver are
+                     computed in the matrix.
+    :type sol_list: [SolverBase, ..]
+
+    :param mkr_list: List of Markers to compile.
+    :type mkr_list: [Marker, ..]
+
+    :rtype: markerutils.MarkerEnableMatrix
+    """
+    frame_numbers = _get_solvers_frame_numbers(sol_list)
+    mkr_nodes = [mkr.get_node() for mkr in mkr_list]
+    matrix = markerutils.MarkerEnableMatrix(mkr_nodes)
+    matrix.compute_frames(frame_numbers)
+    return matrix
+
+
 def markersAndCameras_compile_flags(mkr_list, mkr_static_values=None):
     """
     Compile mmSolver command flags for 'marker' and 'camera'.
@@ -688,11 +728,22 @@ def frames_compile_flags(frm_list, frame_use_tags):
 
 
 def collection_compile(
-    col, sol_list, mkr_list, attr_list, withtest=False, prog_fn=None, status_fn=None
+    col,
+    sol_list,
+    mkr_list,
+    attr_list,
+    withtest=False,
+    prog_fn=None,
+    status_fn=None,
+    mkr_enable_matrix=None,
 ):
     """
     Take the data in the Collection and compile it into actions to run.
 
+    :param mkr_enable_matrix: The marker enable matrix for the
+        enabled solvers, if it has already been computed.
+    :type mkr_enable_matrix: markerutils.MarkerEnableMatrix or None
+
     :return: list of SolverActions.
     :rtype: [SolverAction, ..]
     """
@@ -728,11 +779,17 @@ def collection_compile(
     attr_stiff_static_values = get_attr_stiffness_static_values(col, attr_list)
     attr_smooth_static_values = get_attr_smoothness_static_values(col, attr_list)
     mkr_static_values = get_markers_static_values(mkr_list)
+    if mkr_enable_matrix is None:
+        mkr_enable_matrix = get_markers_enable_matrix(sol_enabled_list, mkr_list)
+    # Node affects queries are shared by all Solvers in this compile.
+    node_affects_cache = affects_utils.AffectsCache()
     precomputed_data = {
         solverbase.MARKER_STATIC_VALUES_KEY: mkr_static_values,
         solverbase.ATTR_STATIC_VALUES_KEY: attr_static_values,
         solverbase.ATTR_STIFFNESS_STATIC_VALUES_KEY: attr_stiff_static_values,
         solverbase.ATTR_SMOOTHNESS_STATIC_VALUES_KEY: attr_smooth_static_values,
+        solverbase.MARKER_ENABLE_MATRIX_KEY: mkr_enable_matrix,
+        solverbase.NODE_AFFECTS_CACHE_KEY: node_affects_cache,
     }
 
     # Compile all the solvers
@@ -754,6 +811,153 @@ def collection_compile(
     return action_list, vaction_list
 
 
+def get_collection_compile_key(
+    col, sol_list, mkr_list, attr_list, withtest, mkr_enable_matrix
+):
+    """
+    Get a hashable key describing the structure of a Collection.
+
+    The key contains the Collection, Solver settings, Marker and
+    Attribute membership (node paths and UUIDs) and the enabled
+    Markers on each solved frame. Keyframe values are not part of the
+    key, so changing an animated value does not change the key.
+
+    :param mkr_enable_matrix: The marker enable matrix for the
+        enabled solvers.
+    :type mkr_enable_matrix: markerutils.MarkerEnableMatrix
+
+    :rtype: tuple
+    """
+    sol_key = []
+    for sol in sol_list:
+        data = sol.get_data()
+        sol_key.append((sol.__class__.__name__, repr(sorted(data.items()))))
+
+    mkr_nodes = [mkr.get_node() for mkr in mkr_list]
+    attr_names = [attr.get_name() for attr in attr_list]
+    attr_nodes = [attr.get_node(full_path=True) for attr in attr_list]
+    nodes = [n for n in mkr_nodes + attr_nodes if n is not None]
+    node_uuids = maya.cmds.ls(nodes, uuid=True) or []
+
+    frame_numbers = sorted(_get_solvers_frame_numbers(sol_list))
+    mkr_enable_columns = [mkr_enable_matrix.get_column(f) for f in frame_numbers]
+
+    key = (
+        col.get_node_uid(),
+        bool(withtest),
+        tuple(sol_key),
+        tuple(mkr_nodes),
+        tuple(attr_names),
+        tuple(node_uuids),
+        tuple(mkr_enable_matrix.get_marker_nodes()),
+        tuple(zip(frame_numbers, mkr_enable_columns)),
+    )
+    return key
+
+
+def _copy_action_list(action_list):
+    # Actions are modified after compiling (see
+    # 'mmSolver._api._execute.main'), so the cached actions must
+    # never be given out directly.
+    copy_list = []
+    for action in action_list:
+        if action is not None:
+            kwargs = action.kwargs
+            if kwargs is not None:
+                kwargs = kwargs.copy()
+            action = api_action.Action(
+                func=action.func, args=action.args, kwargs=kwargs
+            )
+        copy_list.append(action)
+    return copy_list
+
+
+def collection_compile_with_cache(
+    col, sol_list, mkr_list, attr_list, withtest=False, prog_fn=None, status_fn=None
+):
+    """
+    Compile the Collection like 'collection_compile', re-using the
+    actions of the last compile when the Collection is unchanged.
+
+    The actions are stored per-Collection and are re-used when the
+    key from 'get_collection_compile_key' is unchanged. Changes that
+    the key cannot see (attribute locking, animation curves being
+    connected, auxiliary attribute values, re-parenting nodes) must
+    be followed by a call to 'clear_collection_compile_cache'. The
+    Solver UI does this with Maya callbacks.
+
+    :return: list of SolverActions.
+    :rtype: [SolverAction, ..]
+    """
+    sol_enabled_list = [sol for sol in sol_list if sol.get_enabled() is True]
+    mkr_enable_matrix = get_markers_enable_matrix(sol_enabled_list, mkr_list)
+    key = get_collection_compile_key(
+        col, sol_enabled_list, mkr_list, attr_list, withtest, mkr_enable_matrix
+    )
+
+    col_uid = col.get_node_uid()
+    cache_value = __collection_compile_cache.get(col_uid)
+    if cache_value is not None and cache_value[0] == key:
+        LOG.debug('Re-using compiled actions; collection=%r', col.get_node())
+        _, action_list, vaction_list, _ = cache_value
+    else:
+        action_list, vaction_list = collection_compile(
+            col,
+            sol_list,
+            mkr_list,
+            attr_list,
+            withtest=withtest,
+            prog_fn=prog_fn,
+            status_fn=status_fn,
+            mkr_enable_matrix=mkr_enable_matrix,
+        )
+        validate_cache = {}
+        __collection_compile_cache[col_uid] = (
+            key,
+            action_list,
+            vaction_list,
+            validate_cache,
+        )
+    return _copy_action_list(action_list), _copy_action_list(vaction_list)
+
+
+def get_collection_validate_cache(col):
+    """
+    Get the cache of validation results for the actions last compiled
+    by 'collection_compile_with_cache'.
+
+    The cache is removed with the compiled actions, so validation
+    results are re-used only while the Collection is unchanged. See
+    'mmSolver._api._execute.actionstate.run_validate_action_list'.
+
+    :param col: The Collection that was compiled.
+    :type col: Collection
+
+    :returns: The cache, or None if the Collection has not been
+        compiled with 'collection_compile_with_cache'.
+    :rtype: dict or None
+    """
+    cache_value = __collection_compile_cache.get(col.get_node_uid())
+    if cache_value is None:
+        return None
+    return cache_value[3]
+
+
+def clear_collection_compile_cache(col=None):
+    """
+    Remove compiled actions stored by 'collection_compile_with_cache'.
+
+    :param col: Only remove the actions of this Collection, or all
+        Collections if None.
+    :type col: Collection or None
+    """
+    if col is None:
+        __collection_compile_cache.clear()
+    else:
+        __collection_compile_cache.pop(col.get_node_uid(), None)
+    return
+
+
 def create_compile_solver_cache():
     """
     Create the cache for use with the 'compile_solver_with_cache' function.
@@ -785,6 +989,11 @@ def compile_solver_with_cache(sol, col, mkr_list, attr_list, withtest, cache):
     structure or number of errors, we can copy the same mmSolver
     kwargs multiple times (with the frames argument set differently).
 
+    The enabled markers are looked up in the marker enable matrix
+    stored in the solver's precomputed data (see
+    'collection_compile'), so marker enable values are not queried
+    again for each solver.
+
     :param col: The Collection to compile.
     :type col: Collection
 
@@ -807,30 +1016,29 @@ def compile_solver_with_cache(sol, col, mkr_list, attr_list, withtest, cache):
             yield action, vaction
     else:
         frame_list = sol.get_frame_list()
+        mkr_nodes = [m.get_node() for m in mkr_list]
+        frame_numbers = [frm.get_number() for frm in frame_list]
+
+        precomputed_data = sol.get_precomputed_data() or {}
+        enable_matrix = precomputed_data.get(solverbase.MARKER_ENABLE_MATRIX_KEY)
+        if enable_matrix is None or not enable_matrix.has_marker_nodes(mkr_nodes):
+            enable_matrix = markerutils.MarkerEnableMatrix(mkr_nodes)
 
-        # Get frame with lowest number of active markers.
+        # The unique sets of active markers across all frames.
         #
         # If we have a list of frames in the current solver, and on
         # one of the frames there are zero markers, most frames will
-        # solve, except for that one. We must detect this and skip the entire
-        # solve to avoid any invalid solve frames.
-        min_num_of_active_mkr_nodes = 999999999
-        min_list_of_active_mkr_nodes = []
-        for frm in frame_list:
-            frm_num = frm.get_number()
-            active_mkr_nodes = [m.get_node() for m in mkr_list if m.get_enable(frm_num)]
-            if len(active_mkr_nodes) < min_num_of_active_mkr_nodes:
-                min_list_of_active_mkr_nodes = active_mkr_nodes
-
-        hash_string = str(len(min_list_of_active_mkr_nodes))
-        hash_string += '#'.join(min_list_of_active_mkr_nodes)
-        vaction_list = cache.get(hash_string, None)
+        # solve, except for that one. Each unique set of markers is
+        # part of the cache key, so the validation of such a frame
+        # is never shared with a valid frame.
+        cache_key = enable_matrix.get_signature(frame_numbers, mkr_nodes)
+        vaction_list = cache.get(cache_key, None)
 
         # Compile if our testing action is not in the cache.
         if vaction_list is None:
             # Add to the cache
             for action, vaction in sol.compile(col, mkr_list, attr_list, withtest=True):
-                cache[hash_string].append(vaction)
+                cache[cache_key].append(vaction)
                 yield action, vaction
         else:
             # Re-use the cache
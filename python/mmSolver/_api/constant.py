@@ -418,6 +418,7 @@ SOLVER_STD_ONLY_ROOT_FRAMES_DEFAULT_VALUE = False
 SOLVER_STD_GLOBAL_SOLVE_DEFAULT_VALUE = False
 SOLVER_STD_TRIANGULATE_BUNDLES_DEFAULT_VALUE = False
 SOLVER_STD_USE_ATTR_BLOCKS_DEFAULT_VALUE = False
+SOLVER_STD_USE_HIERARCHY_BLOCKS_DEFAULT_VALUE = False
 SOLVER_STD_EVAL_COMPLEX_GRAPHS_DEFAULT_VALUE = False
 SOLVER_STD_SOLVER_TYPE_DEFAULT_VALUE = SOLVER_TYPE_DEFAULT
 SOLVER_STD_SCENE_GRAPH_MODE_DEFAULT_VALUE = SCENE_GRAPH_MODE_DEFAULT
@@ -605,8 +605,8 @@ class Marker(object):
         image_width = float(image_width)
         image_height = image_width * (vfa / hfa)
 
-        weights_list = [self.get_weight(time=t) for t in times]
-        enabled_list = [self.get_enable(time=t) for t in times]
+        weights_list = markerutils.get_marker_weight_values(node, times)
+        enabled_list = markerutils.get_marker_enable_values(node, times)
 
         bnd_node = bnd.get_node()
         dev_list = markerutils.calculate_marker_deviation(
@@ -678,25 +678,12 @@ class Marker(object):
         if node is None:
             LOG.warn('Could not get node. self=%r', self)
             return times
-        plug = '{0}.{1}'.format(node, const.MARKER_ATTR_LONG_NAME_ENABLE)
 
-        anim_curves = maya.cmds.listConnections(plug, type='animCurve') or []
-        if len(anim_curves) == 0:
-            enable_times = list(range(frame_range_start, frame_range_end + 1))
-        else:
-            anim_curve = anim_curves[0]
-            enable_times = (
-                maya.cmds.keyframe(anim_curve, query=True, timeChange=True) or []
-            )
-            if len(enable_times) == 0:
-                enable_times = list(range(frame_range_start, frame_range_end + 1))
-
-        start_frame = int(min(enable_times))
-        end_frame = int(max(enable_times))
-        for f in range(start_frame, end_frame + 1):
-            v = self.get_enable(time=f)
-            if v:
-                times.append(f)
+        frames = markerutils.get_marker_enable_frame_range(
+            node, frame_range_start, frame_range_end
+        )
+        enable_values = markerutils.get_marker_enable_values(node, frames)
+        times = [f for f, v in zip(frames, enable_values) if v]
         return times
 
     def get_weight(self, time=None):
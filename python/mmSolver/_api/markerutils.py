@@ -23,13 +23,19 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import array
+import collections
 import time
 import math
 
 import maya.cmds
+import maya.OpenMayaAnim as OpenMayaAnim
 
 import mmSolver.logger
+import mmSolver._api.constant as const
 import mmSolver._api.attribute as attribute
+import mmSolver.utils.animcurve as anim_utils
+import mmSolver.utils.node as node_utils
 import mmSolver.utils.nodeaffects as affects_utils
 
 
@@ -111,6 +117,280 @@ def calculate_marker_deviation(
     return dev
 
 
+def get_marker_enable_values(mkr_node, times):
+    """
+    Get the enabled state of a marker at each of the given times.
+
+    The 'enable' attribute is evaluated in a single pass, rather than
+    querying the attribute at each time.
+
+    :param mkr_node: The marker transform node to query.
+    :type mkr_node: str
+
+    :param times: The times to query the enabled state.
+    :type times: [int, ..]
+
+    :returns: The enabled state (0 or 1) for each time given, in the
+              same order as 'times'.
+    :rtype: array.array
+    """
+    plug = '{0}.{1}'.format(mkr_node, const.MARKER_ATTR_LONG_NAME_ENABLE)
+    values = anim_utils.evaluate_plug_over_times_apitwo(plug, times)
+    if values is None:
+        LOG.warn('Could not get Marker enable plug. plug=%r', plug)
+        values = [0] * len(times)
+    return array.array('b', [int(round(v)) > 0 for v in values])
+
+
+def get_marker_weight_values(mkr_node, times):
+    """
+    Get the weight of a marker at each of the given times.
+
+    The 'weight' attribute is evaluated in a single pass, rather than
+    querying the attribute at each time.
+
+    :param mkr_node: The marker transform node to query.
+    :type mkr_node: str
+
+    :param times: The times to query the weight.
+    :type times: [int, ..]
+
+    :returns: The weight for each time given, in the same order as
+              'times'.
+    :rtype: array.array
+    """
+    plug = '{0}.{1}'.format(mkr_node, const.MARKER_ATTR_LONG_NAME_WEIGHT)
+    values = anim_utils.evaluate_plug_over_times_apitwo(plug, times)
+    if values is None:
+        LOG.warn('Could not get Marker weight plug. plug=%r', plug)
+        values = [0.0] * len(times)
+    return array.array('d', values)
+
+
+def get_marker_position_values(mkr_node, times):
+    """
+    Get the (translate X and Y) position of a marker at each of the
+    given times.
+
+    The attributes are evaluated in a single pass, rather than
+    querying the attributes at each time. Values are in Maya's
+    user interface distance unit, the same as 'maya.cmds.getAttr'.
+
+    :param mkr_node: The marker transform node to query.
+    :type mkr_node: str
+
+    :param times: The times to query the position.
+    :type times: [int, ..]
+
+    :returns: Tuple of the X and Y values for each time given, in the
+              same order as 'times'.
+    :rtype: (array.array, array.array)
+    """
+    values_list = []
+    for attr_name in ['translateX', 'translateY']:
+        plug = '{0}.{1}'.format(mkr_node, attr_name)
+        values = anim_utils.evaluate_plug_over_times_apitwo(plug, times, ui_units=True)
+        if values is None:
+            LOG.warn('Could not get Marker position plug. plug=%r', plug)
+            values = [0.0] * len(times)
+        values_list.append(array.array('d', values))
+    return values_list[0], values_list[1]
+
+
+def get_marker_enable_frame_range(mkr_node, frame_range_start, frame_range_end):
+    """
+    Get the range of frames that the enabled state of a marker should
+    be queried.
+
+    If the 'enable' attribute has an animation curve, the range
+    between the first and last keyframe is used, otherwise the
+    frame_range_* arguments are used.
+
+    :param mkr_node: The marker transform node to query.
+    :type mkr_node: str
+
+    :param frame_range_start: The frame range start of the marker
+                              to consider when no animCurve exists.
+    :type frame_range_start: int
+
+    :param frame_range_end: The frame range end of the marker
+                            to consider when no animCurve exists.
+    :type frame_range_end: int
+
+    :returns: All frame numbers in the range.
+    :rtype: [int, ..]
+    """
+    plug = '{0}.{1}'.format(mkr_node, const.MARKER_ATTR_LONG_NAME_ENABLE)
+    anim_curves = maya.cmds.listConnections(plug, type='animCurve') or []
+    if len(anim_curves) == 0:
+        enable_times = list(range(frame_range_start, frame_range_end + 1))
+    else:
+        anim_curve = anim_curves[0]
+        enable_times = maya.cmds.keyframe(anim_curve, query=True, timeChange=True) or []
+        if len(enable_times) == 0:
+            enable_times = list(range(frame_range_start, frame_range_end + 1))
+
+    start_frame = int(min(enable_times))
+    end_frame = int(max(enable_times))
+    return list(range(start_frame, end_frame + 1))
+
+
+def get_markers_enable_and_weight_values(mkr_nodes, times):
+    """
+    Get the enabled state and weight for many markers at many times.
+
+    Each marker attribute is evaluated once across all times, and the
+    results are stored as compact arrays that can be indexed by the
+    index of the time in 'times'.
+
+    :param mkr_nodes: The marker transform nodes to query.
+    :type mkr_nodes: [str, ..]
+
+    :param times: The times to query.
+    :type times: [int, ..]
+
+    :returns: Tuple of two lists, the enabled values and weight values
+              per-marker (in the same order as 'mkr_nodes'). Each
+              item is an array the same length as 'times'.
+    :rtype: ([array.array, ..], [array.array, ..])
+    """
+    enable_values_list = []
+    weight_values_list = []
+    for mkr_node in mkr_nodes:
+        enable_values = get_marker_enable_values(mkr_node, times)
+        weight_values = get_marker_weight_values(mkr_node, times)
+        enable_values_list.append(enable_values)
+        weight_values_list.append(weight_values)
+    return enable_values_list, weight_values_list
+
+
+class MarkerEnableMatrix(object):
+    """
+    A (markers x frames) matrix of the enabled state of markers.
+
+    Each frame is stored as a column bitset (a Python integer), where
+    bit 'i' is set when the marker at index 'i' is enabled on that
+    frame. Columns are computed in bulk and cached, so the same
+    matrix can be queried many times while compiling a collection.
+
+    >>> mkr_nodes = ['|marker1', '|marker2']
+    >>> matrix = MarkerEnableMatrix(mkr_nodes)
+    >>> matrix.compute_frames([1, 2, 3])
+    >>> column = matrix.get_column(1)
+    >>> signature = matrix.get_signature([1, 2, 3])
+
+    """
+
+    def __init__(self, mkr_nodes):
+        """
+        Create a matrix for the given marker nodes.
+
+        :param mkr_nodes: The marker transform nodes in the matrix.
+        :type mkr_nodes: [str, ..]
+        """
+        self._mkr_nodes = tuple(mkr_nodes)
+        self._mkr_node_bits = {}
+        for i, mkr_node in enumerate(self._mkr_nodes):
+            self._mkr_node_bits[mkr_node] = 1 << i
+        self._columns = {}
+
+    def get_marker_nodes(self):
+        return list(self._mkr_nodes)
+
+    def has_marker_nodes(self, mkr_nodes):
+        """
+        Are all the given marker nodes in the matrix?
+
+        :rtype: bool
+        """
+        return all(n in self._mkr_node_bits for n in mkr_nodes)
+
+    def get_marker_mask(self, mkr_nodes):
+        """
+        Get a bitset with the bits set for the given marker nodes.
+
+        :param mkr_nodes: Marker nodes that exist in the matrix.
+        :type mkr_nodes: [str, ..]
+
+        :rtype: int
+        """
+        mask = 0
+        for mkr_node in mkr_nodes:
+            mask |= self._mkr_node_bits[mkr_node]
+        return mask
+
+    def compute_frames(self, frames):
+        """
+        Compute the columns for all the given frames.
+
+        Frames that have already been computed are skipped, and all
+        remaining frames are evaluated once per-marker.
+
+        :param frames: The frame numbers to compute.
+        :type frames: [int, ..]
+        """
+        frames = sorted(set(f for f in frames if f not in self._columns))
+        if len(frames) == 0:
+            return
+        columns = [0] * len(frames)
+        for mkr_node in self._mkr_nodes:
+            bit = self._mkr_node_bits[mkr_node]
+            enable_values = get_marker_enable_values(mkr_node, frames)
+            for i, enabled in enumerate(enable_values):
+                if enabled:
+                    columns[i] |= bit
+        self._columns.update(zip(frames, columns))
+        return
+
+    def get_column(self, frame):
+        """
+        Get the bitset of enabled markers on a frame.
+
+        :param frame: The frame number.
+        :type frame: int
+
+        :rtype: int
+        """
+        if frame not in self._columns:
+            self.compute_frames([frame])
+        return self._columns[frame]
+
+    def get_enabled_marker_nodes(self, frame):
+        """
+        Get the marker nodes enabled on a frame.
+
+        :rtype: [str, ..]
+        """
+        column = self.get_column(frame)
+        return [n for n in self._mkr_nodes if column & self._mkr_node_bits[n]]
+
+    def get_signature(self, frames, mkr_nodes=None):
+        """
+        Get a hashable signature of the enabled markers across frames.
+
+        Frames with identical enabled markers share the same column,
+        so the signature is the sorted unique columns, along with the
+        markers of the matrix (which give meaning to each bit). Two
+        frame lists with the same signature have exactly the same sets
+        of enabled markers.
+
+        :param frames: The frame numbers to consider.
+        :type frames: [int, ..]
+
+        :param mkr_nodes: Only consider these marker nodes, or all
+                          markers in the matrix if None.
+        :type mkr_nodes: [str, ..] or None
+
+        :rtype: ((str, ..), (int, ..))
+        """
+        self.compute_frames(frames)
+        columns = set(self._columns[f] for f in frames)
+        if mkr_nodes is not None:
+            mask = self.get_marker_mask(mkr_nodes)
+            columns = set(c & mask for c in columns)
+        return self._mkr_nodes, tuple(sorted(columns))
+
+
 def get_markers_start_end_frames(selected_markers):
     """
     Gets first and last key from the selected markers list, if no keys
@@ -153,9 +433,9 @@ def get_markers_start_end_frames(selected_markers):
     return start_frame, end_frame
 
 
-def find_marker_attr_mapping(mkr_list, attr_list):
+def find_marker_attr_mapping_sparse(mkr_list, attr_list, cache=None):
     """
-    Get a mapping of markers to attributes, as a matrix.
+    Get a mapping of markers to attributes, as a sparse matrix.
 
     :param mkr_list: Markers to consider in mapping.
     :type mkr_list: [Marker, ..]
@@ -163,35 +443,53 @@ def find_marker_attr_mapping(mkr_list, attr_list):
     :param attr_list: Attributes to consider in mapping.
     :type attr_list: [Attribute, ..]
 
-    :returns: Boolean matrix of size 'markers x attrs'. Matrix index
-              is 'mapping[marker_index][attr_index]', based on the
+    :param cache: The cache of Maya scene queries, to be re-used
+        between calls. If None, a cache is created for this call.
+    :type cache: mmSolver.utils.nodeaffects.AffectsCache or None
+
+    :returns: Sparse matrix of size 'markers x attrs', based on the
               index of the mkr_list and attr_list given.
-    :rtype: [[bool, .. ]]
+    :rtype: mmSolver.utils.nodeaffects.MarkerAttrMapping
     """
     assert len(mkr_list) > 0
+    if cache is None:
+        cache = affects_utils.AffectsCache()
     s = time.time()
-    mapping = []
-    for i, mkr in enumerate(mkr_list):
-        # Initialise mapping list size.
-        tmp = [False] * len(attr_list)
-        mapping.append(tmp)
 
+    attr_indices = collections.defaultdict(list)
+    for j, attr in enumerate(attr_list):
+        assert isinstance(attr, attribute.Attribute)
+        attr_name = attr.get_name(full_path=True)
+        attr_indices[attr_name].append(j)
+
+    def get_plug_indices(plugs):
+        indices = set()
+        for plug in plugs:
+            indices.update(attr_indices.get(plug, []))
+        return indices
+
+    # Many markers share the same bundle, so the attributes affecting
+    # a bundle are only found once.
+    bnd_indices = dict()
+    rows = []
+    for mkr in mkr_list:
         bnd = mkr.get_bundle()
         cam = mkr.get_camera()
         mkr_node = mkr.get_node()
         bnd_node = bnd.get_node()
         cam_node = cam.get_transform_node()
-        mkr_plugs = set(
-            affects_utils.find_plugs_affecting_transform(mkr_node, cam_node)
+        mkr_plugs = affects_utils.find_plugs_affecting_transform(
+            mkr_node, cam_node, cache=cache
         )
-        bnd_plugs = set(affects_utils.find_plugs_affecting_transform(bnd_node, None))
-        assert isinstance(mkr_plugs, set)
-        assert isinstance(bnd_plugs, set)
-        plugs = set(mkr_plugs.union(bnd_plugs))
-        for j, attr in enumerate(attr_list):
-            assert isinstance(attr, attribute.Attribute)
-            attr_name = attr.get_name(full_path=True)
-            mapping[i][j] = attr_name in plugs
+        if bnd_node not in bnd_indices:
+            bnd_plugs = affects_utils.find_plugs_affecting_transform(
+                bnd_node, None, cache=cache
+            )
+            bnd_indices[bnd_node] = get_plug_indices(bnd_plugs)
+        row = get_plug_indices(mkr_plugs) | bnd_indices[bnd_node]
+        rows.append(row)
+    mapping = affects_utils.MarkerAttrMapping.from_rows(len(attr_list), rows)
+
     e = time.time()
     num_iters = len(mkr_list)
     assert num_iters != 0
@@ -201,6 +499,29 @@ def find_marker_attr_mapping(mkr_list, attr_list):
     return mapping
 
 
+def find_marker_attr_mapping(mkr_list, attr_list, cache=None):
+    """
+    Get a mapping of markers to attributes, as a matrix.
+
+    :param mkr_list: Markers to consider in mapping.
+    :type mkr_list: [Marker, ..]
+
+    :param attr_list: Attributes to consider in mapping.
+    :type attr_list: [Attribute, ..]
+
+    :param cache: The cache of Maya scene queries, to be re-used
+        between calls. If None, a cache is created for this call.
+    :type cache: mmSolver.utils.nodeaffects.AffectsCache or None
+
+    :returns: Boolean matrix of size 'markers x attrs'. Matrix index
+              is 'mapping[marker_index][attr_index]', based on the
+              index of the mkr_list and attr_list given.
+    :rtype: [[bool, .. ]]
+    """
+    mapping = find_marker_attr_mapping_sparse(mkr_list, attr_list, cache=cache)
+    return mapping.to_dense()
+
+
 def calculate_average_deviation(dev_list):
     """
     Calculate a single float number (in pixels) representing the
@@ -228,3 +549,83 @@ def calculate_maximum_deviation(frames, dev_list):
             max_dev = dev
             max_frm = frm
     return max_dev, max_frm
+
+
+def set_markers_deviation_values(
+    mkr_list, times_list, dev_lists, avg_dev_list, max_dev_list, max_frm_list
+):
+    """
+    Set the deviation, average deviation and maximum deviation of
+    many markers at once.
+
+    This is the same as calling 'Marker.set_deviation',
+    'Marker.set_average_deviation' and 'Marker.set_maximum_deviation'
+    for each marker, but the deviation animCurves are all created
+    together, and the static values are all set together, rather than
+    running Maya commands for each marker.
+
+    :param mkr_list: The markers to set.
+    :type mkr_list: [Marker, ..]
+
+    :param times_list: The deviation times of each marker.
+    :type times_list: [[float, ..], ..]
+
+    :param dev_lists: The deviation values of each marker.
+    :type dev_lists: [[float, ..], ..]
+
+    :param avg_dev_list: The average deviation of each marker.
+    :type avg_dev_list: [float, ..]
+
+    :param max_dev_list: The maximum deviation of each marker.
+    :type max_dev_list: [float, ..]
+
+    :param max_frm_list: The frame of the maximum deviation of each
+        marker.
+    :type max_frm_list: [int, ..]
+
+    :rtype: None
+    """
+    count = len(mkr_list)
+    assert len(times_list) == count
+    assert len(dev_lists) == count
+    assert len(avg_dev_list) == count
+    assert len(max_dev_list) == count
+    assert len(max_frm_list) == count
+    if count == 0:
+        return
+
+    mkr_nodes = [mkr.get_node() for mkr in mkr_list]
+    for mkr, mkr_node in zip(mkr_list, mkr_nodes):
+        if mkr_node is None:
+            raise ValueError('Could not get Marker node; %r' % mkr)
+
+    def _node_attrs(attr_name):
+        return ['{0}.{1}'.format(node, attr_name) for node in mkr_nodes]
+
+    dev_node_attrs = _node_attrs(const.MARKER_ATTR_LONG_NAME_DEVIATION)
+    static_node_attrs = (
+        _node_attrs(const.MARKER_ATTR_LONG_NAME_AVG_DEVIATION)
+        + _node_attrs(const.MARKER_ATTR_LONG_NAME_MAX_DEVIATION)
+        + _node_attrs(const.MARKER_ATTR_LONG_NAME_MAX_DEV_FRAME)
+    )
+    static_values = list(avg_dev_list) + list(max_dev_list) + list(max_frm_list)
+
+    # The deviation attributes are locked so users do not edit them.
+    # 'set_static_plug_values_apitwo' unlocks the static attributes.
+    try:
+        for node_attr in dev_node_attrs:
+            maya.cmds.setAttr(node_attr, lock=False)
+        animfn_list = anim_utils.create_anim_curves_apitwo(
+            dev_node_attrs, times_list, dev_lists
+        )
+    finally:
+        for node_attr in dev_node_attrs:
+            maya.cmds.setAttr(node_attr, lock=True)
+    anim_utils.set_static_plug_values_apitwo(static_node_attrs, static_values)
+
+    # Keep the Marker objects pointing at the deviation animCurves,
+    # the same as 'Marker.set_deviation'.
+    for mkr, animfn in zip(mkr_list, animfn_list):
+        mobj = node_utils.get_as_object_apione(animfn.absoluteName())
+        mkr.set_deviation_anim_curve_fn(OpenMayaAnim.MFnAnimCurve(mobj))
+    return
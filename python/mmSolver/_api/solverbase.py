@@ -38,6 +38,8 @@ MARKER_STATIC_VALUES_KEY = 'marker_state_values'
 ATTR_STATIC_VALUES_KEY = 'attribute_state_values'
 ATTR_STIFFNESS_STATIC_VALUES_KEY = 'attribute_stiffness_state_values'
 ATTR_SMOOTHNESS_STATIC_VALUES_KEY = 'attribute_smoothness_state_values'
+MARKER_ENABLE_MATRIX_KEY = 'marker_enable_matrix'
+NODE_AFFECTS_CACHE_KEY = 'node_affects_cache'
 
 
 class SolverBase(object):
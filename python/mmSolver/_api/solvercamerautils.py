@@ -66,11 +66,18 @@ import mmSolver.utils.transform as tfm_utils
 import mmSolver.utils.node as node_utils
 import mmSolver._api.constant as const
 import mmSolver._api.marker as marker
+import mmSolver._api.markerutils as markerutils
 import mmSolver._api.bundle as bundle
 import mmSolver._api.camera as camera
 import mmSolver._api.triangulatebundle as triangulatebundle
 import mmSolver._api.solveraffects as solveraffects
 
+# NumPy
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 LOG = mmSolver.logger.get_logger()
 TRANSLATE_ATTRS = ['tx', 'ty', 'tz']
@@ -78,6 +85,59 @@ MIN_NUM_ITERATIONS = 3
 BUNDLE_VALUE_MIN = -1e5
 BUNDLE_VALUE_MAX = 1e5
 
+# The frame score counts the image bins covered by markers, for each
+# level of an image pyramid. Marker positions outside the range
+# (-0.5, 0.5] are not counted.
+FRAME_SCORE_LEVELS = 3
+FRAME_SCORE_MIN_POS = -0.5
+FRAME_SCORE_MAX_POS = 0.5
+
+# The minimum number of markers shared between two frames to solve
+# the camera pose and bundles.
+MIN_NUM_SHARED_MARKERS = 6
+
+# The enabled state and position of markers on the root frames,
+# evaluated once and shared by the scoring and filtering functions.
+#
+# 'enabled', 'pos_x' and 'pos_y' are lists with a row for each
+# frame in 'frames', and each row has a value for each marker node
+# in 'mkr_nodes'. Positions of disabled markers are 0.0.
+#
+# 'enabled_frames' maps each marker node to the set of all frames
+# the marker is enabled, not only the root frames.
+MarkerFrameValues = collections.namedtuple(
+    'MarkerFrameValues',
+    ['frames', 'mkr_nodes', 'enabled', 'pos_x', 'pos_y', 'enabled_frames'],
+)
+
+
+def _marker_position_bin(pos_x, pos_y, level):
+    """
+    Get the (x, y) bin index of the marker position, in the image
+    pyramid level.
+
+    The bins of each level split the range (-0.5, 0.5] into
+    2 * pow(2, level) parts. Bin 'x' contains the values
+    'x / (2 * pow(2, level)) < pos <= (x + 1) / (2 * pow(2, level))'.
+
+    :returns: The bin index, or None if the position is outside of
+        all bins.
+    :rtype: (int, int) or None
+    """
+    # Written so NaN values are rejected.
+    min_pos = FRAME_SCORE_MIN_POS
+    max_pos = FRAME_SCORE_MAX_POS
+    if not (min_pos <= pos_x <= max_pos and min_pos <= pos_y <= max_pos):
+        return None
+    total_num = pow(2, level)
+    # Scaling by a power of two is exact, so the bins match the
+    # comparisons in the docstring exactly.
+    x = int(math.ceil(pos_x * 2 * total_num)) - 1
+    y = int(math.ceil(pos_y * 2 * total_num)) - 1
+    if x < -total_num or y < -total_num:
+        return None
+    return x, y
+
 
 def _calculate_marker_frame_score(mkr_nodes, frame, position_marker_nodes):
     """
@@ -92,36 +152,18 @@ def _calculate_marker_frame_score(mkr_nodes, frame, position_marker_nodes):
     # This algorithm tries to score how well distributed a set of
     # points between -0.5 and 0.5. Point distributions that are more
     # uniform and cover the full frame lead to a higher score.
-    min_pos = -0.5
-    max_pos = 0.5
-    levels = 3
-    for level in range(levels):
-        total_num = pow(2, level)
-        weight = total_num
+    positions = []
+    for mkr_node in mkr_nodes:
+        pos = position_marker_nodes[frame][mkr_node]
+        positions.append(pos)
 
+    for level in range(FRAME_SCORE_LEVELS):
+        weight = pow(2, level)
         bins = set()
-        positions = []
-        for mkr_node in mkr_nodes:
-            pos = position_marker_nodes[frame][mkr_node]
-            positions.append(pos)
-
         for pos_x, pos_y in positions:
-            if pos_x < min_pos or pos_x > max_pos or pos_y < min_pos or pos_y > max_pos:
-                continue
-
-            for y in range(-total_num, total_num):
-                for x in range(-total_num, total_num):
-                    min_x_f = -min_pos * (x / total_num)
-                    max_x_f = max_pos * ((x + 1) / total_num)
-                    min_y_f = -min_pos * (y / total_num)
-                    max_y_f = max_pos * ((y + 1) / total_num)
-                    if (
-                        pos_x > min_x_f
-                        and pos_x <= max_x_f
-                        and pos_y > min_y_f
-                        and pos_y <= max_y_f
-                    ):
-                        bins.add((x, y))
+            bin_index = _marker_position_bin(pos_x, pos_y, level)
+            if bin_index is not None:
+                bins.add(bin_index)
         score += len(bins) * weight
 
     # Unlike the paper (see above), the score is multipied with the
@@ -133,6 +175,79 @@ def _calculate_marker_frame_score(mkr_nodes, frame, position_marker_nodes):
     return score
 
 
+def _calculate_frame_pair_scores_numpy(marker_values):
+    """
+    Calculate the score of all pairs of root frames at once.
+
+    The score of the frame pair (a, b) is the same as
+    '_calculate_marker_frame_score' of frame b, with the markers
+    enabled on both frames, or 0 if fewer than MIN_NUM_SHARED_MARKERS
+    markers are shared.
+
+    :type marker_values: MarkerFrameValues
+
+    :returns: Square matrix of scores, the row is the index of frame
+        'a' and the column is the index of frame 'b' in
+        'marker_values.frames'.
+    :rtype: numpy.ndarray
+    """
+    num_frames = len(marker_values.frames)
+    num_markers = len(marker_values.mkr_nodes)
+    shape = (num_frames, num_markers)
+    enabled = np.array(marker_values.enabled, dtype=np.bool_).reshape(shape)
+    pos_x = np.array(marker_values.pos_x, dtype=np.float64).reshape(shape)
+    pos_y = np.array(marker_values.pos_y, dtype=np.float64).reshape(shape)
+    enabled_values = enabled.astype(np.float64)
+
+    # Number of markers shared between each pair of frames.
+    shared_counts = np.rint(np.dot(enabled_values, enabled_values.T))
+    shared_counts = shared_counts.astype(np.int64)
+
+    # The bin of each marker on each frame, for all pyramid levels
+    # combined. Markers outside of the bins are given the index of an
+    # extra (ignored) bin, at the end.
+    in_range = (
+        enabled
+        & (pos_x >= FRAME_SCORE_MIN_POS)
+        & (pos_x <= FRAME_SCORE_MAX_POS)
+        & (pos_y >= FRAME_SCORE_MIN_POS)
+        & (pos_y <= FRAME_SCORE_MAX_POS)
+    )
+    level_bins = []
+    bin_weights = []
+    bin_offset = 0
+    with np.errstate(invalid='ignore'):
+        for level in range(FRAME_SCORE_LEVELS):
+            total_num = pow(2, level)
+            num_side = 2 * total_num
+            x = np.ceil(pos_x * num_side).astype(np.int64) - 1 + total_num
+            y = np.ceil(pos_y * num_side).astype(np.int64) - 1 + total_num
+            valid = in_range & (x >= 0) & (y >= 0)
+            level_bins.append((valid, bin_offset + (y * num_side) + x))
+            bin_weights += [pow(2, level)] * (num_side * num_side)
+            bin_offset += num_side * num_side
+    bin_weights = np.array(bin_weights, dtype=np.int64)
+
+    scores = np.zeros((num_frames, num_frames), dtype=np.int64)
+    marker_indices = np.arange(num_markers)
+    for b in range(num_frames):
+        # Which bins each marker covers on frame b.
+        occupancy = np.zeros((num_markers, bin_offset + 1), dtype=np.float64)
+        for valid, bins in level_bins:
+            bin_index = np.where(valid[b], bins[b], bin_offset)
+            occupancy[marker_indices, bin_index] = 1.0
+        occupancy = occupancy[:, :bin_offset]
+
+        # Number of markers in each bin, for the markers shared
+        # between frame b and every other frame.
+        bin_counts = np.dot(enabled_values * enabled_values[b], occupancy)
+        bins_score = np.dot(bin_counts > 0.5, bin_weights)
+        scores[:, b] = bins_score * shared_counts[:, b]
+
+    scores[shared_counts < MIN_NUM_SHARED_MARKERS] = 0
+    return scores
+
+
 def _compute_enabled_marker_nodes(mkr_list, frame):
     """Given a frame, return the valid marker nodes on that frame."""
     mkr_nodes = set()
@@ -167,7 +282,14 @@ def _compute_connected_frame_scores(
     possible_frames,
     enabled_marker_nodes,
     position_marker_nodes,
+    frame_pair_scores=None,
 ):
+    """
+    Score each possible frame, paired with 'root_frame_a'.
+
+    'frame_pair_scores' is an optional list of pre-computed scores for
+    each of the 'possible_frames', paired with 'root_frame_a'.
+    """
     mkr_nodes_a = enabled_marker_nodes[root_frame_a]
     assert isinstance(mkr_nodes_a, set)
 
@@ -180,7 +302,7 @@ def _compute_connected_frame_scores(
     max_frame_distance = 5
 
     scores = []
-    for frame in possible_frames:
+    for i, frame in enumerate(possible_frames):
         mkr_nodes_b = enabled_marker_nodes[frame]
         assert isinstance(mkr_nodes_b, set)
 
@@ -189,8 +311,13 @@ def _compute_connected_frame_scores(
             continue
 
         score = 0
+        if frame_pair_scores is not None:
+            score = int(frame_pair_scores[i])
+            scores.append(score)
+            continue
+
         mkr_nodes = mkr_nodes_a & mkr_nodes_b
-        if len(mkr_nodes) < 6:
+        if len(mkr_nodes) < MIN_NUM_SHARED_MARKERS:
             # Not enough points, we need at least 6 points to solve
             # two frames of a camera pose and bundles.
             pass
@@ -958,32 +1085,184 @@ def _remove_keyframes_outside_range(cam_tfm, cam_shp, solved_frames):
     return
 
 
-def _cache_enabled_marker_nodes(mkr_list, root_frames):
+def _cache_marker_frame_values(mkr_list, root_frames, start_frame=None, end_frame=None):
+    """
+    Evaluate the enabled state and position of all markers on the
+    root frames, in a single pass.
+
+    Each marker attribute is evaluated once for all frames (see
+    'mmSolver.utils.animcurve.evaluate_plug_over_times_apitwo'),
+    rather than querying the attribute at each frame.
+
+    :param start_frame: The frame range start, used to find the
+        'enabled_frames' of markers without an enable animation
+        curve. If start_frame or end_frame is None, 'enabled_frames'
+        is empty.
+    :type start_frame: int or None
+
+    :param end_frame: The frame range end.
+    :type end_frame: int or None
+
+    :rtype: MarkerFrameValues
+    """
+    frames = list(root_frames)
+    num_frames = len(frames)
+    mkr_nodes = []
+    mkr_node_index = {}
+    enabled_columns = []
+    pos_x_columns = []
+    pos_y_columns = []
+    enabled_frames = {}
+    for mkr in mkr_list:
+        mkr_node = mkr.get_node()
+        if mkr_node is None:
+            LOG.warn('Could not get Marker node. mkr=%r', mkr)
+            continue
+
+        range_frames = []
+        if start_frame is not None and end_frame is not None:
+            range_frames = markerutils.get_marker_enable_frame_range(
+                mkr_node, start_frame, end_frame
+            )
+        times = sorted(set(frames).union(range_frames))
+        enable_values = markerutils.get_marker_enable_values(mkr_node, times)
+        time_enabled = dict(zip(times, enable_values))
+        if start_frame is not None and end_frame is not None:
+            enabled_frames[mkr_node] = set(f for f in range_frames if time_enabled[f])
+
+        enabled_column = [bool(time_enabled[f]) for f in frames]
+        enabled_indices = [i for i in range(num_frames) if enabled_column[i]]
+        pos_times = [frames[i] for i in enabled_indices]
+        pos_x_values, pos_y_values = markerutils.get_marker_position_values(
+            mkr_node, pos_times
+        )
+        pos_x_column = [0.0] * num_frames
+        pos_y_column = [0.0] * num_frames
+        for i, pos_x, pos_y in zip(enabled_indices, pos_x_values, pos_y_values):
+            pos_x_column[i] = pos_x
+            pos_y_column[i] = pos_y
+
+        if mkr_node in mkr_node_index:
+            # Markers given more than once use the last values.
+            index = mkr_node_index[mkr_node]
+            enabled_columns[index] = enabled_column
+            pos_x_columns[index] = pos_x_column
+            pos_y_columns[index] = pos_y_column
+            continue
+        mkr_node_index[mkr_node] = len(mkr_nodes)
+        mkr_nodes.append(mkr_node)
+        enabled_columns.append(enabled_column)
+        pos_x_columns.append(pos_x_column)
+        pos_y_columns.append(pos_y_column)
+
+    # Transpose the per-marker columns into per-frame rows.
+    enabled = [list(row) for row in zip(*enabled_columns)]
+    pos_x = [list(row) for row in zip(*pos_x_columns)]
+    pos_y = [list(row) for row in zip(*pos_y_columns)]
+    if len(mkr_nodes) == 0:
+        enabled = [[] for _ in frames]
+        pos_x = [[] for _ in frames]
+        pos_y = [[] for _ in frames]
+    return MarkerFrameValues(
+        frames=frames,
+        mkr_nodes=mkr_nodes,
+        enabled=enabled,
+        pos_x=pos_x,
+        pos_y=pos_y,
+        enabled_frames=enabled_frames,
+    )
+
+
+def _create_marker_frame_values(
+    root_frames, enabled_marker_nodes, position_marker_nodes
+):
+    """
+    Create MarkerFrameValues from the per-frame enabled marker nodes
+    and marker positions.
+
+    :rtype: MarkerFrameValues
+    """
+    frames = list(root_frames)
+    all_mkr_nodes = set()
+    for frame in frames:
+        all_mkr_nodes |= enabled_marker_nodes[frame]
+    mkr_nodes = sorted(all_mkr_nodes)
+    mkr_node_index = dict((n, i) for i, n in enumerate(mkr_nodes))
+
+    num_markers = len(mkr_nodes)
+    enabled = []
+    pos_x = []
+    pos_y = []
+    for frame in frames:
+        enabled_row = [False] * num_markers
+        pos_x_row = [0.0] * num_markers
+        pos_y_row = [0.0] * num_markers
+        positions = position_marker_nodes[frame]
+        for mkr_node in enabled_marker_nodes[frame]:
+            j = mkr_node_index[mkr_node]
+            enabled_row[j] = True
+            pos_x_row[j], pos_y_row[j] = positions[mkr_node]
+        enabled.append(enabled_row)
+        pos_x.append(pos_x_row)
+        pos_y.append(pos_y_row)
+    return MarkerFrameValues(
+        frames=frames,
+        mkr_nodes=mkr_nodes,
+        enabled=enabled,
+        pos_x=pos_x,
+        pos_y=pos_y,
+        enabled_frames={},
+    )
+
+
+def _cache_enabled_marker_nodes(mkr_list, root_frames, marker_values=None):
     # Create cache for re-use in _compute_enabled_marker_nodes().
+    if marker_values is None:
+        marker_values = _cache_marker_frame_values(mkr_list, root_frames)
     enabled_marker_nodes = {}
-    for frame in root_frames:
-        mkr_nodes = _compute_enabled_marker_nodes(mkr_list, frame)
+    for frame, enabled_row in zip(marker_values.frames, marker_values.enabled):
+        mkr_nodes = set(
+            n for n, enabled in zip(marker_values.mkr_nodes, enabled_row) if enabled
+        )
         enabled_marker_nodes[frame] = mkr_nodes
     return enabled_marker_nodes
 
 
-def _cache_position_marker_nodes(root_frames, enabled_marker_nodes):
+def _cache_position_marker_nodes(root_frames, enabled_marker_nodes, marker_values=None):
     # Create cache for re-use in _marker_maximum_frame_score().
     position_marker_nodes = {}
+    if marker_values is not None:
+        for i, frame in enumerate(marker_values.frames):
+            position_marker_nodes[frame] = {}
+            enabled_row = marker_values.enabled[i]
+            pos_x_row = marker_values.pos_x[i]
+            pos_y_row = marker_values.pos_y[i]
+            for j, mkr_node in enumerate(marker_values.mkr_nodes):
+                if enabled_row[j]:
+                    mkr_position = (pos_x_row[j], pos_y_row[j])
+                    position_marker_nodes[frame][mkr_node] = mkr_position
+        return position_marker_nodes
+
+    # Evaluate the positions of each marker once, for all the frames
+    # the marker is enabled.
+    mkr_node_frames = collections.defaultdict(list)
     for frame in root_frames:
         position_marker_nodes[frame] = {}
-        mkr_nodes = enabled_marker_nodes[frame]
-        for mkr_node in mkr_nodes:
-            attr_tx = mkr_node + '.translateX'
-            attr_ty = mkr_node + '.translateY'
-            pos_x = maya.cmds.getAttr(attr_tx, time=frame)
-            pos_y = maya.cmds.getAttr(attr_ty, time=frame)
+        for mkr_node in enabled_marker_nodes[frame]:
+            mkr_node_frames[mkr_node].append(frame)
+    for mkr_node, frames in mkr_node_frames.items():
+        pos_x_values, pos_y_values = markerutils.get_marker_position_values(
+            mkr_node, frames
+        )
+        for frame, pos_x, pos_y in zip(frames, pos_x_values, pos_y_values):
             mkr_position = (pos_x, pos_y)
             position_marker_nodes[frame][mkr_node] = mkr_position
     return position_marker_nodes
 
 
-def _cache_marker_nodes_enabled(mkr_list, start_frame, end_frame):
+def _cache_marker_nodes_enabled(mkr_list, start_frame, end_frame, marker_values=None):
+    if marker_values is not None:
+        return dict(marker_values.enabled_frames)
     marker_nodes_enabled = {}
     for mkr in mkr_list:
         mkr_node = mkr.get_node()
@@ -995,21 +1274,32 @@ def _cache_marker_nodes_enabled(mkr_list, start_frame, end_frame):
 
 
 def _cache_connected_frame_statistics(
-    root_frames, enabled_marker_nodes, position_marker_nodes
+    root_frames, enabled_marker_nodes, position_marker_nodes, marker_values=None
 ):
     """
     Pre-compute the connected frame statistics, to help guess the
     best frames for solving camera pairs.
     """
+    frame_pair_scores = None
+    if np is not None:
+        if marker_values is None or marker_values.frames != list(root_frames):
+            marker_values = _create_marker_frame_values(
+                root_frames, enabled_marker_nodes, position_marker_nodes
+            )
+        frame_pair_scores = _calculate_frame_pair_scores_numpy(marker_values)
+
     frame_scores_map = {}
     frame_scores_stats_map = {}
     frame_best_frame_map = {}
-    for frame in root_frames:
+    for i, frame in enumerate(root_frames):
         scores = _compute_connected_frame_scores(
             frame,
             root_frames,
             enabled_marker_nodes,
             position_marker_nodes,
+            frame_pair_scores=(
+                None if frame_pair_scores is None else frame_pair_scores[i]
+            ),
         )
         frame_scores = zip(root_frames, scores)
         frame_scores_map[frame] = list(frame_scores)
@@ -1033,20 +1323,32 @@ def _precompute_values(mkr_list, root_frames, start_frame, end_frame):
     LOG.debug('_precompute_values.')
     # LOG.debug('mkr_list: %s', mkr_list)
 
-    enabled_marker_nodes = _cache_enabled_marker_nodes(mkr_list, root_frames)
+    # All marker values are evaluated once, and shared below.
+    marker_values = _cache_marker_frame_values(
+        mkr_list, root_frames, start_frame, end_frame
+    )
+
+    enabled_marker_nodes = _cache_enabled_marker_nodes(
+        mkr_list, root_frames, marker_values=marker_values
+    )
 
     position_marker_nodes = _cache_position_marker_nodes(
-        root_frames, enabled_marker_nodes
+        root_frames, enabled_marker_nodes, marker_values=marker_values
     )
 
-    marker_nodes_enabled = _cache_marker_nodes_enabled(mkr_list, start_frame, end_frame)
+    marker_nodes_enabled = _cache_marker_nodes_enabled(
+        mkr_list, start_frame, end_frame, marker_values=marker_values
+    )
 
     (
         frame_scores_map,
         frame_scores_stats_map,
         frame_best_frame_map,
     ) = _cache_connected_frame_statistics(
-        root_frames, enabled_marker_nodes, position_marker_nodes
+        root_frames,
+        enabled_marker_nodes,
+        position_marker_nodes,
+        marker_values=marker_values,
     )
 
     return (
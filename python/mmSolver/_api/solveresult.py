@@ -123,6 +123,11 @@ def _convert_to(name, key, typ, value, index):
     return v
 
 
+def _is_finite(value):
+    # Infinite and NaN values give NaN when subtracted from themselves.
+    return (value - value) == 0.0
+
+
 def _string_get_solver_stats(input_data):
     name_keys = [
         ('success', 'success', bool),
@@ -242,8 +247,16 @@ def _string_get_error_per_frame(input_data):
         LOG.debug(msg.format(name, key, 'None', values))
     else:
         for value in values:
-            t = _convert_to(name, key, float, value, 0)
-            v = _convert_to(name, key, float, value, 1)
+            # Convert directly, unless the value is unusual.
+            try:
+                t = float(value[0])
+                v = float(value[1])
+                valid = _is_finite(t) and _is_finite(v)
+            except (TypeError, ValueError, IndexError):
+                valid = False
+            if valid is False:
+                t = _convert_to(name, key, float, value, 0)
+                v = _convert_to(name, key, float, value, 1)
             per_frame_error[t] = v
     return per_frame_error
 
@@ -264,9 +277,18 @@ def _string_get_error_per_marker_per_frame(input_data):
         LOG.debug(msg.format(name, key, 'None', values))
     else:
         for value in values:
-            mkr = _convert_to(name, key, str, value, 0)
-            t = _convert_to(name, key, float, value, 1)
-            v = _convert_to(name, key, float, value, 2)
+            # Convert directly, unless the value is unusual.
+            try:
+                mkr = value[0]
+                t = float(value[1])
+                v = float(value[2])
+                valid = _is_finite(t) and _is_finite(v)
+            except (TypeError, ValueError, IndexError):
+                valid = False
+            if valid is False:
+                mkr = _convert_to(name, key, str, value, 0)
+                t = _convert_to(name, key, float, value, 1)
+                v = _convert_to(name, key, float, value, 2)
             per_marker_per_frame_error[mkr][t] = v
 
     return per_marker_per_frame_error
@@ -291,16 +313,24 @@ def _get_node_frame_list(node, attr_name, existing_attrs):
     return set(keyframe_times)
 
 
+def _get_anim_curve_times_and_values(anim_curve):
+    # Querying both times and values returns a flat list of (time,
+    # value) pairs, for all keyframes, in a single command.
+    times_and_values = (
+        maya.cmds.keyframe(anim_curve, query=True, timeChange=True, valueChange=True)
+        or []
+    )
+    return times_and_values[0::2], times_and_values[1::2]
+
+
 def _get_node_frame_error_list(node, attr_name, existing_attrs):
     anim_curve = _get_maya_attr_anim_curve(node, attr_name, existing_attrs)
     if anim_curve is None:
         return {}
 
-    keyframe_times = maya.cmds.keyframe(anim_curve, query=True, timeChange=True) or []
+    keyframe_times, keyframe_values = _get_anim_curve_times_and_values(anim_curve)
     times_and_values = {}
-    for keyframe_time in keyframe_times:
-        time = (keyframe_time, keyframe_time)
-        value = maya.cmds.keyframe(anim_curve, query=True, eval=True, time=time)[0]
+    for keyframe_time, value in zip(keyframe_times, keyframe_values):
         if value > 0.0:
             times_and_values[keyframe_time] = value
     return times_and_values
@@ -415,10 +445,11 @@ def _node_get_per_marker_per_frame_error(node, existing_attrs):
 
     # Get all Marker nodes
     marker_attrs = [x for x in existing_attrs if x.startswith("mkr___")]
-    marker_names = set([x.split('___')[1] for x in marker_attrs])
-    marker_nodes = [x for x in marker_names if maya.cmds.objExists(x) is True]
-    marker_nodes = [maya.cmds.ls(x, long=True) or [] for x in marker_nodes]
-    marker_nodes = set([x[0] for x in marker_nodes if len(x) > 0])
+    marker_names = sorted(set([x.split('___')[1] for x in marker_attrs]))
+    marker_nodes = set()
+    if len(marker_names) > 0:
+        # Nodes that do not exist are ignored by 'ls'.
+        marker_nodes = set(maya.cmds.ls(marker_names, long=True) or [])
 
     data = collections.defaultdict(dict)
     for mkr_node in marker_nodes:
@@ -466,7 +497,9 @@ class SolveResult(object):
             self._solver_stats = _node_get_solver_stats(node, existing_attrs)
             self._error_stats = _node_get_error_stats(node, existing_attrs)
             self._timer_stats = _node_get_timer_stats(node, existing_attrs)
-            self._solver_frames_stats = _node_get_solver_frames_stats(data)
+            self._solver_frames_stats = _node_get_solver_frames_stats(
+                node, existing_attrs
+            )
             self._print_stats = _node_get_print_stats(node, existing_attrs)
             self._per_frame_error = _node_get_per_frame_error(node, existing_attrs)
             self._per_marker_per_frame_error = _node_get_per_marker_per_frame_error(
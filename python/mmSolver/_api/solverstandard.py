@@ -242,6 +242,30 @@ class SolverStandard(solverbase.SolverBase):
         assert isinstance(value, (bool, int, pycompat.LONG_TYPE))
         self._data['use_attr_blocks'] = bool(value)
 
+    def get_use_hierarchy_blocks(self):
+        """
+        Get 'Use Hierarchy Blocks' value.
+
+        When enabled, the Markers and Attributes are split into
+        independent blocks (Markers that are only affected by the
+        Attributes in the same block), and each block is solved
+        separately, top-level (root) objects first.
+
+        :rtype: bool
+        """
+        return self._data.get(
+            'use_hierarchy_blocks', const.SOLVER_STD_USE_HIERARCHY_BLOCKS_DEFAULT_VALUE
+        )
+
+    def set_use_hierarchy_blocks(self, value):
+        """
+        Set 'Use Hierarchy Blocks' value.
+
+        :type value: bool or int
+        """
+        assert isinstance(value, (bool, int, pycompat.LONG_TYPE))
+        self._data['use_hierarchy_blocks'] = bool(value)
+
     ############################################################################
 
     def get_eval_object_relationships(self):
@@ -684,6 +708,7 @@ class SolverStandard(solverbase.SolverBase):
         global_solve = self.get_global_solve()
         triangulate_bundles = self.get_triangulate_bundles()
         use_attr_blocks = self.get_use_attr_blocks()
+        use_hierarchy_blocks = self.get_use_hierarchy_blocks()
         remove_unused_objects = True
         eval_complex_graphs = self.get_eval_complex_graphs()
         solver_version = self.get_solver_version()
@@ -752,50 +777,67 @@ class SolverStandard(solverbase.SolverBase):
         for action, vaction in generator:
             yield action, None
 
-        if use_single_frame is True:
-            generator = solverstandardutils.compile_single_frame(
-                col,
+        # Split the markers and attributes into independent blocks,
+        # each block is solved as a separate (smaller) problem.
+        blocks = [(mkr_list, attr_list)]
+        if use_hierarchy_blocks is True:
+            node_affects_cache = None
+            if precomputed_data is not None:
+                node_affects_cache = precomputed_data.get(
+                    solverbase.NODE_AFFECTS_CACHE_KEY
+                )
+            blocks = solverutils.create_hierarchy_blocks(
                 mkr_list,
                 attr_list,
-                single_frame,
-                block_iter_num,
-                lineup_iter_num,
-                use_attr_blocks,
-                remove_unused_objects,
-                solver_version,
-                solver_type,
-                scene_graph_mode,
-                precomputed_data,
-                withtest,
-                verbose,
+                remove_unused_objects=remove_unused_objects,
+                cache=node_affects_cache,
             )
-            for action, vaction in generator:
-                yield action, vaction
-        else:
-            generator = solverstandardutils.compile_multi_frame(
-                col,
-                mkr_list,
-                attr_list,
-                root_frame_list,
-                frame_list,
-                use_attr_blocks,
-                block_iter_num,
-                only_root_frames,
-                root_iter_num,
-                anim_iter_num,
-                global_solve,
-                eval_complex_graphs,
-                root_frame_strategy,
-                triangulate_bundles,
-                use_euler_filter,
-                remove_unused_objects,
-                solver_version,
-                solver_type,
-                scene_graph_mode,
-                precomputed_data,
-                withtest,
-                verbose,
-            )
-            for action, vaction in generator:
-                yield action, vaction
+
+        for block_mkr_list, block_attr_list in blocks:
+            if use_single_frame is True:
+                generator = solverstandardutils.compile_single_frame(
+                    col,
+                    block_mkr_list,
+                    block_attr_list,
+                    single_frame,
+                    block_iter_num,
+                    lineup_iter_num,
+                    use_attr_blocks,
+                    remove_unused_objects,
+                    solver_version,
+                    solver_type,
+                    scene_graph_mode,
+                    precomputed_data,
+                    withtest,
+                    verbose,
+                )
+                for action, vaction in generator:
+                    yield action, vaction
+            else:
+                generator = solverstandardutils.compile_multi_frame(
+                    col,
+                    block_mkr_list,
+                    block_attr_list,
+                    root_frame_list,
+                    frame_list,
+                    use_attr_blocks,
+                    block_iter_num,
+                    only_root_frames,
+                    root_iter_num,
+                    anim_iter_num,
+                    global_solve,
+                    eval_complex_graphs,
+                    root_frame_strategy,
+                    triangulate_bundles,
+                    use_euler_filter,
+                    remove_unused_objects,
+                    solver_version,
+                    solver_type,
+                    scene_graph_mode,
+                    precomputed_data,
+                    withtest,
+                    verbose,
+                )
+                for action, vaction in generator:
+                    yield action, vaction
         return
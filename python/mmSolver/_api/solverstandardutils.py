@@ -35,6 +35,7 @@ import mmSolver._api.markerutils as markerutils
 import mmSolver._api.rootframe as rootframe
 import mmSolver._api.action as api_action
 import mmSolver._api.compile as api_compile
+import mmSolver._api.solverbase as solverbase
 
 
 LOG = mmSolver.logger.get_logger()
@@ -181,6 +182,10 @@ def _compile_multi_root_frames(
     assert solver_version in const.SOLVER_VERSION_LIST
     assert solver_type in const.SOLVER_TYPE_LIST
 
+    node_affects_cache = None
+    if precomputed_data is not None:
+        node_affects_cache = precomputed_data.get(solverbase.NODE_AFFECTS_CACHE_KEY)
+
     # Solve root frames.
     for frm_list in batch_frame_list:
         # Get root markers
@@ -189,13 +194,17 @@ def _compile_multi_root_frames(
         )
         assert len(root_mkr_list) > 0
 
-        mkr_attr_map = markerutils.find_marker_attr_mapping(root_mkr_list, attr_list)
+        mkr_attr_map = markerutils.find_marker_attr_mapping_sparse(
+            root_mkr_list, attr_list, cache=node_affects_cache
+        )
         root_attr_list = []
-        for i, mkr in enumerate(root_mkr_list):
-            for j, attr in enumerate(attr_list):
-                x = mkr_attr_map[i][j]
-                if x is True and attr not in root_attr_list:
+        root_attr_set = set()
+        for i in range(len(root_mkr_list)):
+            for j in mkr_attr_map.get_attr_indices(i):
+                attr = attr_list[j]
+                if attr not in root_attr_set:
                     root_attr_list.append(attr)
+                    root_attr_set.add(attr)
 
         attr_blocks = solverutils.create_attr_blocks(use_attr_blocks, root_attr_list)
 
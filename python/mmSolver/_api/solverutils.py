@@ -27,11 +27,13 @@ from __future__ import division
 from __future__ import print_function
 
 import mmSolver.logger
+import mmSolver.utils.nodeaffects as affects_utils
 import mmSolver._api.attribute as attribute
 import mmSolver._api.excep as excep
 import mmSolver._api.constant as const
 import mmSolver._api.action as api_action
 import mmSolver._api.compile as api_compile
+import mmSolver._api.markerutils as markerutils
 import mmSolver._api.solveraffects as solveraffects
 import mmSolver._api.solverscenegraph as solverscenegraph
 
@@ -127,6 +129,82 @@ def create_attr_blocks(use_attr_blocks, attr_list):
     return attr_blocks
 
 
+def create_hierarchy_blocks(
+    mkr_list, attr_list, remove_unused_objects=None, cache=None
+):
+    """
+    Splits markers and attributes into independent blocks, that can
+    be solved one after the other.
+
+    The markers in a block are only affected by the attributes in the
+    same block. Blocks are sorted with the top-level (root) objects
+    first.
+
+    Markers and attributes that do not affect anything are not in a
+    block. When 'remove_unused_objects' is False, they are added
+    together as the last block (or added to the last block, if there
+    are only unused markers, or only unused attributes). When no
+    blocks are found, all markers and attributes are given as a
+    single block.
+
+    :type mkr_list: [Marker, ..]
+    :type attr_list: [Attribute, ..]
+
+    :param remove_unused_objects: Leave out the markers and
+        attributes that do not affect anything? None means True.
+    :type remove_unused_objects: bool or None
+
+    :param cache: The cache of Maya scene queries.
+    :type cache: mmSolver.utils.nodeaffects.AffectsCache or None
+
+    :rtype: [([Marker, ..], [Attribute, ..])]
+    """
+    if remove_unused_objects is None:
+        remove_unused_objects = True
+    if len(mkr_list) == 0 or len(attr_list) == 0:
+        return [(mkr_list, attr_list)]
+    if cache is None:
+        cache = affects_utils.AffectsCache()
+
+    mapping = markerutils.find_marker_attr_mapping_sparse(
+        mkr_list, attr_list, cache=cache
+    )
+    attr_names = [attr.get_name(full_path=True) for attr in attr_list]
+    index_blocks = affects_utils.sort_into_hierarchy_groups(
+        mkr_list, attr_names, mapping=mapping, cache=cache
+    )
+
+    if len(index_blocks) == 0:
+        return [(mkr_list, attr_list)]
+
+    blocks = []
+    used_mkr_indices = set()
+    used_attr_indices = set()
+    for mkr_indices, attr_indices in index_blocks:
+        block_mkr_list = [mkr_list[i] for i in mkr_indices]
+        block_attr_list = [attr_list[j] for j in attr_indices]
+        blocks.append((block_mkr_list, block_attr_list))
+        used_mkr_indices |= set(mkr_indices)
+        used_attr_indices |= set(attr_indices)
+
+    if remove_unused_objects is False:
+        unused_mkr_list = [
+            mkr for i, mkr in enumerate(mkr_list) if i not in used_mkr_indices
+        ]
+        unused_attr_list = [
+            attr for j, attr in enumerate(attr_list) if j not in used_attr_indices
+        ]
+        if len(unused_mkr_list) > 0 and len(unused_attr_list) > 0:
+            blocks.append((unused_mkr_list, unused_attr_list))
+        elif len(unused_mkr_list) > 0 or len(unused_attr_list) > 0:
+            last_mkr_list, last_attr_list = blocks[-1]
+            blocks[-1] = (
+                last_mkr_list + unused_mkr_list,
+                last_attr_list + unused_attr_list,
+            )
+    return blocks
+
+
 def compile_solver_step_blocks_with_cache(
     sol, col, mkr_list, attr_blocks, withtest, cache
 ):
@@ -39,6 +39,7 @@ from mmSolver._api.execute import (
     validate,
     execute,
 )
+from mmSolver._api.compile import clear_collection_compile_cache
 from mmSolver._api.frame import Frame
 from mmSolver._api.rootframe import (
     get_root_frames_from_markers,
@@ -85,6 +86,7 @@ from mmSolver._api.markerutils import (
     find_marker_attr_mapping,
     calculate_average_deviation,
     calculate_maximum_deviation,
+    set_markers_deviation_values,
 )
 from mmSolver._api.naming import (
     find_valid_maya_node_name,
@@ -421,12 +423,15 @@ __all__ = [
     'create_execute_options',
     'execute',
     'validate',
+    # Compile
+    'clear_collection_compile_cache',
     # Marker Utils
     'calculate_marker_deviation',
     'get_markers_start_end_frames',
     'find_marker_attr_mapping',
     'calculate_average_deviation',
     'calculate_maximum_deviation',
+    'set_markers_deviation_values',
     # Naming
     'find_valid_maya_node_name',
     'get_new_marker_name',
@@ -60,6 +60,51 @@ MMSOLVER_LOCATION_ENV_VAR_NAME = 'MMSOLVER_LOCATION'
 # The expected file name for the camera solver executable.
 EXECUTABLE_FILE_NAME = 'mmsolver-camerasolve'
 
+# The camera solver executable writes progress lines to stdout (with
+# the '--progress' flag); this prefix followed by a JSON object.
+PROGRESS_LINE_PREFIX = 'MMCAMERASOLVE_PROGRESS '
+
+# The stages of a camera solve, given in the progress lines.
+PROGRESS_STAGE_LOAD = 'load'
+PROGRESS_STAGE_SOLVE = 'solve'
+PROGRESS_STAGE_INTERMEDIATE = 'intermediate'
+PROGRESS_STAGE_WRITE = 'write'
+PROGRESS_STAGE_DONE = 'done'
+PROGRESS_STAGE_LIST = [
+    PROGRESS_STAGE_LOAD,
+    PROGRESS_STAGE_SOLVE,
+    PROGRESS_STAGE_INTERMEDIATE,
+    PROGRESS_STAGE_WRITE,
+    PROGRESS_STAGE_DONE,
+]
+
+# The status of a camera solve job in a batch.
+BATCH_JOB_STATUS_PENDING = 'pending'
+BATCH_JOB_STATUS_RUNNING = 'running'
+BATCH_JOB_STATUS_SUCCESS = 'success'
+BATCH_JOB_STATUS_FAILED = 'failed'
+BATCH_JOB_STATUS_CANCELLED = 'cancelled'
+BATCH_JOB_STATUS_LIST = [
+    BATCH_JOB_STATUS_PENDING,
+    BATCH_JOB_STATUS_RUNNING,
+    BATCH_JOB_STATUS_SUCCESS,
+    BATCH_JOB_STATUS_FAILED,
+    BATCH_JOB_STATUS_CANCELLED,
+]
+BATCH_JOB_STATUS_FINISHED_LIST = [
+    BATCH_JOB_STATUS_SUCCESS,
+    BATCH_JOB_STATUS_FAILED,
+    BATCH_JOB_STATUS_CANCELLED,
+]
+
+# The resources expected to be used by each camera solver process in
+# a batch, used to choose how many processes run at once.
+BATCH_THREADS_PER_PROCESS = 2
+BATCH_MEMORY_PER_PROCESS_BYTES = 2 * 1024 * 1024 * 1024
+
+# How often a blocking batch solve checks the running processes.
+BATCH_POLL_SECONDS = 0.2
+
 # This is a special attribute name that is expected by the
 # mmcamerasolve executable.
 ATTR_CAMERA_FOCAL_LENGTH = 'camera.focal_length_mm'
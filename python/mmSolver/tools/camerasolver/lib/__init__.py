@@ -45,11 +45,19 @@ from mmSolver.tools.camerasolver.lib.types import (
 
 from mmSolver.tools.camerasolver.lib.execute import (
     find_executable_file_path,
+    parse_progress_line,
     SolveProcess,
+    load_intermediate_outputs,
     launch_solve,
     launch_solve_async,
 )
 
+from mmSolver.tools.camerasolver.lib.batch import (
+    get_default_process_count,
+    BatchSolveJob,
+    BatchSolveQueue,
+)
+
 from mmSolver.tools.camerasolver.lib.defaults import (
     compute_focal_length_min_max_from_percentage,
     make_adjustment_solver,
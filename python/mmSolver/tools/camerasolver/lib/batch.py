@@ -0,0 +1,382 @@
+# Copyright (C) 2026 David Cattermole.
+#
+# This file is part of mmSolver.
+#
+# mmSolver is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# mmSolver is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with mmSolver.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""
+Run many camera solves, with a limited number of processes at once.
+
+Solves are added to a :class:`BatchSolveQueue` as
+:class:`BatchSolveJob` objects. The queue starts a new process
+whenever a running process finishes, and loads the results of each
+job into the Maya scene as soon as the job finishes.
+
+Maya commands are only run from :meth:`BatchSolveQueue.poll`, so the
+queue must be polled from the main thread, for example from a
+QTimer, or blocking with :meth:`BatchSolveQueue.wait`::
+
+    queue = BatchSolveQueue()
+    for cam, mkr_list in cameras_and_markers:
+        job = BatchSolveJob(cam, None, mkr_list, ...)
+        queue.add_job(job)
+    queue.wait()
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import copy
+import multiprocessing
+import os
+import time
+
+import maya.cmds
+
+import mmSolver.logger
+import mmSolver.api as mmapi
+import mmSolver.utils.time as time_utils
+import mmSolver.utils.python_compat as pycompat
+
+import mmSolver.tools.camerasolver.constant as const
+
+from mmSolver.tools.camerasolver.lib.types import AdjustmentSolver, AdjustmentAttributes
+
+from mmSolver.tools.camerasolver.lib.execute import (
+    build_solve_cmd_args,
+    start_solve_process,
+    load_solve_outputs,
+)
+
+LOG = mmSolver.logger.get_logger()
+
+
+def _get_cpu_count():
+    # type: () -> int
+    try:
+        return multiprocessing.cpu_count()
+    except NotImplementedError:
+        return 1
+
+
+def _get_available_memory_bytes():
+    # type: () -> int | None
+    try:
+        total = maya.cmds.mmMemorySystem(query=True, systemPhysicalMemoryTotal=True)
+        used = maya.cmds.mmMemorySystem(query=True, systemPhysicalMemoryUsed=True)
+    except (AttributeError, RuntimeError, TypeError):
+        # The mmSolver plug-in is not loaded.
+        return None
+    return int(total) - int(used)
+
+
+def get_default_process_count():
+    # type: () -> int
+    """Get the number of camera solver processes to run at once.
+
+    The number is limited by the CPU cores and by the available
+    memory (when it can be queried).
+    """
+    count = _get_cpu_count() // const.BATCH_THREADS_PER_PROCESS
+    available_memory = _get_available_memory_bytes()
+    if available_memory is not None:
+        count = min(count, available_memory // const.BATCH_MEMORY_PER_PROCESS_BYTES)
+    return max(1, int(count))
+
+
+class BatchSolveJob(object):
+    """A single camera solve in a :class:`BatchSolveQueue`.
+
+    Takes the same arguments as
+    :func:`mmSolver.tools.camerasolver.lib.execute.launch_solve`. If
+    *progress* is True, the progress of the running solve can be read
+    with :meth:`get_last_progress`.
+    """
+
+    def __init__(
+        self,
+        cam,
+        lens,
+        mkr_list,
+        frame_range,
+        adjustment_solver,
+        adjustment_attrs,
+        log_level,  # type: str
+        prefix_name,
+        output_dir,  # type: str
+        progress=None,  # type: bool | None
+    ):
+        # type: (...) -> None
+        assert isinstance(cam, mmapi.Camera)
+        assert lens is None or isinstance(lens, mmapi.Lens)
+        assert isinstance(mkr_list, list)
+        assert len(mkr_list) > 0
+        assert all(isinstance(mkr, mmapi.Marker) for mkr in mkr_list)
+        assert isinstance(frame_range, time_utils.FrameRange)
+        assert isinstance(adjustment_solver, AdjustmentSolver)
+        assert isinstance(adjustment_attrs, AdjustmentAttributes)
+        assert log_level in const.LOG_LEVEL_LIST
+        assert isinstance(prefix_name, pycompat.TEXT_TYPE)
+        assert output_dir and os.path.isdir(output_dir)
+        self._cam = cam
+        self._lens = lens
+        self._mkr_list = list(mkr_list)
+        self._frame_range = frame_range
+        self._adjustment_solver = adjustment_solver
+        self._adjustment_attrs = adjustment_attrs
+        self._log_level = log_level
+        self._prefix_name = prefix_name
+        self._output_dir = output_dir
+        self._progress = progress
+
+        self._status = const.BATCH_JOB_STATUS_PENDING
+        self._solve_process = None
+        self._returncode = None
+        self._stdout = ''
+        self._stderr = ''
+
+    def get_camera(self):
+        # type: () -> mmapi.Camera
+        return self._cam
+
+    def get_marker_list(self):
+        # type: () -> list
+        return list(self._mkr_list)
+
+    def get_prefix_name(self):
+        # type: () -> str
+        return self._prefix_name
+
+    def get_output_directory(self):
+        # type: () -> str
+        return self._output_dir
+
+    def get_status(self):
+        # type: () -> str
+        """One of the ``const.BATCH_JOB_STATUS_*`` values."""
+        return self._status
+
+    def is_finished(self):
+        # type: () -> bool
+        return self._status in const.BATCH_JOB_STATUS_FINISHED_LIST
+
+    def get_output_lines(self):
+        # type: () -> list[str]
+        """The stdout lines of the solver process, read so far."""
+        if self._solve_process is None:
+            return []
+        return self._solve_process.get_stdout_lines()
+
+    def get_last_progress(self):
+        # type: () -> dict | None
+        """The most recent progress of the solver process, or None.
+
+        Always None unless the job was created with ``progress=True``.
+        """
+        if self._solve_process is None:
+            return None
+        return self._solve_process.get_last_progress()
+
+    def result(self):
+        # type: () -> tuple[int | None, str, str]
+        """Return (returncode, stdout, stderr) of a finished job."""
+        return (self._returncode, self._stdout, self._stderr)
+
+    def _start(self, thread_count):
+        # type: (int) -> None
+        adjustment_solver = self._adjustment_solver
+        if adjustment_solver.get_thread_count() is None:
+            # Share the CPU cores with the other running processes.
+            adjustment_solver = copy.copy(adjustment_solver)
+            adjustment_solver.set_thread_count(thread_count)
+
+        cmd_args = build_solve_cmd_args(
+            self._cam,
+            self._lens,
+            self._mkr_list,
+            self._frame_range,
+            adjustment_solver,
+            self._adjustment_attrs,
+            self._log_level,
+            self._prefix_name,
+            self._output_dir,
+            progress=self._progress,
+        )
+        if cmd_args is None:
+            self._status = const.BATCH_JOB_STATUS_FAILED
+            return
+
+        LOG.debug('Camera solver command: %s', ' '.join(cmd_args))
+        self._solve_process = start_solve_process(cmd_args)
+        self._status = const.BATCH_JOB_STATUS_RUNNING
+
+    def _is_process_done(self):
+        # type: () -> bool
+        return self._solve_process.is_done()
+
+    def _finish(self):
+        # type: () -> None
+        self._solve_process.wait()
+        returncode, stdout, stderr = self._solve_process.result()
+        self._returncode = returncode
+        self._stdout = stdout
+        self._stderr = stderr
+        if self._status == const.BATCH_JOB_STATUS_CANCELLED:
+            return
+        if returncode != 0:
+            self._status = const.BATCH_JOB_STATUS_FAILED
+            return
+        load_solve_outputs(
+            self._cam, self._mkr_list, self._prefix_name, self._output_dir
+        )
+        self._status = const.BATCH_JOB_STATUS_SUCCESS
+
+    def _cancel(self):
+        # type: () -> None
+        if self._status == const.BATCH_JOB_STATUS_RUNNING:
+            self._solve_process.cancel()
+        if self.is_finished() is False:
+            self._status = const.BATCH_JOB_STATUS_CANCELLED
+
+
+class BatchSolveQueue(object):
+    """Runs :class:`BatchSolveJob` objects in a bounded number of
+    processes.
+    """
+
+    def __init__(self, process_count=None):
+        # type: (int | None) -> None
+        """
+        :param process_count: The maximum number of processes to run
+            at once, or None to use :func:`get_default_process_count`.
+        """
+        if process_count is None:
+            process_count = get_default_process_count()
+        assert isinstance(process_count, int)
+        assert process_count > 0
+        self._process_count = process_count
+        self._jobs = []
+        self._pending_jobs = []
+        self._running_jobs = []
+
+    def get_process_count(self):
+        # type: () -> int
+        return self._process_count
+
+    def add_job(self, job):
+        # type: (BatchSolveJob) -> BatchSolveJob
+        """Add a job to the end of the queue. Jobs start when polled.
+
+        Jobs write their files with the prefix name into the output
+        directory, so two jobs in the queue cannot use the same prefix
+        name and output directory.
+
+        :raises ValueError: When a job in the queue already uses the
+            prefix name and output directory of *job*.
+        """
+        assert isinstance(job, BatchSolveJob)
+        assert job.get_status() == const.BATCH_JOB_STATUS_PENDING
+        output_dir = os.path.normcase(os.path.abspath(job.get_output_directory()))
+        for other_job in self._jobs:
+            other_output_dir = os.path.normcase(
+                os.path.abspath(other_job.get_output_directory())
+            )
+            if (
+                other_job.get_prefix_name() == job.get_prefix_name()
+                and other_output_dir == output_dir
+            ):
+                msg = 'Job prefix name %r is already used in output directory %r.'
+                raise ValueError(msg % (job.get_prefix_name(), output_dir))
+        self._jobs.append(job)
+        self._pending_jobs.append(job)
+        return job
+
+    def get_jobs(self):
+        # type: () -> list[BatchSolveJob]
+        return list(self._jobs)
+
+    def is_done(self):
+        # type: () -> bool
+        """Return True when no jobs are pending or running."""
+        return len(self._pending_jobs) == 0 and len(self._running_jobs) == 0
+
+    def poll(self):
+        # type: () -> list[BatchSolveJob]
+        """Finish completed jobs and start pending jobs.
+
+        Must be called from the main thread, because the results of
+        finished jobs are loaded into the Maya scene.
+
+        :returns: The jobs that finished during this call.
+        """
+        finished_jobs = []
+        running_jobs = []
+        for job in self._running_jobs:
+            if job._is_process_done() is False:
+                running_jobs.append(job)
+                continue
+            try:
+                job._finish()
+            except Exception:
+                LOG.exception('Camera solve failed to load: %r', job.get_prefix_name())
+                job._status = const.BATCH_JOB_STATUS_FAILED
+            finished_jobs.append(job)
+        self._running_jobs = running_jobs
+
+        thread_count = max(1, _get_cpu_count() // self._process_count)
+        while self._pending_jobs and len(self._running_jobs) < self._process_count:
+            job = self._pending_jobs.pop(0)
+            try:
+                job._start(thread_count)
+            except Exception:
+                LOG.exception('Camera solve failed to start: %r', job.get_prefix_name())
+                job._status = const.BATCH_JOB_STATUS_FAILED
+            if job.get_status() == const.BATCH_JOB_STATUS_RUNNING:
+                self._running_jobs.append(job)
+            else:
+                finished_jobs.append(job)
+        return finished_jobs
+
+    def cancel(self, job=None):
+        # type: (BatchSolveJob | None) -> None
+        """Cancel a job, or all unfinished jobs if job is None.
+
+        Running processes are terminated; the cancelled jobs are
+        finished by the next :meth:`poll`.
+        """
+        jobs = self._jobs if job is None else [job]
+        for job in jobs:
+            if job in self._pending_jobs:
+                self._pending_jobs.remove(job)
+            job._cancel()
+
+    def wait(self, progress_fn=None):
+        # type: (...) -> list[BatchSolveJob]
+        """Block until all jobs are finished.
+
+        :param progress_fn: Called with each job as it finishes.
+        :type progress_fn: callable or None
+
+        :returns: All the jobs in the queue.
+        """
+        while True:
+            finished_jobs = self.poll()
+            if progress_fn is not None:
+                for job in finished_jobs:
+                    progress_fn(job)
+            if self.is_done():
+                break
+            time.sleep(const.BATCH_POLL_SECONDS)
+        return self.get_jobs()
@@ -19,6 +19,7 @@
 Functions for executing the camera solver process.
 """
 
+import json
 import os
 import subprocess
 import threading
@@ -62,6 +63,31 @@ def find_executable_file_path():
     return executable_file_path
 
 
+def parse_progress_line(line):
+    # type: (str) -> dict | None
+    """Parse a progress line written by the camera solver executable.
+
+    The line is :data:`const.PROGRESS_LINE_PREFIX` followed by a JSON
+    object, with the keys 'stage', 'iteration', 'mean_error',
+    'median_error', 'camera_count', 'bundle_count' and 'prefix'.
+
+    Returns the progress as a dict, or None if *line* is not a
+    progress line.
+    """
+    if not line.startswith(const.PROGRESS_LINE_PREFIX):
+        return None
+    try:
+        progress = json.loads(line[len(const.PROGRESS_LINE_PREFIX) :])
+    except ValueError:
+        LOG.debug('Invalid camera solver progress line: %r', line)
+        return None
+    if not isinstance(progress, dict):
+        return None
+    if progress.get('stage') not in const.PROGRESS_STAGE_LIST:
+        return None
+    return progress
+
+
 class SolveProcess(object):
     """Handle for a running (or completed) camera solver process.
 
@@ -69,18 +95,30 @@ class SolveProcess(object):
     from the main thread without blocking.
     """
 
-    def __init__(self, proc, stdout_thread, stderr_thread, stdout_lines, stderr_lines):
+    def __init__(
+        self,
+        proc,
+        stdout_thread,
+        stderr_thread,
+        stdout_lines,
+        stderr_lines,
+        progress_list=None,
+    ):
         # type: (...) -> None
         assert isinstance(proc, subprocess.Popen)
         assert isinstance(stdout_thread, threading.Thread)
         assert isinstance(stderr_thread, threading.Thread)
         assert isinstance(stdout_lines, list)
         assert isinstance(stderr_lines, list)
+        if progress_list is None:
+            progress_list = []
+        assert isinstance(progress_list, list)
         self._proc = proc
         self._stdout_thread = stdout_thread
         self._stderr_thread = stderr_thread
         self._stdout_lines = stdout_lines
         self._stderr_lines = stderr_lines
+        self._progress_list = progress_list
 
     def is_done(self):
         # type: () -> bool
@@ -100,6 +138,34 @@ class SolveProcess(object):
         if self._proc.poll() is None:
             self._proc.terminate()
 
+    def get_stdout_lines(self):
+        # type: () -> list[str]
+        """Return a copy of the stdout lines read so far.
+
+        Safe to call while the process is running.
+        """
+        return list(self._stdout_lines)
+
+    def get_progress_list(self, start_index=None):
+        # type: (int | None) -> list[dict]
+        """Return the progress read so far, starting at *start_index*.
+
+        Progress lines are not included in the stdout lines. Callers
+        can read new progress incrementally by passing the number of
+        items already read. Safe to call while the process is running.
+        """
+        if start_index is None:
+            start_index = 0
+        return self._progress_list[start_index:]
+
+    def get_last_progress(self):
+        # type: () -> dict | None
+        """Return the most recent progress, or None if none was read."""
+        progress_list = self._progress_list
+        if not progress_list:
+            return None
+        return progress_list[-1]
+
     def result(self):
         # type: () -> tuple[int, str, str]
         """Return (returncode, stdout, stderr).  Call after :meth:`wait`."""
@@ -113,8 +179,14 @@ class SolveProcess(object):
         return (returncode, stdout, stderr)
 
 
-def _start_solve_process(cmd_args):
+def start_solve_process(cmd_args):
     # type: (...) -> SolveProcess
+    """Start the solver executable with *cmd_args* in the background.
+
+    The stdout and stderr of the process are read by threads, see
+    :class:`SolveProcess`. *cmd_args* are usually created with
+    :func:`build_solve_cmd_args`.
+    """
     assert isinstance(cmd_args, list)
     assert len(cmd_args) > 0
     assert all(isinstance(arg, pycompat.TEXT_TYPE) for arg in cmd_args)
@@ -132,17 +204,24 @@ def _start_solve_process(cmd_args):
 
     stdout_lines = []
     stderr_lines = []
+    progress_list = []
 
-    def _read_stream(stream, line_list, log_fn):
+    def _read_stream(stream, line_list, log_fn, progress_list=None):
         for raw in iter(stream.readline, b''):
             line = raw.decode('utf-8', errors='replace').rstrip('\n')
+            if progress_list is not None:
+                progress = parse_progress_line(line)
+                if progress is not None:
+                    progress_list.append(progress)
+                    LOG.debug('%s', line)
+                    continue
             line_list.append(line)
             log_fn('%s', line)
         stream.close()
 
     stdout_thread = threading.Thread(
         target=_read_stream,
-        args=(proc.stdout, stdout_lines, LOG.info),
+        args=(proc.stdout, stdout_lines, LOG.info, progress_list),
         daemon=True,
     )
     stderr_thread = threading.Thread(
@@ -152,10 +231,12 @@ def _start_solve_process(cmd_args):
     )
     stdout_thread.start()
     stderr_thread.start()
-    return SolveProcess(proc, stdout_thread, stderr_thread, stdout_lines, stderr_lines)
+    return SolveProcess(
+        proc, stdout_thread, stderr_thread, stdout_lines, stderr_lines, progress_list
+    )
 
 
-def _build_solve_cmd_args(
+def build_solve_cmd_args(
     cam,
     lens,
     mkr_list,
@@ -165,10 +246,19 @@ def _build_solve_cmd_args(
     log_level,
     prefix_name,
     output_dir,
+    intermediate_output=None,
+    progress=None,
 ):
     # type: (...) -> list[str] | None
     """Write input files and return the solver command-line arguments.
 
+    When *progress* is True, the solver writes progress lines, see
+    :func:`parse_progress_line`. To report the error of each round,
+    the solver also computes the intermediate results, which is
+    slower, so only ask for progress when it is read.
+    When *intermediate_output* is True, the solver also writes
+    intermediate results to *output_dir*.
+
     Returns None if the executable cannot be found.
     """
     assert isinstance(cam, mmapi.Camera)
@@ -221,9 +311,45 @@ def _build_solve_cmd_args(
         '--console-level',
         log_level,
     ]
+    if progress is True:
+        cmd_args.append('--progress')
+    if intermediate_output is True:
+        cmd_args.append('--intermediate-output')
     return cmd_args
 
 
+def load_solve_outputs(cam, mkr_list, prefix_name, output_dir):
+    # type: (...) -> None
+    """Load the output files of a successful solve into the Maya scene."""
+    load_camera_outputs(cam, prefix_name, output_dir)
+    load_bundle_outputs(mkr_list, prefix_name, output_dir)
+    load_residuals_outputs(mkr_list, prefix_name, output_dir)
+    # TODO: Load Nuke lens distortion values.
+
+
+def load_intermediate_outputs(cam, mkr_list, progress, output_dir):
+    # type: (...) -> bool
+    """Load an intermediate result of a running solve into the Maya
+    scene, as a preview.
+
+    *progress* is an intermediate progress item from
+    :meth:`SolveProcess.get_progress_list`. The intermediate files are
+    only written when the solve was launched with
+    ``intermediate_output=True``.
+
+    Returns True on success.
+    """
+    assert isinstance(progress, dict)
+    if progress.get('stage') != const.PROGRESS_STAGE_INTERMEDIATE:
+        return False
+    prefix_name = progress.get('prefix')
+    if not prefix_name:
+        return False
+    ok = load_camera_outputs(cam, prefix_name, output_dir)
+    ok = load_bundle_outputs(mkr_list, prefix_name, output_dir) and ok
+    return ok
+
+
 def launch_solve(
     cam,
     lens,
@@ -254,7 +380,7 @@ def launch_solve(
     assert isinstance(prefix_name, pycompat.TEXT_TYPE)
     assert output_dir and os.path.isdir(output_dir)
 
-    cmd_args = _build_solve_cmd_args(
+    cmd_args = build_solve_cmd_args(
         cam,
         lens,
         mkr_list,
@@ -269,7 +395,7 @@ def launch_solve(
         return (-1, '', '')
 
     LOG.debug('Camera solver command: %s', ' '.join(cmd_args))
-    solve_process = _start_solve_process(cmd_args)
+    solve_process = start_solve_process(cmd_args)
 
     solve_process.wait()
     returncode, stdout, stderr = solve_process.result()
@@ -277,10 +403,7 @@ def launch_solve(
     assert isinstance(stdout, pycompat.TEXT_TYPE)
     assert isinstance(stderr, pycompat.TEXT_TYPE)
     if returncode == 0:
-        load_camera_outputs(cam, prefix_name, output_dir)
-        load_bundle_outputs(mkr_list, prefix_name, output_dir)
-        load_residuals_outputs(mkr_list, prefix_name, output_dir)
-        # TODO: Load Nuke lens distortion values.
+        load_solve_outputs(cam, mkr_list, prefix_name, output_dir)
     return (returncode, stdout, stderr)
 
 
@@ -294,6 +417,8 @@ def launch_solve_async(
     log_level,  # type: str
     prefix_name,
     output_dir,  # type: str
+    intermediate_output=None,  # type: bool | None
+    progress=None,  # type: bool | None
 ):
     # type: (...) -> SolveProcess | None
     """Non-blocking variant of :func:`launch_solve`.
@@ -302,6 +427,11 @@ def launch_solve_async(
     background, and returns a :class:`SolveProcess` immediately so the
     caller can continue working.  Call :meth:`SolveProcess.wait` /
     :meth:`SolveProcess.result` when the result is needed.
+
+    If *progress* is True, progress can be read while the solver runs
+    with :meth:`SolveProcess.get_progress_list`. If *intermediate_output* is
+    True, intermediate results can be previewed with
+    :func:`load_intermediate_outputs`.
     """
     assert isinstance(cam, mmapi.Camera)
     assert lens is None or isinstance(lens, mmapi.Lens)
@@ -315,7 +445,7 @@ def launch_solve_async(
     assert isinstance(prefix_name, pycompat.TEXT_TYPE)
     assert output_dir and os.path.isdir(output_dir)
 
-    cmd_args = _build_solve_cmd_args(
+    cmd_args = build_solve_cmd_args(
         cam,
         lens,
         mkr_list,
@@ -325,9 +455,11 @@ def launch_solve_async(
         log_level,
         prefix_name,
         output_dir,
+        intermediate_output=intermediate_output,
+        progress=progress,
     )
     if cmd_args is None:
         return None
 
     LOG.debug('Camera solver command: %s', ' '.join(cmd_args))
-    return _start_solve_process(cmd_args)
+    return start_solve_process(cmd_args)
@@ -30,6 +30,12 @@ import mmSolver.utils.python_compat as pycompat
 
 from mmSolver.tools.camerasolver.lib.save_data import INCHES_TO_MM
 
+# NumPy
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 LOG = mmSolver.logger.get_logger()
 
 
@@ -115,6 +121,63 @@ def load_nuke_lens_file():
     raise NotImplementedError
 
 
+def _calculate_residual_deviations_python(frames, errors_rows):
+    # type: (...) -> tuple[list, list, list, list]
+    marker_count = len(errors_rows[0])
+    dev_lists = [[] for _ in range(marker_count)]
+    for errors in errors_rows:
+        for i, error in enumerate(errors):
+            if error is None:
+                error = 0.0
+            assert isinstance(error, (int, float))
+            dev_lists[i].append(error)
+
+    avg_dev_list = []
+    max_dev_list = []
+    max_frm_list = []
+    for devs in dev_lists:
+        avg_dev = mmapi.calculate_average_deviation(devs)
+        max_dev, max_frm = mmapi.calculate_maximum_deviation(frames, devs)
+        avg_dev_list.append(avg_dev)
+        max_dev_list.append(max_dev)
+        max_frm_list.append(max_frm)
+    return dev_lists, avg_dev_list, max_dev_list, max_frm_list
+
+
+def _calculate_residual_deviations_numpy(frames, errors_rows):
+    # type: (...) -> tuple[list, list, list, list]
+    # Missing (None) errors are converted to NaN, then zero.
+    errors = np.array(errors_rows, dtype=np.float64)
+    errors[np.isnan(errors)] = 0.0
+
+    # The file stores frames x markers; we need markers x frames.
+    devs = np.ascontiguousarray(errors.T)
+    marker_count = devs.shape[0]
+
+    # Same as 'mmapi.calculate_average_deviation'; the average of
+    # the positive deviations, or -1.0 if there are none.
+    positive = devs > 0.0
+    counts = positive.sum(axis=1)
+    sums = np.where(positive, devs, 0.0).sum(axis=1)
+    avg_devs = np.full(marker_count, -1.0)
+    np.divide(sums, counts, out=avg_devs, where=counts > 0)
+
+    # Same as 'mmapi.calculate_maximum_deviation'; the first frame
+    # with the highest deviation, or (-1.0, -1) if no deviation is
+    # above -1.0.
+    max_indices = np.argmax(devs, axis=1)
+    max_devs = devs[np.arange(marker_count), max_indices]
+    found = max_devs > -1.0
+    max_devs = np.where(found, max_devs, -1.0)
+    max_frms = np.where(found, np.array(frames)[max_indices], -1)
+    return (
+        devs.tolist(),
+        avg_devs.tolist(),
+        max_devs.tolist(),
+        max_frms.tolist(),
+    )
+
+
 def load_residuals_file(mkr_list, file_path):
     # type: (...) -> bool
     """Apply per-frame deviation values from a .mmresiduals file to markers.
@@ -175,12 +238,9 @@ def load_residuals_file(mkr_list, file_path):
             )
             return False
 
-    # Collect per-marker frame/error lists. After this loop each
-    # marker has exactly len(per_frame) entries.
     marker_count = len(marker_names)
-    frame_lists = [[] for _ in range(marker_count)]
-    dev_lists = [[] for _ in range(marker_count)]
-
+    frames = []
+    errors_rows = []
     for frame_entry in per_frame:
         assert isinstance(frame_entry, dict)
         frame = frame_entry.get('frame')
@@ -189,27 +249,23 @@ def load_residuals_file(mkr_list, file_path):
         assert isinstance(errors, list)
         # The solver writes exactly one error per marker per frame.
         assert len(errors) == marker_count
-        for i, error in enumerate(errors):
-            frame_lists[i].append(frame)
-            if error is None:
-                error = 0.0
-            assert isinstance(error, (int, float))
-            dev_lists[i].append(error)
-
-    for i, name in enumerate(marker_names):
-        mkr = name_to_mkr[name]
-        assert isinstance(mkr, mmapi.Marker)
-        frames = frame_lists[i]
-        devs = dev_lists[i]
-        assert len(frames) == len(devs)
-
-        mkr.set_deviation(frames, devs)
-        avg_dev = mmapi.calculate_average_deviation(devs)
-        assert isinstance(avg_dev, float)
-        mkr.set_average_deviation(avg_dev)
-        max_dev, max_frm = mmapi.calculate_maximum_deviation(frames, devs)
-        assert isinstance(max_dev, float)
-        mkr.set_maximum_deviation(max_dev, max_frm)
+        frames.append(frame)
+        errors_rows.append(errors)
+
+    if np is not None:
+        deviations = _calculate_residual_deviations_numpy(frames, errors_rows)
+    else:
+        deviations = _calculate_residual_deviations_python(frames, errors_rows)
+    dev_lists, avg_dev_list, max_dev_list, max_frm_list = deviations
+
+    mmapi.set_markers_deviation_values(
+        [name_to_mkr[name] for name in marker_names],
+        [frames] * marker_count,
+        dev_lists,
+        avg_dev_list,
+        max_dev_list,
+        max_frm_list,
+    )
 
     LOG.debug('Applied residuals for %d markers from %r', marker_count, file_path)
     return True
@@ -22,9 +22,8 @@ Functions for saving camera solver input data to files.
 import json
 import os
 
-import maya.cmds
-
 import mmSolver.api as mmapi
+import mmSolver.utils.animcurve as anim_utils
 import mmSolver.utils.time as time_utils
 import mmSolver.utils.python_compat as pycompat
 import mmSolver.tools.savemarkerfile.lib as savemarkerfile_lib
@@ -65,18 +64,26 @@ def save_markers_to_file(mkr_list, frame_range, file_prefix, output_dir):
     return file_path
 
 
-def _query_sample_attr_over_frames(node, attr_name, frames):
-    # type: (...) -> list[list]
+def _query_sample_attrs_over_frames(node, attr_names, frames):
+    # type: (...) -> dict[str, list[list]]
+    """Sample each attribute over all frames, with a single pass per
+    attribute, rather than a 'maya.cmds.getAttr' call per frame.
+
+    Values are in the same units as 'maya.cmds.getAttr'.
+    """
     assert isinstance(node, pycompat.TEXT_TYPE)
     assert len(node) > 0
-    assert isinstance(attr_name, pycompat.TEXT_TYPE)
-    assert len(attr_name) > 0
+    assert isinstance(attr_names, list)
     assert isinstance(frames, list)
     assert len(frames) > 0
-    result = []
-    for frame in frames:
-        value = maya.cmds.getAttr(node + '.' + attr_name, time=frame)
-        result.append([frame, value])
+    result = {}
+    for attr_name in attr_names:
+        node_attr = node + '.' + attr_name
+        values = anim_utils.evaluate_plug_over_times_apitwo(
+            node_attr, frames, ui_units=True
+        )
+        assert values is not None
+        result[attr_name] = [[f, v] for f, v in zip(frames, values)]
     return result
 
 
@@ -99,22 +106,38 @@ def save_camera_to_file(cam, frame_range, file_prefix, output_dir):
 
     frames = list(range(frame_range.start, frame_range.end + 1))
 
-    def _sample_mm(node, attr):
-        raw = _query_sample_attr_over_frames(node, attr, frames)
-        return [[f, v * INCHES_TO_MM] for f, v in raw]
+    tfm_attr_data = _query_sample_attrs_over_frames(
+        cam_tfm,
+        ['translateX', 'translateY', 'translateZ', 'rotateX', 'rotateY', 'rotateZ'],
+        frames,
+    )
+    shp_attr_data = _query_sample_attrs_over_frames(
+        cam_shp,
+        [
+            'focalLength',
+            'horizontalFilmAperture',
+            'verticalFilmAperture',
+            'horizontalFilmOffset',
+            'verticalFilmOffset',
+        ],
+        frames,
+    )
+
+    def _inches_to_mm(attr):
+        return [[f, v * INCHES_TO_MM] for f, v in shp_attr_data[attr]]
 
     attr_data = {
-        'translateX': _query_sample_attr_over_frames(cam_tfm, 'translateX', frames),
-        'translateY': _query_sample_attr_over_frames(cam_tfm, 'translateY', frames),
-        'translateZ': _query_sample_attr_over_frames(cam_tfm, 'translateZ', frames),
-        'rotateX': _query_sample_attr_over_frames(cam_tfm, 'rotateX', frames),
-        'rotateY': _query_sample_attr_over_frames(cam_tfm, 'rotateY', frames),
-        'rotateZ': _query_sample_attr_over_frames(cam_tfm, 'rotateZ', frames),
-        'focalLength': _query_sample_attr_over_frames(cam_shp, 'focalLength', frames),
-        'filmBackWidth': _sample_mm(cam_shp, 'horizontalFilmAperture'),
-        'filmBackHeight': _sample_mm(cam_shp, 'verticalFilmAperture'),
-        'filmBackOffsetX': _sample_mm(cam_shp, 'horizontalFilmOffset'),
-        'filmBackOffsetY': _sample_mm(cam_shp, 'verticalFilmOffset'),
+        'translateX': tfm_attr_data['translateX'],
+        'translateY': tfm_attr_data['translateY'],
+        'translateZ': tfm_attr_data['translateZ'],
+        'rotateX': tfm_attr_data['rotateX'],
+        'rotateY': tfm_attr_data['rotateY'],
+        'rotateZ': tfm_attr_data['rotateZ'],
+        'focalLength': shp_attr_data['focalLength'],
+        'filmBackWidth': _inches_to_mm('horizontalFilmAperture'),
+        'filmBackHeight': _inches_to_mm('verticalFilmAperture'),
+        'filmBackOffsetX': _inches_to_mm('horizontalFilmOffset'),
+        'filmBackOffsetY': _inches_to_mm('verticalFilmOffset'),
     }
 
     image_width, image_height = cam.get_plate_resolution()
@@ -141,6 +141,39 @@ def build_adjustment_attributes(
     )
 
 
+def format_progress_status_text(progress):
+    # type: (dict | None) -> str
+    """Format the progress of a running solve for the status line.
+
+    :param progress: A progress item read from the solver process, or
+                     None if no progress has been read yet.
+    :type progress: dict or None
+
+    :rtype: str
+    """
+    if progress is None:
+        return 'Solving...'
+    stage = progress.get('stage')
+    if stage == const.PROGRESS_STAGE_LOAD:
+        return 'Solving... loading input files.'
+    elif stage == const.PROGRESS_STAGE_WRITE:
+        return 'Solving... writing output files.'
+    elif stage == const.PROGRESS_STAGE_DONE:
+        return 'Solving... finishing.'
+    elif stage == const.PROGRESS_STAGE_INTERMEDIATE:
+        iteration = progress.get('iteration') or 0
+        text = 'Solving... round {0}'.format(iteration + 1)
+        mean_error = progress.get('mean_error')
+        if mean_error is not None:
+            text += ', mean error {0:.4f} px'.format(mean_error)
+        camera_count = progress.get('camera_count')
+        bundle_count = progress.get('bundle_count')
+        if camera_count is not None and bundle_count is not None:
+            text += ' ({0} cameras, {1} bundles)'.format(camera_count, bundle_count)
+        return text + '.'
+    return 'Solving...'
+
+
 class CameraSolverLayout(QtWidgets.QWidget, ui_camerasolver_layout.Ui_Form):
     def __init__(self, parent=None, *args, **kwargs):
         # type: (...) -> None
@@ -154,6 +187,7 @@ class CameraSolverLayout(QtWidgets.QWidget, ui_camerasolver_layout.Ui_Form):
         self._prefix_name = None
         self._solver_process = None
         self._log_line_count = 0
+        self._progress_count = 0
 
         self._poll_timer = QtCore.QTimer(self)
         self._poll_timer.setInterval(200)
@@ -614,6 +648,16 @@ class CameraSolverLayout(QtWidgets.QWidget, ui_camerasolver_layout.Ui_Form):
             self._log_line_count += len(new_lines)
         return
 
+    def updateStatusFromProcess(self):
+        # type: () -> None
+        if self._solver_process is None:
+            return
+        new_progress = self._solver_process.get_progress_list(self._progress_count)
+        if new_progress:
+            self._progress_count += len(new_progress)
+            self.setStatusLine(format_progress_status_text(new_progress[-1]))
+        return
+
     @QtCore.Slot(str)
     def setStatusLine(self, text):
         # type: (pycompat.TEXT_TYPE) -> None
@@ -698,6 +742,7 @@ class CameraSolverLayout(QtWidgets.QWidget, ui_camerasolver_layout.Ui_Form):
 
         self.log_plainTextEdit.clear()
         self._log_line_count = 0
+        self._progress_count = 0
         self.setStatusLine('Solving...')
         self.setButtonStateSolving()
 
@@ -711,6 +756,7 @@ class CameraSolverLayout(QtWidgets.QWidget, ui_camerasolver_layout.Ui_Form):
             log_level,
             prefix_name,
             output_directory,
+            progress=True,
         )
         if solver_process is None:
             self.setStatusLine('Failed to launch camera solver.')
@@ -727,6 +773,7 @@ class CameraSolverLayout(QtWidgets.QWidget, ui_camerasolver_layout.Ui_Form):
             self._poll_timer.stop()
             return
         self.updateLogFromProcess()
+        self.updateStatusFromProcess()
         if self._solver_process.is_done():
             self._poll_timer.stop()
             self.onSolveFinished()
@@ -25,7 +25,12 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
-import os
+import sys
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 import maya.cmds
 
@@ -39,57 +44,198 @@ import mmSolver.utils.python_compat as pycompat
 import mmSolver.utils.loadfile.excep as excep
 import mmSolver.utils.loadfile.floatutils as floatutils
 import mmSolver.utils.loadfile.keyframedata as keyframedata
-import mmSolver.utils.loadmarker.formatmanager as fmtmgr
 import mmSolver.utils.loadmarker.markerdata as markerdata
+import mmSolver.utils.loadmarker.parsecache as parsecache
+import mmSolver.utils.loadmarker.readfile as readfile
 import mmSolver.tools.loadmarker.lib.fieldofview as fieldofview
 
-# Used to force importing of formats; do not remove this line.
-import mmSolver.utils.loadmarker.formats
+LOG = mmSolver.logger.get_logger()
 
 
-LOG = mmSolver.logger.get_logger()
+def _get_file_format_classes(file_path):
+    """
+    Find the format parsers based on the file extension.
+    """
+    return readfile.get_file_format_classes(file_path)
+
+
+def _read_with_cache(name, read_func, file_path, use_cache, **kwargs):
+    """
+    Call 'read_func' for the file path, using the parse cache to skip
+    parsing files that have not changed.
+    """
+    if use_cache is None:
+        use_cache = True
+    if use_cache is False:
+        return read_func(file_path, **kwargs)
+
+    cache = parsecache.get_parse_cache()
+    key = parsecache.create_key(file_path, name, **kwargs)
+    contents = cache.get(key)
+    if contents is not None:
+        return contents
+
+    file_info, data_list = read_func(file_path, **kwargs)
+    if file_info:
+        cache.set(key, (file_info, data_list))
+    return file_info, data_list
+
 
+def _read(file_path, **kwargs):
+    return readfile.read(file_path, **kwargs)
 
-def read(file_path, **kwargs):
+
+def read(file_path, use_cache=None, point_names=None, **kwargs):
     """
     Read a file path, find the format parser based on the file extension.
+
+    :param use_cache: Use the parse cache, so reading an unchanged
+        file again does not parse the file. None means True. The
+        cache is only stored in memory, unless a disk budget is set
+        (see 'mmSolver.utils.loadmarker.parsecache').
+    :type use_cache: bool or None
+
+    :param point_names: Only read the points with these names. The
+        .uv formats only decode the per-frame data of these points.
+        None means all points are read. Use 'read_index' to get the
+        point names of a file.
+    :type point_names: [str, ..] or None
+    """
+    if point_names is not None:
+        kwargs['point_names'] = sorted(set(point_names))
+    return _read_with_cache('read', _read, file_path, use_cache, **kwargs)
+
+
+def read_many(
+    file_paths,
+    use_cache=None,
+    max_workers=None,
+    prog_fn=None,
+    status_fn=None,
+    point_names=None,
+    **kwargs,
+):
+    """
+    Read many file paths, parsing the files in a pool of processes.
+
+    Files in the parse cache are not parsed again. The other files
+    are parsed with 'mmSolver.utils.loadmarker.readfile.read_many',
+    which does not create Maya nodes. Give the results to
+    'create_nodes' or 'update_nodes' afterwards, on the main thread.
+
+    :param file_paths: The file paths to read.
+    :type file_paths: [str, ..]
+
+    :param use_cache: Use the parse cache. None means True.
+    :type use_cache: bool or None
+
+    :param max_workers: The maximum number of worker processes. None
+        uses the number of CPUs, 1 reads the files in order without
+        starting any processes.
+    :type max_workers: int or None
+
+    :param prog_fn: A function called with an 'int' argument, each
+        time a file is read.
+    :type prog_fn: None or function
+
+    :param status_fn: A function called with an 'str' argument, each
+        time a file is read.
+    :type status_fn: None or function
+
+    :param point_names: Only read the points with these names, in
+        every file. None means all points are read.
+    :type point_names: [str, ..] or None
+
+    :returns: Tuple of FileInfo and list of MarkerData for each file
+        path, in the same order as 'file_paths'.
+    :rtype: [(FileInfo, [MarkerData, ..]), ..]
     """
-    if isinstance(file_path, pycompat.TEXT_TYPE) is False:
-        msg = 'file path must be a string, got %r'
-        raise TypeError(msg % type(file_path))
-    if os.path.isfile(file_path) is False:
-        msg = 'file path does not exist; %r'
-        raise OSError(msg % file_path)
-
-    file_format_classes = []
-    mgr = fmtmgr.get_format_manager()
-    for fmt in mgr.get_formats():
-        attr = getattr(fmt, 'file_exts', None)
-        if attr is None:
-            continue
-        if not isinstance(fmt.file_exts, list):
-            continue
-        for ext in fmt.file_exts:
-            if file_path.endswith(ext):
-                file_format_classes.append(fmt)
-    if len(file_format_classes) == 0:
-        msg = 'No file formats found for file path: %r'
-        raise RuntimeError(msg % file_path)
+    if use_cache is None:
+        use_cache = True
+    if point_names is not None:
+        kwargs['point_names'] = sorted(set(point_names))
+    file_paths = list(file_paths)
+    num_files = len(file_paths)
+
+    results = [None] * num_files
+    keys = [None] * num_files
+    cache = parsecache.get_parse_cache()
+    if use_cache is True:
+        for i, file_path in enumerate(file_paths):
+            keys[i] = parsecache.create_key(file_path, 'read', **kwargs)
+            results[i] = cache.get(keys[i])
+
+    indices = [i for i, result in enumerate(results) if result is None]
+    num_cached = num_files - len(indices)
+
+    num_read = [num_cached]
+
+    def _prog_fn(_percent):
+        # Called once per parsed file; files found in the cache are
+        # counted as already read.
+        num_read[0] += 1
+        prog_fn(int((num_read[0] * 100) / num_files))
+
+    contents_list = readfile.read_many(
+        [file_paths[i] for i in indices],
+        max_workers=max_workers,
+        prog_fn=_prog_fn if prog_fn is not None else None,
+        status_fn=status_fn,
+        **kwargs,
+    )
+    for i, contents in zip(indices, contents_list):
+        results[i] = contents
+        file_info = contents[0]
+        if use_cache is True and file_info:
+            cache.set(keys[i], contents)
+    if prog_fn is not None and len(indices) == 0:
+        prog_fn(100)
+    return results
+
+
+def _read_index(file_path, **kwargs):
+    file_format_classes = _get_file_format_classes(file_path)
 
     file_info = None
-    mkr_data_list = []
+    mkr_index_list = []
     for file_format_class in file_format_classes:
         file_format_obj = file_format_class()
         try:
-            contents = file_format_obj.parse(file_path, **kwargs)
+            contents = file_format_obj.parse_index(file_path, **kwargs)
         except (excep.ParserError, OSError):
             contents = (None, [])
 
-        file_info, mkr_data_list = contents
-        if file_info and (isinstance(mkr_data_list, list) and len(mkr_data_list) > 0):
+        file_info, mkr_index_list = contents
+        if file_info and (isinstance(mkr_index_list, list) and len(mkr_index_list) > 0):
             break
 
-    return file_info, mkr_data_list
+    # Formats without a fast index give the full MarkerData.
+    if isinstance(mkr_index_list, list):
+        for i, mkr_data in enumerate(mkr_index_list):
+            if isinstance(mkr_data, markerdata.MarkerData):
+                mkr_index = markerdata.create_marker_index_from_marker_data(mkr_data)
+                mkr_index_list[i] = mkr_index
+    return file_info, mkr_index_list
+
+
+def read_index(file_path, use_cache=None, **kwargs):
+    """
+    Read a summary of a file path, find the format parser based on the
+    file extension.
+
+    Reading the index avoids decoding all the per-frame data of
+    formats that support it, and should be used to preview a file.
+
+    :param use_cache: Use the parse cache, so reading an unchanged
+        file again does not parse the file. None means True. The
+        cache is only stored in memory, unless a disk budget is set
+        (see 'mmSolver.utils.loadmarker.parsecache').
+    :type use_cache: bool or None
+
+    :returns: Tuple of FileInfo and list of MarkerIndex.
+    :rtype: (FileInfo, [MarkerIndex, ..])
+    """
+    return _read_with_cache('read_index', _read_index, file_path, use_cache, **kwargs)
 
 
 def __create_node(mkr_data, cam, mkr_grp, with_bundles):
@@ -132,17 +278,67 @@ def __create_node(mkr_data, cam, mkr_grp, with_bundles):
     return mkr, bnd
 
 
-def __set_attr_keyframes(
-    node, attr_name, keyframes, before_value=None, after_value=None, reduce_keys=None
-):
+def _reduce_keyframes(times, values):
     """
-    Set keyframes on a node.attribute, from a KeyframeData instance.
+    Reduce keyframes, we don't need per-frame keyframes if the data
+    is the same.
 
-    :param node: Node to set data on.
-    :type node: str
+    A keyframe is kept if it is the first keyframe, or the value
+    changes to or from the keyframe. Values will NEVER be changed,
+    only duplicate keyframe data is removed.
 
-    :param attr_name: Attribute (on 'node') to set keyframes.
-    :type attr_name: str
+    All values are compared at once when numpy is available.
+
+    :param times: The keyframe times, sorted.
+    :type times: [int, ..]
+
+    :param values: The keyframe values.
+    :type values: [float, ..]
+
+    :returns: The reduced keyframe times and values.
+    :rtype: ([int, ..], [float, ..])
+    """
+    num = len(times)
+    if num < 2:
+        return list(times), list(values)
+
+    if np is None:
+        changed = [
+            floatutils.float_is_equal(values[i], values[i + 1]) is False
+            for i in range(num - 1)
+        ]
+        indices = [
+            i
+            for i in range(num)
+            if i == 0 or changed[i - 1] or (i < (num - 1) and changed[i])
+        ]
+    else:
+        # Same comparison as 'floatutils.float_is_equal'.
+        values_array = np.asarray(values, dtype=np.float64)
+        prev_values = values_array[:-1]
+        next_values = values_array[1:]
+        eps = sys.float_info.epsilon * 100.0
+        equal = np.abs(next_values - prev_values) < eps
+        equal |= np.round(prev_values, 9) == np.round(next_values, 9)
+        changed = ~equal
+
+        keep = np.zeros(num, dtype=bool)
+        keep[0] = True
+        keep[1:] |= changed
+        keep[:-1] |= changed
+        indices = np.flatnonzero(keep).tolist()
+
+    times = [times[i] for i in indices]
+    values = [values[i] for i in indices]
+    return times, values
+
+
+def __get_attr_keyframes(
+    keyframes, before_value=None, after_value=None, reduce_keys=None
+):
+    """
+    Get the keyframe times and values to be set on a node.attribute,
+    from a KeyframeData instance.
 
     :param keyframes: The keyframe information.
     :type keyframes: KeyframeData
@@ -159,8 +355,9 @@ def __set_attr_keyframes(
                         removed.
     :type reduce_keys: bool
 
-    :returns: Maya API (version 1) MFnAnimCurve object.
-    :rtype: maya.OpenMaya.MFnAnimCurve
+    :returns: The keyframe times, values and if the values are static
+              (the animCurve is not needed).
+    :rtype: ([int, ..], [float, ..], bool)
     """
     if isinstance(keyframes, keyframedata.KeyframeData) is False:
         msg = 'keyframes must be type %r'
@@ -184,37 +381,50 @@ def __set_attr_keyframes(
             times = times + [end_time + 1]
             values = values + [after_value]
 
-    # Reduce keyframes, we don't need per-frame keyframes if the data
-    # is the same. Change the times/values just before we set the
-    # keyframes
+    # Reduce keyframes. A single remaining keyframe is a static
+    # value, which does not need an animCurve at all.
+    is_static = False
     if reduce_keys is True:
-        tmp_times = list(times)
-        tmp_values = list(values)
-        times = []
-        values = []
-        prev_t = None
-        prev_v = None
-        for t, v in zip(tmp_times, tmp_values):
-            if prev_v is None:
-                times.append(t)
-                values.append(v)
-            elif floatutils.float_is_equal(prev_v, v) is False:
-                times.append(prev_t)
-                values.append(prev_v)
-                times.append(t)
-                values.append(v)
-            prev_t = t
-            prev_v = v
-
-    node_attr = node + '.' + attr_name
-    anim_fn = anim_utils.create_anim_curve_node_apione(times, values, node_attr)
+        times, values = _reduce_keyframes(times, values)
+        is_static = len(times) == 1
+    return times, values, is_static
 
-    if reduce_keys is True:
-        locked = maya.cmds.getAttr(node_attr, lock=True)
-        maya.cmds.setAttr(node_attr, lock=False)
-        maya.cmds.delete(node_attr, staticChannels=True)
-        maya.cmds.setAttr(node_attr, lock=locked)
-    return anim_fn
+
+def __set_many_attr_keyframes(attr_keyframes):
+    """
+    Set keyframes on many node.attributes, at once.
+
+    The animCurves are all created together, and static values are
+    set without creating an animCurve.
+
+    :param attr_keyframes: List of the node attribute, keyframe
+        times, keyframe values and if the values are static (see
+        '__get_attr_keyframes').
+    :type attr_keyframes: [(str, [int, ..], [float, ..], bool), ..]
+
+    :rtype: None
+    """
+    anim_node_attrs = []
+    anim_times_list = []
+    anim_values_list = []
+    static_node_attrs = []
+    static_values = []
+    for node_attr, times, values, is_static in attr_keyframes:
+        if is_static is True:
+            static_node_attrs.append(node_attr)
+            static_values.append(float(values[0]))
+        else:
+            anim_node_attrs.append(node_attr)
+            anim_times_list.append(times)
+            anim_values_list.append(values)
+
+    if len(anim_node_attrs) > 0:
+        anim_utils.create_anim_curves_apitwo(
+            anim_node_attrs, anim_times_list, anim_values_list
+        )
+    if len(static_node_attrs) > 0:
+        anim_utils.set_static_plug_values_apitwo(static_node_attrs, static_values)
+    return
 
 
 def __set_node_data_bundle_local(mkr_data, bnd_node):
@@ -269,9 +479,13 @@ def __set_node_data_bundle_world(mkr_data, bnd_node):
         assert bnd_world_x.get_length() > 0
         assert bnd_world_y.get_length() > 0
         assert bnd_world_z.get_length() > 0
-        __set_attr_keyframes(bnd_node, 'translateX', bnd_world_x)
-        __set_attr_keyframes(bnd_node, 'translateY', bnd_world_y)
-        __set_attr_keyframes(bnd_node, 'translateZ', bnd_world_z)
+        __set_many_attr_keyframes(
+            [
+                (bnd_node + '.translateX',) + __get_attr_keyframes(bnd_world_x),
+                (bnd_node + '.translateY',) + __get_attr_keyframes(bnd_world_y),
+                (bnd_node + '.translateZ',) + __get_attr_keyframes(bnd_world_z),
+            ]
+        )
     else:
         assert isinstance(bnd_world_x, float)
         assert isinstance(bnd_world_y, float)
@@ -287,28 +501,20 @@ def __set_node_data_bundle_world(mkr_data, bnd_node):
     return
 
 
-def __set_node_data(
-    mkr,
-    bnd,
-    mkr_data,
-    load_bnd_pos,
-    world_space_bnd_pos,
-    overscan_x,
-    overscan_y,
-):
+def __set_nodes_data(node_data_list, load_bnd_pos, world_space_bnd_pos):
     """
-    Set and override the data on the given marker node.
-
-    .. note:: marker may have existing data or not.
+    Set and override the data on the given marker nodes.
 
-    :param mkr: Marker object to set data on.
-    :type mkr: mmapi.Marker
+    The keyframes of all Markers are set together, rather than one
+    Marker at a time.
 
-    :param bnd: (optional) Bundle object to set data on.
-    :type bnd: None or mmapi.Marker
+    .. note:: markers may have existing data or not.
 
-    :param mkr_data: The data to set on the Marker/Bundle.
-    :type mkr_data: MarkerData
+    :param node_data_list: For each Marker; the Marker object to set
+        data on, the (optional) Bundle object to set data on, the
+        MarkerData to set on the Marker/Bundle, and the overscan x
+        and y factors to apply to the MarkerData x and y values.
+    :type node_data_list: [(Marker, Bundle or None, MarkerData, float, float), ..]
 
     :param load_bnd_pos: Should we set Bundle positions?
     :type load_bnd_pos: bool
@@ -316,117 +522,116 @@ def __set_node_data(
     :param world_space_bnd_pos: Bundle positions should be in world-space.
     :type world_space_bnd_pos: bool
 
-    :param overscan_x: Overscan factor to apply to the MarkerData x values.
-    :type overscan_x: float
-
-    :param overscan_y: Overscan factor to apply to the MarkerData y values.
-    :type overscan_y: float
-
-    :returns: Tuple of Marker and Bundle objects.
-    :rtype: (Marker, Bundle or None)
+    :rtype: None
     """
-    assert isinstance(mkr, mmapi.Marker)
-    assert bnd is None or isinstance(bnd, mmapi.Bundle)
-    assert isinstance(mkr_data, markerdata.MarkerData)
     assert load_bnd_pos is None or isinstance(load_bnd_pos, bool)
     assert isinstance(world_space_bnd_pos, bool)
-    assert isinstance(overscan_x, float)
-    assert isinstance(overscan_y, float)
-    mkr_node = mkr.get_node()
-
-    mkr_name = mkr_data.get_name()
-    assert isinstance(mkr_name, pycompat.TEXT_TYPE)
-    maya.cmds.setAttr(mkr_node + '.markerName', lock=False)
-    maya.cmds.setAttr(mkr_node + '.markerName', mkr_name, type='string')
-    maya.cmds.setAttr(mkr_node + '.markerName', lock=True)
-
-    # Add marker data ID onto the marker node, to be used
-    # for re-mapping point data regardless of point name.
-    mkr_id = mkr_data.get_id()
-    if mkr_id is None:
-        mkr_id = -1
-    maya.cmds.setAttr(mkr_node + '.markerId', lock=False)
-    maya.cmds.setAttr(mkr_node + '.markerId', mkr_id)
-    maya.cmds.setAttr(mkr_node + '.markerId', lock=True)
-
-    # Get keyframe data
-    mkr_x_data = mkr_data.get_x().get_raw_data()
-    mkr_y_data = mkr_data.get_y().get_raw_data()
-    for t, v in mkr_x_data.items():
-        mkr_x_data[t] = (v - 0.5) * overscan_x
-    for t, v in mkr_y_data.items():
-        mkr_y_data[t] = (v - 0.5) * overscan_y
-    mkr_x = keyframedata.KeyframeData(data=mkr_x_data)
-    mkr_y = keyframedata.KeyframeData(data=mkr_y_data)
-    mkr_enable = mkr_data.get_enable()
-    mkr_weight = mkr_data.get_weight()
-
-    # Unlock
-    maya.cmds.setAttr(mkr_node + '.translateX', lock=False)
-    maya.cmds.setAttr(mkr_node + '.translateY', lock=False)
-    maya.cmds.setAttr(mkr_node + '.enable', lock=False)
-    maya.cmds.setAttr(mkr_node + '.weight', lock=False)
-
-    # Set keyframes.
-    __set_attr_keyframes(mkr_node, 'translateX', mkr_x)
-    __set_attr_keyframes(mkr_node, 'translateY', mkr_y)
-    __set_attr_keyframes(
-        mkr_node,
-        'enable',
-        mkr_enable,
-        before_value=False,
-        after_value=False,
-        reduce_keys=True,
-    )
-    __set_attr_keyframes(mkr_node, 'weight', mkr_weight, reduce_keys=True)
-
-    # Lock
-    maya.cmds.setAttr(mkr_node + '.translateX', lock=True)
-    maya.cmds.setAttr(mkr_node + '.translateY', lock=True)
-    maya.cmds.setAttr(mkr_node + '.enable', lock=True)
-    maya.cmds.setAttr(mkr_node + '.weight', lock=True)
-
-    # Set Bundle Position
-    if bnd and load_bnd_pos:
-        bnd_node = bnd.get_node()
-
-        if world_space_bnd_pos is True:
-            is_world_static = (
-                isinstance(mkr_data.bundle_world_x, float)
-                and isinstance(mkr_data.bundle_world_y, float)
-                and isinstance(mkr_data.bundle_world_z, float)
-            )
-
-            has_world_xyz = False
-            if is_world_static:
-                has_world_xyz = True
-            else:
-                world_x_count = mkr_data.bundle_world_x.get_length()
-                world_y_count = mkr_data.bundle_world_y.get_length()
-                world_z_count = mkr_data.bundle_world_z.get_length()
-                has_world_xyz = (
-                    world_x_count > 0
-                    and world_x_count == world_y_count == world_z_count
+    keyed_attr_names = ['translateX', 'translateY', 'enable', 'weight']
+
+    attr_keyframes = []
+    for mkr, bnd, mkr_data, overscan_x, overscan_y in node_data_list:
+        assert isinstance(mkr, mmapi.Marker)
+        assert bnd is None or isinstance(bnd, mmapi.Bundle)
+        assert isinstance(mkr_data, markerdata.MarkerData)
+        assert isinstance(overscan_x, float)
+        assert isinstance(overscan_y, float)
+        mkr_node = mkr.get_node()
+
+        mkr_name = mkr_data.get_name()
+        assert isinstance(mkr_name, pycompat.TEXT_TYPE)
+        maya.cmds.setAttr(mkr_node + '.markerName', lock=False)
+        maya.cmds.setAttr(mkr_node + '.markerName', mkr_name, type='string')
+        maya.cmds.setAttr(mkr_node + '.markerName', lock=True)
+
+        # Add marker data ID onto the marker node, to be used
+        # for re-mapping point data regardless of point name.
+        mkr_id = mkr_data.get_id()
+        if mkr_id is None:
+            mkr_id = -1
+        maya.cmds.setAttr(mkr_node + '.markerId', lock=False)
+        maya.cmds.setAttr(mkr_node + '.markerId', mkr_id)
+        maya.cmds.setAttr(mkr_node + '.markerId', lock=True)
+
+        # Get keyframe data
+        x_times, x_values = mkr_data.get_x().get_times_and_values()
+        y_times, y_values = mkr_data.get_y().get_times_and_values()
+        mkr_x = keyframedata.KeyframeData()
+        mkr_y = keyframedata.KeyframeData()
+        mkr_x.set_times_and_values(x_times, [(v - 0.5) * overscan_x for v in x_values])
+        mkr_y.set_times_and_values(y_times, [(v - 0.5) * overscan_y for v in y_values])
+        mkr_enable = mkr_data.get_enable()
+        mkr_weight = mkr_data.get_weight()
+
+        # Unlock
+        for attr_name in keyed_attr_names:
+            maya.cmds.setAttr(mkr_node + '.' + attr_name, lock=False)
+
+        attr_keyframes += [
+            (mkr_node + '.translateX',) + __get_attr_keyframes(mkr_x),
+            (mkr_node + '.translateY',) + __get_attr_keyframes(mkr_y),
+            (mkr_node + '.enable',)
+            + __get_attr_keyframes(
+                mkr_enable,
+                before_value=False,
+                after_value=False,
+                reduce_keys=True,
+            ),
+            (mkr_node + '.weight',)
+            + __get_attr_keyframes(mkr_weight, reduce_keys=True),
+        ]
+
+    # Set keyframes, for all Markers at once.
+    __set_many_attr_keyframes(attr_keyframes)
+
+    for mkr, bnd, mkr_data, _, _ in node_data_list:
+        mkr_node = mkr.get_node()
+        mkr_name = mkr_data.get_name()
+
+        # Lock
+        for attr_name in keyed_attr_names:
+            maya.cmds.setAttr(mkr_node + '.' + attr_name, lock=True)
+
+        # Set Bundle Position
+        if bnd and load_bnd_pos:
+            bnd_node = bnd.get_node()
+
+            if world_space_bnd_pos is True:
+                is_world_static = (
+                    isinstance(mkr_data.bundle_world_x, float)
+                    and isinstance(mkr_data.bundle_world_y, float)
+                    and isinstance(mkr_data.bundle_world_z, float)
                 )
 
-            if has_world_xyz:
-                __set_node_data_bundle_world(mkr_data, bnd_node)
+                has_world_xyz = False
+                if is_world_static:
+                    has_world_xyz = True
+                else:
+                    world_x_count = mkr_data.bundle_world_x.get_length()
+                    world_y_count = mkr_data.bundle_world_y.get_length()
+                    world_z_count = mkr_data.bundle_world_z.get_length()
+                    has_world_xyz = (
+                        world_x_count > 0
+                        and world_x_count == world_y_count == world_z_count
+                    )
+
+                if has_world_xyz:
+                    __set_node_data_bundle_world(mkr_data, bnd_node)
+                else:
+                    # We were asked to give bundle positions in
+                    # world-space, but we cannot do that. Warning the user
+                    # seems appropriate.
+                    msg = (
+                        '%r | %r; '
+                        'World-space bundle data does not exist, '
+                        'cannot set world-space position.'
+                    )
+                    LOG.warning(msg, mkr_name, bnd_node)
+
+                    __set_node_data_bundle_local(mkr_data, bnd_node)
             else:
-                # We were asked to give bundle positions in
-                # world-space, but we cannot do that. Warning the user
-                # seems appropriate.
-                msg = (
-                    '%r | %r; '
-                    'World-space bundle data does not exist, '
-                    'cannot set world-space position.'
-                )
-                LOG.warning(msg, mkr_name, bnd_node)
-
                 __set_node_data_bundle_local(mkr_data, bnd_node)
-        else:
-            __set_node_data_bundle_local(mkr_data, bnd_node)
 
-    return mkr, bnd
+    return
 
 
 def create_nodes(
@@ -503,6 +708,7 @@ def create_nodes(
 
     mkr_nodes = []
     mkr_list = []
+    node_data_list = []
     # When a Marker is created it is automatically added to the active
     # collection, but we don't want that, so we block the events.
     event_names_to_block = [mmapi.EVENT_NAME_MARKER_CREATED]
@@ -517,18 +723,16 @@ def create_nodes(
             )
             mkr_nodes.append(mkr.get_node())
             if mkr is not None:
-                # Set attributes and add into list
-                __set_node_data(
-                    mkr,
-                    bnd,
-                    mkr_data,
-                    load_bundle_position,
-                    world_space_bundle_position,
-                    overscan_x,
-                    overscan_y,
-                )
+                node_data_list.append((mkr, bnd, mkr_data, overscan_x, overscan_y))
                 mkr_list.append(mkr)
 
+        # Set attributes of all the new nodes.
+        __set_nodes_data(
+            node_data_list,
+            load_bundle_position,
+            world_space_bundle_position,
+        )
+
     if len(mkr_list) > 0 and col is not None:
         assert isinstance(col, mmapi.Collection)
         col.add_marker_list(mkr_list)
@@ -615,33 +819,6 @@ def _find_marker_data(mkr, mkr_data_list):
     return found_mkr_data
 
 
-def _update_node(
-    mkr,
-    bnd,
-    mkr_data,
-    load_bundle_position,
-    world_space_bundle_position,
-    overscan_x,
-    overscan_y,
-):
-    """
-    Set the MarkerData on the given Marker and Bundle.
-    """
-    assert isinstance(mkr, mmapi.Marker)
-    assert bnd is None or isinstance(bnd, mmapi.Bundle)
-    assert isinstance(mkr_data, markerdata.MarkerData)
-    __set_node_data(
-        mkr,
-        bnd,
-        mkr_data,
-        load_bundle_position,
-        world_space_bundle_position,
-        overscan_x,
-        overscan_y,
-    )
-    return
-
-
 def update_nodes(
     mkr_list,
     mkr_data_list,
@@ -708,21 +885,14 @@ def update_nodes(
         cam_shp = cam.get_shape_node()
         fallback_overscan = (1.0, 1.0)
         overscan_x, overscan_y = overscan_per_camera.get(cam_shp, fallback_overscan)
-        _update_node(
-            mkr,
-            bnd,
-            mkr_data,
-            load_bundle_position,
-            world_space_bundle_position,
-            overscan_x,
-            overscan_y,
-        )
+        node_data_list = [(mkr, bnd, mkr_data, overscan_x, overscan_y)]
     else:
         # Make a copy of mkr_list and mkr_data_list, to avoid any
         # possibility of the given arguments mkr_list and mkr_data_list
         # being modified indirectly (which can happen in Python).
         mkr_list = list(mkr_list)
         mkr_data_list = list(mkr_data_list)
+        node_data_list = []
         while len(mkr_list) > 0:
             mkr = mkr_list.pop(0)
             mkr_data = _find_marker_data(mkr, mkr_data_list)
@@ -736,18 +906,17 @@ def update_nodes(
                 cam_shp,
                 fallback_overscan,
             )
-            _update_node(
-                mkr,
-                bnd,
-                mkr_data,
-                load_bundle_position,
-                world_space_bundle_position,
-                overscan_x,
-                overscan_y,
-            )
+            node_data_list.append((mkr, bnd, mkr_data, overscan_x, overscan_y))
             mkr_data_list.remove(mkr_data)
             mkr_list_changed.append(mkr)
 
+    # Set the data of all Markers at once.
+    __set_nodes_data(
+        node_data_list,
+        load_bundle_position,
+        world_space_bundle_position,
+    )
+
     mkr_nodes_changed = [mkr.get_node() for mkr in mkr_list_changed]
     if len(mkr_nodes_changed) > 0:
         maya.cmds.select(mkr_nodes_changed, replace=True)
@@ -176,6 +176,7 @@ class LoadMarkerLayout(QtWidgets.QWidget, ui_loadmarker_layout.Ui_Form):
         self.filepath_lineEdit.editingFinished.connect(self.updateFilePathWidget)
         self.overscan_checkBox.toggled.connect(self.setOverscanEnabledState)
         self.overscan_checkBox.released.connect(self.updateOverscanValues)
+        self.points_listWidget.itemChanged.connect(self.pointItemChanged)
         return
 
     def populateUi(self):
@@ -216,7 +217,7 @@ class LoadMarkerLayout(QtWidgets.QWidget, ui_loadmarker_layout.Ui_Form):
         try:
             clippy = QtGui.QClipboard()
             text = str(clippy.text()).strip()
-            if fileutils.is_valid_file_path(text, mayareadfile.read):
+            if fileutils.is_valid_file_path(text, mayareadfile.read_index):
                 self.setFilePath(text)
         except Exception as e:
             msg = 'Could not get file path from clipboard.'
@@ -285,14 +286,14 @@ class LoadMarkerLayout(QtWidgets.QWidget, ui_loadmarker_layout.Ui_Form):
         file_path = self.getFilePath()
         if not file_path:
             return
-        file_info = fileutils.get_file_info(file_path, mayareadfile.read)
+        file_info = fileutils.get_file_info(file_path, mayareadfile.read_index)
         self.setFileInfo(file_info)
         return
 
     def updateFileInfoText(self):
         file_path = self.getFilePath()
         info_widget = self.fileInfo_plainTextEdit
-        valid = fileutils.is_valid_file_path(file_path, mayareadfile.read)
+        valid = fileutils.is_valid_file_path(file_path, mayareadfile.read_index)
         if valid is False:
             text = 'File path is not valid:\n'
             text += repr(file_path)
@@ -309,7 +310,7 @@ class LoadMarkerLayout(QtWidgets.QWidget, ui_loadmarker_layout.Ui_Form):
         text += 'With Camera FOV: {has_camera_fov}\n'
         text += 'Scene Transform: {has_scene_transform}\n'
         text += 'Point Group Transform: {has_point_group_transform}\n'
-        info = fileutils.get_file_info_strings(file_path, mayareadfile.read)
+        info = fileutils.get_file_info_strings(file_path, mayareadfile.read_index)
 
         # Change point names into single string.
         point_names = info.get('point_names', '')
@@ -321,6 +322,45 @@ class LoadMarkerLayout(QtWidgets.QWidget, ui_loadmarker_layout.Ui_Form):
         info_widget.setPlainText(text)
         return
 
+    def updatePointList(self):
+        list_widget = self.points_listWidget
+        list_widget.clear()
+        file_path = self.getFilePath()
+        valid = fileutils.is_valid_file_path(file_path, mayareadfile.read_index)
+        if valid is False:
+            return
+        _, mkr_index_list = mayareadfile.read_index(file_path)
+        point_names = []
+        for mkr_index in mkr_index_list:
+            if mkr_index.name not in point_names:
+                point_names.append(mkr_index.name)
+
+        block = list_widget.blockSignals(True)
+        try:
+            for point_name in point_names:
+                item = QtWidgets.QListWidgetItem(point_name)
+                item.setFlags(item.flags() | QtCore.Qt.ItemIsUserCheckable)
+                item.setCheckState(QtCore.Qt.Checked)
+                list_widget.addItem(item)
+        finally:
+            list_widget.blockSignals(block)
+        return
+
+    def pointItemChanged(self, item):
+        """Check or uncheck all the selected points together."""
+        list_widget = self.points_listWidget
+        selected_items = list_widget.selectedItems()
+        if item not in selected_items:
+            return
+        state = item.checkState()
+        block = list_widget.blockSignals(True)
+        try:
+            for selected_item in selected_items:
+                selected_item.setCheckState(state)
+        finally:
+            list_widget.blockSignals(block)
+        return
+
     def updateLoadMode(self):
         text = self.getLoadModeText()
         value = None
@@ -435,7 +475,7 @@ class LoadMarkerLayout(QtWidgets.QWidget, ui_loadmarker_layout.Ui_Form):
     def updateImageResEnabledState(self):
         enabled = False
         file_path = self.getFilePath()
-        fmt = fileutils.get_file_path_format(file_path, mayareadfile.read)
+        fmt = fileutils.get_file_path_format(file_path, mayareadfile.read_index)
         if fmt is None:
             enabled = False
         else:
@@ -706,6 +746,7 @@ class LoadMarkerLayout(QtWidgets.QWidget, ui_loadmarker_layout.Ui_Form):
     def updateFilePathWidget(self):
         self.updateFileInfo()
         self.updateFileInfoText()
+        self.updatePointList()
         self.updateImageResEnabledState()
         self.updateDistortionModeEnabledState()
         self.updateOverscanValues()
@@ -735,6 +776,25 @@ class LoadMarkerLayout(QtWidgets.QWidget, ui_loadmarker_layout.Ui_Form):
     def getFileInfo(self):
         return self._file_info
 
+    def getPointNames(self):
+        """
+        Get the names of the checked points.
+
+        :returns: The checked point names, or None if all points are
+            checked.
+        :rtype: [str, ..] or None
+        """
+        list_widget = self.points_listWidget
+        count = list_widget.count()
+        point_names = []
+        for i in range(count):
+            item = list_widget.item(i)
+            if item.checkState() == QtCore.Qt.Checked:
+                point_names.append(str(item.text()))
+        if len(point_names) == count:
+            return None
+        return point_names
+
     def getCameraFieldOfViewValue(self):
         file_info = self.getFileInfo()
         if file_info is None:
@@ -194,6 +194,7 @@ class LoadMarkerWindow(BaseWindow):
         undistorted = undist_mode == const.UNDISTORTION_MODE_VALUE
         width, height = self.subForm.getImageResolution()
         bundle_space = self.subForm.getBundleSpaceText()
+        point_names = self.subForm.getPointNames()
 
         # Otherwise when we try to rename markers, the tool will get
         # errors.
@@ -211,6 +212,10 @@ class LoadMarkerWindow(BaseWindow):
                 )
                 return
 
+        if point_names is not None and len(point_names) == 0:
+            LOG.error('Please check at least one point to load.')
+            return
+
         camera_field_of_view = None
         if use_overscan is True:
             camera_field_of_view = self.subForm.getCameraFieldOfViewValue()
@@ -233,6 +238,7 @@ class LoadMarkerWindow(BaseWindow):
                     image_width=width,
                     image_height=height,
                     undistorted=undistorted,
+                    point_names=point_names,
                 )
                 self.progressBar.setValue(50)
 
@@ -21,21 +21,50 @@ The Save Marker File library functions.
 Write out a mmSolver Marker node as a .uv file.
 """
 
+import array
 import json
 import os
+import struct
+import sys
 import tempfile
 
 import maya.cmds
 
 import mmSolver.logger
+import mmSolver._api.markerutils as markerutils
+import mmSolver.utils.animcurve as anim_utils
 import mmSolver.utils.camera as camera_utils
 import mmSolver.utils.python_compat as pycompat
+import mmSolver.utils.loadmarker.formats.uvcache as uvcache
 import mmSolver.tools.savemarkerfile.constant as const
 
 
 LOG = mmSolver.logger.get_logger()
 
 
+def _get_marker_enabled_frame_values(mkr_node, frames):
+    """
+    Get the position and weight of a marker on each enabled frame.
+
+    Each attribute is evaluated over all frames in a single pass,
+    rather than querying the attributes at each frame.
+
+    :returns: List of (frame, (x, y), weight) tuples. Lower-left is
+        (0.0, 0.0), upper-right is (1.0, 1.0).
+    :rtype: [(int, (float, float), float), ..]
+    """
+    enable_values = markerutils.get_marker_enable_values(mkr_node, frames)
+    weight_values = markerutils.get_marker_weight_values(mkr_node, frames)
+    tx_values, ty_values = markerutils.get_marker_position_values(mkr_node, frames)
+    values = []
+    iterator = zip(frames, enable_values, tx_values, ty_values, weight_values)
+    for f, enable, tx, ty, weight in iterator:
+        if not enable:
+            continue
+        values.append((f, (0.5 + tx, 0.5 + ty), weight))
+    return values
+
+
 def _marker_object_to_point_data(mkr, frames):
     mkr_node = mkr.get_node()
     bnd = mkr.get_bundle()
@@ -44,18 +73,7 @@ def _marker_object_to_point_data(mkr, frames):
 
     # Per-frame data.
     frames_data = []
-    for f in frames:
-        enable = mkr.get_enable(time=f)
-        if not enable:
-            continue
-        attr_tx = mkr_node + '.translateX'
-        attr_ty = mkr_node + '.translateY'
-        # Lower-left is (0.0, 0.0), upper-right is (1.0, 1.0).
-        tx = 0.5 + maya.cmds.getAttr(attr_tx, time=f)
-        ty = 0.5 + maya.cmds.getAttr(attr_ty, time=f)
-        pos = (tx, ty)
-        weight = mkr.get_weight(time=f)
-
+    for f, pos, weight in _get_marker_enabled_frame_values(mkr_node, frames):
         frame_data = {}
         frame_data['frame'] = f
         frame_data['pos_dist'] = pos
@@ -139,9 +157,11 @@ def _camera_to_camera_data(cam, frames):
     camera_data['film_back_cm'] = (fbk_width_cm, fbk_height_cm)
     camera_data['lens_center_offset_cm'] = (lco_x_cm, lco_y_cm)
 
+    focal_length_values = anim_utils.evaluate_plug_over_times_apitwo(
+        attr_focal_length, frames
+    )
     per_frame_data = []
-    for f in frames:
-        focal_length_mm = maya.cmds.getAttr(attr_focal_length, time=f)
+    for f, focal_length_mm in zip(frames, focal_length_values):
         focal_length_cm = focal_length_mm * 0.1
         frame_data = {'frame': f, 'focal_length_cm': focal_length_cm}
         per_frame_data.append(frame_data)
@@ -202,48 +222,20 @@ def _generate_v1(mkr_list, frame_range):
     if len(mkr_list) == 0:
         return ''
 
-    data_str = ''
-    data_str += '{0:d}\n'.format(len(mkr_list))
-
+    lines = ['{0:d}\n'.format(len(mkr_list))]
     for mkr in mkr_list:
         mkr_node = mkr.get_node()
         name = mkr_node.rpartition('|')[-1]
 
         # Write per-frame position data.
-        num_valid_frame = 0
-        pos_list = []
-        weight_list = []
-
-        for f in frames:
-            enable = mkr.get_enable(time=f)
-            if not enable:
-                continue
-
-            attr_tx = mkr_node + '.translateX'
-            attr_ty = mkr_node + '.translateY'
-            # Lower-left is (0.0, 0.0), upper-right is (1.0, 1.0).
-            tx = 0.5 + maya.cmds.getAttr(attr_tx, time=f)
-            ty = 0.5 + maya.cmds.getAttr(attr_ty, time=f)
-            pos = (tx, ty)
-            weight = mkr.get_weight(time=f)
-
-            # Number of points with valid positions.
-            num_valid_frame += 1
-
-            pos_list.append((f, pos))
-            weight_list.append((f, weight))
+        frame_values = _get_marker_enabled_frame_values(mkr_node, frames)
 
         # Add data.
-        data_str += name + '\n'
-        data_str += '{0:d}\n'.format(num_valid_frame)
-        for pos_data, weight_data in zip(pos_list, weight_list):
-            f = pos_data[0]
-            v = pos_data[1]
-            w = weight_data[1]
-            assert f == weight_data[0]
-            data_str += '%d %.15f %.15f %.8f\n' % (f, v[0], v[1], w)
-
-    return data_str
+        lines.append(name + '\n')
+        lines.append('{0:d}\n'.format(len(frame_values)))
+        for f, v, w in frame_values:
+            lines.append('%d %.15f %.15f %.8f\n' % (f, v[0], v[1], w))
+    return ''.join(lines)
 
 
 def _generate_v4(mkr_list, frame_range):
@@ -320,6 +312,95 @@ def write_file(file_path, data):
     return result
 
 
+def write_cache_file(file_path, data):
+    """
+    Write .uv data to a binary (.uvcache) file, that can be read
+    quickly.
+
+    The data is stored exactly, so it can be read back with
+    'mmSolver.utils.loadmarker.formats.uvcache.read_uv_data'.
+
+    :param file_path: Path to write the file to.
+    :type file_path: str
+
+    :param data: The .uv format data, as returned by 'generate' with
+        the v4 format, or read from a version 2 to 5 .uv file.
+    :type data: dict
+
+    :returns: True if file was written successfully.
+    :rtype: bool
+    """
+    assert isinstance(data, dict)
+    columns = dict((name, array.array(typecode)) for name, typecode in uvcache.COLUMNS)
+    points = []
+    for point_data in data.get('points', []):
+        per_frame = point_data.get('per_frame', [])
+        frames = [frame_data['frame'] for frame_data in per_frame]
+
+        header_point = dict(point_data)
+        header_point.pop('per_frame', None)
+        header_point['frame_offset'] = len(columns[uvcache.COLUMN_FRAME])
+        header_point['num_frames'] = len(per_frame)
+        header_point['start_frame'] = min(frames) if frames else None
+        header_point['end_frame'] = max(frames) if frames else None
+        # Version 2 has no distorted positions.
+        header_point['has_pos_dist'] = all('pos_dist' in x for x in per_frame)
+        points.append(header_point)
+
+        columns[uvcache.COLUMN_FRAME].extend(frames)
+        for frame_data in per_frame:
+            pos = frame_data['pos']
+            pos_x, pos_y = pos
+            pos_dist_x, pos_dist_y = frame_data.get('pos_dist', pos)
+            columns[uvcache.COLUMN_POS_X].append(pos_x)
+            columns[uvcache.COLUMN_POS_Y].append(pos_y)
+            columns[uvcache.COLUMN_POS_DIST_X].append(pos_dist_x)
+            columns[uvcache.COLUMN_POS_DIST_Y].append(pos_dist_y)
+            columns[uvcache.COLUMN_WEIGHT].append(frame_data['weight'])
+
+    file_data = dict(data)
+    file_data.pop('points', None)
+    header = {
+        'byte_order': sys.byteorder,
+        'num_frames': len(columns[uvcache.COLUMN_FRAME]),
+        'columns': {},
+        'data': file_data,
+        'points': points,
+    }
+
+    # Column offsets are relative to the start of the column data.
+    offset = 0
+    for name, _ in uvcache.COLUMNS:
+        offset += -offset % uvcache.COLUMN_ALIGNMENT
+        header['columns'][name] = offset
+        offset += len(columns[name]) * columns[name].itemsize
+    header_bytes = json.dumps(header).encode('utf-8')
+    header_size = len(header_bytes)
+    data_start = uvcache.get_column_data_start(header_size)
+
+    with open(file_path, 'wb') as f:
+        f.write(
+            struct.pack(
+                uvcache.PREAMBLE_FORMAT,
+                uvcache.MAGIC,
+                uvcache.CACHE_FORMAT_VERSION,
+                header_size,
+            )
+        )
+        f.write(header_bytes)
+        for name, _ in uvcache.COLUMNS:
+            column_start = data_start + header['columns'][name]
+            f.write(b'\0' * (column_start - f.tell()))
+            column = columns[name]
+            if hasattr(column, 'tobytes'):
+                f.write(column.tobytes())
+            else:
+                # Python 2.x
+                f.write(column.tostring())
+    result = os.path.isfile(file_path)
+    return result
+
+
 def write_temp_file(data):
     """
     Write file to temporary location. Handles both string (v1) and dictionary (v4) data.
@@ -30,6 +30,10 @@ WINDOW_BUTTON_SOLVE_STOP_LABEL = 'Stop Solve'
 WINDOW_BUTTON_CLOSE_LABEL = 'Close'
 WINDOW_BUTTON_CLOSE_AND_STOP_LABEL = 'Stop Solve and Close'
 
+# The solver information is computed after the UI stops changing for
+# this many milliseconds.
+SOLVER_INFO_UPDATE_DELAY_MILLISECONDS = 500
+
 # HTML Color Names, for Qt Rich Text.
 #
 # https://htmlcolorcodes.com/color-names/
@@ -27,6 +27,7 @@ import maya.cmds
 
 import mmSolver.logger
 import mmSolver.api as mmapi
+import mmSolver._api.compile as api_compile
 
 import mmSolver.ui.uiutils as uiutils
 import mmSolver.ui.converttypes as convert_types
@@ -45,6 +46,11 @@ import mmSolver.tools.solver.constant as const
 
 LOG = mmSolver.logger.get_logger()
 
+# The solver information text of each Collection, and the key from
+# 'mmSolver._api.compile.get_collection_compile_key' it was computed
+# with. The Solver UI Maya callbacks clear it when the scene changes.
+__solver_info_text_cache = {}
+
 
 # Function aliases, for the 'collectionstate' module.
 get_attribute_toggle_animated_from_collection = (
@@ -742,17 +748,49 @@ def execute_collection(
     return
 
 
-def query_solver_info_text(col):
+def _get_solver_info_key(col):
+    sol_list = col.get_solver_list()
+    mkr_list = col.get_marker_list()
+    attr_list = col.get_attribute_list()
+    sol_enabled_list = [sol for sol in sol_list if sol.get_enabled() is True]
+    mkr_enable_matrix = api_compile.get_markers_enable_matrix(
+        sol_enabled_list, mkr_list
+    )
+    withtest = True
+    return api_compile.get_collection_compile_key(
+        col, sol_enabled_list, mkr_list, attr_list, withtest, mkr_enable_matrix
+    )
+
+
+def clear_solver_info_text_cache():
+    """
+    Remove the solver information text stored by
+    'query_solver_info_text'.
+    """
+    __solver_info_text_cache.clear()
+    return
+
+
+def query_solver_info_text(col, use_cache=None):
     """
     Get a string of text, telling the user of the current solve inputs/outputs.
 
     :param col: The collection to compile and query.
     :type col: Collection
 
+    :param use_cache: Re-use the text of the Collection, if the key
+        from 'get_collection_compile_key' is unchanged. Only use this
+        while the Solver UI callbacks exist, because they clear the
+        cache (with 'clear_solver_info_text_cache') for scene changes
+        the key cannot see.
+    :type use_cache: bool or None
+
     :return: Text, ready for a QLabel.setText().
     :return: str
     """
     LOG.debug('query_solver_info_text: col=%r', col)
+    if use_cache is None:
+        use_cache = False
     param_num = 0
     dev_num = 0
     frm_num = 0
@@ -771,9 +809,17 @@ def query_solver_info_text(col):
     # the text to be bold or coloured to indicate warnings or
     # errors.
 
+    key = None
     if col is not None:
         assert isinstance(col, mmapi.Collection)
+        # The Solvers are created from the UI state, so the key must
+        # be computed after compiling.
         compile_collection(col)
+        if use_cache is True:
+            key = _get_solver_info_key(col)
+            cache_value = __solver_info_text_cache.get(col.get_node_uid())
+            if cache_value is not None and cache_value[0] == key:
+                return cache_value[1]
         state_list = mmapi.validate(col, as_state=True)
         status_list = [state.status for state in state_list]
         only_failure_status = [
@@ -813,6 +859,8 @@ def query_solver_info_text(col):
         bad_solves=failed_num,
     )
     text = pre_text + text + post_text
+    if key is not None:
+        __solver_info_text_cache[col.get_node_uid()] = (key, text)
     return text
 
 
@@ -866,6 +914,11 @@ def run_solve_ui(col, options, log_level, window):
             if options.use_minimal_ui is True:
                 window.setMinimalUI(True)
 
+            # The window's Maya callbacks clear the compile cache
+            # when the scene changes, so compiled actions can be
+            # re-used.
+            options = options._replace(use_compile_cache=True)
+
         execute_collection(
             col,
             options=options,
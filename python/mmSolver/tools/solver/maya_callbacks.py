@@ -33,6 +33,7 @@ import mmSolver.api as mmapi
 import mmSolver.ui.uiutils as uiutils
 import mmSolver.utils.node as node_utils
 import mmSolver.utils.event as event_utils
+import mmSolver.tools.solver.lib.collection as lib_collection
 
 TYPE_NEW_SCENE = 'new_scene'
 TYPE_SELECTION_CHANGED = 'selection_changed'
@@ -49,6 +50,10 @@ TYPE_LIST = [
     TYPE_COLLECTION,
 ]
 
+# The prefix of auxiliary attribute names, see
+# 'mmSolver._api.collection._get_auxiliary_attr_name'.
+AUXILIARY_ATTR_PREFIX = 'aux_'
+
 LOG = mmSolver.logger.get_logger()
 
 
@@ -434,6 +439,16 @@ def add_selection_changed_callback(obj_UI):
     return callback_ids
 
 
+def _clear_collection_caches():
+    """
+    Remove the compiled actions and solver information text of all
+    Collections, after a scene change.
+    """
+    mmapi.clear_collection_compile_cache()
+    lib_collection.clear_solver_info_text_cache()
+    return
+
+
 def attribute_changed_func(callback_msg, plugA, plugB, clientData):
     """
     Callback triggered when an event happens to an attribute on a node.
@@ -457,6 +472,15 @@ def attribute_changed_func(callback_msg, plugA, plugB, clientData):
     :return: Nothing.
     :rtype: None
     """
+    if (
+        callback_msg & OpenMaya.MNodeMessage.kAttributeSet
+        and mmapi.is_solver_running() is False
+    ):
+        # Collection settings for an attribute (such as minimum and
+        # maximum values) are stored in auxiliary attributes.
+        attr_name = OpenMaya.MFnAttribute(plugA.attribute()).name()
+        if attr_name.startswith(AUXILIARY_ATTR_PREFIX):
+            _clear_collection_caches()
     if (
         callback_msg & OpenMaya.MNodeMessage.kConnectionMade
         or callback_msg & OpenMaya.MNodeMessage.kConnectionBroken
@@ -469,6 +493,7 @@ def attribute_changed_func(callback_msg, plugA, plugB, clientData):
     ):
         if mmapi.is_solver_running() is True:
             return
+        _clear_collection_caches()
         node_uuid = clientData
         event_utils.trigger_event(
             mmapi.EVENT_NAME_ATTRIBUTE_STATE_CHANGED, node=node_uuid, plug=plugA
@@ -505,6 +530,7 @@ def attribute_connection_changed_func(callback_msg, plugA, plugB, clientData):
         or callback_msg & OpenMaya.MNodeMessage.kConnectionBroken
         or callback_msg & OpenMaya.MNodeMessage.kAttributeRemoved
     ):
+        _clear_collection_caches()
         event_utils.trigger_event(
             mmapi.EVENT_NAME_ATTRIBUTE_CONNECTION_CHANGED, node=node_uuid, plug=plugA
         )
@@ -529,6 +555,7 @@ def node_name_changed_func(node, prevName, clientData):
     """
     node_uuid = clientData
     LOG.debug('node_name_changed: %r', node_uuid)
+    _clear_collection_caches()
     event_utils.trigger_event(
         mmapi.EVENT_NAME_NODE_NAME_CHANGED, node=node_uuid, previous_name=prevName
     )
@@ -547,6 +574,7 @@ def node_deleted_func(clientData):
     """
     node_uuid = clientData
     LOG.debug('node_deleted: %r', node_uuid)
+    _clear_collection_caches()
     event_utils.trigger_event(mmapi.EVENT_NAME_NODE_DELETED, node=node_uuid)
     return
 
@@ -554,6 +582,7 @@ def node_deleted_func(clientData):
 def membership_change_func(node_obj, clientData):
     node_uuid = clientData
     LOG.debug('membership_changed: %r', node_uuid)
+    _clear_collection_caches()
     event_utils.trigger_event(mmapi.EVENT_NAME_MEMBERSHIP_CHANGED, node=node_uuid)
     return
 
@@ -570,6 +599,7 @@ def new_scene_func(clientData):
     :return: Nothing.
     :rtype: None
     """
+    _clear_collection_caches()
     try:
         valid = uiutils.isValidQtObject(clientData)
         if clientData is not None and valid is True:
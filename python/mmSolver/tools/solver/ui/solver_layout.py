@@ -147,6 +147,15 @@ class SolverLayout(QtWidgets.QWidget):
         )
 
         self.solver_settings.tabChanged.connect(self.solver_settings.updateModel, ct)
+        self.solver_settings.tabChanged.connect(
+            self.solver_state.requestSolverInfoUpdate, ct
+        )
+        self.object_browser.dataChanged.connect(
+            self.solver_state.requestSolverInfoUpdate, ct
+        )
+        self.attribute_browser.dataChanged.connect(
+            self.solver_state.requestSolverInfoUpdate, ct
+        )
         self.solver_settings.sendWarning.connect(self.setStatusLine, ct)
         return
 
@@ -531,6 +531,7 @@ class SolverWindow(BaseWindow):
         ):
             block = self.blockSignals(True)
             try:
+                self.subForm.solver_state.cancelSolverInfoUpdate()
                 mmapi.set_solver_running(True)
                 self.applyBtn.setText(const.WINDOW_BUTTON_SOLVE_STOP_LABEL)
                 self.closeBtn.setText(const.WINDOW_BUTTON_CLOSE_AND_STOP_LABEL)
@@ -544,6 +545,7 @@ class SolverWindow(BaseWindow):
                     self.applyBtn.setText(const.WINDOW_BUTTON_SOLVE_START_LABEL)
                     self.closeBtn.setText(const.WINDOW_BUTTON_CLOSE_LABEL)
                     self.blockSignals(block)
+                    self.subForm.solver_state.requestSolverInfoUpdate()
         return
 
     def closeEvent(self, event):
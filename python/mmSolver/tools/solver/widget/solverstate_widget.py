@@ -34,9 +34,11 @@ import mmSolver.ui.Qt.QtCore as QtCore
 import mmSolver.ui.Qt.QtWidgets as QtWidgets
 
 import mmSolver.logger
+import mmSolver.api as mmapi
 import mmSolver.ui.uiutils as uiutils
 import mmSolver.tools.solver.lib.collection as lib_collection
 import mmSolver.tools.solver.lib.state as lib_state
+import mmSolver.tools.solver.constant as const
 import mmSolver.tools.solver.widget.ui_solverstate_widget as ui_solverstate_widget
 
 
@@ -47,16 +49,56 @@ class SolverStateWidget(QtWidgets.QWidget, ui_solverstate_widget.Ui_Form):
 
     statusUpdated = QtCore.Signal()
     infoUpdated = QtCore.Signal()
+    solverInfoUpdated = QtCore.Signal()
 
     def __init__(self, parent=None, *args, **kwargs):
         s = time.time()
         super(SolverStateWidget, self).__init__(*args, **kwargs)
         self.setupUi(self)
+
+        # Many changes in a short time only compute the solver
+        # information once.
+        self._solver_info_timer = QtCore.QTimer(self)
+        self._solver_info_timer.setSingleShot(True)
+        self._solver_info_timer.setInterval(const.SOLVER_INFO_UPDATE_DELAY_MILLISECONDS)
+        self._solver_info_timer.timeout.connect(self.updateSolverInfo)
         e = time.time()
         LOG.debug('SolverStateWidget init: %r seconds', e - s)
         return
 
     def updateModel(self):
+        self.requestSolverInfoUpdate()
+        return
+
+    def requestSolverInfoUpdate(self):
+        """
+        Compute the solver information after the UI stops changing.
+
+        Each request restarts the delay, so a pending update is
+        replaced by the newest request.
+        """
+        self._solver_info_timer.start()
+        return
+
+    def cancelSolverInfoUpdate(self):
+        """
+        Cancel a pending solver information update.
+        """
+        self._solver_info_timer.stop()
+        return
+
+    @QtCore.Slot()
+    def updateSolverInfo(self):
+        valid = uiutils.isValidQtObject(self)
+        if valid is False:
+            return
+        if mmapi.is_solver_running() is True:
+            return
+        col = lib_state.get_active_collection()
+        # The job runs on the main thread, from the Qt event loop;
+        # Maya commands are not thread-safe.
+        text = lib_collection.query_solver_info_text(col, use_cache=True)
+        self.setSolverInfoLine(text)
         return
 
     def updateStatusWithSolveResult(self):
@@ -99,6 +141,18 @@ class SolverStateWidget(QtWidgets.QWidget, ui_solverstate_widget.Ui_Form):
         self.statusUpdated.emit()
         return
 
+    @QtCore.Slot(str)
+    def setSolverInfoLine(self, text):
+        valid = uiutils.isValidQtObject(self)
+        if valid is False:
+            return
+        valid = uiutils.isValidQtObject(self.solverInfoLine_label)
+        if valid is False:
+            return
+        self.solverInfoLine_label.setText(text)
+        self.solverInfoUpdated.emit()
+        return
+
     @QtCore.Slot(str)
     def setSolveInfoLine(self, text):
         valid = uiutils.isValidQtObject(self)
@@ -29,14 +29,23 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import math
 import warnings
 
 import maya.cmds
 import maya.OpenMaya as OpenMaya1
 import maya.OpenMayaAnim as OpenMayaAnim1
+import maya.api.OpenMaya as OpenMaya2
+import maya.api.OpenMayaAnim as OpenMayaAnim2
 
 import mmSolver.utils.node as node_utils
 
+# NumPy
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 def create_anim_curve_node_apione(
     times,
@@ -128,6 +137,190 @@ def create_anim_curve_node_apione(
     return animfn
 
 
+def create_anim_curves_apitwo(
+    node_attrs,
+    times_list,
+    values_list,
+    tangent_in_type=OpenMayaAnim2.MFnAnimCurve.kTangentGlobal,
+    tangent_out_type=OpenMayaAnim2.MFnAnimCurve.kTangentGlobal,
+):
+    """
+    Create (or re-use) animCurves for many plugs, using Maya API (two).
+
+    All new animCurves are created and connected with a single
+    MDGModifier, then the keyframes are added to each animCurve.
+    Plugs that are already animated re-use the existing animCurve,
+    the same as 'create_anim_curve_node_apione'.
+
+    :param node_attrs: The 'plugs' to connect the animCurves to.
+    :type node_attrs: [str, ..]
+
+    :param times_list: Time values for each animCurve.
+    :type times_list: [[float, ..], ..]
+
+    :param values_list: Values for each animCurve, None is not a
+        valid value.
+    :type values_list: [[float, ..], ..]
+
+    :param tangent_in_type: The "in" tangent type for keyframes.
+    :type tangent_in_type: maya.api.OpenMayaAnim.MFnAnimCurve.kTangent*
+
+    :param tangent_out_type: The "out" tangent type for keyframes.
+    :type tangent_out_type: maya.api.OpenMayaAnim.MFnAnimCurve.kTangent*
+
+    :return: MFnAnimCurve objects attached to the animation curves,
+        in the same order as 'node_attrs'.
+    :rtype: [maya.api.OpenMayaAnim.MFnAnimCurve, ..]
+    """
+    if not (len(node_attrs) == len(times_list) == len(values_list)):
+        raise ValueError(
+            'Number of node attributes, times and values does not match; '
+            'node_attrs=%r times=%r values=%r'
+            % (len(node_attrs), len(times_list), len(values_list))
+        )
+
+    dg_mod = OpenMaya2.MDGModifier()
+    animfn_list = []
+    for node_attr, times, values in zip(node_attrs, times_list, values_list):
+        if len(times) == 0:
+            raise ValueError('times must have 1 or more values; %r' % times)
+        if len(times) != len(values):
+            raise ValueError(
+                'Number of times and values does not match; times=%r values=%r'
+                % (len(times), len(values))
+            )
+        if None in values:
+            raise ValueError(
+                'values must not contain None; node_attr=%r values=%r'
+                % (node_attr, values)
+            )
+        plug = node_utils.get_as_plug_apitwo(node_attr)
+        if plug is None:
+            raise ValueError('node attribute does not exist; %r' % node_attr)
+
+        objs = OpenMayaAnim2.MAnimUtil.findAnimation(plug)
+        if len(objs) > 0:
+            animfn = OpenMayaAnim2.MFnAnimCurve(objs[0])
+        else:
+            animfn = OpenMayaAnim2.MFnAnimCurve()
+            animfn.create(plug, modifier=dg_mod)
+        animfn_list.append(animfn)
+    dg_mod.doIt()
+
+    ui_unit = OpenMaya2.MTime.uiUnit()
+    for animfn, times, values in zip(animfn_list, times_list, values_list):
+        time_array = OpenMaya2.MTimeArray([OpenMaya2.MTime(t, ui_unit) for t in times])
+        value_array = OpenMaya2.MDoubleArray([float(v) for v in values])
+        animfn.addKeys(
+            time_array,
+            value_array,
+            tangent_in_type,
+            tangent_out_type,
+            False,  # overwrite any keys that get in our way
+        )
+    return animfn_list
+
+
+def _get_connected_anim_curve_apitwo(plug):
+    """
+    Get the animCurve node connected directly to the plug.
+
+    AnimCurves connected through other nodes (for example a
+    pairBlend) may be shared, and are not returned.
+
+    :param plug: The plug to query.
+    :type plug: maya.api.OpenMaya.MPlug
+
+    :returns: The animCurve node, or None.
+    :rtype: maya.api.OpenMaya.MObject or None
+    """
+    if plug.isDestination is False:
+        return None
+    node = plug.source().node()
+    if node.hasFn(OpenMaya2.MFn.kAnimCurve) is False:
+        return None
+    return node
+
+
+def _get_plug_ui_value_apitwo(plug, value):
+    """
+    Convert a value in internal units to the value given to
+    'maya.cmds.setAttr' for the plug.
+    """
+    attr = plug.attribute()
+    if attr.hasFn(OpenMaya2.MFn.kNumericAttribute):
+        numeric_type = OpenMaya2.MFnNumericAttribute(attr).numericType()
+        if numeric_type == OpenMaya2.MFnNumericData.kBoolean:
+            return bool(value)
+        integer_types = [
+            OpenMaya2.MFnNumericData.kByte,
+            OpenMaya2.MFnNumericData.kChar,
+            OpenMaya2.MFnNumericData.kShort,
+            OpenMaya2.MFnNumericData.kInt,
+        ]
+        if numeric_type in integer_types:
+            return int(round(value))
+    return float(value) * _get_plug_ui_unit_scale_apitwo(plug)
+
+
+def set_static_plug_values_apitwo(node_attrs, values):
+    """
+    Set a static (un-animated) value on many plugs.
+
+    An animCurve connected directly to a plug is deleted, like
+    'maya.cmds.delete(node_attr, staticChannels=True)' does for
+    animCurves that do not change value. AnimCurves connected through
+    other nodes (such as a pairBlend) are not changed.
+
+    The plugs are found with Maya API (two), but the changes are made
+    with Maya commands, so they can be undone. Locked plugs are
+    unlocked to be set, then locked again.
+
+    :param node_attrs: The 'plugs' to set.
+    :type node_attrs: [str, ..]
+
+    :param values: The value for each plug, in internal units.
+    :type values: [float, ..]
+
+    :rtype: None
+    """
+    if len(node_attrs) != len(values):
+        raise ValueError(
+            'Number of node attributes and values does not match; '
+            'node_attrs=%r values=%r' % (len(node_attrs), len(values))
+        )
+
+    anim_curves = []
+    plug_values = []
+    for node_attr, value in zip(node_attrs, values):
+        if value is None:
+            raise ValueError('value must not be None; node_attr=%r' % node_attr)
+        plug = node_utils.get_as_plug_apitwo(node_attr)
+        if plug is None:
+            raise ValueError('node attribute does not exist; %r' % node_attr)
+        anim_curve = _get_connected_anim_curve_apitwo(plug)
+        if anim_curve is not None:
+            name = OpenMaya2.MFnDependencyNode(anim_curve).absoluteName()
+            if name not in anim_curves:
+                anim_curves.append(name)
+        plug_value = _get_plug_ui_value_apitwo(plug, value)
+        plug_values.append((node_attr, plug_value, plug.isLocked))
+
+    for node_attr, _, locked in plug_values:
+        if locked is True:
+            maya.cmds.setAttr(node_attr, lock=False)
+    try:
+        if len(anim_curves) > 0:
+            maya.cmds.delete(anim_curves)
+        for node_attr, plug_value, _ in plug_values:
+            maya.cmds.setAttr(node_attr, plug_value)
+    finally:
+        for node_attr, _, locked in plug_values:
+            if locked is True:
+                maya.cmds.setAttr(node_attr, lock=True)
+    return
+
+
 def create_anim_curve_node(*args, **kwargs):
     msg = 'Use mmSolver.utils.animcurve.create_anim_curve_node_apione instead.'
     warnings.warn(msg, DeprecationWarning)
@@ -216,3 +409,200 @@ def euler_filter_value(prev_value, value):
     elif value_diff < -180.0:
         value = euler_filter_value(prev_value, value + 360.0)
     return value
+
+
+def euler_filter_values(values, prev_value=None):
+    """
+    Perform a 'Euler Filter' on a sequence of rotation values.
+
+    The result is the same as calling 'euler_filter_value' on each
+    value with the previous (filtered) value, but when NumPy is
+    available all values are filtered in a single vectorised pass
+    (only changes of exactly +/-180 degrees are looped over).
+
+    :param values: The rotation values of a single axis, in time order.
+    :type values: [float, ..] or numpy.ndarray
+
+    :param prev_value: The rotation value before the first value, or
+        None if the first value should not be changed.
+    :type prev_value: float or None
+
+    :returns: New filtered rotation values. A numpy.ndarray is
+              returned when NumPy is available.
+    :rtype: numpy.ndarray or [float, ..]
+    """
+    if np is None:
+        new_values = []
+        for value in values:
+            if prev_value is not None:
+                value = euler_filter_value(prev_value, value)
+            new_values.append(value)
+            prev_value = value
+        return new_values
+
+    values = np.array(values, dtype=np.float64).reshape(-1)
+    if len(values) == 0:
+        return values
+    value_diffs = np.empty_like(values)
+    value_diffs[0] = 0.0
+    if prev_value is not None:
+        value_diffs[0] = values[0] - prev_value
+    value_diffs[1:] = np.diff(values)
+
+    # The number of full rotations to remove from each value, so the
+    # change from the previous value is within +/-180 degrees.
+    turns = np.zeros_like(values)
+    above = value_diffs > 180.0
+    below = value_diffs < -180.0
+    turns[above] = np.ceil((value_diffs[above] - 180.0) / 360.0)
+    turns[below] = -np.ceil((-value_diffs[below] - 180.0) / 360.0)
+    total_turns = np.cumsum(turns)
+
+    # A change of exactly +/-180 degrees is not filtered, so both
+    # +180 and -180 are possible; which one depends on the previous
+    # *filtered* value. Count the turns of these (rare) values
+    # against the previous filtered value, like 'euler_filter_value'.
+    steps = np.abs(value_diffs - (turns * 360.0))
+    for index in np.flatnonzero(np.abs(steps - 180.0) < 1e-9):
+        if index == 0:
+            continue
+        prev_filtered = values[index - 1] - (total_turns[index - 1] * 360.0)
+        value_diff = values[index] - prev_filtered
+        index_turns = 0.0
+        if value_diff > 180.0:
+            index_turns = math.ceil((value_diff - 180.0) / 360.0)
+        elif value_diff < -180.0:
+            index_turns = -math.ceil((-value_diff - 180.0) / 360.0)
+        total_turns[index:] += index_turns - total_turns[index]
+    return values - (total_turns * 360.0)
+
+
+def _get_plug_ui_unit_scale_apitwo(plug):
+    """
+    Get the scale from Maya's internal units to the user interface
+    units of a plug.
+
+    Only distance (linear) and angle plugs are scaled, all other
+    plugs return 1.0.
+
+    :param plug: The plug to query.
+    :type plug: maya.api.OpenMaya.MPlug
+
+    :rtype: float
+    """
+    attr = plug.attribute()
+    if attr.hasFn(OpenMaya2.MFn.kUnitAttribute) is False:
+        return 1.0
+    scale = 1.0
+    unit_type = OpenMaya2.MFnUnitAttribute(attr).unitType()
+    if unit_type == OpenMaya2.MFnUnitAttribute.kDistance:
+        scale = OpenMaya2.MDistance(1.0, OpenMaya2.MDistance.internalUnit()).asUnits(
+            OpenMaya2.MDistance.uiUnit()
+        )
+    elif unit_type == OpenMaya2.MFnUnitAttribute.kAngle:
+        scale = OpenMaya2.MAngle(1.0, OpenMaya2.MAngle.internalUnit()).asUnits(
+            OpenMaya2.MAngle.uiUnit()
+        )
+    return scale
+
+
+def _is_plug_time_varying_apitwo(plug):
+    """
+    Can the value of the plug change over time?
+
+    A plug can change over time if it, a parent compound plug or an
+    array plug it is an element of, is the destination of a
+    connection. For example 'node.translateX' is driven by a
+    connection into 'node.translate'. Computed (non-storable) output
+    attributes may also change over time.
+
+    :param plug: The plug to check.
+    :type plug: maya.api.OpenMaya.MPlug
+
+    :rtype: bool
+    """
+    attr_fn = OpenMaya2.MFnAttribute(plug.attribute())
+    if attr_fn.storable is False:
+        return True
+    while True:
+        if plug.isDestination is True:
+            return True
+        if plug.isChild is True:
+            plug = plug.parent()
+        elif plug.isElement is True:
+            plug = plug.array()
+        else:
+            return False
+
+
+def evaluate_plug_over_times_apitwo(node_attr, times, ui_units=None):
+    """
+    Evaluate a numeric plug at many times, with as little overhead as
+    possible.
+
+    The plug is evaluated using the cheapest method available:
+
+    - A plug that has no input connection (on the plug, or a parent
+      compound or array plug) is queried once, and the value is
+      repeated for all times.
+
+    - A plug driven directly by a time-based animCurve (with no
+      input connection) is evaluated by the animCurve function set,
+      without evaluating the DG.
+
+    - Otherwise the plug is evaluated with a DG (time) context for
+      each time.
+
+    .. note:: By default values are returned in Maya's internal units
+       (for example centimeters and radians), the same as
+       'maya.api.OpenMaya.MPlug.asDouble'. Use 'ui_units' to get
+       values in the same units as 'maya.cmds.getAttr'.
+
+    :param node_attr: Node attribute string in format 'node.attr'.
+    :type node_attr: str
+
+    :param times: The times (frame numbers) to evaluate the plug at.
+    :type times: [float, ..] or [int, ..]
+
+    :param ui_units: Convert distance (linear) and angle values to
+        Maya's user interface units. Defaults to False.
+    :type ui_units: bool or None
+
+    :returns: The plug values at each time, or None if the plug
+              could not be found.
+    :rtype: [float, ..] or None
+    """
+    if ui_units is None:
+        ui_units = False
+    plug = node_utils.get_as_plug_apitwo(node_attr)
+    if plug is None:
+        return None
+
+    values = None
+    if _is_plug_time_varying_apitwo(plug) is False:
+        value = plug.asDouble()
+        values = [value] * len(times)
+    else:
+        unit = OpenMaya2.MTime.uiUnit()
+        src_node = None
+        if plug.isDestination is True:
+            src_node = plug.source().node()
+        if src_node is not None and src_node.hasFn(OpenMaya2.MFn.kAnimCurve):
+            animfn = OpenMayaAnim2.MFnAnimCurve(src_node)
+            input_plug = animfn.findPlug('input', False)
+            if animfn.isTimeInput is True and input_plug.isDestination is False:
+                values = [
+                    animfn.evaluate(OpenMaya2.MTime(float(t), unit)) for t in times
+                ]
+
+        if values is None:
+            values = [None] * len(times)
+            for i, t in enumerate(times):
+                ctx = OpenMaya2.MDGContext(OpenMaya2.MTime(float(t), unit))
+                values[i] = plug.asDouble(ctx)
+
+    if ui_units is True:
+        scale = _get_plug_ui_unit_scale_apitwo(plug)
+        if scale != 1.0:
+            values = [v * scale for v in values]
+    return values
@@ -23,6 +23,8 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import array
+import bisect
 
 import mmSolver.utils.loadfile.floatutils as floatutils
 
@@ -33,30 +35,32 @@ class KeyframeData(object):
 
     Note: Static data is just a single keyframe of data, or multiple keyframes
     with the same value.
+
+    The keyframes are stored as parallel, sorted, arrays of times and
+    values. Appending keyframes in increasing frame order is O(1),
+    and looking up a frame is a binary search.
     """
 
     def __init__(self, data=None):
-        self._data = dict()
-        self._up_to_date = False
-        self._keyframe_values = None
+        self._times = array.array('d')
+        self._values = array.array('d')
         if isinstance(data, dict):
-            self._data = data.copy()
+            keys = sorted(data.keys(), key=int)
+            self._times.extend([int(k) for k in keys])
+            self._values.extend([data[k] for k in keys])
 
     def get_start_frame(self):
-        times = self.get_times()
-        if len(times) == 0:
+        if len(self._times) == 0:
             return None
-        return int(times[0])
+        return int(self._times[0])
 
     def get_end_frame(self):
-        times = self.get_times()
-        if len(times) == 0:
+        if len(self._times) == 0:
             return None
-        return int(times[-1])
+        return int(self._times[-1])
 
     def get_length(self):
-        times = self.get_times()
-        return len(times)
+        return len(self._times)
 
     def get_raw_data(self):
         """
@@ -64,87 +68,122 @@ class KeyframeData(object):
 
         This is so that the user can query the data then give it to the
         __init__ of a new class.
+
+        :returns: Dictionary of frame number (as a string) to value.
+        :rtype: {str: float}
         """
-        return self._data.copy()
+        return dict(zip([str(int(t)) for t in self._times], self._values))
 
     def get_value(self, frame):
         """
         Get the key value at frame. frame is an integer.
+
+        If there is no key on the frame, the value of the closest
+        frame is returned.
         """
-        assert isinstance(self._data, dict)
-        key = str(frame)
-        value = self._data.get(key)
-        if value is None:
-            # there is no key on the frame, find the closest frame.
-            frame = floatutils.get_closest_frame(frame, self._data)
-            key = str(frame)
-            if key in self._data:
-                value = self._data[key]
-        return value
+        num = len(self._times)
+        if num == 0:
+            return None
+        index = bisect.bisect_left(self._times, frame)
+        if index < num and self._times[index] == frame:
+            return self._values[index]
+
+        # There is no key on the frame, find the closest frame,
+        # preferring the previous frame when both are equally close.
+        prev_index = max(index - 1, 0)
+        next_index = min(index, num - 1)
+        prev_diff = abs(self._times[prev_index] - frame)
+        next_diff = abs(self._times[next_index] - frame)
+        if next_diff < prev_diff:
+            return self._values[next_index]
+        return self._values[prev_index]
 
     def get_keyframe_values(self):
-        assert isinstance(self._data, dict)
-
-        # This enables multiple calls not to re-compute this data.
-        if self._up_to_date is True:
-            return self._keyframe_values
-
-        key_values = list()
-
-        # Sort keys, based on int values, not string.
-        int_keys = list()
-        for key in self._data.keys():
-            int_keys.append(int(key))
-        keys = sorted(int_keys)
-
-        # Create key/value pairs.
-        for key in keys:
-            key_value = (int(key), self.get_value(int(key)))
-            key_values.append(key_value)
-
-        self._keyframe_values = key_values
-        self._up_to_date = True
-        return key_values
+        return list(zip(self.get_times(), self._values))
 
     def get_times(self):
         """
         Get all times, should be first half of get_keyframe_values.
         """
-        time_values = list()
-        key_values = self.get_keyframe_values()
-        for kv in key_values:
-            time_values.append(kv[0])
-        return time_values
+        return [int(t) for t in self._times]
 
     def get_values(self):
         """
         Get all values, should be second half of get_keyframe_values.
         """
-        values = list()
-        key_values = self.get_keyframe_values()
-        for kv in key_values:
-            values.append(kv[1])
-        return values
+        return self._values.tolist()
 
     def get_times_and_values(self):
         """
         Get all times, should be first half of get_keyframe_values.
         """
-        times = list()
-        values = list()
-        key_values = self.get_keyframe_values()
-        for kv in key_values:
-            times.append(kv[0])
-            values.append(kv[1])
-        return times, values
+        return self.get_times(), self.get_values()
+
+    def get_times_array(self):
+        """
+        Get a copy of the underlying (sorted) times array.
+
+        :rtype: array.array
+        """
+        return array.array('d', self._times)
+
+    def get_values_array(self):
+        """
+        Get a copy of the underlying values array, in the same order
+        as the times array.
+
+        :rtype: array.array
+        """
+        return array.array('d', self._values)
 
     def set_value(self, frame, value):
         """
         Set the 'value', at 'frame'.
         """
-        self._up_to_date = False
-        frame_str = str(frame)
-        self._data[frame_str] = value
+        value = float(value)
+        num = len(self._times)
+        if num == 0 or frame > self._times[-1]:
+            self._times.append(frame)
+            self._values.append(value)
+            return True
+
+        index = bisect.bisect_left(self._times, frame)
+        if index < num and self._times[index] == frame:
+            self._values[index] = value
+        else:
+            self._times.insert(index, frame)
+            self._values.insert(index, value)
+        return True
+
+    def set_times_and_values(self, times, values):
+        """
+        Replace all keyframes with the given 'times' and 'values'.
+
+        Setting many values at once is faster than calling
+        'set_value' for each frame.
+
+        :param times: Frame numbers, ideally in increasing order.
+        :type times: [int, ..] or array.array
+
+        :param values: Values for each frame in 'times'.
+        :type values: [float, ..] or array.array
+        """
+        if len(times) != len(values):
+            raise ValueError(
+                'Number of times and values does not match; times=%r values=%r'
+                % (len(times), len(values))
+            )
+        self._times = array.array('d', times)
+        self._values = array.array('d', values)
+
+        is_sorted = all(a < b for a, b in zip(self._times, self._times[1:]))
+        if is_sorted is False:
+            # Later duplicate frames override earlier frames, like
+            # 'set_value'.
+            data = dict(zip(self._times, self._values))
+            sorted_times = sorted(data.keys())
+            self._times = array.array('d', sorted_times)
+            self._values = array.array('d', [data[t] for t in sorted_times])
         return True
 
     def simplify_data(self):
@@ -152,17 +191,11 @@ class KeyframeData(object):
         Tries to convert the keyframe data into
         static if all values are the same.
         """
-        assert isinstance(self._data, dict)
-        self._up_to_date = False
-        initial = None
-        total = float()  # assume it's a float?
-        total_num = int()
-        for key in self._data.keys():
-            if initial is None:
-                initial = self._data[key]
-            total = total + float(self._data[key])
-            total_num = total_num + 1
-        average = total / total_num
+        if len(self._values) == 0:
+            return True
+        initial = self._values[0]
+        average = sum(self._values) / len(self._values)
         if floatutils.float_is_equal(average, initial):
-            self._data = average
+            self._times = array.array('d', self._times[:1])
+            self._values = array.array('d', [average])
         return True
@@ -0,0 +1,162 @@
+# Copyright (C) 2026 David Cattermole.
+#
+# This file is part of mmSolver.
+#
+# mmSolver is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# mmSolver is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with mmSolver.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""
+Incremental reading of line-based text files, for format parsers.
+
+Rather than reading all lines of a file into memory, the file is read
+as it is parsed, and blocks of lines (for example many lines of
+per-frame data) are read and split into columns together.
+
+Example usage::
+
+  import mmSolver.utils.loadfile.linestream as linestream
+  with open(file_path, 'r') as f:
+      stream = linestream.LineStream(f)
+      num_points = int(stream.next_line())
+      lines = stream.read_block(num_points)
+      frames, pos_x, pos_y = linestream.split_block_columns(lines, 3)
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+import itertools
+
+import mmSolver.utils.loadfile.excep as excep
+
+
+class LineStream(object):
+    """
+    Read stripped lines from a text file object, one line or one block
+    of lines at a time.
+
+    If 'comment_char' is given, lines starting with the comment
+    character are skipped entirely and any trailing comment is removed
+    from a line.
+    """
+
+    def __init__(self, file_obj, comment_char=None):
+        self._iter = iter(file_obj)
+        self._pending = collections.deque()
+        self._comment_char = comment_char
+        self._line_number = 0
+
+    def get_line_number(self):
+        """
+        The number of (non-comment) lines read so far.
+
+        :rtype: int
+        """
+        return self._line_number
+
+    def _clean_lines(self, lines):
+        lines = [line.strip() for line in lines]
+        comment_char = self._comment_char
+        if comment_char is not None:
+            lines = [
+                line.partition(comment_char)[0].strip()
+                for line in lines
+                if not line.startswith(comment_char)
+            ]
+        return lines
+
+    def _take(self, num):
+        """
+        Take up to 'num' clean lines, from pending lines first, then
+        from the file.
+        """
+        lines = []
+        while len(lines) < num and len(self._pending) > 0:
+            lines.append(self._pending.popleft())
+        while len(lines) < num:
+            raw_lines = list(itertools.islice(self._iter, num - len(lines)))
+            if len(raw_lines) == 0:
+                break
+            lines += self._clean_lines(raw_lines)
+        return lines
+
+    def next_line(self):
+        """
+        Read the next line.
+
+        :returns: The stripped line, or None at the end of the file.
+        :rtype: str or None
+        """
+        lines = self._take(1)
+        if len(lines) == 0:
+            return None
+        self._line_number += 1
+        return lines[0]
+
+    def read_block(self, num_lines):
+        """
+        Read a block of up to 'num_lines' non-empty lines.
+
+        The block ends early at the end of the file, or at an empty
+        line (the empty line is consumed and not returned).
+
+        :param num_lines: The maximum number of lines to read.
+        :type num_lines: int
+
+        :returns: The stripped lines of the block.
+        :rtype: [str, ..]
+        """
+        lines = self._take(num_lines)
+        if '' in lines:
+            index = lines.index('')
+            self._pending.extendleft(reversed(lines[index + 1 :]))
+            lines = lines[:index]
+            self._line_number += 1
+        self._line_number += len(lines)
+        return lines
+
+
+def split_block_columns(lines, num_columns):
+    """
+    Split a block of lines into columns of string tokens.
+
+    All lines are split together, rather than line-by-line.
+
+    :param lines: The lines to split, each line must contain exactly
+                  'num_columns' values separated by whitespace.
+    :type lines: [str, ..]
+
+    :param num_columns: The number of values on each line.
+    :type num_columns: int
+
+    :raises ParserError: When a line does not contain exactly
+                         'num_columns' values.
+
+    :returns: List of 'num_columns' lists, each list has a value for
+              each line.
+    :rtype: [[str, ..], ..]
+    """
+    tokens = ' '.join(lines).split()
+    if len(tokens) != len(lines) * num_columns:
+        for i, line in enumerate(lines):
+            if len(line.split()) != num_columns:
+                msg = (
+                    'File invalid, there must be %r numbers in a line'
+                    ' (separated by spaces): line=%r block_line_num=%r'
+                )
+                raise excep.ParserError(msg % (num_columns, line, i))
+    columns = [tokens[i::num_columns] for i in range(num_columns)]
+    return columns
@@ -57,3 +57,25 @@ class LoaderBase(object):
         :rtype: (FileInfo, [MarkerData, ...])
         """
         return
+
+    def parse_index(self, file_path, **kwargs):
+        """
+        Parse a summary of the given file path, for previewing the
+        contents of the file.
+
+        Override this method when a format can summarise the file
+        without decoding all the per-frame data. By default the file
+        is fully parsed with 'parse'.
+
+        :raise ParserError:
+            When the parser encounters an error related to parsing.
+
+        :raise OSError:
+            When there is a problem with reading or accessing the
+            given file.
+
+        :return: Tuple of FileInfo and List of MarkerIndex (or
+            MarkerData).
+        :rtype: (FileInfo, [MarkerIndex or MarkerData, ...])
+        """
+        return self.parse(file_path, **kwargs)
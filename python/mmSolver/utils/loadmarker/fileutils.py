@@ -29,6 +29,7 @@ import os.path
 import mmSolver.logger
 import mmSolver.utils.python_compat as pycompat
 import mmSolver.utils.loadmarker.formatmanager as fmtmgr
+import mmSolver.utils.loadmarker.markerdata as markerdata
 
 
 LOG = mmSolver.logger.get_logger()
@@ -100,6 +101,9 @@ def get_file_info(file_path, read_func):
     """
     Get the file path information.
 
+    'read_func' is expected to be a fast function to only read the
+    file header, such as 'mayareadfile.read_index'.
+
     :param file_path: The marker file path to get info for.
     :type file_path: str
 
@@ -117,6 +121,8 @@ def get_file_info_strings(file_path, read_func):
     :param file_path: The marker file path to get info for.
     :type file_path: str
 
+    'read_func' may return a list of MarkerData or MarkerIndex.
+
     :return: Dictionary of various information about the given file path.
     :rtype: dict
     """
@@ -146,15 +152,14 @@ def get_file_info_strings(file_path, read_func):
     end_frame = int(-999999)
     point_names = []
     for mkr_data in mkr_data_list:
-        name = mkr_data.get_name()
-        point_names.append(name)
+        mkr_index = mkr_data
+        if isinstance(mkr_data, markerdata.MarkerData):
+            mkr_index = markerdata.create_marker_index_from_marker_data(mkr_data)
+        point_names.append(mkr_index.name)
 
         # Get start / end frame.
-        # We assume that there are X and Y keyframes on each frame,
-        # therefore we do not test Y.
-        x_keys = mkr_data.get_x()
-        x_start = x_keys.get_start_frame()
-        x_end = x_keys.get_end_frame()
+        x_start = mkr_index.start_frame
+        x_end = mkr_index.end_frame
         if x_start < start_frame:
             start_frame = x_start
         if x_end > end_frame:
@@ -48,6 +48,7 @@ from __future__ import print_function
 import mmSolver.logger
 
 import mmSolver.utils.loadfile.excep as excep
+import mmSolver.utils.loadfile.linestream as linestream
 import mmSolver.utils.loadfile.loader as loader
 import mmSolver.utils.loadmarker.markerdata as markerdata
 import mmSolver.utils.loadmarker.fileinfo as fileinfo
@@ -70,17 +71,6 @@ def _parse_float_or_none(value):
         return None
 
 
-def _remove_comments_from_lines(lines):
-    clean_lines = []
-    for line in lines:
-        line = line.strip()
-        if line.startswith('#'):
-            continue
-        line = line.partition('#')[0]
-        clean_lines.append(line)
-    return clean_lines
-
-
 class Loader3DETXT(loader.LoaderBase):
 
     name = '3DEqualizer Track Points (*.txt)'
@@ -111,93 +101,63 @@ class Loader3DETXT(loader.LoaderBase):
         inv_image_width = 1.0 / image_width
         inv_image_height = 1.0 / image_height
 
-        f = open(file_path, 'r')
-        lines = f.readlines()
-        f.close()
-        if len(lines) == 0:
-            raise OSError('No contents in the file: %s' % file_path)
         mkr_data_list = []
-
-        lines = _remove_comments_from_lines(lines)
-
-        line = lines[0]
-        line = line.strip()
-        num_points = _parse_int_or_none(line)
-        if num_points is None:
-            raise excep.ParserError('Invalid file format.')
-        if num_points < 1:
-            raise excep.ParserError('No points exist.')
-
-        idx = 1  # Skip the first line
-        for i in range(num_points):
-            line = lines[idx]
-            mkr_name = line.strip()
-
-            # Create marker
-            mkr_data = markerdata.MarkerData()
-            mkr_data.set_name(mkr_name)
-
-            # Get point color
-            idx += 1
-            line = lines[idx]
-            line = line.strip()
-            mkr_color = _parse_int_or_none(line)
-            if mkr_color is None:
+        with open(file_path, 'r') as f:
+            stream = linestream.LineStream(f, comment_char='#')
+            line = stream.next_line()
+            if line is None:
+                raise OSError('No contents in the file: %s' % file_path)
+
+            num_points = _parse_int_or_none(line)
+            if num_points is None:
                 raise excep.ParserError('Invalid file format.')
-            mkr_data.set_color(mkr_color)
+            if num_points < 1:
+                raise excep.ParserError('No points exist.')
 
-            idx += 1
-            line = lines[idx]
-            line = line.strip()
-            num_frames = _parse_int_or_none(line)
-            if num_frames is None:
-                raise excep.ParserError('Invalid file format.')
-            if num_frames <= 0:
-                idx += 1
-                msg = 'point has no data: %r'
-                LOG.warning(msg, mkr_name)
-                continue
-
-            # Frame data parsing
-            frames = []
-            j = num_frames
-            while j > 0:
-                idx += 1
-                line = lines[idx]
-                line = line.strip()
-                if len(line) == 0:
-                    # Have we reached the end of the file?
-                    break
-                j = j - 1
-                split = line.split()
-                if len(split) != 3:
-                    # We should not get here
-                    msg = 'File invalid, there must be 3 numbers in line: %r'
-                    raise excep.ParserError(msg % line)
-                frame = _parse_int_or_none(split[0])
-                pos_x = _parse_float_or_none(split[1])
-                pos_y = _parse_float_or_none(split[2])
-                if frame is None or pos_x is None or pos_y is None:
+            for i in range(num_points):
+                mkr_name = stream.next_line()
+
+                # Create marker
+                mkr_data = markerdata.MarkerData()
+                mkr_data.set_name(mkr_name)
+
+                # Get point color
+                line = stream.next_line()
+                mkr_color = _parse_int_or_none(line)
+                if mkr_color is None:
+                    raise excep.ParserError('Invalid file format.')
+                mkr_data.set_color(mkr_color)
+
+                line = stream.next_line()
+                num_frames = _parse_int_or_none(line)
+                if num_frames is None:
+                    raise excep.ParserError('Invalid file format.')
+                if num_frames <= 0:
+                    msg = 'point has no data: %r'
+                    LOG.warning(msg, mkr_name)
+                    continue
+
+                # Frame data parsing, all frames of the point at once.
+                lines = stream.read_block(num_frames)
+                columns = linestream.split_block_columns(lines, 3)
+                try:
+                    frames = [int(v) for v in columns[0]]
+                    mkr_u = [float(v) * inv_image_width for v in columns[1]]
+                    mkr_v = [float(v) * inv_image_height for v in columns[2]]
+                except ValueError:
                     raise excep.ParserError('Invalid file format.')
-                mkr_u = pos_x * inv_image_width
-                mkr_v = pos_y * inv_image_height
-                mkr_weight = 1.0
-
-                mkr_data.weight.set_value(frame, mkr_weight)
-                mkr_data.x.set_value(frame, mkr_u)
-                mkr_data.y.set_value(frame, mkr_v)
-                frames.append(frame)
-
-            # Fill in occluded point frames
-            all_frames = list(range(min(frames), max(frames) + 1))
-            for frame in all_frames:
-                mkr_enable = bool(frame in frames)
-                mkr_data.enable.set_value(frame, int(mkr_enable))
-                if mkr_enable is False:
-                    mkr_data.weight.set_value(frame, 0.0)
-
-            mkr_data_list.append(mkr_data)
-            idx += 1
+                mkr_data.x.set_times_and_values(frames, mkr_u)
+                mkr_data.y.set_times_and_values(frames, mkr_v)
+
+                # Fill in occluded point frames
+                frames_set = set(frames)
+                all_frames = list(range(min(frames), max(frames) + 1))
+                mkr_enable = [int(frame in frames_set) for frame in all_frames]
+                mkr_weight = [float(enable) for enable in mkr_enable]
+                mkr_data.enable.set_times_and_values(all_frames, mkr_enable)
+                mkr_data.weight.set_times_and_values(all_frames, mkr_weight)
+
+                mkr_data_list.append(mkr_data)
 
         file_info = fileinfo.create_file_info()
         return file_info, mkr_data_list
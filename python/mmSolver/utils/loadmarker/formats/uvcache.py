@@ -0,0 +1,457 @@
+# Copyright (C) 2026 David Cattermole.
+#
+# This file is part of mmSolver.
+#
+# mmSolver is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# mmSolver is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with mmSolver.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""
+The .uvcache format is a binary, columnar, copy of the .uv (JSON)
+format, to be read quickly.
+
+The file is written by
+'mmSolver.tools.savemarkerfile.lib.write_cache_file' and contains
+exactly the same data as the .uv (version 2 to 5) data it was
+written from.
+
+The file layout is::
+
+    bytes[8]     # Magic identifier, MAGIC.
+    uint32       # Cache format version, CACHE_FORMAT_VERSION.
+    uint32       # Number of bytes in the header.
+    bytes[]      # Header, UTF-8 encoded JSON.
+    bytes[]      # Padding, so columns are aligned to 8 bytes.
+    # Column data starts here.
+    int32[]      # Column 'frame', all points concatenated.
+    float64[]    # Column 'pos_x'.
+    float64[]    # Column 'pos_y'.
+    float64[]    # Column 'pos_dist_x'.
+    float64[]    # Column 'pos_dist_y'.
+    float64[]    # Column 'weight'.
+
+The header looks like this::
+
+    {
+        'byte_order': str,  # 'little' or 'big'.
+        'num_frames': int,  # Number of values in each column.
+        'columns': {
+            'frame': int,  # Byte offset from the start of column data.
+            'pos_x': int,
+            ...
+        },
+        # The .uv data, without the 'points'.
+        'data': {
+            'version': int,
+            'num_points': int,
+            ...
+        },
+        'points': [
+            {
+                'name': str,
+                'id': int,  # or None
+                'set_name': str,
+                '3d': {...},  # Same as the .uv format.
+                'frame_offset': int,  # Index of the first frame in the columns.
+                'num_frames': int,
+                'start_frame': int,  # or None
+                'end_frame': int,  # or None
+                'has_pos_dist': bool,  # Are distorted positions in the .uv data?
+            },
+        ]
+    }
+
+The file is memory-mapped when read, and each column of a point is
+copied in bulk, without creating Python objects for each frame.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import array
+import json
+import mmap
+import struct
+import sys
+
+import mmSolver.logger
+
+import mmSolver.utils.loadfile.excep as excep
+import mmSolver.utils.loadfile.loader as loader
+import mmSolver.utils.loadmarker.markerdata as markerdata
+import mmSolver.utils.loadmarker.formatmanager as fmtmgr
+import mmSolver.utils.loadmarker.formats.uvtrack as uvtrack
+import mmSolver.tools.loadmarker.constant as const
+
+LOG = mmSolver.logger.get_logger()
+
+EXT = '.uvcache'
+MAGIC = b'MMSLVUVC'
+CACHE_FORMAT_VERSION = 1
+
+# Magic, cache format version and header size.
+PREAMBLE_FORMAT = '<8sII'
+PREAMBLE_SIZE = struct.calcsize(PREAMBLE_FORMAT)
+COLUMN_ALIGNMENT = 8
+
+# Column names and their 'array' type codes, in file order.
+COLUMN_FRAME = 'frame'
+COLUMN_POS_X = 'pos_x'
+COLUMN_POS_Y = 'pos_y'
+COLUMN_POS_DIST_X = 'pos_dist_x'
+COLUMN_POS_DIST_Y = 'pos_dist_y'
+COLUMN_WEIGHT = 'weight'
+COLUMNS = [
+    (COLUMN_FRAME, 'i'),
+    (COLUMN_POS_X, 'd'),
+    (COLUMN_POS_Y, 'd'),
+    (COLUMN_POS_DIST_X, 'd'),
+    (COLUMN_POS_DIST_Y, 'd'),
+    (COLUMN_WEIGHT, 'd'),
+]
+
+
+def get_column_data_start(header_size):
+    """
+    Get the byte offset of the column data in the file.
+
+    :param header_size: The number of bytes in the header.
+    :type header_size: int
+
+    :rtype: int
+    """
+    offset = PREAMBLE_SIZE + header_size
+    offset += -offset % COLUMN_ALIGNMENT
+    return offset
+
+
+class CacheFile(object):
+    """
+    A memory-mapped .uvcache file.
+
+    Use as a context manager, so the file is closed after reading::
+
+        with CacheFile(file_path) as cache:
+            header = cache.get_header()
+            frames = cache.get_column('frame', 0, 10)
+
+    """
+
+    def __init__(self, file_path):
+        self._file_path = file_path
+        self._file = None
+        self._mmap = None
+        self._view = None
+        self._header = None
+        self._data_start = None
+
+    def __enter__(self):
+        self._file = open(self._file_path, 'rb')
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Cannot map empty files.
+            self.close()
+            raise OSError('No contents in the file: %s' % self._file_path)
+        try:
+            self._view = memoryview(self._mmap)
+        except TypeError:
+            # Python 2.x cannot create a memoryview of a mmap, so the
+            # mmap is sliced directly.
+            self._view = self._mmap
+        try:
+            self._header = self._read_header()
+        except Exception:
+            self.close()
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def close(self):
+        if self._view is not None:
+            if isinstance(self._view, memoryview):
+                self._view.release()
+            self._view = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        return
+
+    def _read_header(self):
+        if len(self._mmap) < PREAMBLE_SIZE:
+            raise excep.ParserError('Invalid file format.')
+        magic, version, header_size = struct.unpack_from(PREAMBLE_FORMAT, self._mmap, 0)
+        if magic != MAGIC:
+            raise excep.ParserError('Invalid file format.')
+        if version != CACHE_FORMAT_VERSION:
+            msg = 'Unsupported cache format version: %r'
+            raise excep.ParserError(msg % version)
+        header_end = PREAMBLE_SIZE + header_size
+        self._data_start = get_column_data_start(header_size)
+        header_bytes = bytes(self._view[PREAMBLE_SIZE:header_end])
+        try:
+            header = json.loads(header_bytes.decode('utf-8'))
+        except ValueError:
+            raise excep.ParserError('Invalid file format.')
+        return header
+
+    def get_header(self):
+        """
+        :rtype: dict
+        """
+        return self._header
+
+    def get_column(self, name, start, count):
+        """
+        Copy 'count' values of a column, starting at index 'start'.
+
+        :param name: The column name, one of the names in COLUMNS.
+        :type name: str
+
+        :param start: The index of the first value to get.
+        :type start: int
+
+        :param count: The number of values to get.
+        :type count: int
+
+        :rtype: array.array
+        """
+        typecode = dict(COLUMNS)[name]
+        values = array.array(typecode)
+        column_offset = self._data_start + self._header['columns'][name]
+        byte_start = column_offset + (start * values.itemsize)
+        byte_end = byte_start + (count * values.itemsize)
+        if byte_end > len(self._mmap):
+            raise excep.ParserError('Invalid file format.')
+        chunk = self._view[byte_start:byte_end]
+        if hasattr(values, 'frombytes'):
+            values.frombytes(chunk)
+        else:
+            # Python 2.x
+            values.fromstring(chunk)
+        if self._header.get('byte_order') != sys.byteorder:
+            values.byteswap()
+        return values
+
+
+def _parse_points(
+    cache,
+    scene_data=None,
+    point_group_data=None,
+    undistorted=None,
+    with_3d_pos=None,
+    point_names=None,
+):
+    """
+    Create the MarkerData from the cache columns, the same as
+    'uvtrack._parse_v2_v3_v4_and_v5' does from .uv data.
+
+    :rtype: [MarkerData, ..]
+    """
+    if with_3d_pos is None:
+        with_3d_pos = False
+
+    pos_x_column = COLUMN_POS_DIST_X
+    pos_y_column = COLUMN_POS_DIST_Y
+    if undistorted is None:
+        undistorted = True
+    if undistorted is True:
+        pos_x_column = COLUMN_POS_X
+        pos_y_column = COLUMN_POS_Y
+
+    if point_names is not None:
+        point_names = set(point_names)
+
+    msg = 'Per-frame tracking data was not found on marker, skipping. name=%r'
+    header = cache.get_header()
+    mkr_data_list = []
+    for point_data in header.get('points', []):
+        if point_names is not None and point_data.get('name') not in point_names:
+            continue
+        mkr_data = markerdata.MarkerData()
+
+        # Static point information.
+        mkr_data = uvtrack._parse_point_info_v2_v3(mkr_data, point_data)
+
+        # 3D point data.
+        if with_3d_pos is True:
+            mkr_data = uvtrack._parse_point_3d_data_v3_v4_and_v5(
+                mkr_data, point_data, scene_data, point_group_data
+            )
+
+        num_frames = point_data['num_frames']
+        if num_frames == 0:
+            name = mkr_data.get_name()
+            LOG.warning(msg, name)
+            continue
+
+        # Marker per-frame data.
+        offset = point_data['frame_offset']
+        frames = cache.get_column(COLUMN_FRAME, offset, num_frames)
+        pos_x = cache.get_column(pos_x_column, offset, num_frames)
+        pos_y = cache.get_column(pos_y_column, offset, num_frames)
+        weight = cache.get_column(COLUMN_WEIGHT, offset, num_frames)
+        mkr_data.x.set_times_and_values(frames, pos_x)
+        mkr_data.y.set_times_and_values(frames, pos_y)
+        mkr_data.weight.set_times_and_values(frames, weight)
+
+        # Fill in occluded point frames.
+        mkr_data = uvtrack._parse_marker_occluded_frames_v1_v2_v3(
+            mkr_data,
+            frames.tolist(),
+        )
+        mkr_data_list.append(mkr_data)
+    return mkr_data_list
+
+
+def read_uv_data(file_path):
+    """
+    Read the .uv data that the cache file was written from.
+
+    The returned data can be written as a .uv (JSON) file.
+
+    :param file_path: File path to read.
+    :type file_path: str
+
+    :returns: The .uv format data.
+    :rtype: dict
+    """
+    with CacheFile(file_path) as cache:
+        header = cache.get_header()
+        data = dict(header['data'])
+        points = []
+        for point_data in header['points']:
+            point_data = dict(point_data)
+            offset = point_data.pop('frame_offset')
+            num_frames = point_data.pop('num_frames')
+            point_data.pop('start_frame')
+            point_data.pop('end_frame')
+            has_pos_dist = point_data.pop('has_pos_dist')
+            columns = dict(
+                (name, cache.get_column(name, offset, num_frames).tolist())
+                for name, _ in COLUMNS
+            )
+            point_data['per_frame'] = [
+                {
+                    'frame': frame,
+                    'pos_dist': [pos_dist_x, pos_dist_y],
+                    'pos': [pos_x, pos_y],
+                    'weight': weight,
+                }
+                for (frame, pos_x, pos_y, pos_dist_x, pos_dist_y, weight) in zip(
+                    columns[COLUMN_FRAME],
+                    columns[COLUMN_POS_X],
+                    columns[COLUMN_POS_Y],
+                    columns[COLUMN_POS_DIST_X],
+                    columns[COLUMN_POS_DIST_Y],
+                    columns[COLUMN_WEIGHT],
+                )
+            ]
+            if has_pos_dist is False:
+                for frame_data in point_data['per_frame']:
+                    frame_data.pop('pos_dist')
+            points.append(point_data)
+        data['points'] = points
+    return data
+
+
+class LoaderUVCache(loader.LoaderBase):
+    name = 'UV Track Cache (*.uvcache)'
+    file_exts = [EXT]
+    args = ['undistorted', 'with_3d_pos', 'point_names']
+
+    def parse(self, file_path, **kwargs):
+        """
+        Decodes a file path into a list of MarkerData.
+
+        :param file_path: The file path to parse.
+        :type file_path: str
+
+        :param kwargs: The same keywords as the .uv format;
+            'undistorted', 'with_3d_pos' and 'point_names'.
+
+        :return: List of MarkerData
+        """
+        point_names = kwargs.get('point_names', None)
+        undistorted = kwargs.get('undistorted', None)
+        assert undistorted is None or isinstance(undistorted, bool)
+        with_3d_pos = kwargs.get('with_3d_pos', True)
+        assert isinstance(with_3d_pos, bool)
+
+        with CacheFile(file_path) as cache:
+            data = cache.get_header()['data']
+            version = data.get('version')
+            file_info = uvtrack._parse_file_info_v2_v3_v4_and_v5(data, version)
+
+            scene_data = None
+            point_group_data = None
+            if version == const.UV_TRACK_FORMAT_VERSION_2:
+                undistorted = True
+                with_3d_pos = False
+            elif version == const.UV_TRACK_FORMAT_VERSION_5:
+                scene_data = data.get('scene', dict())
+                point_group_data = data.get('point_group', dict())
+
+            mkr_data_list = _parse_points(
+                cache,
+                scene_data=scene_data,
+                point_group_data=point_group_data,
+                undistorted=undistorted,
+                with_3d_pos=with_3d_pos,
+                point_names=point_names,
+            )
+        return file_info, mkr_data_list
+
+    def parse_index(self, file_path, **kwargs):
+        """
+        Decodes a file path into a summary of each point, only the
+        file header is read.
+
+        :param file_path: The file path to parse.
+        :type file_path: str
+
+        :return: Tuple of FileInfo and List of MarkerIndex.
+        :rtype: (FileInfo, [MarkerIndex, ..])
+        """
+        with CacheFile(file_path) as cache:
+            header = cache.get_header()
+        data = header['data']
+        file_info = uvtrack._parse_file_info_v2_v3_v4_and_v5(data, data.get('version'))
+
+        msg = 'Per-frame tracking data was not found on marker, skipping. name=%r'
+        mkr_index_list = []
+        for point_data in header['points']:
+            if point_data['num_frames'] == 0:
+                LOG.warning(msg, point_data.get('name'))
+                continue
+            mkr_index = markerdata.create_marker_index(
+                point_data.get('name'),
+                id_=point_data.get('id'),
+                group_name=point_data.get('set_name'),
+                start_frame=point_data['start_frame'],
+                end_frame=point_data['end_frame'],
+                num_frames=point_data['num_frames'],
+            )
+            mkr_index_list.append(mkr_index)
+        return file_info, mkr_index_list
+
+
+# Register the File Format
+mgr = fmtmgr.get_format_manager()
+mgr.register_format(LoaderUVCache)
@@ -209,6 +209,7 @@ import mmSolver.logger
 
 import mmSolver.utils.python_compat as pycompat
 import mmSolver.utils.loadfile.excep as excep
+import mmSolver.utils.loadfile.linestream as linestream
 import mmSolver.utils.loadfile.loader as loader
 import mmSolver.utils.loadmarker.markerdata as markerdata
 import mmSolver.utils.loadmarker.fileinfo as fileinfo
@@ -218,18 +219,35 @@ import mmSolver.tools.loadmarker.constant as const
 LOG = mmSolver.logger.get_logger()
 
 
-def determine_format_version(file_path):
+def _read_json_data(file_path):
     """
-    Work out the format version by reading the 'file_path'.
+    Read the JSON data from the 'file_path'.
 
-    returns: The format version, must be one of
-        constants.UV_TRACK_FORMAT_VERSION_LIST
+    :returns: The decoded JSON data, or an empty dict if the file is
+        not a JSON file (for example the v1 ASCII format).
+    :rtype: dict
     """
     with open(file_path) as f:
         try:
             data = json.load(f)
         except ValueError:
             data = {}
+    return data
+
+
+def determine_format_version(file_path, data=None):
+    """
+    Work out the format version by reading the 'file_path'.
+
+    :param data: The already decoded JSON data of 'file_path', used
+        to avoid reading and decoding the file again.
+    :type data: dict or None
+
+    returns: The format version, must be one of
+        constants.UV_TRACK_FORMAT_VERSION_LIST
+    """
+    if data is None:
+        data = _read_json_data(file_path)
     if len(data) == 0:
         return const.UV_TRACK_FORMAT_VERSION_1
     version = data.get('version', const.UV_TRACK_FORMAT_VERSION_UNKNOWN)
@@ -393,6 +411,9 @@ def _parse_per_frame_v2_v3_v4_v5(mkr_data, per_frame_data, pos_key=None):
         mkr_u, mkr_v = pos
 
         mkr_weight = frame_data.get('weight')
+        if mkr_weight is None:
+            # Files without a weight are loaded with the full weight.
+            mkr_weight = 1.0
 
         # Set Marker Data
         mkr_data.x.set_value(frame_num, mkr_u)
@@ -415,17 +436,20 @@ def _parse_marker_occluded_frames_v1_v2_v3(mkr_data, frames):
 
     :rtype: MarkerData
     """
+    frames_set = set(frames)
     all_frames = list(range(min(frames), max(frames) + 1))
-    for frame in all_frames:
-        mkr_enable = int(frame in frames)
-        mkr_data.enable.set_value(frame, mkr_enable)
-        if mkr_enable is False:
-            mkr_data.weight.set_value(frame, 0.0)
+    enable_values = [int(frame in frames_set) for frame in all_frames]
+    mkr_data.enable.set_times_and_values(all_frames, enable_values)
     return mkr_data
 
 
 def _parse_v2_v3_v4_and_v5(
-    data, scene_data=None, point_group_data=None, undistorted=None, with_3d_pos=None
+    data,
+    scene_data=None,
+    point_group_data=None,
+    undistorted=None,
+    with_3d_pos=None,
+    point_names=None,
 ):
     """
     Parse the UV file format.
@@ -449,6 +473,10 @@ def _parse_v2_v3_v4_and_v5(
                         uvtrack version 3+.
     :type with_3d_pos: bool or None
 
+    :param point_names: Only decode the points with these names,
+                        None means all points are decoded.
+    :type point_names: [str, ..] or None
+
     :return: List of MarkerData objects.
     """
     assert isinstance(data, dict)
@@ -464,10 +492,15 @@ def _parse_v2_v3_v4_and_v5(
     if undistorted is True:
         pos_key = 'pos'
 
+    if point_names is not None:
+        point_names = set(point_names)
+
     msg = 'Per-frame tracking data was not found on marker, skipping. name=%r'
     points = data.get('points', [])
     mkr_data_list = []
     for point_data in points:
+        if point_names is not None and point_data.get('name') not in point_names:
+            continue
         mkr_data = markerdata.MarkerData()
 
         # Static point information.
@@ -502,6 +535,94 @@ def _parse_v2_v3_v4_and_v5(
     return mkr_data_list
 
 
+def _parse_index_v2_v3_v4_and_v5(data):
+    """
+    Parse a summary of each point in the UV file format, without
+    decoding the per-frame data into MarkerData objects.
+
+    :param data: The data to parse, from the file path.
+    :type data: dict
+
+    :return: List of MarkerIndex objects.
+    """
+    assert isinstance(data, dict)
+
+    msg = 'Per-frame tracking data was not found on marker, skipping. name=%r'
+    points = data.get('points', [])
+    mkr_index_list = []
+    for point_data in points:
+        name = point_data.get('name')
+        assert isinstance(name, pycompat.TEXT_TYPE)
+
+        per_frame = point_data.get('per_frame', [])
+        if len(per_frame) == 0:
+            LOG.warning(msg, name)
+            continue
+
+        frames = [frame_data.get('frame') for frame_data in per_frame]
+        mkr_index = markerdata.create_marker_index(
+            name,
+            id_=point_data.get('id'),
+            group_name=point_data.get('set_name'),
+            start_frame=min(frames),
+            end_frame=max(frames),
+            num_frames=len(frames),
+        )
+        mkr_index_list.append(mkr_index)
+    return mkr_index_list
+
+
+def _parse_file_info_v2_v3_v4_and_v5(data, version):
+    """
+    Parse the types of contents available in the UV file format.
+
+    :param data: The data to parse, from the file path.
+    :type data: dict
+
+    :param version: The format version of the data.
+    :type version: int
+
+    :rtype: FileInfo
+    """
+    assert isinstance(data, dict)
+    if version == const.UV_TRACK_FORMAT_VERSION_2:
+        return fileinfo.create_file_info(marker_undistorted=True)
+    if version == const.UV_TRACK_FORMAT_VERSION_3:
+        return fileinfo.create_file_info(
+            marker_distorted=True,
+            marker_undistorted=True,
+            bundle_positions=True,
+        )
+
+    cam_fov_list = _parse_camera_fov_v4(data)
+    if version == const.UV_TRACK_FORMAT_VERSION_4:
+        return fileinfo.create_file_info(
+            marker_distorted=True,
+            marker_undistorted=True,
+            bundle_positions=True,
+            camera_field_of_view=cam_fov_list,
+        )
+
+    assert version == const.UV_TRACK_FORMAT_VERSION_5
+    scene_data = data.get('scene', dict())
+    scene_transform = scene_data.get('transform')
+    has_scene_transform = scene_transform is not None and len(scene_transform) == 16
+
+    point_group_data = data.get('point_group', dict())
+    point_group_transform = point_group_data.get('transform')
+    has_point_group_transform = (
+        isinstance(point_group_transform, dict) and len(point_group_transform) > 0
+    )
+    return fileinfo.create_file_info(
+        marker_distorted=True,
+        marker_undistorted=True,
+        bundle_positions=True,
+        scene_transform=has_scene_transform,
+        point_group_transform=has_point_group_transform,
+        camera_field_of_view=cam_fov_list,
+    )
+
+
 def _parse_camera_fov_v4(data):
     """
     Parse the camera FoV value.
@@ -538,107 +659,109 @@ def parse_v1(file_path, **kwargs):
     """
     Parse the UV file format or 3DEqualizer .txt format.
 
+    Accepts the keyword 'point_names'.
+
     :param file_path: File path to read.
     :type file_path: str
 
     :return: List of MarkerData objects.
     """
-    with open(file_path, 'r') as f:
-        lines = f.readlines()
-    if len(lines) == 0:
-        raise OSError('No contents in the file: %s' % file_path)
-    mkr_data_list = []
-
-    num_points = int(lines[0])
-    if num_points < 1:
-        raise excep.ParserError('No points exist.')
-
-    idx = 1  # Skip the first line
-    for _ in range(num_points):
-        mkr_name = lines[idx]
-        mkr_name = mkr_name.strip()
+    point_names = kwargs.get('point_names', None)
+    if point_names is not None:
+        point_names = set(point_names)
 
-        # Create marker
-        mkr_data = markerdata.MarkerData()
-        mkr_data.set_name(mkr_name)
-
-        idx += 1
-        num_frames = int(lines[idx])
-        if num_frames <= 0:
-            idx += 1
-            msg = 'Point has no data: mkr_name=%r line_num=%r'
-            LOG.warning(msg, mkr_name, idx)
-            continue
-
-        # Frame data parsing
-        frames = []
-        j = num_frames
-        while j > 0:
-            idx += 1
-            line = lines[idx]
-            line = line.strip()
-            if len(line) == 0:
-                # Have we reached the end of the file?
-                break
-            j = j - 1
-            split = line.split()
-            if len(split) != 4:
-                # We should not get here
-                msg = (
-                    'File invalid, there must be 4 numbers in a line'
-                    ' (separated by spaces): line=%r line_num=%r'
-                )
-                raise excep.ParserError(msg % (line, idx))
-            frame = int(split[0])
-            mkr_u = float(split[1])
-            mkr_v = float(split[2])
-            mkr_weight = float(split[3])
-
-            mkr_data.weight.set_value(frame, mkr_weight)
-            mkr_data.x.set_value(frame, mkr_u)
-            mkr_data.y.set_value(frame, mkr_v)
-            frames.append(frame)
-
-        # Fill in occluded point frames
-        mkr_data = _parse_marker_occluded_frames_v1_v2_v3(
-            mkr_data,
-            frames,
-        )
+    with open(file_path, 'r') as f:
+        stream = linestream.LineStream(f)
+        line = stream.next_line()
+        if line is None:
+            raise OSError('No contents in the file: %s' % file_path)
+        mkr_data_list = []
+
+        num_points = int(line)
+        if num_points < 1:
+            raise excep.ParserError('No points exist.')
+
+        for _ in range(num_points):
+            mkr_name = stream.next_line()
+
+            # Create marker
+            mkr_data = markerdata.MarkerData()
+            mkr_data.set_name(mkr_name)
+
+            num_frames = int(stream.next_line())
+            if num_frames <= 0:
+                msg = 'Point has no data: mkr_name=%r line_num=%r'
+                LOG.warning(msg, mkr_name, stream.get_line_number())
+                continue
+
+            # Frame data parsing, all frames of the point at once.
+            lines = stream.read_block(num_frames)
+            if point_names is not None and mkr_name not in point_names:
+                continue
+            columns = linestream.split_block_columns(lines, 4)
+            frames = [int(v) for v in columns[0]]
+            mkr_u = [float(v) for v in columns[1]]
+            mkr_v = [float(v) for v in columns[2]]
+            mkr_weight = [float(v) for v in columns[3]]
+
+            mkr_data.weight.set_times_and_values(frames, mkr_weight)
+            mkr_data.x.set_times_and_values(frames, mkr_u)
+            mkr_data.y.set_times_and_values(frames, mkr_v)
+
+            # Fill in occluded point frames
+            mkr_data = _parse_marker_occluded_frames_v1_v2_v3(
+                mkr_data,
+                frames,
+            )
 
-        mkr_data_list.append(mkr_data)
-        idx += 1
+            mkr_data_list.append(mkr_data)
 
     file_info = fileinfo.create_file_info(marker_undistorted=True)
     return file_info, mkr_data_list
 
 
-def parse_v2(file_path, **kwargs):
+def parse_v2(file_path, data=None, **kwargs):
     """
     Parse the UV file format, using JSON.
 
+    Accepts the keyword 'point_names'.
+
     :param file_path: File path to read.
     :type file_path: str
 
+    :param data: The already decoded JSON data of 'file_path'.
+    :type data: dict or None
+
     :return: List of MarkerData objects.
     """
-    file_info = fileinfo.create_file_info(marker_undistorted=True)
+    point_names = kwargs.get('point_names', None)
 
-    with open(file_path) as f:
-        data = json.load(f)
+    if data is None:
+        with open(file_path) as f:
+            data = json.load(f)
 
-    mkr_data_list = _parse_v2_v3_v4_and_v5(data, undistorted=True, with_3d_pos=False)
+    file_info = _parse_file_info_v2_v3_v4_and_v5(data, const.UV_TRACK_FORMAT_VERSION_2)
+    mkr_data_list = _parse_v2_v3_v4_and_v5(
+        data,
+        undistorted=True,
+        with_3d_pos=False,
+        point_names=point_names,
+    )
     return file_info, mkr_data_list
 
 
-def parse_v3(file_path, **kwargs):
+def parse_v3(file_path, data=None, **kwargs):
     """
     Parse the UV file format, using JSON.
 
-    Accepts the keyword 'undistorted'.
+    Accepts the keyword 'undistorted' and 'point_names'.
 
     :param file_path: File path to read.
     :type file_path: str
 
+    :param data: The already decoded JSON data of 'file_path'.
+    :type data: dict or None
+
     :return: List of MarkerData objects.
     """
     # Should we choose the undistorted or distorted marker data?
@@ -648,31 +771,35 @@ def parse_v3(file_path, **kwargs):
     with_3d_pos = kwargs.get('with_3d_pos', True)
     assert isinstance(with_3d_pos, bool)
 
-    with open(file_path) as f:
-        data = json.load(f)
+    point_names = kwargs.get('point_names', None)
 
-    file_info = fileinfo.create_file_info(
-        marker_distorted=True,
-        marker_undistorted=True,
-        bundle_positions=True,
-    )
+    if data is None:
+        with open(file_path) as f:
+            data = json.load(f)
+
+    file_info = _parse_file_info_v2_v3_v4_and_v5(data, const.UV_TRACK_FORMAT_VERSION_3)
     mkr_data_list = _parse_v2_v3_v4_and_v5(
         data,
         undistorted=undistorted,
         with_3d_pos=with_3d_pos,
+        point_names=point_names,
     )
     return file_info, mkr_data_list
 
 
-def parse_v4(file_path, **kwargs):
+def parse_v4(file_path, data=None, **kwargs):
     """
     Parse the UV file format, using JSON.
 
-    Accepts the keyword 'undistorted', 'overscan_x' and 'overscan_y'.
+    Accepts the keyword 'undistorted', 'overscan_x', 'overscan_y' and
+    'point_names'.
 
     :param file_path: File path to read.
     :type file_path: str
 
+    :param data: The already decoded JSON data of 'file_path'.
+    :type data: dict or None
+
     :return: List of MarkerData objects.
     """
     # Should we choose the undistorted or distorted marker data?
@@ -682,35 +809,35 @@ def parse_v4(file_path, **kwargs):
     with_3d_pos = kwargs.get('with_3d_pos', True)
     assert isinstance(with_3d_pos, bool)
 
-    with open(file_path) as f:
-        data = json.load(f)
+    point_names = kwargs.get('point_names', None)
 
-    cam_fov_list = _parse_camera_fov_v4(
-        data,
-    )
-    file_info = fileinfo.create_file_info(
-        marker_distorted=True,
-        marker_undistorted=True,
-        bundle_positions=True,
-        camera_field_of_view=cam_fov_list,
-    )
+    if data is None:
+        with open(file_path) as f:
+            data = json.load(f)
+
+    file_info = _parse_file_info_v2_v3_v4_and_v5(data, const.UV_TRACK_FORMAT_VERSION_4)
     mkr_data_list = _parse_v2_v3_v4_and_v5(
         data,
         undistorted=undistorted,
         with_3d_pos=with_3d_pos,
+        point_names=point_names,
     )
     return file_info, mkr_data_list
 
 
-def parse_v5(file_path, **kwargs):
+def parse_v5(file_path, data=None, **kwargs):
     """
     Parse the UV file format, using JSON.
 
-    Accepts the keyword 'undistorted', 'overscan_x' and 'overscan_y'.
+    Accepts the keyword 'undistorted', 'overscan_x', 'overscan_y' and
+    'point_names'.
 
     :param file_path: File path to read.
     :type file_path: str
 
+    :param data: The already decoded JSON data of 'file_path'.
+    :type data: dict or None
+
     :return: List of MarkerData objects.
     """
     # Should we choose the undistorted or distorted marker data?
@@ -720,34 +847,22 @@ def parse_v5(file_path, **kwargs):
     with_3d_pos = kwargs.get('with_3d_pos', True)
     assert isinstance(with_3d_pos, bool)
 
-    with open(file_path) as f:
-        data = json.load(f)
+    point_names = kwargs.get('point_names', None)
 
-    scene_data = data.get('scene', dict())
-    scene_transform = scene_data.get('transform')
-    has_scene_transform = scene_transform is not None and len(scene_transform) == 16
+    if data is None:
+        with open(file_path) as f:
+            data = json.load(f)
 
+    scene_data = data.get('scene', dict())
     point_group_data = data.get('point_group', dict())
-    point_group_transform = point_group_data.get('transform')
-    has_point_group_transform = (
-        isinstance(point_group_transform, dict) and len(point_group_transform) > 0
-    )
-
-    cam_fov_list = _parse_camera_fov_v4(data)
-    file_info = fileinfo.create_file_info(
-        marker_distorted=True,
-        marker_undistorted=True,
-        bundle_positions=True,
-        scene_transform=has_scene_transform,
-        point_group_transform=has_point_group_transform,
-        camera_field_of_view=cam_fov_list,
-    )
+    file_info = _parse_file_info_v2_v3_v4_and_v5(data, const.UV_TRACK_FORMAT_VERSION_5)
     mkr_data_list = _parse_v2_v3_v4_and_v5(
         data,
         scene_data=scene_data,
         point_group_data=point_group_data,
         undistorted=undistorted,
         with_3d_pos=with_3d_pos,
+        point_names=point_names,
     )
     return file_info, mkr_data_list
 
@@ -755,7 +870,7 @@ def parse_v5(file_path, **kwargs):
 class LoaderUVTrack(loader.LoaderBase):
     name = 'UV Track Points (*.uv)'
     file_exts = ['.uv']
-    args = ['undistorted', 'with_3d_pos']
+    args = ['undistorted', 'with_3d_pos', 'point_names']
 
     def parse(self, file_path, **kwargs):
         """
@@ -767,25 +882,62 @@ class LoaderUVTrack(loader.LoaderBase):
         :param kwargs: The keyword 'undistorted' is used by
             UV_TRACK_FORMAT_VERSION_3 formats. 'with_3d_pos' can be
             used to use the (3D) bundle positions or not.
+            'point_names' can be used to only decode some points.
 
         :return: List of MarkerData
         """
-        version = determine_format_version(file_path)
+        data = _read_json_data(file_path)
+        version = determine_format_version(file_path, data=data)
         if version == const.UV_TRACK_FORMAT_VERSION_1:
             file_info, mkr_data_list = parse_v1(file_path, **kwargs)
         elif version == const.UV_TRACK_FORMAT_VERSION_2:
-            file_info, mkr_data_list = parse_v2(file_path, **kwargs)
+            file_info, mkr_data_list = parse_v2(file_path, data=data, **kwargs)
         elif version == const.UV_TRACK_FORMAT_VERSION_3:
-            file_info, mkr_data_list = parse_v3(file_path, **kwargs)
+            file_info, mkr_data_list = parse_v3(file_path, data=data, **kwargs)
         elif version == const.UV_TRACK_FORMAT_VERSION_4:
-            file_info, mkr_data_list = parse_v4(file_path, **kwargs)
+            file_info, mkr_data_list = parse_v4(file_path, data=data, **kwargs)
         elif version == const.UV_TRACK_FORMAT_VERSION_5:
-            file_info, mkr_data_list = parse_v5(file_path, **kwargs)
+            file_info, mkr_data_list = parse_v5(file_path, data=data, **kwargs)
         else:
             msg = 'Could not determine format version for UV Track file.'
             raise excep.ParserError(msg)
         return file_info, mkr_data_list
 
+    def parse_index(self, file_path, **kwargs):
+        """
+        Decodes a file path into a summary of each point, without
+        creating the per-frame MarkerData.
+
+        The (JSON) UV Track formats are only indexed, the v1 ASCII
+        format is fully parsed.
+
+        :param file_path: The file path to parse.
+        :type file_path: str
+
+        :return: Tuple of FileInfo and List of MarkerIndex.
+        :rtype: (FileInfo, [MarkerIndex, ..])
+        """
+        data = _read_json_data(file_path)
+        version = determine_format_version(file_path, data=data)
+        if version == const.UV_TRACK_FORMAT_VERSION_1:
+            file_info, mkr_data_list = parse_v1(file_path, **kwargs)
+            mkr_index_list = [
+                markerdata.create_marker_index_from_marker_data(x)
+                for x in mkr_data_list
+            ]
+        elif version in [
+            const.UV_TRACK_FORMAT_VERSION_2,
+            const.UV_TRACK_FORMAT_VERSION_3,
+            const.UV_TRACK_FORMAT_VERSION_4,
+            const.UV_TRACK_FORMAT_VERSION_5,
+        ]:
+            file_info = _parse_file_info_v2_v3_v4_and_v5(data, version)
+            mkr_index_list = _parse_index_v2_v3_v4_and_v5(data)
+        else:
+            msg = 'Could not determine format version for UV Track file.'
+            raise excep.ParserError(msg)
+        return file_info, mkr_index_list
+
 
 # Register the File Format
 mgr = fmtmgr.get_format_manager()
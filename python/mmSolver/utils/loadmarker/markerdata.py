@@ -23,9 +23,63 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import collections
 
 import mmSolver.utils.loadfile.keyframedata as keyframedata
 
+# A summary of a marker in a file, without the per-frame data.
+MarkerIndex = collections.namedtuple(
+    'MarkerIndex',
+    [
+        'name',
+        'id',
+        'group_name',
+        'start_frame',
+        'end_frame',
+        'num_frames',
+    ],
+)
+
+
+def create_marker_index(
+    name, id_=None, group_name=None, start_frame=None, end_frame=None, num_frames=None
+):
+    """
+    Create a summary of a marker, for previewing the contents of a file.
+    """
+    if num_frames is None:
+        num_frames = 0
+    mkr_index = MarkerIndex(
+        name=name,
+        id=id_,
+        group_name=group_name,
+        start_frame=start_frame,
+        end_frame=end_frame,
+        num_frames=num_frames,
+    )
+    return mkr_index
+
+
+def create_marker_index_from_marker_data(mkr_data):
+    """
+    Create a summary of an already parsed MarkerData.
+
+    We assume that there are X and Y keyframes on each frame,
+    therefore we do not test Y.
+
+    :type mkr_data: MarkerData
+    :rtype: MarkerIndex
+    """
+    x_keys = mkr_data.get_x()
+    return create_marker_index(
+        mkr_data.get_name(),
+        id_=mkr_data.get_id(),
+        group_name=mkr_data.get_group_name(),
+        start_frame=x_keys.get_start_frame(),
+        end_frame=x_keys.get_end_frame(),
+        num_frames=x_keys.get_length(),
+    )
+
 
 class MarkerData(object):
     def __init__(self):
@@ -0,0 +1,537 @@
+# Copyright (C) 2026 David Cattermole.
+#
+# This file is part of mmSolver.
+#
+# mmSolver is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# mmSolver is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with mmSolver.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""
+A cache of parsed marker files, in memory and (optionally) on disk.
+
+Entries are keyed on the file path, file modification time and
+file size, so a file that changes is parsed again. The least
+recently used entries are removed when the memory or disk budget is
+exceeded.
+
+The parsed data is stored as JSON, so each 'get' returns a new
+copy that the caller may modify. Only the FileInfo, MarkerIndex,
+MarkerData and KeyframeData types are created when the data is
+read, so a cache file cannot run code.
+
+The disk cache is disabled by default. It is enabled by setting a
+disk budget, for example with the
+'MMSOLVER_LOADMARKER_CACHE_DISK_SIZE' environment variable. Cache
+files are only used from a directory that is owned by the current
+user and cannot be accessed by other users.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+import hashlib
+import json
+import os
+import os.path
+import stat
+import sys
+import tempfile
+import threading
+
+import mmSolver.logger
+import mmSolver.utils.config as config_utils
+import mmSolver.utils.python_compat as pycompat
+import mmSolver.utils.loadfile.keyframedata as keyframedata
+import mmSolver.utils.loadmarker.fileinfo as fileinfo
+import mmSolver.utils.loadmarker.markerdata as markerdata
+
+LOG = mmSolver.logger.get_logger()
+
+# Increment when the stored data changes, to ignore old cache files.
+CACHE_VERSION = 2
+
+CACHE_PATH_VAR_NAME = 'MMSOLVER_LOADMARKER_CACHE_PATH'
+CACHE_DISK_SIZE_VAR_NAME = 'MMSOLVER_LOADMARKER_CACHE_DISK_SIZE'
+CACHE_DIRECTORY_NAME = 'loadmarker_cache'
+CACHE_FILE_EXT = '.json'
+
+# Only the owner may read, write or list the cache directory.
+CACHE_DIRECTORY_MODE = 0o700
+
+# Budgets, in bytes.
+DEFAULT_MEMORY_BUDGET = 256 * 1024 * 1024
+DEFAULT_DISK_BUDGET = 0
+
+# The key used to store the type of encoded values.
+TYPE_KEY = '__type__'
+
+# module level cache, stores an instance of 'ParseCache'.
+__parse_cache = None
+
+
+def get_default_directory():
+    """
+    Get the directory used to store cache files.
+
+    The 'MMSOLVER_LOADMARKER_CACHE_PATH' environment variable can be
+    used to override the default directory, in the user's mmSolver
+    home directory.
+
+    :rtype: str
+    """
+    dir_path = os.environ.get(CACHE_PATH_VAR_NAME)
+    if not dir_path:
+        dir_path = config_utils.get_home_dir_path(CACHE_DIRECTORY_NAME)
+    return dir_path
+
+
+def get_default_disk_budget():
+    """
+    Get the number of bytes that may be stored on disk.
+
+    The 'MMSOLVER_LOADMARKER_CACHE_DISK_SIZE' environment variable
+    is the size in megabytes, the default is 0 (disabled).
+
+    :rtype: int
+    """
+    value = os.environ.get(CACHE_DISK_SIZE_VAR_NAME)
+    if not value:
+        return DEFAULT_DISK_BUDGET
+    try:
+        megabytes = int(value)
+    except ValueError:
+        msg = '%s must be a number of megabytes: %r'
+        LOG.warning(msg, CACHE_DISK_SIZE_VAR_NAME, value)
+        return DEFAULT_DISK_BUDGET
+    return max(0, megabytes) * 1024 * 1024
+
+
+def create_key(file_path, name, **kwargs):
+    """
+    Create a cache key for the parsed file path.
+
+    :param file_path: The file path that is parsed.
+    :type file_path: str
+
+    :param name: The name of the parsing function, so different
+        parsers of the same file do not share entries.
+    :type name: str
+
+    :param kwargs: The keyword arguments given to the parser.
+
+    :returns: The key, or None if the file cannot be found.
+    :rtype: str or None
+    """
+    try:
+        file_stat = os.stat(file_path)
+    except OSError:
+        return None
+    mtime = getattr(file_stat, 'st_mtime_ns', file_stat.st_mtime)
+    items = [
+        CACHE_VERSION,
+        sys.version_info[0],
+        name,
+        os.path.abspath(file_path),
+        mtime,
+        file_stat.st_size,
+        sorted((k, repr(v)) for k, v in kwargs.items()),
+    ]
+    key = hashlib.sha1(repr(items).encode('utf-8')).hexdigest()
+    return key
+
+
+def _encode_value(value):
+    if isinstance(value, keyframedata.KeyframeData):
+        return {
+            TYPE_KEY: 'KeyframeData',
+            'times': value.get_times_array().tolist(),
+            'values': value.get_values_array().tolist(),
+        }
+    if isinstance(value, markerdata.MarkerData):
+        return {
+            TYPE_KEY: 'MarkerData',
+            'attrs': dict((k, _encode_value(v)) for k, v in vars(value).items()),
+        }
+    if isinstance(value, fileinfo.FileInfo):
+        return {TYPE_KEY: 'FileInfo', 'items': _encode_value(tuple(value))}
+    if isinstance(value, markerdata.MarkerIndex):
+        return {TYPE_KEY: 'MarkerIndex', 'items': _encode_value(tuple(value))}
+    if isinstance(value, tuple):
+        return {TYPE_KEY: 'tuple', 'items': [_encode_value(v) for v in value]}
+    if isinstance(value, list):
+        return [_encode_value(v) for v in value]
+    if value is None or isinstance(value, (bool, float, pycompat.TEXT_TYPE)):
+        return value
+    if isinstance(value, pycompat.INT_TYPES):
+        return value
+    raise TypeError('Cannot store type in parse cache: %r' % type(value))
+
+
+def _decode_value(value):
+    if isinstance(value, list):
+        return [_decode_value(v) for v in value]
+    if isinstance(value, dict) is False:
+        return value
+
+    type_name = value.get(TYPE_KEY)
+    if type_name == 'KeyframeData':
+        keys = keyframedata.KeyframeData()
+        keys.set_times_and_values(value['times'], value['values'])
+        return keys
+    if type_name == 'MarkerData':
+        mkr_data = markerdata.MarkerData()
+        attrs = vars(mkr_data)
+        for attr_name, attr_value in value['attrs'].items():
+            # Only attributes of a new MarkerData may be set.
+            if attr_name not in attrs:
+                raise ValueError('Unknown MarkerData attribute: %r' % attr_name)
+            attrs[attr_name] = _decode_value(attr_value)
+        return mkr_data
+    if type_name == 'FileInfo':
+        return fileinfo.FileInfo(*_decode_value(value['items']))
+    if type_name == 'MarkerIndex':
+        return markerdata.MarkerIndex(*_decode_value(value['items']))
+    if type_name == 'tuple':
+        return tuple(_decode_value(v) for v in value['items'])
+    raise ValueError('Unknown parse cache type: %r' % type_name)
+
+
+def _dumps(value):
+    return json.dumps(_encode_value(value), separators=(',', ':'))
+
+
+def _loads(data):
+    return _decode_value(json.loads(data))
+
+
+def _is_private_directory(dir_path):
+    """
+    Is the directory owned by the current user, and cannot be
+    accessed by any other user?
+
+    Windows does not have POSIX owners and permissions, so only
+    the type of the path is checked.
+
+    :rtype: bool
+    """
+    try:
+        dir_stat = os.lstat(dir_path)
+    except OSError:
+        return False
+    if stat.S_ISDIR(dir_stat.st_mode) is False:
+        # Symbolic links are not followed.
+        return False
+    getuid = getattr(os, 'getuid', None)
+    if getuid is None:
+        return True
+    if dir_stat.st_uid != getuid():
+        return False
+    return (stat.S_IMODE(dir_stat.st_mode) & 0o077) == 0
+
+
+class ParseCache(object):
+    """
+    Stores parsed file data in memory and (optionally) on disk.
+
+    The cache may be used from many threads at once.
+    """
+
+    def __init__(self, memory_budget=None, disk_budget=None, directory=None):
+        """
+        :param memory_budget: The maximum number of bytes stored in
+            memory. 0 disables the memory cache.
+        :type memory_budget: int or None
+
+        :param disk_budget: The maximum number of bytes stored on
+            disk. 0 disables the disk cache. None uses
+            'get_default_disk_budget'.
+        :type disk_budget: int or None
+
+        :param directory: The directory to store cache files in.
+        :type directory: str or None
+        """
+        if memory_budget is None:
+            memory_budget = DEFAULT_MEMORY_BUDGET
+        if disk_budget is None:
+            disk_budget = get_default_disk_budget()
+        if directory is None:
+            directory = get_default_directory()
+        self._memory_budget = memory_budget
+        self._disk_budget = disk_budget
+        self._directory = directory
+        self._directory_valid = None
+        self._disk_size = None
+        self._memory = collections.OrderedDict()
+        self._memory_size = 0
+        self._lock = threading.Lock()
+
+    def get_memory_budget(self):
+        return self._memory_budget
+
+    def set_memory_budget(self, value):
+        assert isinstance(value, int)
+        with self._lock:
+            self._memory_budget = value
+            self._evict_memory()
+
+    def get_disk_budget(self):
+        return self._disk_budget
+
+    def set_disk_budget(self, value):
+        assert isinstance(value, int)
+        self._disk_budget = value
+        if self._has_directory() is True:
+            self._evict_disk()
+
+    def get_directory(self):
+        return self._directory
+
+    def get_memory_size(self):
+        """
+        The number of bytes stored in memory.
+
+        :rtype: int
+        """
+        return self._memory_size
+
+    def _get_file_path(self, key):
+        return os.path.join(self._directory, key + CACHE_FILE_EXT)
+
+    def _has_directory(self, create=None):
+        """
+        Can the cache directory be used?
+
+        The directory is checked once, and is created if 'create' is
+        True.
+        """
+        if create is None:
+            create = False
+        if self._directory_valid is not None:
+            return self._directory_valid
+        if os.path.lexists(self._directory) is False:
+            if create is False:
+                return False
+            try:
+                os.makedirs(self._directory, CACHE_DIRECTORY_MODE)
+            except OSError:
+                # Another thread may have created the directory.
+                pass
+        valid = _is_private_directory(self._directory)
+        if valid is False:
+            LOG.warning(
+                'Parse cache directory is not private to the current user, '
+                'the disk cache is disabled: %r',
+                self._directory,
+            )
+        self._directory_valid = valid
+        return valid
+
+    def _list_disk(self):
+        entries = []
+        for file_name in os.listdir(self._directory):
+            if file_name.endswith(CACHE_FILE_EXT) is False:
+                continue
+            path = os.path.join(self._directory, file_name)
+            try:
+                file_stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((file_stat.st_mtime, file_stat.st_size, path))
+        return entries
+
+    def _evict_memory(self):
+        # The lock must be held by the caller.
+        while self._memory and self._memory_size > self._memory_budget:
+            _, data = self._memory.popitem(last=False)
+            self._memory_size -= len(data)
+        return
+
+    def _evict_disk(self):
+        # The directory is only listed when the budget may be
+        # exceeded, not on every write.
+        entries = self._list_disk()
+        total_size = sum(size for _, size, _ in entries)
+
+        # Oldest used first.
+        for _, size, path in sorted(entries):
+            if total_size <= self._disk_budget:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total_size -= size
+        self._disk_size = total_size
+        return
+
+    def _set_memory(self, key, data):
+        if len(data) > self._memory_budget:
+            return
+        with self._lock:
+            old_data = self._memory.pop(key, None)
+            if old_data is not None:
+                self._memory_size -= len(old_data)
+            self._memory[key] = data
+            self._memory_size += len(data)
+            self._evict_memory()
+        return
+
+    def _read_disk(self, key):
+        if self._disk_budget <= 0 or self._has_directory() is False:
+            return None
+        path = self._get_file_path(key)
+        try:
+            with open(path, 'r') as f:
+                data = f.read()
+            # Mark the file as recently used.
+            os.utime(path, None)
+        except (IOError, OSError):
+            data = None
+        return data
+
+    def _write_disk(self, key, data):
+        if len(data) > self._disk_budget:
+            return
+        if self._has_directory(create=True) is False:
+            return
+        if self._disk_size is None:
+            self._evict_disk()
+
+        path = self._get_file_path(key)
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=self._directory)
+            with os.fdopen(fd, 'w') as f:
+                f.write(data)
+            if os.path.isfile(path):
+                os.remove(path)
+            os.rename(tmp_path, path)
+        except (IOError, OSError):
+            LOG.debug('Could not write parse cache file: %r', path)
+            if tmp_path is not None and os.path.isfile(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        self._disk_size += len(data)
+        if self._disk_size > self._disk_budget:
+            self._evict_disk()
+        return
+
+    def get(self, key):
+        """
+        Get the value stored with the key.
+
+        :param key: The key, from 'create_key'.
+        :type key: str
+
+        :returns: A copy of the value, or None if the key is not stored.
+        """
+        if key is None:
+            return None
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                # Mark the entry as recently used.
+                self._memory[key] = self._memory.pop(key)
+
+        from_disk = False
+        if data is None:
+            data = self._read_disk(key)
+            from_disk = data is not None
+        if data is None:
+            return None
+
+        try:
+            value = _loads(data)
+        except (ValueError, TypeError, KeyError):
+            LOG.debug('Could not read parse cache data: %r', key)
+            self.remove(key)
+            return None
+        if from_disk is True:
+            self._set_memory(key, data)
+        return value
+
+    def set(self, key, value):
+        """
+        Store a value with the key.
+
+        :param key: The key, from 'create_key'.
+        :type key: str
+
+        :param value: A value made of FileInfo, MarkerIndex,
+            MarkerData, KeyframeData, lists, tuples and numbers or
+            strings.
+        """
+        if key is None:
+            return
+        try:
+            data = _dumps(value)
+        except (ValueError, TypeError):
+            LOG.debug('Could not store parse cache data: %r', key)
+            return
+        self._set_memory(key, data)
+        if self._disk_budget > 0:
+            self._write_disk(key, data)
+        return
+
+    def remove(self, key):
+        """
+        Remove the value stored with the key.
+
+        :param key: The key, from 'create_key'.
+        :type key: str
+        """
+        with self._lock:
+            data = self._memory.pop(key, None)
+            if data is not None:
+                self._memory_size -= len(data)
+        if self._has_directory() is False:
+            return
+        path = self._get_file_path(key)
+        if os.path.isfile(path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            self._disk_size = None
+        return
+
+    def clear(self, disk=None):
+        """
+        Remove all stored values.
+
+        :param disk: Remove the files on disk too? None means True.
+        :type disk: bool or None
+        """
+        if disk is None:
+            disk = True
+        with self._lock:
+            self._memory.clear()
+            self._memory_size = 0
+        if disk is False or self._has_directory() is False:
+            return
+        for _, _, path in self._list_disk():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self._disk_size = None
+        return
+
+
+def get_parse_cache():
+    global __parse_cache
+    if __parse_cache is None:
+        __parse_cache = ParseCache()
+    return __parse_cache
@@ -0,0 +1,245 @@
+# Copyright (C) 2026 David Cattermole.
+#
+# This file is part of mmSolver.
+#
+# mmSolver is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# mmSolver is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with mmSolver.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""
+Parse marker files, without creating any Maya nodes.
+
+Many files can be parsed at the same time, in a pool of processes,
+with 'read_many'. This module does not use 'maya.cmds', so it can be
+imported by the worker processes.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+import sys
+
+try:
+    import concurrent.futures as futures
+    import concurrent.futures.process as futures_process
+    import multiprocessing
+except ImportError:
+    # Python 2.x
+    futures = None
+
+import mmSolver.logger
+import mmSolver.utils.python_compat as pycompat
+import mmSolver.utils.loadfile.excep as excep
+import mmSolver.utils.loadmarker.formatmanager as fmtmgr
+
+# Used to force importing of formats; do not remove this line.
+import mmSolver.utils.loadmarker.formats
+
+LOG = mmSolver.logger.get_logger()
+
+
+def get_file_format_classes(file_path):
+    """
+    Find the format parsers based on the file extension.
+
+    :param file_path: The file path to find parsers for.
+    :type file_path: str
+
+    :rtype: [LoaderBase, ..]
+    """
+    if isinstance(file_path, pycompat.TEXT_TYPE) is False:
+        msg = 'file path must be a string, got %r'
+        raise TypeError(msg % type(file_path))
+    if os.path.isfile(file_path) is False:
+        msg = 'file path does not exist; %r'
+        raise OSError(msg % file_path)
+
+    file_format_classes = []
+    mgr = fmtmgr.get_format_manager()
+    for fmt in mgr.get_formats():
+        attr = getattr(fmt, 'file_exts', None)
+        if attr is None:
+            continue
+        if not isinstance(fmt.file_exts, list):
+            continue
+        for ext in fmt.file_exts:
+            if file_path.endswith(ext):
+                file_format_classes.append(fmt)
+    if len(file_format_classes) == 0:
+        msg = 'No file formats found for file path: %r'
+        raise RuntimeError(msg % file_path)
+    return file_format_classes
+
+
+def read(file_path, **kwargs):
+    """
+    Parse a file path, using the format parser found from the file
+    extension.
+
+    The keyword 'point_names' ([str, ..] or None) only reads the
+    points with these names.
+
+    :param file_path: The file path to parse.
+    :type file_path: str
+
+    :param kwargs: Keyword arguments given to the format parser.
+
+    :returns: Tuple of FileInfo and list of MarkerData.
+    :rtype: (FileInfo, [MarkerData, ..])
+    """
+    file_format_classes = get_file_format_classes(file_path)
+
+    file_info = None
+    mkr_data_list = []
+    for file_format_class in file_format_classes:
+        file_format_obj = file_format_class()
+        try:
+            contents = file_format_obj.parse(file_path, **kwargs)
+        except (excep.ParserError, OSError):
+            contents = (None, [])
+
+        file_info, mkr_data_list = contents
+        if file_info and (isinstance(mkr_data_list, list) and len(mkr_data_list) > 0):
+            break
+
+    # Formats that do not support the 'point_names' keyword decode
+    # all points.
+    point_names = kwargs.get('point_names')
+    if point_names is not None and isinstance(mkr_data_list, list):
+        point_names = set(point_names)
+        mkr_data_list = [x for x in mkr_data_list if x.get_name() in point_names]
+    return file_info, mkr_data_list
+
+
+def _read_in_process(file_path, kwargs):
+    # Run in a worker process, see 'read_many'.
+    return read(file_path, **kwargs)
+
+
+def get_process_executable():
+    """
+    Get the Python executable used to start worker processes.
+
+    Inside the Maya GUI 'sys.executable' is the Maya executable, so
+    the 'mayapy' executable next to it is used instead.
+
+    :returns: The executable file path, or None if the executable
+        cannot be found.
+    :rtype: str or None
+    """
+    executable = sys.executable
+    name = os.path.basename(executable or '').lower()
+    if name.startswith('python') or name.startswith('mayapy'):
+        return executable
+
+    maya_location = os.environ.get('MAYA_LOCATION')
+    if not maya_location:
+        return None
+    file_name = 'mayapy'
+    if os.name == 'nt':
+        file_name = 'mayapy.exe'
+    executable = os.path.join(maya_location, 'bin', file_name)
+    if os.path.isfile(executable) is False:
+        return None
+    return executable
+
+
+def _create_process_pool(max_workers):
+    executable = get_process_executable()
+    if executable is None:
+        LOG.warning('Could not find a Python executable for reading files.')
+        return None
+    context = multiprocessing.get_context('spawn')
+    if executable != sys.executable:
+        context.set_executable(executable)
+    return futures.ProcessPoolExecutor(max_workers=max_workers, mp_context=context)
+
+
+def read_many(file_paths, max_workers=None, prog_fn=None, status_fn=None, **kwargs):
+    """
+    Parse many file paths at once, in a pool of processes.
+
+    The parsers are pure Python and hold the Global Interpreter Lock,
+    so processes are used rather than threads. Starting the worker
+    processes takes time; use this for many (or large) files.
+
+    The files are parsed one after another in the current process
+    when there are fewer than two files, 'max_workers' is 1, or the
+    process pool cannot be used (for example with Python 2.x).
+
+    :param file_paths: The file paths to parse.
+    :type file_paths: [str, ..]
+
+    :param max_workers: The maximum number of worker processes. None
+        uses the number of CPUs.
+    :type max_workers: int or None
+
+    :param prog_fn: A function called with an 'int' argument, to
+        display progress to the user, each time a file is parsed.
+        Called on the calling thread.
+    :type prog_fn: None or function
+
+    :param status_fn: A function called with an 'str' argument, to
+        display the file that was parsed to the user. Called on the
+        calling thread.
+    :type status_fn: None or function
+
+    :param kwargs: Keyword arguments given to 'read' for every file.
+        The keyword values must be picklable.
+
+    :returns: Tuple of FileInfo and list of MarkerData for each file
+        path, in the same order as 'file_paths'.
+    :rtype: [(FileInfo, [MarkerData, ..]), ..]
+    """
+    assert max_workers is None or max_workers > 0
+    assert prog_fn is None or callable(prog_fn)
+    assert status_fn is None or callable(status_fn)
+    file_paths = list(file_paths)
+    num_files = len(file_paths)
+    results = [None] * num_files
+    done = [0]
+
+    def _file_read(index, result):
+        results[index] = result
+        done[0] += 1
+        if prog_fn is not None:
+            prog_fn(int((done[0] * 100) / num_files))
+        if status_fn is not None:
+            msg = 'Read file %s of %s: %s'
+            status_fn(msg % (done[0], num_files, file_paths[index]))
+        return
+
+    executor = None
+    if futures is not None and num_files > 1 and max_workers != 1:
+        if max_workers is None:
+            max_workers = multiprocessing.cpu_count()
+        max_workers = min(max_workers, num_files)
+        executor = _create_process_pool(max_workers)
+
+    if executor is not None:
+        try:
+            with executor:
+                future_to_index = {}
+                for i, file_path in enumerate(file_paths):
+                    future = executor.submit(_read_in_process, file_path, kwargs)
+                    future_to_index[future] = i
+                for future in futures.as_completed(future_to_index):
+                    _file_read(future_to_index[future], future.result())
+        except (futures_process.BrokenProcessPool, OSError):
+            LOG.warning('Worker processes failed, reading the files in order.')
+
+    for i, file_path in enumerate(file_paths):
+        if results[i] is None:
+            _file_read(i, read(file_path, **kwargs))
+    return results
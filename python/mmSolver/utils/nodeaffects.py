@@ -47,10 +47,10 @@ and attributes.
 - Cameras; transform attributes and focal length will affect all
   markers
 
-.. todo:: Calculating node affect relationships is too slow. We need
-    to find a way of caching the calculation, so that batches of
-    functions that do not change connections can re-use exist
-    computations, leading to greater speed ups, at the cost of memory.
+Calculating node affect relationships is slow, so queries of the
+Maya scene can be cached with an 'AffectsCache'. The same cache
+should be given to all functions called while the connections in the
+scene do not change, such as while compiling a Collection.
 
 """
 
@@ -58,9 +58,13 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import array
+import collections
+
 import maya.cmds
 
 import mmSolver.logger
+import mmSolver.utils.animcurve as anim_utils
 import mmSolver.utils.node as node_utils
 
 
@@ -152,27 +156,163 @@ LENS_ATTRS = set(
 )
 
 
-def _get_full_path_plug(plug):
+class AffectsCache(object):
+    """
+    Stores the results of Maya scene queries used to find the plugs
+    affecting nodes.
+
+    The cache assumes the nodes, attributes and connections in the
+    Maya scene do not change while the cache is used. Call 'clear'
+    after the scene is changed.
+
+    >>> cache = AffectsCache()
+    >>> plugs_a = find_plugs_affecting_transform(node_a, None, cache=cache)
+    >>> plugs_b = find_plugs_affecting_transform(node_b, None, cache=cache)
+    >>> cache.clear()
+
+    """
+
+    def __init__(self):
+        self._values = collections.defaultdict(dict)
+
+    def clear(self):
+        """
+        Remove all cached values.
+        """
+        self._values.clear()
+
+    def get_dict(self, name):
+        """
+        Get the dictionary that stores the values for 'name'.
+
+        :rtype: dict
+        """
+        return self._values[name]
+
+    def _get_value(self, name, key, func):
+        values = self._values[name]
+        try:
+            value = values[key]
+        except KeyError:
+            value = func()
+            values[key] = value
+        return value
+
+    def get_long_name(self, node):
+        """
+        :returns: The full path of the node.
+        :rtype: str
+        """
+        return self._get_value(
+            'long_name', node, lambda: maya.cmds.ls(node, long=True)[0]
+        )
+
+    def get_node_type(self, node):
+        """
+        :rtype: str
+        """
+        return self._get_value('node_type', node, lambda: maya.cmds.nodeType(node))
+
+    def get_inherited_node_types(self, node):
+        """
+        :rtype: [str, ..]
+        """
+        value = self._get_value(
+            'inherited_node_types',
+            node,
+            lambda: tuple(maya.cmds.nodeType(node, inherited=True) or []),
+        )
+        return list(value)
+
+    def get_leaf_attrs(self, node):
+        """
+        :rtype: {str, ..}
+        """
+        value = self._get_value(
+            'leaf_attrs',
+            node,
+            lambda: frozenset(maya.cmds.listAttr(node, leaf=True) or []),
+        )
+        return set(value)
+
+    def get_parent_nodes(self, node):
+        """
+        :returns: The full path of all the parents of the node, from
+            the closest parent to the root.
+        :rtype: [str, ..]
+        """
+
+        def func():
+            parent_nodes = []
+            parents = maya.cmds.listRelatives(node, parent=True, fullPath=True) or []
+            parent_nodes += parents
+            while len(parents) > 0:
+                parents = (
+                    maya.cmds.listRelatives(parents, parent=True, fullPath=True) or []
+                )
+                parent_nodes += parents
+            return tuple(parent_nodes)
+
+        return list(self._get_value('parent_nodes', node, func))
+
+    def get_attr_values(self, node_attr, frames):
+        """
+        Get the values of the attribute at each frame.
+
+        Only the frames not cached are evaluated, in a single pass.
+
+        :param node_attr: Node attribute string in format 'node.attr'.
+        :type node_attr: str
+
+        :param frames: The frames to get values for.
+        :type frames: [int, ..]
+
+        :returns: The value at each frame, in the same order as 'frames'.
+        :rtype: [float, ..]
+        """
+        frame_values = self._values['attr_values'].setdefault(node_attr, dict())
+        new_frames = sorted(set(f for f in frames if f not in frame_values))
+        if len(new_frames) > 0:
+            values = None
+            try:
+                values = anim_utils.evaluate_plug_over_times_apitwo(
+                    node_attr, new_frames
+                )
+            except RuntimeError:
+                # The plug cannot be evaluated as a number.
+                pass
+            if values is None:
+                values = [maya.cmds.getAttr(node_attr, time=f) for f in new_frames]
+            frame_values.update(zip(new_frames, values))
+        return [frame_values[f] for f in frames]
+
+
+def _get_full_path_plug(plug, cache=None):
     """
     Get convert a 'name.attr' string into the long name equal.
 
     :param plug: Name and attribute as a dot-separated string.
     :type plug: str
 
+    :param cache: The cache of Maya scene queries.
+    :type cache: AffectsCache or None
+
     :returns: Long name for the given plug.
     :rtype: str
     """
+    if cache is None:
+        cache = AffectsCache()
     node = plug.partition('.')[0]
     attr = plug.partition('.')[-1]
     # NOTE: We assume the plug exists, so we assume the full path of
     # such a node must exist.
-    node = maya.cmds.ls(node, long=True)[0]
+    node = cache.get_long_name(node)
     full_path = node + '.' + attr
     return str(full_path)
 
 
-def _get_upstream_nodes(node_name):
-    node_types = maya.cmds.nodeType(node_name, inherited=True)
+def _get_upstream_nodes(node_name, cache):
+    node_types = cache.get_inherited_node_types(node_name)
     out_nodes = []
     if 'dagNode' in node_types:
         # DAG upstream
@@ -204,10 +344,21 @@ def _get_upstream_nodes(node_name):
     return out_nodes
 
 
-def _get_connected_nodes(tfm_node):
+def _get_connected_nodes(tfm_node, cache):
+    connected_nodes = cache.get_dict('connected_nodes')
+    if tfm_node in connected_nodes:
+        return list(connected_nodes[tfm_node])
+
+    upstream_nodes = cache.get_dict('upstream_nodes')
+
+    def get_upstream_nodes(node_name):
+        if node_name not in upstream_nodes:
+            upstream_nodes[node_name] = tuple(_get_upstream_nodes(node_name, cache))
+        return list(upstream_nodes[node_name])
+
     all_nodes = []
     node_name = tfm_node
-    out_nodes = _get_upstream_nodes(node_name)
+    out_nodes = get_upstream_nodes(node_name)
     all_nodes += out_nodes
     # TODO: Can we limit this more?
     max_iter_count = 9
@@ -215,14 +366,16 @@ def _get_connected_nodes(tfm_node):
     while len(out_nodes) > 0:
         iter_count += 1
         for node_name in list(out_nodes):
-            out_nodes = _get_upstream_nodes(node_name)
+            out_nodes = get_upstream_nodes(node_name)
             out_nodes = list(set(out_nodes).difference(all_nodes))
             all_nodes += out_nodes
         if iter_count > max_iter_count:
             msg = 'Gathering connected nodes exceeded %r iterations, stopping.'
             LOG.warn(msg, max_iter_count)
             break
-    return sorted(list(set(all_nodes)))
+    all_nodes = sorted(list(set(all_nodes)))
+    connected_nodes[tfm_node] = tuple(all_nodes)
+    return all_nodes
 
 
 def __get_and_fill_cache_value(cache, key, func):
@@ -247,12 +400,12 @@ def __get_and_fill_cache_value(cache, key, func):
     return value
 
 
-def _convert_node_to_plugs(
-    node, attr, node_type, worldspace_cache=None, type_cache=None
-):
+def _convert_node_to_plugs(node, attr, node_type, cache):
     """
     Logic to decide if this attribute will affect the node.
 
+    The plugs for each node attribute are cached.
+
     :returns: Set of plugs that the input node will affect.
     :rtype: {str, ..}
     """
@@ -261,6 +414,19 @@ def _convert_node_to_plugs(
     # 'maya.cmds.attributeQuery' will not work.
     assert '.' not in attr
 
+    node_plugs = cache.get_dict('node_plugs')
+    key = (node, attr)
+    if key not in node_plugs:
+        node_plugs[key] = frozenset(
+            _convert_node_to_plugs_uncached(node, attr, node_type, cache)
+        )
+    return set(node_plugs[key])
+
+
+def _convert_node_to_plugs_uncached(node, attr, node_type, cache):
+    worldspace_cache = cache.get_dict('worldspace')
+    type_cache = cache.get_dict('attr_type')
+
     plugs = set()
     node_type_plug = '{0}.{1}'.format(node_type, attr)
 
@@ -299,11 +465,11 @@ def _convert_node_to_plugs(
     )
     while len(conn_attrs) > 0:
         node_attr = conn_attrs.pop()
-        node_attr = _get_full_path_plug(node_attr)
+        node_attr = _get_full_path_plug(node_attr, cache=cache)
         settable = maya.cmds.getAttr(node_attr, settable=True)
         if settable is True:
             attr = node_attr.rpartition('.')[-1]
-            node_type = maya.cmds.nodeType(node)
+            node_type = cache.get_node_type(node)
             node_type_plug = '{0}.{1}'.format(node_type, attr)
             typ = __get_and_fill_cache_value(
                 type_cache,
@@ -336,17 +502,17 @@ def _convert_node_to_plugs(
                 if len(compound_attrs) > 1:
                     for array_item in compound_attrs:
                         node_attr = node_ + '.' + array_item
-                        node_attr = _get_full_path_plug(node_attr)
+                        node_attr = _get_full_path_plug(node_attr, cache=cache)
                         conn_attrs += [node_attr]
                 else:
-                    node_attr = _get_full_path_plug(node_attr)
+                    node_attr = _get_full_path_plug(node_attr, cache=cache)
                     conn_attrs += [node_attr]
         # Only unique attributes.
         conn_attrs = list(set(conn_attrs))
     return plugs
 
 
-def _check_node_is_enabled_on_frames(node, attrs, frames):
+def _check_node_is_enabled_on_frames(node, attrs, frames, cache=None):
     assert len(node) > 0
     assert isinstance(frames, (set, list))
     assert len(frames) > 0
@@ -365,20 +531,19 @@ def _check_node_is_enabled_on_frames(node, attrs, frames):
         # enabled on all frames.
         return set(frames)
 
-    enabled_frames = set()
-    for frame in sorted(frames):
-        enable = True
-        weight = 1.0
-        if node_attr_enable:
-            # TODO: We may be able to use a cache here, to avoid
-            # calling Maya multiple times for the same value.
-            enable = maya.cmds.getAttr(node_attr_enable, time=frame)
-
-        if node_attr_weight:
-            # TODO: We may be able to use a cache here, to avoid
-            # calling Maya multiple times for the same value.
-            weight = maya.cmds.getAttr(node_attr_weight, time=frame)
+    if cache is None:
+        cache = AffectsCache()
+
+    frames = sorted(frames)
+    enable_values = [True] * len(frames)
+    weight_values = [1.0] * len(frames)
+    if node_attr_enable:
+        enable_values = cache.get_attr_values(node_attr_enable, frames)
+    if node_attr_weight:
+        weight_values = cache.get_attr_values(node_attr_weight, frames)
 
+    enabled_frames = set()
+    for frame, enable, weight in zip(frames, enable_values, weight_values):
         enabled = enable * weight
         if enabled > 0.00001:
             enabled_frames.add(frame)
@@ -386,34 +551,26 @@ def _check_node_is_enabled_on_frames(node, attrs, frames):
     return enabled_frames
 
 
-def _get_attribute_plugs_dict(nodes, frames):
+def _get_attribute_plugs_dict(nodes, frames, cache):
     assert frames is None or len(frames) > 0
 
     node_plugs_dict = dict()
-    worldspace_cache = dict()
-    type_cache = dict()
     for node in nodes:
-        node_type = maya.cmds.nodeType(node)
-
-        attrs = maya.cmds.listAttr(node, leaf=True) or []
-        attrs = set(attrs)
+        node_type = cache.get_node_type(node)
+        attrs = cache.get_leaf_attrs(node)
 
         enabled_frames = set()
         if frames is not None:
-            enabled_frames = _check_node_is_enabled_on_frames(node, attrs, frames)
+            enabled_frames = _check_node_is_enabled_on_frames(
+                node, attrs, frames, cache=cache
+            )
             if len(enabled_frames) == 0:
                 # This node is not valid on any frames given, skip it.
                 continue
 
         node_plugs = set()
         for attr in attrs:
-            node_plugs |= _convert_node_to_plugs(
-                node,
-                attr,
-                node_type,
-                worldspace_cache=worldspace_cache,
-                type_cache=type_cache,
-            )
+            node_plugs |= _convert_node_to_plugs(node, attr, node_type, cache)
 
         if frames is None:
             for node_plug in node_plugs:
@@ -430,7 +587,49 @@ def _get_attribute_plugs_dict(nodes, frames):
     return node_plugs_dict
 
 
-def find_plugs_affecting_bundle(bnd_tfm, mkr_tfm, cam_tfms, frames=None):
+def _get_camera_nodes(cam_tfm, cache):
+    """
+    Get the camera transform, shape and lens nodes of the camera.
+
+    :rtype: {str, ..}
+    """
+    camera_nodes = cache.get_dict('camera_nodes')
+    if cam_tfm in camera_nodes:
+        return set(camera_nodes[cam_tfm])
+
+    nodes = set()
+    assert maya.cmds.objExists(cam_tfm) is True
+    cam_tfm_node = cache.get_long_name(cam_tfm)
+    cam_shp_node = maya.cmds.listRelatives(cam_tfm, shapes=True, fullPath=True)[0]
+    if cam_tfm_node not in nodes:
+        nodes.add(cam_tfm_node)
+    if cam_shp_node not in nodes:
+        nodes.add(cam_shp_node)
+
+    # Find all lens nodes.
+    if node_utils.attribute_exists('inLens', cam_shp_node):
+        lens_in_attr = cam_shp_node + '.inLens'
+        conn_nodes = maya.cmds.listConnections(lens_in_attr) or []
+        conn_nodes = [
+            x for x in conn_nodes if cache.get_node_type(x).startswith('mmLensModel')
+        ]
+        while len(conn_nodes) > 0:
+            lens_node = conn_nodes.pop()
+            lens_in_attr = lens_node + '.inLens'
+            if node_utils.attribute_exists('inLens', lens_node):
+                tmp_nodes = maya.cmds.listConnections(lens_in_attr) or []
+                conn_nodes += [
+                    x
+                    for x in tmp_nodes
+                    if cache.get_node_type(x).startswith('mmLensModel')
+                ]
+            nodes.add(lens_node)
+
+    camera_nodes[cam_tfm] = frozenset(nodes)
+    return nodes
+
+
+def find_plugs_affecting_bundle(bnd_tfm, mkr_tfm, cam_tfms, frames=None, cache=None):
     """
     Find plugs that affect the world-matrix transform of the
     bundle transform node for the given frames.
@@ -451,11 +650,17 @@ def find_plugs_affecting_bundle(bnd_tfm, mkr_tfm, cam_tfms, frames=None):
     :param frames: Sequence of frame numbers (optional).
     :type frames: [int, ..] or None
 
+    :param cache: The cache of Maya scene queries, shared between
+        calls. If None, a cache is created for this call only.
+    :type cache: AffectsCache or None
+
     :returns:
         An unordered list of Maya attributes in 'node.attr' string
         format.
     :rtype: [str, ..]
     """
+    if cache is None:
+        cache = AffectsCache()
     # TODO: Support multiple camera transforms passed to this
     # function.
     assert cam_tfms is None
@@ -466,19 +671,21 @@ def find_plugs_affecting_bundle(bnd_tfm, mkr_tfm, cam_tfms, frames=None):
         mkr_enabled_frames = []
 
     if frames is not None and mkr_tfm is not None:
-        mkr_tfm = maya.cmds.ls(mkr_tfm, long=True)[0]
-        attrs = maya.cmds.listAttr(mkr_tfm, leaf=True) or []
+        mkr_tfm = cache.get_long_name(mkr_tfm)
+        attrs = cache.get_leaf_attrs(mkr_tfm)
         mkr_enabled_frames = _check_node_is_enabled_on_frames(
-            mkr_tfm, set(attrs), frames
+            mkr_tfm, attrs, frames, cache=cache
         )
     if len(mkr_enabled_frames) == 0:
         return []
 
-    bnd_tfm = maya.cmds.ls(bnd_tfm, long=True)[0]
-    return find_plugs_affecting_transform(bnd_tfm, cam_tfms, frames=mkr_enabled_frames)
+    bnd_tfm = cache.get_long_name(bnd_tfm)
+    return find_plugs_affecting_transform(
+        bnd_tfm, cam_tfms, frames=mkr_enabled_frames, cache=cache
+    )
 
 
-def find_plugs_affected_by_marker(mkr_tfm, cam_tfm, frames=None):
+def find_plugs_affected_by_marker(mkr_tfm, cam_tfm, frames=None, cache=None):
     """
     Find plugs that are affected by the given marker transform
     node for the given frames.
@@ -495,31 +702,39 @@ def find_plugs_affected_by_marker(mkr_tfm, cam_tfm, frames=None):
     :param frames: Sequence of frame numbers (optional).
     :type frames: [int, ..] or None
 
+    :param cache: The cache of Maya scene queries, shared between
+        calls. If None, a cache is created for this call only.
+    :type cache: AffectsCache or None
+
     :returns:
         An unordered list of Maya attributes in 'node.attr' string
         format.
     :rtype: [str, ..]
     """
+    if cache is None:
+        cache = AffectsCache()
     assert frames is None or len(frames) > 0
 
     mkr_enabled_frames = frames
     if frames is None:
         mkr_enabled_frames = []
 
-    mkr_tfm = maya.cmds.ls(mkr_tfm, long=True)[0]
+    mkr_tfm = cache.get_long_name(mkr_tfm)
     if frames is not None:
-        attrs = maya.cmds.listAttr(mkr_tfm, leaf=True) or []
+        attrs = cache.get_leaf_attrs(mkr_tfm)
         mkr_enabled_frames = _check_node_is_enabled_on_frames(
-            mkr_tfm, set(attrs), frames
+            mkr_tfm, attrs, frames, cache=cache
         )
     if len(mkr_enabled_frames) == 0:
         return []
 
-    cam_tfm = maya.cmds.ls(cam_tfm, long=True)[0]
-    return find_plugs_affecting_transform(mkr_tfm, cam_tfm, frames=mkr_enabled_frames)
+    cam_tfm = cache.get_long_name(cam_tfm)
+    return find_plugs_affecting_transform(
+        mkr_tfm, cam_tfm, frames=mkr_enabled_frames, cache=cache
+    )
 
 
-def find_plugs_affecting_transform(tfm_node, cam_tfm, frames=None):
+def find_plugs_affecting_transform(tfm_node, cam_tfm, frames=None, cache=None):
     """
     Find plugs that affect the world-matrix transform of the node
     for the given frames.
@@ -536,65 +751,48 @@ def find_plugs_affecting_transform(tfm_node, cam_tfm, frames=None):
     :param frames: Sequence of frame numbers (optional).
     :type frames: [int, ..] or None
 
+    :param cache: The cache of Maya scene queries, shared between
+        calls. If None, a cache is created for this call only.
+    :type cache: AffectsCache or None
+
     :returns:
         An unordered list of Maya attributes in 'node.attr' string
         format.
     :rtype: [str, ..]
     """
-    tfm_node = maya.cmds.ls(tfm_node, long=True)[0]
+    if cache is None:
+        cache = AffectsCache()
+    tfm_node = cache.get_long_name(tfm_node)
     assert frames is None or len(frames) > 0
 
+    transform_plugs = cache.get_dict('transform_plugs')
+    key = (tfm_node, cam_tfm)
+    if frames is None and key in transform_plugs:
+        return list(transform_plugs[key])
+
     # Get camera related to the given transform.
     #
     # TODO: Can we get a list of camera transform nodes as input?
     camera_nodes = set()
     if cam_tfm is not None:
-        assert maya.cmds.objExists(cam_tfm) is True
-        cam_tfm_node = maya.cmds.ls(cam_tfm, long=True)[0]
-        cam_shp_node = maya.cmds.listRelatives(cam_tfm, shapes=True, fullPath=True)[0]
-        if cam_tfm_node not in camera_nodes:
-            camera_nodes.add(cam_tfm_node)
-        if cam_shp_node not in camera_nodes:
-            camera_nodes.add(cam_shp_node)
-
-        # Find all lens nodes.
-        if node_utils.attribute_exists('inLens', cam_shp_node):
-            lens_in_attr = cam_shp_node + '.inLens'
-            conn_nodes = maya.cmds.listConnections(lens_in_attr) or []
-            conn_nodes = [
-                x for x in conn_nodes if maya.cmds.nodeType(x).startswith('mmLensModel')
-            ]
-            while len(conn_nodes) > 0:
-                lens_node = conn_nodes.pop()
-                lens_in_attr = lens_node + '.inLens'
-                if node_utils.attribute_exists('inLens', lens_node):
-                    tmp_nodes = maya.cmds.listConnections(lens_in_attr) or []
-                    conn_nodes += [
-                        x
-                        for x in tmp_nodes
-                        if maya.cmds.nodeType(x).startswith('mmLensModel')
-                    ]
-                camera_nodes.add(lens_node)
+        camera_nodes = _get_camera_nodes(cam_tfm, cache)
 
     # Get all the parents above the nodes.
     parent_nodes = []
     get_parent_nodes = list(sorted(camera_nodes)) + [tfm_node]
     for node in get_parent_nodes:
-        parents = maya.cmds.listRelatives(node, parent=True, fullPath=True) or []
-        parent_nodes += parents
-        while len(parents) > 0:
-            parents = maya.cmds.listRelatives(parents, parent=True, fullPath=True) or []
-            parent_nodes += parents
+        parent_nodes += cache.get_parent_nodes(node)
     nodes = [tfm_node] + list(sorted(camera_nodes)) + parent_nodes
 
     conn_nodes = set()
     for node in list(nodes):
-        conn_nodes |= set(_get_connected_nodes(node))
+        conn_nodes |= set(_get_connected_nodes(node, cache))
     nodes = nodes + list(sorted(conn_nodes))
 
-    plugs_dict = _get_attribute_plugs_dict(nodes, frames)
+    plugs_dict = _get_attribute_plugs_dict(nodes, frames, cache)
     if frames is None:
         plugs = list(sorted(plugs_dict.keys()))  # Only unique plugs.
+        transform_plugs[key] = tuple(plugs)
     else:
         plugs = []
         for plug_name in plugs_dict.keys():
@@ -609,7 +807,154 @@ def find_plugs_affecting_transform(tfm_node, cam_tfm, frames=None):
     return plugs
 
 
-def find_marker_attr_mapping_raw(mkr_list, attr_list):
+class MarkerAttrMapping(object):
+    """
+    A sparse mapping of Markers to the Attributes that affect them.
+
+    The mapping is stored in Compressed Sparse Row (CSR) format; the
+    indices of the Attributes affecting Marker 'i' are stored in
+    'indices[indptr[i]:indptr[i + 1]]', sorted in increasing order.
+
+    >>> mapping = MarkerAttrMapping.from_rows(3, [[0, 2], [], [1]])
+    >>> mapping.get_attr_indices(0)
+    [0, 2]
+    >>> mapping.is_affected(2, 1)
+    True
+    >>> mapping.to_dense()
+    [[True, False, True], [False, False, False], [False, True, False]]
+
+    """
+
+    def __init__(self, num_attrs, indptr, indices):
+        """
+        :param num_attrs: The number of Attributes (columns).
+        :type num_attrs: int
+
+        :param indptr: The offset into 'indices' for each Marker,
+            with one more value than the number of Markers.
+        :type indptr: array.array
+
+        :param indices: The Attribute indices of each Marker.
+        :type indices: array.array
+        """
+        assert len(indptr) > 0
+        self._num_attrs = num_attrs
+        self._indptr = indptr
+        self._indices = indices
+
+    @classmethod
+    def from_rows(cls, num_attrs, rows):
+        """
+        Create a mapping from the Attribute indices of each Marker.
+
+        :param num_attrs: The number of Attributes (columns).
+        :type num_attrs: int
+
+        :param rows: The Attribute indices affecting each Marker.
+        :type rows: [[int, ..], ..]
+
+        :rtype: MarkerAttrMapping
+        """
+        indptr = array.array('i', [0])
+        indices = array.array('i')
+        for row in rows:
+            indices.extend(sorted(set(row)))
+            indptr.append(len(indices))
+        return cls(num_attrs, indptr, indices)
+
+    def get_num_markers(self):
+        return len(self._indptr) - 1
+
+    def get_num_attrs(self):
+        return self._num_attrs
+
+    def get_indptr(self):
+        return self._indptr
+
+    def get_indices(self):
+        return self._indices
+
+    def get_attr_indices(self, mkr_index):
+        """
+        The indices of Attributes affecting the Marker.
+
+        :rtype: [int, ..]
+        """
+        start = self._indptr[mkr_index]
+        end = self._indptr[mkr_index + 1]
+        return self._indices[start:end].tolist()
+
+    def is_affected(self, mkr_index, attr_index):
+        """
+        Is the Marker affected by the Attribute?
+
+        :rtype: bool
+        """
+        return attr_index in self.get_attr_indices(mkr_index)
+
+    def to_dense(self):
+        """
+        Convert to a dense matrix of size 'markers x attrs'.
+
+        :rtype: [[bool, .. ]]
+        """
+        mapping = []
+        for i in range(self.get_num_markers()):
+            row = [False] * self._num_attrs
+            for j in self.get_attr_indices(i):
+                row[j] = True
+            mapping.append(row)
+        return mapping
+
+
+def find_marker_attr_mapping_raw_sparse(mkr_list, attr_list, cache=None):
+    """
+    Get a mapping of markers to attributes, as a sparse matrix.
+
+    Markers sharing the same bundle node are only evaluated once.
+
+    :param mkr_list: Tuple of marker node, bundle node and camera
+                     shape node in a list; each list of nodes
+                     represent a single Marker relationship and will
+                     be considered in mapping.
+    :type mkr_list: [(str, str, str), ..]
+
+    :param attr_list: Maya attributes to consider in mapping, in the
+                      familiar 'node.attr' string representation.
+    :type attr_list: [str, ..]
+
+    :param cache: The cache of Maya scene queries, shared between
+        calls. If None, a cache is created for this call only.
+    :type cache: AffectsCache or None
+
+    :returns: Sparse matrix of size 'markers x attrs', based on the
+              index of the mkr_cam_node_frm_list and attr_list given.
+    :rtype: MarkerAttrMapping
+    """
+    if cache is None:
+        cache = AffectsCache()
+
+    attr_indices = collections.defaultdict(list)
+    for j, attr_name in enumerate(attr_list):
+        attr_name = _get_full_path_plug(attr_name, cache=cache)
+        attr_indices[attr_name].append(j)
+
+    bnd_rows = dict()
+    rows = []
+    for mkr in mkr_list:
+        bnd_node = mkr[2]
+        row = bnd_rows.get(bnd_node)
+        if row is None:
+            bnd_plugs = find_plugs_affecting_transform(bnd_node, None, cache=cache)
+            row = []
+            for plug in set(bnd_plugs):
+                row += attr_indices.get(plug, [])
+            bnd_rows[bnd_node] = row
+        rows.append(row)
+    return MarkerAttrMapping.from_rows(len(attr_list), rows)
+
+
+def find_marker_attr_mapping_raw(mkr_list, attr_list, cache=None):
     """
     Get a mapping of markers to attributes, as a matrix.
 
@@ -623,34 +968,145 @@ def find_marker_attr_mapping_raw(mkr_list, attr_list):
                       familiar 'node.attr' string representation.
     :type attr_list: [str, ..]
 
+    :param cache: The cache of Maya scene queries, shared between
+        calls. If None, a cache is created for this call only.
+    :type cache: AffectsCache or None
+
     :returns: Boolean matrix of size 'markers x attrs'. Matrix index
               is 'mapping[marker_index][attr_index]', based on the
               index of the mkr_cam_node_frm_list and attr_list given.
     :rtype: [[bool, .. ]]
     """
-    mapping = []
-    for i, mkr in enumerate(mkr_list):
-        # Initialise mapping list size.
-        tmp = [False] * len(attr_list)
-        mapping.append(tmp)
+    mapping = find_marker_attr_mapping_raw_sparse(mkr_list, attr_list, cache=cache)
+    return mapping.to_dense()
 
-        bnd_node = mkr[2]
-        mkr_plugs = []
-        bnd_plugs = find_plugs_affecting_transform(bnd_node, None)
-        plugs = list(set(mkr_plugs + bnd_plugs))
-        for j, attr_name in enumerate(attr_list):
-            attr_name = _get_full_path_plug(attr_name)
-            mapping[i][j] = attr_name in plugs
-    return mapping
 
+def _get_node_depth(node, cache):
+    """
+    The number of parents above the node in the DAG hierarchy.
 
-def sort_into_hierarchy_groups(mkr_list, attr_list):
+    :returns: The depth of the node, or None if the node is not a DAG
+        node.
+    :rtype: int or None
+    """
+    node = cache.get_long_name(node)
+    if '|' not in node:
+        return None
+    return node.count('|') - 1
+
+
+def _partition_mapping(mapping):
+    """
+    Split a marker to attribute mapping into connected blocks.
+
+    A marker and an attribute are connected when the marker is
+    affected by the attribute, and blocks share no markers or
+    attributes with each other.
+
+    :param mapping: Sparse matrix of size 'markers x attrs'.
+    :type mapping: MarkerAttrMapping
+
+    :returns: List of marker indices and attribute indices for each
+        block. Markers or attributes not connected to anything are
+        not included in a block.
+    :rtype: [([int, ..], [int, ..]), ..]
+    """
+    num_mkrs = mapping.get_num_markers()
+    num_attrs = mapping.get_num_attrs()
+    # Union-find, markers are index 'i' and attributes are index
+    # 'num_mkrs + j'.
+    parents = list(range(num_mkrs + num_attrs))
+
+    def find(index):
+        root = index
+        while parents[root] != root:
+            root = parents[root]
+        while parents[index] != root:
+            parents[index], index = root, parents[index]
+        return root
+
+    used = [False] * (num_mkrs + num_attrs)
+    for i in range(num_mkrs):
+        for j in mapping.get_attr_indices(i):
+            index = num_mkrs + j
+            used[i] = True
+            used[index] = True
+            root_a = find(i)
+            root_b = find(index)
+            if root_a != root_b:
+                parents[root_b] = root_a
+
+    blocks = collections.OrderedDict()
+    for index in range(num_mkrs + num_attrs):
+        if used[index] is False:
+            continue
+        mkr_indices, attr_indices = blocks.setdefault(find(index), ([], []))
+        if index < num_mkrs:
+            mkr_indices.append(index)
+        else:
+            attr_indices.append(index - num_mkrs)
+    return list(blocks.values())
+
+
+def sort_into_hierarchy_groups(mkr_list, attr_list, mapping=None, cache=None):
     """
     Create blocks of Markers and Attributes, sorted by hierarchy.
 
-    This will allow us to solve top-level objects (ie, root level)
-    first, before solving children. This will ensure we minimise the
-    base before attempting to solve the children.
+    Each block contains Markers and Attributes that affect each
+    other, and no Marker or Attribute is in more than one block, so
+    each block can be solved as an independent (smaller) problem.
+
+    The blocks are sorted by the DAG depth of the Attribute nodes,
+    so top-level objects (ie, root level) are first, before
+    children. Blocks with only DG (non-DAG) Attribute nodes are
+    last.
+
+    :param mkr_list: Tuple of marker node, bundle node and camera
+                     shape node in a list; each list of nodes
+                     represent a single Marker relationship and will
+                     be considered in mapping.
+    :type mkr_list: [(str, str, str), ..]
+
+    :param attr_list: Maya attributes to consider in mapping, in the
+                      familiar 'node.attr' string representation.
+    :type attr_list: [str, ..]
+
+    :param mapping: The marker to attribute mapping, as returned by
+        'find_marker_attr_mapping_raw_sparse'. If None, the mapping
+        is computed.
+    :type mapping: MarkerAttrMapping or None
+
+    :param cache: The cache of Maya scene queries, shared between
+        calls. If None, a cache is created for this call only.
+    :type cache: AffectsCache or None
+
+    :returns: List of marker indices and attribute indices for each
+        block, based on the index of the mkr_list and attr_list
+        given. Markers or Attributes that do not affect anything
+        are not included in a block.
+    :rtype: [([int, ..], [int, ..]), ..]
     """
-    # TODO: Write this.
-    raise NotImplementedError
+    if cache is None:
+        cache = AffectsCache()
+    if mapping is None:
+        mapping = find_marker_attr_mapping_raw_sparse(mkr_list, attr_list, cache=cache)
+    assert mapping.get_num_markers() == len(mkr_list)
+    assert mapping.get_num_attrs() == len(attr_list)
+
+    blocks = _partition_mapping(mapping)
+
+    attr_depths = dict()
+    for _, attr_indices in blocks:
+        for j in attr_indices:
+            node = attr_list[j].partition('.')[0]
+            attr_depths[j] = _get_node_depth(node, cache)
+
+    def sort_key(block):
+        attr_indices = block[1]
+        depths = [attr_depths[j] for j in attr_indices]
+        depths = [d for d in depths if d is not None]
+        if len(depths) == 0:
+            return True, 0, attr_indices[0]
+        return False, min(depths), attr_indices[0]
+
+    return sorted(blocks, key=sort_key)
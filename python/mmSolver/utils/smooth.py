@@ -28,6 +28,10 @@ Smoothing functions supported:
 - Gaussian (blur smoothing)
 - Fourier (frequency smoothing)
 
+Many curves (of the same length) can be smoothed at once with
+:func:`smooth_batch`, which processes a 2D (curves x values) array in
+a single vectorised pass when numpy is available.
+
 Example usage::
 
   import mmSolver.utils.smooth as smooth
@@ -36,6 +40,10 @@ Example usage::
   width = 2.0
   new_data = smooth.smooth(const.SMOOTH_TYPE_AVERAGE, data, width)
 
+  # Smooth many curves at once.
+  curves = [data, [0.0, 1.0, 0.0, 1.0, 0.0]]
+  new_curves = smooth.smooth_batch(const.SMOOTH_TYPE_GAUSSIAN, curves, width)
+
 """
 
 from __future__ import absolute_import
@@ -96,13 +104,72 @@ def smooth(smooth_type, value_array, width):
     return new_array
 
 
-def average_smooth(value_array, width):
+def smooth_batch(smooth_type, value_arrays, width, filtr=None):
     """
-    Average Smooth Function
+    Smooth many curves at once, of any smooth type.
+
+    All curves must have the same number of values. When numpy is
+    available all curves are smoothed in a single vectorised pass,
+    otherwise each curve is smoothed one at a time with the standard
+    python functions.
+
+    :param smooth_type: Type of smoothing operation.
+    :type smooth_type: SMOOTH_TYPE_*
+
+    :param value_arrays: Input data to smooth, as a 2D array; one row
+                         per curve.
+    :type value_arrays: [[float, ..], ..] or numpy.ndarray
+
+    :param width: The width to smooth over. Values above 1.0 will
+                  perform smoothing. 1.0 or below has no effect.
+    :type width: float
+
+    :param filtr: Type of frequency-space smoothing filter, 'gaussian',
+                  'triangle' or 'box'. Default filter is
+                  'gaussian'. Only used by SMOOTH_TYPE_FOURIER.
+    :type filtr: str
+
+    :returns: Smoothed copy of 'value_arrays', using the 'smooth_type'
+              given. A 2D numpy.ndarray is returned when numpy is
+              available, otherwise a list of lists.
+    :rtype: numpy.ndarray or [[float, ..], ..]
+    """
+    if smooth_type not in const.SMOOTH_TYPES:
+        msg = 'smoothType argument is invalid, ' 'must be SMOOTH_TYPE_* attribute'
+        raise ValueError(msg)
 
-    .. note::
+    if np is None:
+        new_arrays = []
+        for value_array in value_arrays:
+            value_array = list(value_array)
+            if smooth_type == const.SMOOTH_TYPE_AVERAGE:
+                new_array = _average_smooth_raw(value_array, width)
+            elif smooth_type == const.SMOOTH_TYPE_GAUSSIAN:
+                new_array = _gaussian_smooth_raw(value_array, width)
+            else:
+                new_array = _fourier_smooth_raw(value_array, width, filtr=filtr)
+            new_arrays.append(list(new_array))
+        return new_arrays
+
+    data = np.array(value_arrays, dtype=np.float64, ndmin=2)
+    if data.ndim != 2:
+        msg = 'value_arrays must be a 2D array; ndim={0}'
+        raise ValueError(msg.format(data.ndim))
+
+    if smooth_type == const.SMOOTH_TYPE_AVERAGE:
+        new_data = _average_smooth_numpy(data, width)
+    elif smooth_type == const.SMOOTH_TYPE_GAUSSIAN:
+        new_data = _gaussian_smooth_numpy(data, width)
+    else:
+        new_data = _fourier_smooth_numpy(data, width, filtr=filtr)
+    return new_data
 
-        Uses standard python functions only.
+
+def _average_smooth_raw(value_array, width):
+    """
+    Average Smooth Function
+
+    Uses standard python functions only.
 
     :param value_array: Input data to smooth.
     :type value_array: [float, ..]
@@ -122,7 +189,6 @@ def average_smooth(value_array, width):
     value_num = len(value_array)
     sum_avg = 0.0
     new_array = [0.0] * value_num
-    weights = [1.0] * value_num
     for i in range(value_num):
 
         # Get Average
@@ -136,16 +202,72 @@ def average_smooth(value_array, width):
             sum_avg = sum_avg + value_array[j]
         sum_avg = sum_avg / (end - start)
 
-        for k in range(value_num):
-            new_array[i] = (sum_avg * weights[i]) + (
-                value_array[i] * (1.0 - weights[i])
-            )
+        new_array[i] = sum_avg
         sum_avg = 0
 
     assert len(value_array) == len(new_array)
     return new_array
 
 
+def _average_smooth_numpy(data, width):
+    """
+    Average Smooth Function.
+
+    Uses the numpy module; every row of 'data' is smoothed at once,
+    using a cumulative sum to compute each window in constant time.
+
+    :param data: Input data to smooth, one curve per row.
+    :type data: numpy.ndarray
+
+    :param width: The width to smooth over. Values above 1.0 will
+                  perform smoothing. 1.0 or below has no effect.
+    :type width: float
+
+    :returns: Smoothed copy of 'data'.
+    :rtype: numpy.ndarray
+    """
+    assert np is not None
+    sigma_val = width - 1.0
+    if sigma_val <= 0.0:
+        return data
+
+    value_num = data.shape[-1]
+    index = np.arange(value_num, dtype=np.float64)
+    # Casting to int truncates towards zero, to match the 'int()'
+    # used in the pure python function.
+    start = np.clip((index - sigma_val).astype(np.int64), 0, value_num)
+    end = np.clip((index + sigma_val).astype(np.int64) + 1, 0, value_num)
+
+    cumulative = np.zeros(data.shape[:-1] + (value_num + 1,), dtype=np.float64)
+    np.cumsum(data, axis=-1, out=cumulative[..., 1:])
+    new_data = (cumulative[..., end] - cumulative[..., start]) / (end - start)
+    return new_data
+
+
+def average_smooth(value_array, width):
+    """
+    Average Smooth Function
+
+    :param value_array: Input data to smooth.
+    :type value_array: [float, ..]
+
+    :param width: The width to smooth over. Values above 1.0 will
+                  perform smoothing. 1.0 or below has no effect.
+    :type width: float
+
+    :returns: Smoothed copy of 'value_array'.
+    :rtype: [float, ..]
+    """
+    if np is not None:
+        sigma_val = width - 1.0
+        if sigma_val <= 0.0:
+            return value_array
+        data = np.array(value_array, dtype=np.float64)
+        return _average_smooth_numpy(data, width).tolist()
+    else:
+        return _average_smooth_raw(value_array, width)
+
+
 def _gaussian(sigma, x, mean):
     """
     Gaussian Distribution Function
@@ -164,13 +286,32 @@ def _gaussian(sigma, x, mean):
     return math.exp(-(math.pow((x - mean), 2) / (2 * (math.pow(sigma, 2)))))
 
 
-def gaussian_smooth(value_array, width):
+def _gaussian_kernel_radius(sigma, value_num):
     """
-    Gaussian Smooth Function.
+    The number of values either side of the kernel center that have a
+    meaningful Gaussian weight.
+
+    Beyond 10 sigma the weight is below 1e-21 of the center weight,
+    which is far below the precision of a double, so those values do
+    not change the smoothed result.
 
-    .. note::
+    :param sigma: Sigma value (the width)
+    :type sigma: float
+
+    :param value_num: Number of values to be smoothed.
+    :type value_num: int
+
+    :rtype: int
+    """
+    radius = int(math.ceil(sigma * 10.0))
+    return max(0, min(radius, value_num - 1))
 
-        Uses standard python functions only.
+
+def _gaussian_smooth_raw(value_array, width):
+    """
+    Gaussian Smooth Function.
+
+    Uses standard python functions only.
 
     :param value_array: Input data to smooth.
     :type value_array: [float, ..]
@@ -187,27 +328,91 @@ def gaussian_smooth(value_array, width):
         return value_array
 
     value_num = len(value_array)
+    radius = _gaussian_kernel_radius(sigma_val, value_num)
+    kernel = [_gaussian(sigma_val, i, 0) for i in range(radius + 1)]
 
     # Smooth Function
-    sum_gaussian = 0.0
-    tmp_gaussian = [None] * value_num
     new_array = [0.0] * value_num
     for i in range(value_num):
+        start = max(0, i - radius)
+        end = min(value_num, i + radius + 1)
 
-        for j in range(value_num):
-            tmp_gaussian[j] = _gaussian(sigma_val, i, j)
-            sum_gaussian = sum_gaussian + tmp_gaussian[j]
-        for k in range(value_num):
-            new_array[i] = new_array[i] + (
-                value_array[k] * (tmp_gaussian[k] / sum_gaussian)
-            )
-
-        sum_gaussian = 0
+        sum_gaussian = 0.0
+        sum_value = 0.0
+        for j in range(start, end):
+            weight = kernel[abs(i - j)]
+            sum_gaussian = sum_gaussian + weight
+            sum_value = sum_value + (value_array[j] * weight)
+        new_array[i] = sum_value / sum_gaussian
 
     assert len(value_array) == len(new_array)
     return new_array
 
 
+def _gaussian_smooth_numpy(data, width):
+    """
+    Gaussian Smooth Function.
+
+    Uses the numpy module; every row of 'data' is smoothed at once.
+
+    :param data: Input data to smooth, one curve per row.
+    :type data: numpy.ndarray
+
+    :param width: The width to smooth over. Values above 1.0 will perform
+                  smoothing. 1.0 or below has no effect.
+    :type width: float
+
+    :returns: Smoothed copy of 'data'.
+    :rtype: numpy.ndarray
+    """
+    assert np is not None
+    sigma_val = (width - 1.0) * 0.5
+    if sigma_val <= 0.0:
+        return data
+
+    value_num = data.shape[-1]
+    radius = _gaussian_kernel_radius(sigma_val, value_num)
+    offsets = np.arange(radius + 1, dtype=np.float64)
+    kernel = np.exp(-(offsets * offsets) / (2.0 * sigma_val * sigma_val))
+
+    # Accumulate each kernel offset over all rows at once. The sum of
+    # weights is the same for every row, and only varies near the
+    # edges of the data where the kernel is truncated.
+    sum_value = data * kernel[0]
+    sum_gaussian = np.full(value_num, kernel[0])
+    for offset in range(1, radius + 1):
+        weight = kernel[offset]
+        sum_value[..., offset:] += data[..., :-offset] * weight
+        sum_value[..., :-offset] += data[..., offset:] * weight
+        sum_gaussian[offset:] += weight
+        sum_gaussian[:-offset] += weight
+    return sum_value / sum_gaussian
+
+
+def gaussian_smooth(value_array, width):
+    """
+    Gaussian Smooth Function.
+
+    :param value_array: Input data to smooth.
+    :type value_array: [float, ..]
+
+    :param width: The width to smooth over. Values above 1.0 will perform
+                  smoothing. 1.0 or below has no effect.
+    :type width: float
+
+    :returns: Smoothed copy of 'value_array'.
+    :rtype: [float, ..]
+    """
+    if np is not None:
+        sigma_val = (width - 1.0) * 0.5
+        if sigma_val <= 0.0:
+            return value_array
+        data = np.array(value_array, dtype=np.float64)
+        return _gaussian_smooth_numpy(data, width).tolist()
+    else:
+        return _gaussian_smooth_raw(value_array, width)
+
+
 def _generate_window_raw(n, filtr=None):
     """
     Create a "window" array used for convolving.
@@ -322,10 +527,6 @@ def _fourier_smooth_raw(data, width, filtr=None):
     # 3 = 5
     n = ((int(width) - 1) * 2) + 1  # number of 'frames' to smooth by.
 
-    # Convert to frequency space.
-    x = fft.transform(data, inverse=False)
-    assert len(x) == len(data)
-
     # Generate Smoothing Window
     window = _generate_window_raw(n, filtr=filtr)
 
@@ -395,14 +596,45 @@ def _generate_window_numpy(n, filtr=None):
     return window
 
 
+def _convolve_valid_numpy(data, window):
+    """
+    Convolve every row of 'data' by 'window', with 'valid' mode.
+
+    Equivalent to calling ``numpy.convolve(row, window, mode='valid')``
+    for each row, but all rows are computed at once.
+
+    :param data: Input signals, one per row.
+    :type data: numpy.ndarray
+
+    :param window: The window to be multiplied over each row of 'data'.
+    :type window: numpy.ndarray
+
+    :returns: Convolved rows of 'data'.
+    :rtype: numpy.ndarray
+    """
+    assert np is not None
+    n = len(window)
+    length = data.shape[-1] - n + 1
+    if length < 1:
+        rows = [np.convolve(row, window, mode='valid') for row in data]
+        return np.array(rows)
+
+    # Convolution reverses the window.
+    result = np.zeros(data.shape[:-1] + (length,), dtype=np.float64)
+    for i, weight in enumerate(window[::-1]):
+        result += data[..., i : i + length] * weight
+    return result
+
+
 def _fourier_smooth_numpy(data, width, filtr=None):
     """
     Fourier smooth function.
 
-    Uses the numpy module.
+    Uses the numpy module. If 'data' is a 2D array, every row is
+    smoothed at once.
 
     :param data: Input data to smooth.
-    :type data: [float, ..]
+    :type data: [float, ..] or numpy.ndarray
 
     :param width: The width to smooth over. Values above 1.0 will perform
                   smoothing. 1.0 or below has no effect.
@@ -426,25 +658,28 @@ def _fourier_smooth_numpy(data, width, filtr=None):
     # 3 = 5
     n = ((int(width) - 1) * 2) + 1  # number of 'frames' to smooth by.
 
-    # Convert to frequency space.
-    data = np.array(data)
-    x = np.fft.fft(data)
-    assert len(x) == len(data)
+    data = np.array(data, dtype=np.float64)
 
     # Generate Smoothing Window
     window = _generate_window_numpy(n, filtr=filtr)
 
-    # NumPy Convolve (with 'valid' mode)
-    s = np.r_[data[n - 1 : 0 : -1], data, data[-2 : -n - 1 : -1]]
-    x = np.convolve(s, window, mode='valid')
+    # Reflect the data at both ends, then convolve (with 'valid' mode).
+    if data.ndim == 1:
+        s = np.r_[data[n - 1 : 0 : -1], data, data[-2 : -n - 1 : -1]]
+        x = np.convolve(s, window, mode='valid')
+    else:
+        s = np.concatenate(
+            [data[:, n - 1 : 0 : -1], data, data[:, -2 : -n - 1 : -1]], axis=1
+        )
+        x = _convolve_valid_numpy(s, window)
     if n % 2 == 1:
         # n is odd
-        x = x[n // 2 : -(n // 2)]
+        x = x[..., n // 2 : -(n // 2)]
     else:
         # n is even
-        x = x[(n // 2) - 1 : -(n // 2)]
+        x = x[..., (n // 2) - 1 : -(n // 2)]
 
-    assert len(x) == len(data)
+    assert x.shape == data.shape
     return x
 
 
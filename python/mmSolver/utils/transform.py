@@ -34,6 +34,7 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import array
 import math
 
 import maya.cmds
@@ -46,6 +47,12 @@ import mmSolver.utils.animcurve as animcurve_utils
 import mmSolver.utils.constant as const
 import mmSolver.utils.python_compat as pycompat
 
+# NumPy
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 ROTATE_ORDER_STR_TO_APITWO_CONSTANT = {
     'xyz': OpenMaya2.MTransformationMatrix.kXYZ,
@@ -55,8 +62,21 @@ ROTATE_ORDER_STR_TO_APITWO_CONSTANT = {
     'zxy': OpenMaya2.MTransformationMatrix.kZXY,
     'zyx': OpenMaya2.MTransformationMatrix.kZYX,
 }
+# The axis index (0=X, 1=Y, 2=Z) of each rotation, in the order the
+# rotations are applied.
+ROTATE_ORDER_STR_TO_AXES = {
+    'xyz': (0, 1, 2),
+    'xzy': (0, 2, 1),
+    'yxz': (1, 0, 2),
+    'yzx': (1, 2, 0),
+    'zxy': (2, 0, 1),
+    'zyx': (2, 1, 0),
+}
 LOG = mmSolver.logger.get_logger()
 
+# Matrices with a larger error are decomposed by Maya, one at a time.
+DECOMPOSE_TOLERANCE = 1e-9
+
 
 def create_dg_context_apitwo(frame):
     """
@@ -329,10 +349,29 @@ class TransformNode(object):
         return parent_tfm_nodes
 
 
+def _get_attr_value_size(attr_name):
+    """
+    The number of float values stored for each time of the attribute.
+
+    :rtype: int
+    """
+    attr_name_lower = attr_name.lower()
+    if 'matrix' in attr_name_lower:
+        return 16
+    return 1
+
+
 class TransformMatrixCache(object):
     """
     Hold a list of matrix node/values to be queried and stored in the object.
 
+    All node attributes share the same (sorted) list of times; every
+    node attribute is evaluated at all the times added to the cache,
+    not only the times given with that node attribute. The values of
+    each node attribute are stored in a contiguous array of 64-bit
+    floats, with one row for each time; 16 values per row for
+    matrices (row-major), or 1 value per row for doubles.
+
     >>> tfm_node = TransformNode(node='myNode')
     >>> times = list(range(1001, 1101))
     >>> tfm_matrix_cache = TransformMatrixCache()
@@ -347,6 +386,9 @@ class TransformMatrixCache(object):
         Construct an empty TransformMatrixCache.
         """
         self._data = None
+        self._times = None
+        self._time_to_index = None
+        self._pending_times = None
         self.clear()
 
     def clear(self):
@@ -354,6 +396,9 @@ class TransformMatrixCache(object):
         Clear all the cached values, nodes, attributes and times.
         """
         self._data = dict()
+        self._times = []
+        self._time_to_index = dict()
+        self._pending_times = set()
 
     def add_node(self, tfm_node, times):
         """
@@ -403,9 +448,12 @@ class TransformMatrixCache(object):
         if uuid not in self._data:
             self._data[uuid] = dict()
         if attr_name not in self._data[uuid]:
-            self._data[uuid][attr_name] = dict()
+            # The values are filled by 'process'.
+            self._data[uuid][attr_name] = array.array('d')
+        # Times are evaluated by the next call to 'process'.
         for t in times:
-            self._data[uuid][attr_name][t] = None
+            if t not in self._time_to_index:
+                self._pending_times.add(t)
         return
 
     def get_nodes(self):
@@ -422,9 +470,17 @@ class TransformMatrixCache(object):
                 tfm_nodes.append(node)
         return tfm_nodes
 
+    def get_times(self):
+        """
+        Get all the times evaluated in the cache, sorted.
+
+        :rtype: [int, ..]
+        """
+        return list(self._times)
+
     def __get_times_and_nodes(self):
         """Get times and nodes."""
-        times = []
+        times = list(sorted(self._pending_times.union(self._time_to_index.keys())))
         map_uuid_to_node = dict()
         for uuid in self._data.keys():
             node = maya.cmds.ls(uuid, long=True)[0]
@@ -434,11 +490,6 @@ class TransformMatrixCache(object):
                 plug = node_utils.get_as_plug_apitwo(plug_name)
                 assert plug is not None
                 map_uuid_to_node[uuid][attr_name] = plug
-                data = self._data.get(uuid, dict())
-                data = data.get(attr_name, dict())
-                times += data
-        times = list(set(times))
-        times = list(sorted(times))
         return times, map_uuid_to_node
 
     def __get_process_list(self, map_uuid_to_node):
@@ -446,50 +497,49 @@ class TransformMatrixCache(object):
         for uuid in self._data.keys():
             d = self._data.get(uuid, dict())
             for attr_name in d.keys():
+                attr_name_lower = attr_name.lower()
+                is_matrix = 'matrix' in attr_name_lower
+                if not is_matrix and 'rotatepivot' not in attr_name_lower:
+                    msg = 'Attribute name is not supported; attr_name=%r'
+                    raise ValueError(msg % attr_name)
                 d2 = map_uuid_to_node.get(uuid, dict())
                 plug = d2.get(attr_name, dict())
                 plug_name = plug.name()
-                data.append((uuid, attr_name, plug, plug_name))
+                values = d[attr_name]
+                data.append((values, is_matrix, plug, plug_name))
         return data
 
-    def __process_with_getattr(self, map_uuid_to_node, time):
+    @staticmethod
+    def __process_with_getattr(process_list, time):
         """Process the TransformMatrixCache, with getAttr functions."""
         maya.cmds.currentTime(time, update=True)
-        process_list = self.__get_process_list(map_uuid_to_node)
-        for uuid, attr_name, plug, plug_name in process_list:
-            attr_name_lower = attr_name.lower()
-            if 'matrix' in attr_name_lower:
-                matrix = maya.cmds.getAttr(plug_name)
-                matrix = OpenMaya2.MMatrix(matrix)
-                self._data[uuid][attr_name][time] = matrix
-            elif 'rotatepivot' in attr_name_lower:
-                value = maya.cmds.getAttr(plug_name)
-                self._data[uuid][attr_name][time] = value
+        for values, is_matrix, plug, plug_name in process_list:
+            if is_matrix is True:
+                values.extend(maya.cmds.getAttr(plug_name))
             else:
-                msg = 'Attribute name is not supported; attr_name=%r'
-                raise ValueError(msg % attr_name)
+                values.append(maya.cmds.getAttr(plug_name))
         return
 
-    def __process_with_api(self, map_uuid_to_node, time, ctx):
+    @staticmethod
+    def __process_with_api(process_list, ctx):
         """Process the TransformMatrixCache, with API functions."""
-        process_list = self.__get_process_list(map_uuid_to_node)
-        for uuid, attr_name, plug, plug_name in process_list:
-            attr_name_lower = attr_name.lower()
-            if 'matrix' in attr_name_lower:
+        for values, is_matrix, plug, plug_name in process_list:
+            if is_matrix is True:
                 matrix = get_matrix_from_plug_apitwo(plug, ctx)
-                self._data[uuid][attr_name][time] = matrix
-            elif 'rotatepivot' in attr_name_lower:
-                value = get_double_from_plug_apitwo(plug, ctx)
-                self._data[uuid][attr_name][time] = value
+                values.extend(matrix)
             else:
-                msg = 'Attribute name is not supported; attr_name=%r'
-                raise ValueError(msg % attr_name)
+                values.append(get_double_from_plug_apitwo(plug, ctx))
         return
 
     def process(self, eval_mode=None):
         """
         Evaluate all the node attributes at times.
 
+        All node attributes are evaluated at a time, before moving to
+        the next time, so each time is only evaluated once. Each node
+        attribute is evaluated at all the times added to the cache
+        (the union of the times of all node attributes).
+
         :param eval_mode: What type of evaluation method to use?
         :type eval_mode: mmSolver.utils.constant.EVAL_MODE_*
 
@@ -502,18 +552,30 @@ class TransformMatrixCache(object):
         current_frame = maya.cmds.currentTime(query=True)
         times, map_uuid_to_node = self.__get_times_and_nodes()
 
+        # Values are re-evaluated for all times.
+        for uuid in self._data.keys():
+            for attr_name in self._data[uuid].keys():
+                self._data[uuid][attr_name] = array.array('d')
+        self._times = []
+        self._time_to_index = dict()
+        process_list = self.__get_process_list(map_uuid_to_node)
+
         # Query the matrices, looping over time sequentially.
         if eval_mode == const.EVAL_MODE_TIME_SWITCH_GET_ATTR:
             for t in times:
-                self.__process_with_getattr(map_uuid_to_node, t)
+                self.__process_with_getattr(process_list, t)
         elif eval_mode == const.EVAL_MODE_API_DG_CONTEXT:
             for t in times:
                 ctx = create_dg_context_apitwo(t)
-                self.__process_with_api(map_uuid_to_node, t, ctx)
+                self.__process_with_api(process_list, ctx)
         else:
             msg = 'eval_mode does not have a valid value'
             raise ValueError(msg % eval_mode)
 
+        self._times = times
+        self._time_to_index = dict((t, i) for i, t in enumerate(times))
+        self._pending_times = set()
+
         if eval_mode == const.EVAL_MODE_TIME_SWITCH_GET_ATTR:
             maya.cmds.currentTime(current_frame, update=True)
         return
@@ -537,6 +599,13 @@ class TransformMatrixCache(object):
         attr_names = self._data.get(node_uuid, dict()).keys()
         return attr_names
 
+    def __get_node_attr_values(self, tfm_node, attr_name):
+        node_uuid = tfm_node
+        if isinstance(tfm_node, TransformNode):
+            node_uuid = tfm_node.get_node_uuid()
+        node_values = self._data.get(node_uuid, dict())
+        return node_values.get(attr_name)
+
     def get_node_attr(self, tfm_node, attr_name, times):
         """
         Get the node attribute matrix data, at given times
@@ -556,20 +625,66 @@ class TransformMatrixCache(object):
                   list entry.
         :rtype: [maya.api.OpenMaya.MMatrix or None, ..]
         """
-        node_uuid = tfm_node
-        if isinstance(tfm_node, TransformNode):
-            node_uuid = tfm_node.get_node_uuid()
-        node_values = self._data.get(node_uuid, dict())
-        attr_values = node_values.get(attr_name, dict())
-        attr_values = attr_values.copy()
+        attr_values = self.__get_node_attr_values(tfm_node, attr_name)
+        size = _get_attr_value_size(attr_name)
+        num_rows = 0
+        if attr_values is not None:
+            num_rows = len(attr_values) // size
         values = []
         for t in times:
-            v = attr_values.get(t, None)
+            index = self._time_to_index.get(t)
+            v = None
+            if index is not None and index < num_rows:
+                if size == 1:
+                    v = attr_values[index]
+                else:
+                    start = index * size
+                    v = OpenMaya2.MMatrix(attr_values[start : start + size])
             values.append(v)
         return values
 
     get_node_attr_matrix = get_node_attr
 
+    def get_node_attr_array(self, tfm_node, attr_name, times):
+        """
+        Get the node attribute data at given times, as an array.
+
+        :param tfm_node: The transform node to query.
+        :type tfm_node: TransformNode or str
+
+        :param attr_name: Name of the attribute (previously added to
+                          the cache).
+        :type attr_name: str
+
+        :param times: The list of times to query from the cache.
+        :type times: [int, ..]
+
+        :returns: Array of shape (len(times), 16) for matrix
+                  attributes (each row is a row-major 4x4 matrix), or
+                  shape (len(times),) for double attributes. If no
+                  cached value exists the values are NaN. None is
+                  returned if NumPy is not available.
+        :rtype: numpy.ndarray or None
+        """
+        if np is None:
+            return None
+        size = _get_attr_value_size(attr_name)
+        attr_values = self.__get_node_attr_values(tfm_node, attr_name)
+        data = np.zeros((0, size), dtype=np.float64)
+        if attr_values is not None and len(attr_values) > 0:
+            data = np.frombuffer(attr_values, dtype=np.float64).reshape(-1, size)
+
+        indices = np.array(
+            [self._time_to_index.get(t, -1) for t in times], dtype=np.intp
+        )
+        indices[indices >= len(data)] = -1
+        valid = indices >= 0
+        values = np.full((len(times), size), np.nan, dtype=np.float64)
+        values[valid] = data[indices[valid]]
+        if size == 1:
+            values = values.reshape(-1)
+        return values
+
 
 def get_transform_matrix_list(
     tfm_matrix_cache, times, src_tfm_node, rotate_order=None, eval_mode=None
@@ -746,6 +861,142 @@ def decompose_matrix(tfm_matrix, prv_rot):
     return tuple(trans + rot + scl)
 
 
+def _decompose_matrix_array_numpy(matrices, rotate_order):
+    """
+    Decompose matrices without shear, negative scale or gimbal lock.
+
+    :returns: Array of shape (N, 9) for TX, TY, TZ, RX, RY, RZ, SX, SY
+        and SZ (rotations in degrees), and a boolean array of shape
+        (N,) for the matrices that could be decomposed.
+    :rtype: (numpy.ndarray, numpy.ndarray)
+    """
+    axis_i, axis_j, axis_k = ROTATE_ORDER_STR_TO_AXES[rotate_order]
+    num = len(matrices)
+    basis = matrices[:, :3, :3]
+    values = np.zeros((num, 9), dtype=np.float64)
+    values[:, 0:3] = matrices[:, 3, :3]
+
+    # Maya uses row vectors, so each row of the (rotation * scale)
+    # matrix is scaled by the scale value of the axis.
+    scale = np.sqrt(np.einsum('nij,nij->ni', basis, basis))
+    values[:, 6:9] = scale
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rot = basis / scale[:, :, np.newaxis]
+
+    # For rotation order 'xyz' the row vector rotation matrix is
+    # 'Rx * Ry * Rz'; the column vector (transposed) matrix is used
+    # to find the angles.
+    col = np.swapaxes(rot, 1, 2)
+    is_even = (axis_j - axis_i) % 3 == 1
+    sign = 1.0 if is_even else -1.0
+    sin_j = -sign * col[:, axis_k, axis_i]
+    angle_i = np.arctan2(sign * col[:, axis_k, axis_j], col[:, axis_k, axis_k])
+    angle_j = np.arcsin(np.clip(sin_j, -1.0, 1.0))
+    angle_k = np.arctan2(sign * col[:, axis_j, axis_i], col[:, axis_i, axis_i])
+    values[:, 3 + axis_i] = np.degrees(angle_i)
+    values[:, 3 + axis_j] = np.degrees(angle_j)
+    values[:, 3 + axis_k] = np.degrees(angle_k)
+
+    # Shear, negative scale and gimbal lock are left to Maya.
+    identity = np.eye(3)[np.newaxis, :, :]
+    ortho_error = np.abs(np.einsum('nij,nkj->nik', rot, rot) - identity)
+    with np.errstate(invalid='ignore'):
+        valid = np.all(np.isfinite(values), axis=1)
+        valid &= np.all(scale > DECOMPOSE_TOLERANCE, axis=1)
+        valid &= np.linalg.det(basis) > 0.0
+        valid &= np.all(ortho_error < DECOMPOSE_TOLERANCE, axis=(1, 2))
+        valid &= np.abs(sin_j) < (1.0 - DECOMPOSE_TOLERANCE)
+    return values, valid
+
+
+def decompose_matrix_array(matrices, rotate_order=None, prv_rot=None):
+    """
+    Decompose many 4x4 matrices into transform attributes, at once.
+
+    The rotation values are Euler filtered, in the order of the given
+    matrices.
+
+    When NumPy is available the matrices are decomposed in a single
+    vectorised pass. Matrices with shear, negative scale or at gimbal
+    lock are decomposed with a MTransformationMatrix.
+
+    :param matrices: The (row-major) matrices to decompose, as N
+        sequences of 16 values, or an array of shape (N, 4, 4).
+    :type matrices: numpy.ndarray or [[float, ..], ..]
+
+    :param rotate_order: The rotation order of the rotation values,
+        'xyz' if None.
+    :type rotate_order: str or None
+
+    :param prv_rot: The rotation values before the first matrix (on
+        the previous frame).
+    :type prv_rot: (float, float, float) or None
+
+    :returns: Array of shape (N, 9) for TX, TY, TZ, RX, RY, RZ, SX,
+              SY and SZ. If NumPy is not available, a list of tuples
+              of 9 values is returned.
+    :rtype: numpy.ndarray or [(float, ..), ..]
+    """
+    if rotate_order is None:
+        rotate_order = 'xyz'
+    assert rotate_order in const.ROTATE_ORDER_STR_LIST
+    rotate_order_api = ROTATE_ORDER_STR_TO_APITWO_CONSTANT[rotate_order]
+
+    def decompose_with_maya(matrix_values, previous_rotation):
+        tfm_matrix = OpenMaya2.MTransformationMatrix(
+            OpenMaya2.MMatrix([float(v) for v in matrix_values])
+        )
+        tfm_matrix.reorderRotation(rotate_order_api)
+        return decompose_matrix(tfm_matrix, previous_rotation)
+
+    if np is None:
+        values = []
+        for matrix_values in matrices:
+            components = decompose_with_maya(matrix_values, prv_rot)
+            prv_rot = components[3:6]
+            values.append(components)
+        return values
+
+    matrices = np.array(matrices, dtype=np.float64).reshape(-1, 4, 4)
+    values, valid = _decompose_matrix_array_numpy(matrices, rotate_order)
+    for index in np.flatnonzero(~valid):
+        values[index] = decompose_with_maya(matrices[index].reshape(-1), None)
+
+    for axis in range(3):
+        prv_value = None
+        if prv_rot is not None:
+            prv_value = prv_rot[axis]
+        values[:, 3 + axis] = animcurve_utils.euler_filter_values(
+            values[:, 3 + axis], prev_value=prv_value
+        )
+    return values
+
+
+def _get_world_matrix_values(tfm_matrix_cache, times, src_tfm_node):
+    """
+    Get the world matrix values of the source node at times.
+
+    :returns: Array of shape (N, 4, 4), or a list of 16 values for
+        each time if NumPy is not available.
+    :rtype: numpy.ndarray or [[float, ..], ..]
+    """
+    src_node_uuid = src_tfm_node.get_node_uuid()
+    src_node_attrs = tfm_matrix_cache.get_attrs_for_node(src_node_uuid)
+    with_pivot = len(src_node_attrs) > 1
+    if with_pivot is False and np is not None:
+        values = tfm_matrix_cache.get_node_attr_array(
+            src_node_uuid, 'worldMatrix[0]', times
+        )
+        assert not np.any(np.isnan(values))
+        return values.reshape(-1, 4, 4)
+
+    world_mat_list = get_transform_matrix_list(tfm_matrix_cache, times, src_tfm_node)
+    values = [list(world_mat.asMatrix()) for world_mat in world_mat_list]
+    if np is not None:
+        values = np.array(values, dtype=np.float64).reshape(-1, 4, 4)
+    return values
+
+
 def set_transform_values(
     tfm_matrix_cache,
     times,
@@ -804,7 +1055,6 @@ def set_transform_values(
     assert eval_mode in const.EVAL_MODE_LIST
 
     current_frame = maya.cmds.currentTime(query=True)
-    space = OpenMaya2.MSpace.kWorld
     attrs = [
         'translateX',
         'translateY',
@@ -823,7 +1073,6 @@ def set_transform_values(
     else:
         maya.cmds.xform(dst_node, edit=True, rotateOrder=rotate_order)
     assert rotate_order in const.ROTATE_ORDER_STR_LIST
-    rotate_order_api = ROTATE_ORDER_STR_TO_APITWO_CONSTANT[rotate_order]
 
     # Get destination node plug.
     dst_node = dst_tfm_node.get_node()
@@ -831,57 +1080,46 @@ def set_transform_values(
     parent_inv_matrix_plug = node_utils.get_as_plug_apitwo(dst_name)
 
     # Query the matrix of nodes.
-    world_mat_list = get_transform_matrix_list(
-        tfm_matrix_cache, times, src_tfm_node, rotate_order=rotate_order
-    )
-    assert len(world_mat_list) == len(times)
+    world_matrices = _get_world_matrix_values(tfm_matrix_cache, times, src_tfm_node)
+    assert len(world_matrices) == len(times)
 
-    # Set transform
-    dst_node = dst_tfm_node.get_node()
-    prv_rot = None
-    for t, world_mat in zip(times, world_mat_list):
+    # Query the parent inverse matrix of the destination node.
+    parent_inv_matrices = []
+    for t in times:
         assert t is not None
-        assert world_mat is not None
-
         parent_inv_mat = None
         if eval_mode == const.EVAL_MODE_API_DG_CONTEXT:
             ctx = create_dg_context_apitwo(t)
             parent_inv_mat = get_matrix_from_plug_apitwo(parent_inv_matrix_plug, ctx)
+            parent_inv_mat = list(parent_inv_mat)
         elif eval_mode == const.EVAL_MODE_TIME_SWITCH_GET_ATTR:
             maya.cmds.currentTime(t, update=True)
             plug_name = parent_inv_matrix_plug.name()
             parent_inv_mat = maya.cmds.getAttr(plug_name)
-            parent_inv_mat = OpenMaya2.MMatrix(parent_inv_mat)
         else:
             msg = 'eval_mode does not have a valid value'
             raise ValueError(msg % eval_mode)
+        parent_inv_matrices.append(parent_inv_mat)
 
-        local_mat = world_mat.asMatrix() * parent_inv_mat
-        local_mat = OpenMaya2.MTransformationMatrix(local_mat)
-        local_mat.reorderRotation(rotate_order_api)
-
-        # Decompose matrix into components
-        trans = local_mat.translation(space)
-        scl = local_mat.scale(space)
-        rot = local_mat.rotation(asQuaternion=False)
-
-        # Convert and clean rotation values
-        trans = (trans[0], trans[1], trans[2])
-        scl = (scl[0], scl[1], scl[2])
-        rot = (math.degrees(rot[0]), math.degrees(rot[1]), math.degrees(rot[2]))
-        if prv_rot is not None:
-            rot = (
-                animcurve_utils.euler_filter_value(prv_rot[0], rot[0]),
-                animcurve_utils.euler_filter_value(prv_rot[1], rot[1]),
-                animcurve_utils.euler_filter_value(prv_rot[2], rot[2]),
-            )
-        prv_rot = rot
-
-        # Set Keyframes
-        values = trans + rot + scl
+    # Decompose all local matrices at once.
+    if np is not None:
+        parent_inv_matrices = np.array(parent_inv_matrices, dtype=np.float64)
+        local_matrices = np.matmul(
+            world_matrices, parent_inv_matrices.reshape(-1, 4, 4)
+        )
+    else:
+        local_matrices = []
+        for world_mat, parent_inv_mat in zip(world_matrices, parent_inv_matrices):
+            local_mat = OpenMaya2.MMatrix(world_mat) * OpenMaya2.MMatrix(parent_inv_mat)
+            local_matrices.append(list(local_mat))
+    values_list = decompose_matrix_array(local_matrices, rotate_order=rotate_order)
+    assert len(values_list) == len(times)
+
+    # Set Keyframes
+    for t, values in zip(times, values_list):
         assert len(attrs) == len(values)
         for attr, v in zip(attrs, values):
-            maya.cmds.setKeyframe(dst_node, attribute=attr, time=t, value=v)
+            maya.cmds.setKeyframe(dst_node, attribute=attr, time=t, value=float(v))
 
     if delete_static_anim_curves is True:
         maya.cmds.delete(dst_node, staticChannels=True)
@@ -0,0 +1,122 @@
+# Copyright (C) 2026 David Cattermole.
+#
+# This file is part of mmSolver.
+#
+# mmSolver is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# mmSolver is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with mmSolver.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""
+Benchmark the standard Python and NumPy smoothing backends.
+
+Each smooth type is run over many long random curves, with the
+standard Python functions (one curve at a time) and with
+'mmSolver.utils.smooth.smooth_batch' (all curves at once, using
+NumPy).
+
+Usage:
+$ mayapy tests/benchmarkSmooth.py --frames 10000 --curves 4
+
+This is not part of the test suite; the results of both backends are
+checked by 'test.test_utils.test_smooth'.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import os
+import random
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'python'))
+
+import mmSolver.utils.constant as const
+import mmSolver.utils.smooth as smooth_utils
+
+RAW_SMOOTH_FUNCS = {
+    const.SMOOTH_TYPE_AVERAGE: smooth_utils._average_smooth_raw,
+    const.SMOOTH_TYPE_GAUSSIAN: smooth_utils._gaussian_smooth_raw,
+    const.SMOOTH_TYPE_FOURIER: smooth_utils._fourier_smooth_raw,
+}
+
+
+def generate_curves(frame_count, curve_count, seed):
+    rng = random.Random(seed)
+    return [
+        [rng.uniform(-1.0, 1.0) for _ in range(frame_count)] for _ in range(curve_count)
+    ]
+
+
+def time_func(func, repeat):
+    """
+    Run the function 'repeat' times, returning the fastest time in
+    seconds.
+    """
+    times = []
+    for _ in range(repeat):
+        s = timeit.default_timer()
+        func()
+        e = timeit.default_timer()
+        times.append(e - s)
+    return min(times)
+
+
+def run_benchmark(frame_count, curve_count, width, repeat, seed):
+    data = generate_curves(frame_count, curve_count, seed)
+    print('curves:', curve_count, 'frames:', frame_count, 'width:', width)
+    for smooth_type in const.SMOOTH_TYPES:
+        raw_func = RAW_SMOOTH_FUNCS[smooth_type]
+
+        def raw_smooth():
+            return [raw_func(list(curve), width) for curve in data]
+
+        def numpy_smooth():
+            return smooth_utils.smooth_batch(smooth_type, data, width)
+
+        raw_time = time_func(raw_smooth, repeat)
+        numpy_time = time_func(numpy_smooth, repeat)
+        print(
+            'smooth type: {0:<10}'.format(smooth_type),
+            'python: {0:f} seconds'.format(raw_time),
+            'numpy: {0:f} seconds'.format(numpy_time),
+            'speed up: {0:.1f}x'.format(raw_time / max(numpy_time, 1e-9)),
+        )
+    return
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the Python and NumPy smoothing backends.'
+    )
+    parser.add_argument(
+        '--frames', type=int, default=10000, help='Number of frames per curve.'
+    )
+    parser.add_argument('--curves', type=int, default=4, help='Number of curves.')
+    parser.add_argument('--width', type=float, default=5.0, help='Smooth width.')
+    parser.add_argument(
+        '--repeat', type=int, default=3, help='Number of runs; the fastest is used.'
+    )
+    parser.add_argument('--seed', type=int, default=42, help='Random seed.')
+    args = parser.parse_args()
+
+    if smooth_utils.np is None:
+        print('NumPy is not available; cannot benchmark the NumPy backend.')
+        sys.exit(1)
+    run_benchmark(args.frames, args.curves, args.width, args.repeat, args.seed)
+
+
+if __name__ == '__main__':
+    main()
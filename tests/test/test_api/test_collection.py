@@ -39,6 +39,7 @@ import mmSolver._api.marker as marker
 import mmSolver._api.bundle as bundle
 import mmSolver._api.attribute as attribute
 import mmSolver._api.collection as collection
+import mmSolver._api.compile as api_compile
 
 
 # @unittest.skip
@@ -535,6 +536,84 @@ class TestCollection(test_api_utils.APITestCase):
         x.add_attribute(attr)
         self.assertTrue(x.is_valid())
 
+    def test_compile_cache(self):
+        """
+        Compiled actions are re-used until the Collection changes.
+        """
+        x = collection.Collection()
+        x.create_node('myCollection')
+        sol = solver.Solver()
+        sol.add_frame(frame.Frame(1))
+        sol.add_frame(frame.Frame(2))
+        x.add_solver(sol)
+
+        maya.cmds.createNode('transform', name='camera1')
+        cam_shp = maya.cmds.createNode('camera', name='cameraShape1')
+        cam = camera.Camera(shape=cam_shp)
+        bnd = bundle.Bundle().create_node()
+        mkr = marker.Marker().create_node(cam=cam, bnd=bnd)
+        x.add_marker(mkr)
+        attr = attribute.Attribute(node=bnd.get_node(), attr='translateX')
+        x.add_attribute(attr)
+
+        def get_key():
+            sol_list = x.get_solver_list()
+            mkr_list = x.get_marker_list()
+            mkr_enable_matrix = api_compile.get_markers_enable_matrix(
+                sol_list, mkr_list
+            )
+            return api_compile.get_collection_compile_key(
+                x,
+                sol_list,
+                mkr_list,
+                x.get_attribute_list(),
+                True,
+                mkr_enable_matrix,
+            )
+
+        def compile_actions():
+            return api_compile.collection_compile_with_cache(
+                x,
+                x.get_solver_list(),
+                x.get_marker_list(),
+                x.get_attribute_list(),
+                withtest=True,
+            )
+
+        api_compile.clear_collection_compile_cache()
+        key_a = get_key()
+        self.assertEqual(key_a, get_key())
+        action_list_a, vaction_list_a = compile_actions()
+        action_list_b, vaction_list_b = compile_actions()
+        self.assertEqual(action_list_a, action_list_b)
+        self.assertEqual(vaction_list_a, vaction_list_b)
+
+        # Actions given out must be safe to modify.
+        action_list_a[0].kwargs['frame'] = []
+        action_list_c, _ = compile_actions()
+        self.assertEqual(action_list_b, action_list_c)
+
+        # Validation results are stored with the compiled actions.
+        validate_cache = api_compile.get_collection_validate_cache(x)
+        self.assertEqual(validate_cache, {})
+        validate_cache['key'] = None
+        compile_actions()
+        self.assertIs(api_compile.get_collection_validate_cache(x), validate_cache)
+
+        # Disabling a marker on a solved frame changes the key.
+        plug = mkr.get_node() + '.enable'
+        maya.cmds.setKeyframe(plug, time=1, value=1)
+        maya.cmds.setKeyframe(plug, time=2, value=0)
+        key_b = get_key()
+        self.assertNotEqual(key_a, key_b)
+
+        # Changing the solver settings changes the key.
+        sol.add_frame(frame.Frame(3))
+        x.set_solver_list([sol])
+        self.assertNotEqual(key_b, get_key())
+        api_compile.clear_collection_compile_cache()
+        self.assertIs(api_compile.get_collection_validate_cache(x), None)
+
 
 if __name__ == '__main__':
     prog = unittest.main()
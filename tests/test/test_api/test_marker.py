@@ -35,6 +35,7 @@ import mmSolver._api.bundle as bundle
 import mmSolver._api.camera as camera
 import mmSolver._api.markergroup as markergroup
 import mmSolver._api.marker as marker
+import mmSolver._api.markerutils as markerutils
 
 
 # @unittest.skip
@@ -299,6 +300,111 @@ class TestMarker(test_api_utils.APITestCase):
         self.assertIs(mkr_grp6, None)
         self.assertEqual(mkr_grp6, None)
 
+    def test_get_enabled_frames(self):
+        x = marker.Marker().create_node()
+        node = x.get_node()
+        plug = node + '.enable'
+        maya.cmds.setKeyframe(plug, time=1, value=1)
+        maya.cmds.setKeyframe(plug, time=3, value=0)
+        maya.cmds.setKeyframe(plug, time=5, value=1)
+        maya.cmds.keyTangent(plug, outTangentType='step')
+
+        frames = x.get_enabled_frames()
+        self.assertEqual(frames, [1, 2, 5])
+
+        times = [1, 2, 3, 4, 5]
+        enable_values = markerutils.get_marker_enable_values(node, times)
+        self.assertEqual(list(enable_values), [1, 1, 0, 0, 1])
+        expected = [maya.cmds.getAttr(plug, time=t) for t in times]
+        self.assertEqual(list(enable_values), expected)
+
+    def test_get_marker_enable_and_weight_values(self):
+        x = marker.Marker().create_node()
+        y = marker.Marker().create_node()
+        x_node = x.get_node()
+        y_node = y.get_node()
+        maya.cmds.setKeyframe(x_node + '.weight', time=1, value=0.0)
+        maya.cmds.setKeyframe(x_node + '.weight', time=11, value=1.0)
+        maya.cmds.setAttr(y_node + '.enable', 0)
+        maya.cmds.setAttr(y_node + '.weight', 0.5)
+
+        times = list(range(1, 12))
+        enable_values_list, weight_values_list = (
+            markerutils.get_markers_enable_and_weight_values([x_node, y_node], times)
+        )
+        self.assertEqual(len(enable_values_list), 2)
+        self.assertEqual(len(weight_values_list), 2)
+        self.assertEqual(list(enable_values_list[0]), [1] * len(times))
+        self.assertEqual(list(enable_values_list[1]), [0] * len(times))
+        self.assertEqual(list(weight_values_list[1]), [0.5] * len(times))
+        for t, weight in zip(times, weight_values_list[0]):
+            expected = maya.cmds.getAttr(x_node + '.weight', time=t)
+            self.assertApproxEqual(weight, expected)
+
+    def test_marker_enable_matrix(self):
+        x = marker.Marker().create_node()
+        y = marker.Marker().create_node()
+        x_node = x.get_node()
+        y_node = y.get_node()
+        maya.cmds.setKeyframe(x_node + '.enable', time=1, value=1)
+        maya.cmds.setKeyframe(x_node + '.enable', time=2, value=0)
+        maya.cmds.setKeyframe(x_node + '.enable', time=3, value=1)
+        maya.cmds.keyTangent(x_node + '.enable', outTangentType='step')
+
+        matrix = markerutils.MarkerEnableMatrix([x_node, y_node])
+        matrix.compute_frames([1, 2, 3])
+        self.assertEqual(matrix.get_column(1), 3)
+        self.assertEqual(matrix.get_column(2), 2)
+        self.assertEqual(matrix.get_enabled_marker_nodes(2), [y_node])
+
+        # Frames 1 and 3 have the same enabled markers.
+        sig_a = matrix.get_signature([1])
+        sig_b = matrix.get_signature([3])
+        sig_c = matrix.get_signature([1, 2])
+        self.assertEqual(sig_a, sig_b)
+        self.assertNotEqual(sig_a, sig_c)
+
+        # Only the 'y' marker is considered, which is always enabled.
+        sig_d = matrix.get_signature([1, 2, 3], mkr_nodes=[y_node])
+        sig_e = matrix.get_signature([2], mkr_nodes=[y_node])
+        self.assertEqual(sig_d, sig_e)
+
+    def test_set_markers_deviation_values(self):
+        x = marker.Marker().create_node()
+        y = marker.Marker().create_node()
+        x_node = x.get_node()
+        y_node = y.get_node()
+
+        times = [1, 2, 3]
+        x_devs = [0.5, 2.0, 1.0]
+        y_devs = [-1.0, 3.0, 0.25]
+        markerutils.set_markers_deviation_values(
+            [x, y],
+            [times, times],
+            [x_devs, y_devs],
+            [markerutils.calculate_average_deviation(x_devs), 1.625],
+            [2.0, 3.0],
+            [2, 2],
+        )
+
+        for node, devs in [(x_node, x_devs), (y_node, y_devs)]:
+            plug = node + '.deviation'
+            self.assertTrue(maya.cmds.getAttr(plug, lock=True))
+            for t, dev in zip(times, devs):
+                self.assertApproxEqual(maya.cmds.getAttr(plug, time=t), dev)
+        self.assertApproxEqual(x.get_average_deviation(), 3.5 / 3.0)
+        self.assertApproxEqual(y.get_average_deviation(), 1.625)
+        self.assertEqual(y.get_maximum_deviation(), (3.0, 2))
+        self.assertTrue(maya.cmds.getAttr(y_node + '.maximumDeviation', lock=True))
+
+        # The Marker objects use the new deviation animCurves.
+        for mkr, devs in [(x, x_devs), (y, y_devs)]:
+            self.assertIsNotNone(mkr._MFnAnimCurve_deviation)
+            anim_curve_fn = mkr.get_deviation_anim_curve_fn()
+            self.assertIsNotNone(anim_curve_fn)
+            self.assertEqual(anim_curve_fn.numKeys(), len(times))
+            self.assertApproxEqual(anim_curve_fn.value(1), devs[1])
+
 
 if __name__ == '__main__':
     prog = unittest.main()
@@ -0,0 +1,172 @@
+# Copyright (C) 2026 David Cattermole.
+#
+# This file is part of mmSolver.
+#
+# mmSolver is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# mmSolver is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with mmSolver.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""
+Solve two unrelated rigs, split into independent hierarchy blocks.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import unittest
+
+import maya.cmds
+
+import mmSolver.logger
+import mmSolver.api as mmapi
+import mmSolver._api.solverutils as solverutils
+import test.test_api.apiutils as test_api_utils
+
+LOG = mmSolver.logger.get_logger()
+
+
+# @unittest.skip
+class TestSolveHierarchyBlocks(test_api_utils.APITestCase):
+    def create_scene(self):
+        # Camera
+        cam_tfm = maya.cmds.createNode('transform', name='cam_tfm')
+        cam_shp = maya.cmds.createNode('camera', name='cam_shp', parent=cam_tfm)
+        maya.cmds.setAttr(cam_tfm + '.tz', 10.0)
+        cam = mmapi.Camera(shape=cam_shp)
+
+        # Two rigs, each with a root node and a child bundle.
+        mkr_list = []
+        root_nodes = []
+        for name, pos, mkr_pos in [
+            ('rig_a', (-3.0, 1.0, -5.0), (-0.1, 0.05)),
+            ('rig_b', (4.0, -2.0, -8.0), (0.2, -0.1)),
+        ]:
+            root = maya.cmds.createNode('transform', name=name + '_root')
+            bnd = mmapi.Bundle().create_node(name=name + '_bnd')
+            bnd_node = maya.cmds.parent(bnd.get_node(), root)[0]
+            maya.cmds.setAttr(bnd_node + '.translateX', pos[0])
+            maya.cmds.setAttr(bnd_node + '.translateY', pos[1])
+            maya.cmds.setAttr(bnd_node + '.translateZ', pos[2])
+
+            mkr = mmapi.Marker().create_node(name=name + '_mkr', cam=cam, bnd=bnd)
+            mkr_node = mkr.get_node()
+            maya.cmds.setAttr(mkr_node + '.translateX', mkr_pos[0])
+            maya.cmds.setAttr(mkr_node + '.translateY', mkr_pos[1])
+            mkr_list.append(mkr)
+            root_nodes.append(maya.cmds.ls(root, long=True)[0])
+        return mkr_list, root_nodes
+
+    def do_solve(self, solver_name, solver_type_index, scene_graph_mode):
+        if self.haveSolverType(name=solver_name) is False:
+            msg = '%r solver is not available!' % solver_name
+            raise unittest.SkipTest(msg)
+        scene_graph_name = mmapi.SCENE_GRAPH_MODE_NAME_LIST[scene_graph_mode]
+
+        mkr_list, root_nodes = self.create_scene()
+        attr_list = []
+        for root in root_nodes:
+            attr_list.append(mmapi.Attribute(root + '.translateX'))
+            attr_list.append(mmapi.Attribute(root + '.translateY'))
+
+        # Each rig is solved as an independent block.
+        blocks = solverutils.create_hierarchy_blocks(mkr_list, attr_list)
+        self.assertEqual(len(blocks), 2)
+
+        frm_list = [mmapi.Frame(1, primary=True)]
+        sol = mmapi.SolverStandard()
+        sol.set_use_single_frame(True)
+        sol.set_single_frame(frm_list[0])
+        sol.set_global_solve(False)
+        sol.set_only_root_frames(False)
+        sol.set_use_hierarchy_blocks(True)
+        sol.set_solver_type(solver_type_index)
+        sol.set_scene_graph_mode(scene_graph_mode)
+
+        col = mmapi.Collection()
+        col.create_node('mySolveCollection')
+        col.add_solver(sol)
+        col.add_marker_list(mkr_list)
+        col.add_attribute_list(attr_list)
+
+        # Run solver!
+        results = mmapi.execute(col)
+
+        # save the output
+        file_name = 'test_solve_hierarchyBlocks_{}_{}_after.ma'.format(
+            solver_name, scene_graph_name
+        )
+        path = self.get_output_path(file_name)
+        maya.cmds.file(rename=path)
+        maya.cmds.file(save=True, type='mayaAscii', force=True)
+
+        # Both rigs must be solved.
+        for root in root_nodes:
+            self.assertNotEqual(maya.cmds.getAttr(root + '.translateX'), 0.0)
+            self.assertNotEqual(maya.cmds.getAttr(root + '.translateY'), 0.0)
+        self.checkSolveResults(
+            results, allow_max_avg_error=0.001, allow_max_error=0.001
+        )
+        return
+
+    def test_hierarchy_blocks_unused_objects(self):
+        """
+        Markers and attributes not in a block are only kept when
+        unused objects are not removed.
+        """
+        mkr_list, root_nodes = self.create_scene()
+        attr_list = [
+            mmapi.Attribute(root_nodes[0] + '.translateX'),
+            mmapi.Attribute(root_nodes[0] + '.translateY'),
+        ]
+        unused_node = maya.cmds.createNode('transform', name='unused')
+        unused_attr = mmapi.Attribute(unused_node + '.translateX')
+        attr_list.append(unused_attr)
+
+        blocks = solverutils.create_hierarchy_blocks(mkr_list, attr_list)
+        self.assertEqual(len(blocks), 1)
+        self.assertEqual(blocks[0], ([mkr_list[0]], attr_list[:2]))
+
+        blocks = solverutils.create_hierarchy_blocks(
+            mkr_list, attr_list, remove_unused_objects=False
+        )
+        self.assertEqual(len(blocks), 2)
+        self.assertEqual(blocks[0], ([mkr_list[0]], attr_list[:2]))
+        self.assertEqual(blocks[1], ([mkr_list[1]], [unused_attr]))
+
+        # No marker is affected by any attribute.
+        blocks = solverutils.create_hierarchy_blocks(mkr_list, [unused_attr])
+        self.assertEqual(blocks, [(mkr_list, [unused_attr])])
+        return
+
+    def test_hierarchy_blocks_ceres_lmder_maya_dag(self):
+        self.do_solve(
+            'ceres_lmder',
+            mmapi.SOLVER_TYPE_CERES_LMDER,
+            mmapi.SCENE_GRAPH_MODE_MAYA_DAG,
+        )
+
+    def test_hierarchy_blocks_ceres_lmder_mmscenegraph(self):
+        self.do_solve(
+            'ceres_lmder', mmapi.SOLVER_TYPE_CERES_LMDER, mmapi.SCENE_GRAPH_MODE_AUTO
+        )
+
+    def test_hierarchy_blocks_cminpack_lmder_maya_dag(self):
+        self.do_solve(
+            'cminpack_lmder',
+            mmapi.SOLVER_TYPE_CMINPACK_LMDER,
+            mmapi.SCENE_GRAPH_MODE_MAYA_DAG,
+        )
+
+
+if __name__ == '__main__':
+    prog = unittest.main()
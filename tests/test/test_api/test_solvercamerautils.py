@@ -0,0 +1,251 @@
+# Copyright (C) 2026 David Cattermole.
+#
+# This file is part of mmSolver.
+#
+# mmSolver is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# mmSolver is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with mmSolver.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""
+Test functions for 'solvercamerautils' module.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import random
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+import maya.cmds
+
+import test.test_api.apiutils as test_api_utils
+import mmSolver._api.marker as marker
+import mmSolver._api.solvercamerautils as solvercamerautils
+
+# Positions on the edges of the bins of all levels, outside of the
+# bins, and NaN.
+EDGE_POSITIONS = [-0.5, -0.25, -0.125, 0.0, 0.125, 0.25, 0.375, 0.5]
+OUT_OF_RANGE_POSITIONS = [-0.75, -0.5000001, 0.5000001, 1.0]
+NAN_POSITION = float('nan')
+
+
+def _random_position(rand):
+    choice = rand.random()
+    if choice < 0.3:
+        return rand.choice(EDGE_POSITIONS)
+    elif choice < 0.4:
+        return rand.choice(OUT_OF_RANGE_POSITIONS)
+    elif choice < 0.45:
+        return NAN_POSITION
+    return rand.uniform(-0.5, 0.5)
+
+
+def _create_random_marker_frames(seed, num_markers, root_frames):
+    """
+    Create the enabled marker nodes and marker positions for each
+    root frame, with a random number of markers enabled.
+    """
+    rand = random.Random(seed)
+    mkr_nodes = ['marker%s' % i for i in range(num_markers)]
+    enabled_marker_nodes = {}
+    position_marker_nodes = {}
+    for frame in root_frames:
+        enable_ratio = rand.choice([0.1, 0.5, 0.8, 1.0])
+        enabled = set(n for n in mkr_nodes if rand.random() < enable_ratio)
+        positions = {}
+        for mkr_node in enabled:
+            positions[mkr_node] = (_random_position(rand), _random_position(rand))
+        enabled_marker_nodes[frame] = enabled
+        position_marker_nodes[frame] = positions
+    return enabled_marker_nodes, position_marker_nodes
+
+
+# @unittest.skip
+class TestSolverCameraUtils(test_api_utils.APITestCase):
+    @unittest.skipIf(np is None, 'numpy is not available.')
+    def test_calculate_frame_pair_scores_numpy(self):
+        root_frames = [1, 6, 11, 16, 21, 26, 31]
+        num_shared_zero = 0
+        num_scored = 0
+        for seed in range(20):
+            (
+                enabled_marker_nodes,
+                position_marker_nodes,
+            ) = _create_random_marker_frames(seed, 16, root_frames)
+            marker_values = solvercamerautils._create_marker_frame_values(
+                root_frames, enabled_marker_nodes, position_marker_nodes
+            )
+            scores = solvercamerautils._calculate_frame_pair_scores_numpy(marker_values)
+            self.assertEqual(scores.shape, (len(root_frames), len(root_frames)))
+
+            for i, frame_a in enumerate(root_frames):
+                for j, frame_b in enumerate(root_frames):
+                    mkr_nodes = (
+                        enabled_marker_nodes[frame_a] & enabled_marker_nodes[frame_b]
+                    )
+                    expected_score = 0
+                    if len(mkr_nodes) < solvercamerautils.MIN_NUM_SHARED_MARKERS:
+                        num_shared_zero += 1
+                    else:
+                        expected_score = (
+                            solvercamerautils._calculate_marker_frame_score(
+                                mkr_nodes, frame_b, position_marker_nodes
+                            )
+                        )
+                        num_scored += 1
+                    msg = 'seed=%r frame_a=%r frame_b=%r'
+                    self.assertEqual(
+                        int(scores[i][j]),
+                        expected_score,
+                        msg=msg % (seed, frame_a, frame_b),
+                    )
+
+        # Both cases must be tested.
+        self.assertGreater(num_shared_zero, 0)
+        self.assertGreater(num_scored, 0)
+        return
+
+    def test_cache_connected_frame_statistics_without_numpy(self):
+        root_frames = [1, 6, 11, 16, 21, 26, 31]
+        for seed in range(5):
+            (
+                enabled_marker_nodes,
+                position_marker_nodes,
+            ) = _create_random_marker_frames(seed, 16, root_frames)
+
+            module_np = solvercamerautils.np
+            solvercamerautils.np = None
+            try:
+                python_stats = solvercamerautils._cache_connected_frame_statistics(
+                    root_frames, enabled_marker_nodes, position_marker_nodes
+                )
+            finally:
+                solvercamerautils.np = module_np
+
+            frame_scores_map = python_stats[0]
+            for frame in root_frames:
+                scores = solvercamerautils._compute_connected_frame_scores(
+                    frame,
+                    root_frames,
+                    enabled_marker_nodes,
+                    position_marker_nodes,
+                )
+                expected_frame_scores = list(zip(root_frames, scores))
+                self.assertEqual(frame_scores_map[frame], expected_frame_scores)
+
+            # The same statistics are calculated with numpy.
+            if np is not None:
+                numpy_stats = solvercamerautils._cache_connected_frame_statistics(
+                    root_frames, enabled_marker_nodes, position_marker_nodes
+                )
+                self.assertEqual(numpy_stats, python_stats)
+        return
+
+    def test_precompute_values(self):
+        start_frame = 1
+        end_frame = 30
+        root_frames = [1, 5, 10, 15, 20, 25, 30]
+
+        mkr_list = []
+        for i in range(8):
+            mkr = marker.Marker().create_node(name='marker%s' % i)
+            mkr_node = mkr.get_node()
+            for attr, value_a, value_b in [
+                ('translateX', -0.4 + (i * 0.1), 0.3 - (i * 0.05)),
+                ('translateY', 0.2 - (i * 0.07), -0.1 + (i * 0.03)),
+            ]:
+                maya.cmds.setKeyframe(mkr_node, attribute=attr, time=1, value=value_a)
+                maya.cmds.setKeyframe(mkr_node, attribute=attr, time=30, value=value_b)
+            mkr_list.append(mkr)
+
+        # Stepped enable animation curves on some markers, the other
+        # markers do not have an enable animation curve.
+        for i, enable_keys in [
+            (0, [(1, 1), (10, 0), (20, 1)]),
+            (1, [(5, 1), (25, 0)]),
+            (2, [(1, 0), (12, 1), (28, 0)]),
+            (7, [(3, 1), (30, 1)]),
+        ]:
+            plug = mkr_list[i].get_node() + '.enable'
+            for frame, value in enable_keys:
+                maya.cmds.setKeyframe(plug, time=frame, value=value)
+            maya.cmds.keyTangent(plug, edit=True, outTangentType='step')
+        maya.cmds.setAttr(mkr_list[6].get_node() + '.enable', 0)
+
+        # Markers given more than once.
+        mkr_list += [mkr_list[0], mkr_list[3]]
+
+        (
+            enabled_marker_nodes,
+            position_marker_nodes,
+            marker_nodes_enabled,
+            frame_scores_map,
+            frame_scores_stats_map,
+            frame_best_frame_map,
+        ) = solvercamerautils._precompute_values(
+            mkr_list, root_frames, start_frame, end_frame
+        )
+
+        # The values queried on each frame.
+        expected_enabled_marker_nodes = {}
+        expected_position_marker_nodes = {}
+        for frame in root_frames:
+            mkr_nodes = set(
+                mkr.get_node() for mkr in mkr_list if mkr.get_enable(time=frame) > 0
+            )
+            positions = {}
+            for mkr_node in mkr_nodes:
+                pos_x = maya.cmds.getAttr(mkr_node + '.translateX', time=frame)
+                pos_y = maya.cmds.getAttr(mkr_node + '.translateY', time=frame)
+                positions[mkr_node] = (pos_x, pos_y)
+            expected_enabled_marker_nodes[frame] = mkr_nodes
+            expected_position_marker_nodes[frame] = positions
+        expected_marker_nodes_enabled = {}
+        for mkr in mkr_list:
+            enabled_frames = mkr.get_enabled_frames(
+                frame_range_start=start_frame, frame_range_end=end_frame
+            )
+            expected_marker_nodes_enabled[mkr.get_node()] = set(enabled_frames)
+
+        self.assertEqual(enabled_marker_nodes, expected_enabled_marker_nodes)
+        self.assertEqual(marker_nodes_enabled, expected_marker_nodes_enabled)
+        self.assertEqual(
+            sorted(position_marker_nodes.keys()),
+            sorted(expected_position_marker_nodes.keys()),
+        )
+        for frame, expected_positions in expected_position_marker_nodes.items():
+            positions = position_marker_nodes[frame]
+            self.assertEqual(
+                sorted(positions.keys()), sorted(expected_positions.keys())
+            )
+            for mkr_node, (pos_x, pos_y) in expected_positions.items():
+                self.assertAlmostEqual(positions[mkr_node][0], pos_x)
+                self.assertAlmostEqual(positions[mkr_node][1], pos_y)
+
+        expected_stats = solvercamerautils._cache_connected_frame_statistics(
+            root_frames, expected_enabled_marker_nodes, expected_position_marker_nodes
+        )
+        self.assertEqual(
+            (frame_scores_map, frame_scores_stats_map, frame_best_frame_map),
+            expected_stats,
+        )
+        return
+
+
+if __name__ == '__main__':
+    prog = unittest.main()
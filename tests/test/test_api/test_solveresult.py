@@ -110,6 +110,29 @@ class TestSolveResult(test_api_utils.APITestCase):
             + pprint.pformat(dict(results[0].get_marker_error_list()))
         )
 
+    def test_init_string_data(self):
+        cmd_data = [
+            'success=1',
+            'error_final=0.5',
+            'error_per_frame=1#0.25',
+            'error_per_frame=2#inf',
+            'error_per_marker_per_frame=marker1#1#0.5',
+            'error_per_marker_per_frame=marker1#2#0.75',
+            'error_per_marker_per_frame=marker2#1#nan',
+        ]
+        solres = solveresult.SolveResult(cmd_data)
+        self.assertIs(solres.get_success(), True)
+        self.assertEqual(solres.get_final_error(), 0.5)
+        self.assertEqual(solres.get_frame_list(), [1.0, 2.0])
+        self.assertEqual(solres.get_frame_error_list(), {1.0: 0.25, 2.0: -1.0})
+        self.assertEqual(
+            solres.get_marker_error_list(marker_node='marker1'), {1.0: 0.5, 2.0: 0.75}
+        )
+        self.assertEqual(
+            solres.get_marker_error_list(marker_node='marker2'), {1.0: -1.0}
+        )
+        self.assertEqual(solres.get_data_raw(), cmd_data)
+
     def test_combine_timer_stats(self):
         col = create_example_solve_scene()
         results = col.execute()
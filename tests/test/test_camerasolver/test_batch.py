@@ -0,0 +1,225 @@
+# Copyright (C) 2026 David Cattermole.
+#
+# This file is part of mmSolver.
+#
+# mmSolver is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# mmSolver is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with mmSolver.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""
+Test the Camera Solver batch queue scheduling, without running the
+camera solver executable.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import unittest
+
+import mmSolver.api as mmapi
+import mmSolver.utils.time as time_utils
+import mmSolver.tools.camerasolver.constant as camerasolver_const
+import mmSolver.tools.camerasolver.lib.batch as batch
+
+import test.test_camerasolver.camerasolverutils as camerasolverutils
+
+
+class _FakeSolveProcess(object):
+    """Stands in for 'SolveProcess'; finished by the test."""
+
+    def __init__(self, cmd_args):
+        self.cmd_args = cmd_args
+        self.done = False
+        self.cancelled = False
+        self.returncode = 0
+
+    def is_done(self):
+        return self.done
+
+    def wait(self):
+        return
+
+    def cancel(self):
+        self.cancelled = True
+        self.done = True
+        self.returncode = -1
+
+    def get_stdout_lines(self):
+        return []
+
+    def get_last_progress(self):
+        return None
+
+    def result(self):
+        return (self.returncode, '', '')
+
+
+# @unittest.skip
+class TestBatchSolveQueue(camerasolverutils.CameraSolverTestCase):
+    def setUp(self):
+        super(TestBatchSolveQueue, self).setUp()
+        self._processes = []
+        self._loaded_prefix_names = []
+        self._fail_prefix_names = set()
+        self._original_functions = (
+            batch.build_solve_cmd_args,
+            batch.start_solve_process,
+            batch.load_solve_outputs,
+        )
+
+        def build_solve_cmd_args(*args, **kwargs):
+            prefix_name = args[7]
+            if prefix_name in self._fail_prefix_names:
+                raise RuntimeError('Could not write input files.')
+            return [prefix_name]
+
+        def start_solve_process(cmd_args):
+            proc = _FakeSolveProcess(cmd_args)
+            self._processes.append(proc)
+            return proc
+
+        def load_solve_outputs(cam, mkr_list, prefix_name, output_dir):
+            self._loaded_prefix_names.append(prefix_name)
+
+        batch.build_solve_cmd_args = build_solve_cmd_args
+        batch.start_solve_process = start_solve_process
+        batch.load_solve_outputs = load_solve_outputs
+
+    def tearDown(self):
+        (
+            batch.build_solve_cmd_args,
+            batch.start_solve_process,
+            batch.load_solve_outputs,
+        ) = self._original_functions
+        super(TestBatchSolveQueue, self).tearDown()
+
+    def make_job(self, prefix_name):
+        cam = self.make_camera(prefix_name, 35.0, 36.0, 24.0)
+        mkr = mmapi.Marker().create_node(name=prefix_name + '_mkr', cam=cam)
+        adj_solver, adj_attrs = self.make_default_solver()
+        return batch.BatchSolveJob(
+            cam,
+            None,
+            [mkr],
+            time_utils.FrameRange(start=1, end=10),
+            adj_solver,
+            adj_attrs,
+            camerasolver_const.LOG_LEVEL_ERROR,
+            prefix_name,
+            self._output_dir,
+        )
+
+    def running_prefix_names(self, queue):
+        return [
+            job.get_prefix_name()
+            for job in queue.get_jobs()
+            if job.get_status() == camerasolver_const.BATCH_JOB_STATUS_RUNNING
+        ]
+
+    def test_bounded_process_count(self):
+        queue = batch.BatchSolveQueue(process_count=2)
+        jobs = [queue.add_job(self.make_job('job%d' % i)) for i in range(4)]
+
+        self.assertEqual(queue.poll(), [])
+        self.assertEqual(self.running_prefix_names(queue), ['job0', 'job1'])
+        self.assertEqual(len(self._processes), 2)
+
+        # No process is done, so no new process is started.
+        self.assertEqual(queue.poll(), [])
+        self.assertEqual(len(self._processes), 2)
+
+        self._processes[0].done = True
+        self.assertEqual(queue.poll(), [jobs[0]])
+        self.assertEqual(self.running_prefix_names(queue), ['job1', 'job2'])
+        self.assertEqual(
+            jobs[0].get_status(), camerasolver_const.BATCH_JOB_STATUS_SUCCESS
+        )
+        self.assertEqual(self._loaded_prefix_names, ['job0'])
+
+        self._processes[1].returncode = 1
+        for proc in self._processes:
+            proc.done = True
+        queue.poll()
+        self.assertEqual(self.running_prefix_names(queue), ['job3'])
+        self._processes[-1].done = True
+
+        queue.wait()
+        self.assertTrue(queue.is_done())
+        self.assertEqual(len(self._processes), 4)
+        self.assertEqual(
+            [job.get_status() for job in jobs],
+            [
+                camerasolver_const.BATCH_JOB_STATUS_SUCCESS,
+                camerasolver_const.BATCH_JOB_STATUS_FAILED,
+                camerasolver_const.BATCH_JOB_STATUS_SUCCESS,
+                camerasolver_const.BATCH_JOB_STATUS_SUCCESS,
+            ],
+        )
+        self.assertEqual(self._loaded_prefix_names, ['job0', 'job2', 'job3'])
+
+    def test_cancel(self):
+        queue = batch.BatchSolveQueue(process_count=1)
+        running_job = queue.add_job(self.make_job('running'))
+        pending_job = queue.add_job(self.make_job('pending'))
+        queue.poll()
+
+        queue.cancel(pending_job)
+        self.assertEqual(
+            pending_job.get_status(), camerasolver_const.BATCH_JOB_STATUS_CANCELLED
+        )
+        self.assertEqual(
+            running_job.get_status(), camerasolver_const.BATCH_JOB_STATUS_RUNNING
+        )
+
+        queue.cancel()
+        self.assertTrue(self._processes[0].cancelled)
+        self.assertEqual(
+            running_job.get_status(), camerasolver_const.BATCH_JOB_STATUS_CANCELLED
+        )
+
+        queue.wait()
+        self.assertTrue(queue.is_done())
+        self.assertEqual(len(self._processes), 1)
+        self.assertEqual(self._loaded_prefix_names, [])
+        self.assertEqual(
+            running_job.get_status(), camerasolver_const.BATCH_JOB_STATUS_CANCELLED
+        )
+
+    def test_start_failure(self):
+        self._fail_prefix_names.add('broken')
+        queue = batch.BatchSolveQueue(process_count=1)
+        broken_job = queue.add_job(self.make_job('broken'))
+        job = queue.add_job(self.make_job('job'))
+
+        # The failed job does not use a process.
+        self.assertEqual(queue.poll(), [broken_job])
+        self.assertEqual(
+            broken_job.get_status(), camerasolver_const.BATCH_JOB_STATUS_FAILED
+        )
+        self.assertEqual(self.running_prefix_names(queue), ['job'])
+
+        self._processes[0].done = True
+        queue.wait()
+        self.assertEqual(job.get_status(), camerasolver_const.BATCH_JOB_STATUS_SUCCESS)
+
+    def test_duplicate_job(self):
+        queue = batch.BatchSolveQueue(process_count=1)
+        queue.add_job(self.make_job('job'))
+        self.assertRaises(ValueError, queue.add_job, self.make_job('job'))
+        self.assertEqual(len(queue.get_jobs()), 1)
+        queue.add_job(self.make_job('other'))
+        self.assertEqual(len(queue.get_jobs()), 2)
+
+
+if __name__ == '__main__':
+    prog = unittest.main()
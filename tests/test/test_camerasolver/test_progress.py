@@ -0,0 +1,137 @@
+# Copyright (C) 2026 David Cattermole.
+#
+# This file is part of mmSolver.
+#
+# mmSolver is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# mmSolver is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with mmSolver.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""
+Test parsing and formatting of the Camera Solver progress lines.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import unittest
+
+import mmSolver.tools.camerasolver.constant as camerasolver_const
+import mmSolver.tools.camerasolver.lib as camerasolver_lib
+import mmSolver.tools.camerasolver.ui.camerasolver_layout as camerasolver_layout
+
+import test.baseutils as baseUtils
+
+
+def _progress_line(text):
+    return camerasolver_const.PROGRESS_LINE_PREFIX + text
+
+
+# @unittest.skip
+class TestProgress(baseUtils.TestBase):
+    def test_parse_progress_line(self):
+        line = _progress_line(
+            '{"stage":"intermediate","iteration":3,"mean_error":0.25,'
+            '"median_error":0.2,"camera_count":10,"bundle_count":42,'
+            '"prefix":"solve_iter3"}'
+        )
+        progress = camerasolver_lib.parse_progress_line(line)
+        self.assertEqual(
+            progress['stage'], camerasolver_const.PROGRESS_STAGE_INTERMEDIATE
+        )
+        self.assertEqual(progress['iteration'], 3)
+        self.assertAlmostEqual(progress['mean_error'], 0.25)
+        self.assertEqual(progress['camera_count'], 10)
+        self.assertEqual(progress['bundle_count'], 42)
+        self.assertEqual(progress['prefix'], 'solve_iter3')
+
+        progress = camerasolver_lib.parse_progress_line(
+            _progress_line('{"stage":"load","iteration":null}')
+        )
+        self.assertEqual(progress['stage'], camerasolver_const.PROGRESS_STAGE_LOAD)
+        self.assertIsNone(progress['iteration'])
+
+    def test_parse_progress_line_invalid(self):
+        for line in [
+            # Log lines.
+            '',
+            'Solving camera...',
+            '{"stage":"load"}',
+            # Malformed JSON.
+            _progress_line(''),
+            _progress_line('{"stage":"load"'),
+            _progress_line('not json'),
+            # Not a JSON object.
+            _progress_line('["load"]'),
+            _progress_line('"load"'),
+            _progress_line('42'),
+            _progress_line('null'),
+            # Unknown or missing stage.
+            _progress_line('{"stage":"unknown"}'),
+            _progress_line('{"iteration":1}'),
+            _progress_line('{}'),
+        ]:
+            self.assertIsNone(camerasolver_lib.parse_progress_line(line), msg=line)
+
+    def test_format_progress_status_text(self):
+        format_text = camerasolver_layout.format_progress_status_text
+        self.assertEqual(format_text(None), 'Solving...')
+        self.assertEqual(
+            format_text({'stage': camerasolver_const.PROGRESS_STAGE_LOAD}),
+            'Solving... loading input files.',
+        )
+        self.assertEqual(
+            format_text({'stage': camerasolver_const.PROGRESS_STAGE_SOLVE}),
+            'Solving...',
+        )
+        self.assertEqual(
+            format_text({'stage': camerasolver_const.PROGRESS_STAGE_WRITE}),
+            'Solving... writing output files.',
+        )
+        self.assertEqual(
+            format_text({'stage': camerasolver_const.PROGRESS_STAGE_DONE}),
+            'Solving... finishing.',
+        )
+        self.assertEqual(
+            format_text(
+                {
+                    'stage': camerasolver_const.PROGRESS_STAGE_INTERMEDIATE,
+                    'iteration': 2,
+                    'mean_error': 0.123456,
+                    'camera_count': 10,
+                    'bundle_count': 42,
+                }
+            ),
+            'Solving... round 3, mean error 0.1235 px (10 cameras, 42 bundles).',
+        )
+
+        # Missing values are left out.
+        self.assertEqual(
+            format_text(
+                {
+                    'stage': camerasolver_const.PROGRESS_STAGE_INTERMEDIATE,
+                    'iteration': None,
+                    'mean_error': None,
+                    'camera_count': 10,
+                    'bundle_count': None,
+                }
+            ),
+            'Solving... round 1.',
+        )
+
+        # Unknown stages.
+        self.assertEqual(format_text({'stage': 'unknown'}), 'Solving...')
+        self.assertEqual(format_text({}), 'Solving...')
+
+
+if __name__ == '__main__':
+    prog = unittest.main()
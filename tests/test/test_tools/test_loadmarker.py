@@ -23,7 +23,10 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import json
 import os
+import shutil
+import tempfile
 import unittest
 
 import maya.cmds
@@ -35,6 +38,65 @@ import mmSolver.tools.loadmarker.lib.utils as lib_utils
 import mmSolver.utils.loadmarker.fileutils as lib_fileutils
 import mmSolver.utils.loadmarker.fileinfo as lib_fileinfo
 import mmSolver.tools.createmarker.tool as create_marker
+import mmSolver.tools.savemarkerfile.lib as save_lib
+import mmSolver.utils.loadmarker.formats.uvcache as uvcache
+import mmSolver.utils.loadmarker.parsecache as parsecache
+import mmSolver.utils.loadfile.floatutils as floatutils
+import mmSolver.utils.loadfile.keyframedata as keyframedata
+import mmSolver.utils.animcurve as anim_utils
+
+
+def _get_baseline_keyframes(
+    keyframes, before_value=None, after_value=None, reduce_keys=None
+):
+    """
+    The keyframes that were set on a Marker attribute, one keyframe
+    at a time, before the keyframes of all Markers were set at once.
+
+    :returns: The keyframe times, values and if the attribute is
+        static (the animCurve was deleted).
+    :rtype: ([int, ..], [float, ..], bool)
+    """
+    times, values = keyframes.get_times_and_values()
+    if len(times) > 0:
+        if before_value is not None:
+            times = [times[0] - 1] + times
+            values = [before_value] + values
+        if after_value is not None:
+            times = times + [times[-1] + 1]
+            values = values + [after_value]
+
+    is_static = False
+    if reduce_keys is True:
+        tmp_times = list(times)
+        tmp_values = list(values)
+        times = []
+        values = []
+        prev_t = None
+        prev_v = None
+        for t, v in zip(tmp_times, tmp_values):
+            if prev_v is None:
+                times.append(t)
+                values.append(v)
+            elif floatutils.float_is_equal(prev_v, v) is False:
+                times.append(prev_t)
+                values.append(prev_v)
+                times.append(t)
+                values.append(v)
+            prev_t = t
+            prev_v = v
+        # The same keyframe may be added twice, an animCurve only has
+        # one keyframe at each time.
+        times_values = []
+        for t, v in zip(times, values):
+            if len(times_values) == 0 or times_values[-1][0] != t:
+                times_values.append((t, v))
+        times = [t for t, _ in times_values]
+        values = [v for _, v in times_values]
+        # 'maya.cmds.delete(node_attr, staticChannels=True)' was
+        # used to remove animCurves that do not change value.
+        is_static = len(set(values)) == 1
+    return times, [float(v) for v in values], is_static
 
 
 # @unittest.skip
@@ -105,6 +167,280 @@ class TestLoadMarker(test_tools_utils.ToolsTestCase):
             assert os.path.isdir(start_dir) is True
         return
 
+    def test_read_index(self):
+        file_names = [
+            'test_v1.uv',
+            'test_v3.uv',
+            'test_v4.uv',
+            'test_v5_pgroup_camera_many_points.uv',
+            'stA_with_emptyMarker.uv',
+        ]
+        for file_name in file_names:
+            path = self.get_data_path('uvtrack', file_name)
+            file_info, mkr_data_list = marker_read.read(path)
+            index_file_info, mkr_index_list = marker_read.read_index(path)
+            self.assertEqual(index_file_info, file_info)
+            self.assertEqual(len(mkr_index_list), len(mkr_data_list))
+            for mkr_index, mkr_data in zip(mkr_index_list, mkr_data_list):
+                x_keys = mkr_data.get_x()
+                self.assertEqual(mkr_index.name, mkr_data.get_name())
+                self.assertEqual(mkr_index.id, mkr_data.get_id())
+                self.assertEqual(mkr_index.start_frame, x_keys.get_start_frame())
+                self.assertEqual(mkr_index.end_frame, x_keys.get_end_frame())
+                self.assertEqual(mkr_index.num_frames, x_keys.get_length())
+
+            # Only the requested points are decoded.
+            point_names = [mkr_index_list[0].name]
+            _, mkr_data_list = marker_read.read(path, point_names=point_names)
+            names = [x.get_name() for x in mkr_data_list]
+            self.assertEqual(names, point_names)
+        return
+
+    def test_read_uvcache(self):
+        file_names = [
+            'test_v3.uv',
+            'test_v4.uv',
+            'test_v5_pgroup_camera_many_points.uv',
+            'test_v5_pgroup_object_many_points.uv',
+            'stA_with_emptyMarker.uv',
+        ]
+        for file_name in file_names:
+            path = self.get_data_path('uvtrack', file_name)
+            with open(path) as f:
+                data = json.load(f)
+            name = os.path.splitext(file_name)[0] + uvcache.EXT
+            cache_path = self.get_output_path(name)
+            ok = save_lib.write_cache_file(cache_path, data)
+            self.assertTrue(ok)
+
+            # The .uv data is stored exactly.
+            self.assertEqual(uvcache.read_uv_data(cache_path), data)
+
+            for undistorted in [True, False]:
+                file_info, mkr_data_list = marker_read.read(
+                    path, undistorted=undistorted
+                )
+                cache_file_info, cache_mkr_data_list = marker_read.read(
+                    cache_path, undistorted=undistorted
+                )
+                self.assertEqual(cache_file_info, file_info)
+                self.assertEqual(len(cache_mkr_data_list), len(mkr_data_list))
+                for cache_mkr_data, mkr_data in zip(cache_mkr_data_list, mkr_data_list):
+                    self.assertEqual(cache_mkr_data.get_name(), mkr_data.get_name())
+                    self.assertEqual(
+                        cache_mkr_data.get_x().get_raw_data(),
+                        mkr_data.get_x().get_raw_data(),
+                    )
+                    self.assertEqual(
+                        cache_mkr_data.get_y().get_raw_data(),
+                        mkr_data.get_y().get_raw_data(),
+                    )
+                    self.assertEqual(
+                        cache_mkr_data.get_enable().get_raw_data(),
+                        mkr_data.get_enable().get_raw_data(),
+                    )
+                    self.assertEqual(
+                        cache_mkr_data.get_bundle_x(),
+                        mkr_data.get_bundle_x(),
+                    )
+        return
+
+    def test_read_parse_cache(self):
+        # The disk cache is disabled by default.
+        self.assertEqual(parsecache.ParseCache(directory='').get_disk_budget(), 0)
+
+        root = tempfile.mkdtemp()
+        directory = os.path.join(root, 'parse_cache')
+        cache = parsecache.ParseCache(disk_budget=1024 * 1024, directory=directory)
+        path = self.get_data_path('uvtrack', 'test_v5_pgroup_camera_many_points.uv')
+        file_info, mkr_data_list = marker_read.read(path, use_cache=False)
+
+        key = parsecache.create_key(path, 'read')
+        self.assertIsNone(cache.get(key))
+        cache.set(key, (file_info, mkr_data_list))
+        self.assertGreater(cache.get_memory_size(), 0)
+
+        # Each value is a new copy.
+        cached_file_info, cached_mkr_data_list = cache.get(key)
+        self.assertEqual(cached_file_info, file_info)
+        self.assertIsNot(cached_mkr_data_list[0], mkr_data_list[0])
+        self.assertEqual(
+            cached_mkr_data_list[0].get_x().get_raw_data(),
+            mkr_data_list[0].get_x().get_raw_data(),
+        )
+
+        # Read from disk.
+        cache.clear(disk=False)
+        self.assertEqual(cache.get_memory_size(), 0)
+        self.assertIsNotNone(cache.get(key))
+
+        # The least recently used values are removed.
+        cache.set_memory_budget(0)
+        self.assertEqual(cache.get_memory_size(), 0)
+        cache.set_disk_budget(0)
+        self.assertIsNone(cache.get(key))
+
+        # Different keyword arguments are different keys.
+        other_key = parsecache.create_key(path, 'read', undistorted=False)
+        self.assertNotEqual(other_key, key)
+
+        # Cache files only create the cached data types.
+        cache.set_disk_budget(1024 * 1024)
+        cache.clear()
+        file_path = os.path.join(directory, key + parsecache.CACHE_FILE_EXT)
+        with open(file_path, 'w') as f:
+            json.dump({parsecache.TYPE_KEY: 'os.system', 'items': ['ls']}, f)
+        self.assertIsNone(cache.get(key))
+        self.assertFalse(os.path.isfile(file_path))
+
+        # Directories that other users can access are not used.
+        if hasattr(os, 'getuid'):
+            shared_directory = os.path.join(root, 'shared_parse_cache')
+            os.mkdir(shared_directory)
+            os.chmod(shared_directory, 0o777)
+            shared_cache = parsecache.ParseCache(
+                disk_budget=1024 * 1024, directory=shared_directory
+            )
+            shared_cache.set(key, (file_info, mkr_data_list))
+            self.assertEqual(os.listdir(shared_directory), [])
+
+        shutil.rmtree(root)
+        return
+
+    def test_read_uvtrack_missing_weight(self):
+        data = {
+            'version': 2,
+            'num_points': 1,
+            'is_undistorted': True,
+            'points': [
+                {
+                    'name': '01',
+                    'id': None,
+                    'set_name': 'markers',
+                    'per_frame': [
+                        {'frame': 1, 'pos': [0.25, 0.5]},
+                        {'frame': 2, 'pos': [0.5, 0.5], 'weight': None},
+                        {'frame': 3, 'pos': [0.75, 0.5], 'weight': 0.5},
+                    ],
+                }
+            ],
+        }
+        root = tempfile.mkdtemp()
+        path = os.path.join(root, 'missing_weight.uv')
+        with open(path, 'w') as f:
+            json.dump(data, f)
+
+        file_info, mkr_data_list = marker_read.read(path, use_cache=False)
+        shutil.rmtree(root)
+        self.assertEqual(len(mkr_data_list), 1)
+        weight = mkr_data_list[0].get_weight()
+        self.assertEqual(weight.get_value(1), 1.0)
+        self.assertEqual(weight.get_value(2), 1.0)
+        self.assertEqual(weight.get_value(3), 0.5)
+        return
+
+    def test_read_point_names(self):
+        per_frame = [
+            {'frame': 1, 'pos': [0.25, 0.5], 'weight': 1.0},
+            {'frame': 2, 'pos': [0.5, 0.5], 'weight': 1.0},
+        ]
+        data = {
+            'version': 2,
+            'num_points': 3,
+            'is_undistorted': True,
+            'points': [
+                {
+                    'name': name,
+                    'id': None,
+                    'set_name': 'markers',
+                    'per_frame': per_frame,
+                }
+                for name in ['01', '02', '03']
+            ],
+        }
+        root = tempfile.mkdtemp()
+        path = os.path.join(root, 'point_names.uv')
+        with open(path, 'w') as f:
+            json.dump(data, f)
+
+        _, mkr_data_list = marker_read.read(path, use_cache=False)
+        self.assertEqual([x.get_name() for x in mkr_data_list], ['01', '02', '03'])
+
+        # Only the requested points are read, in the file order.
+        for use_cache in [False, True]:
+            _, mkr_data_list = marker_read.read(
+                path, use_cache=use_cache, point_names=['03', '01']
+            )
+            names = [x.get_name() for x in mkr_data_list]
+            self.assertEqual(names, ['01', '03'])
+
+        _, mkr_data_list = marker_read.read(path, use_cache=False, point_names=[])
+        self.assertEqual(mkr_data_list, [])
+        shutil.rmtree(root)
+        return
+
+    def test_read_many(self):
+        root = tempfile.mkdtemp()
+        paths = []
+        for i in range(4):
+            per_frame = [
+                {'frame': f, 'pos': [0.1 * f, 0.1 * i], 'weight': 1.0}
+                for f in range(1, 11)
+            ]
+            data = {
+                'version': 2,
+                'num_points': 2,
+                'is_undistorted': True,
+                'points': [
+                    {
+                        'name': name,
+                        'id': None,
+                        'set_name': 'markers',
+                        'per_frame': per_frame,
+                    }
+                    for name in ['01', '02']
+                ],
+            }
+            path = os.path.join(root, 'read_many_{0}.uv'.format(i))
+            with open(path, 'w') as f:
+                json.dump(data, f)
+            paths.append(path)
+
+        for max_workers in [1, 2]:
+            progress = []
+            status = []
+            results = marker_read.read_many(
+                paths,
+                use_cache=False,
+                max_workers=max_workers,
+                prog_fn=progress.append,
+                status_fn=status.append,
+            )
+            # Progress is given once for each file.
+            self.assertEqual(progress, [25, 50, 75, 100])
+            self.assertEqual(len(status), len(paths))
+
+            # Results are in the same order as the file paths.
+            self.assertEqual(len(results), len(paths))
+            for path, (file_info, mkr_data_list) in zip(paths, results):
+                _, expected_list = marker_read.read(path, use_cache=False)
+                self.assertTrue(file_info)
+                self.assertEqual(len(mkr_data_list), len(expected_list))
+                for mkr_data, expected in zip(mkr_data_list, expected_list):
+                    self.assertEqual(mkr_data.get_name(), expected.get_name())
+                    x_keys = mkr_data.get_x()
+                    expected_x_keys = expected.get_x()
+                    for frame in range(1, 11):
+                        self.assertEqual(
+                            x_keys.get_value(frame), expected_x_keys.get_value(frame)
+                        )
+
+        results = marker_read.read_many(paths, use_cache=False, point_names=['02'])
+        for _, mkr_data_list in results:
+            self.assertEqual([x.get_name() for x in mkr_data_list], ['02'])
+        shutil.rmtree(root)
+        return
+
     def test_create_new_camera(self):
         cam = lib_utils.create_new_camera()
         assert cam
@@ -233,6 +569,90 @@ class TestLoadMarker(test_tools_utils.ToolsTestCase):
         self.assertEqual(maya.cmds.getAttr('BottomRight_MKR.translateX'), 0.5)
         self.assertEqual(maya.cmds.getAttr('BottomRight_MKR.translateY'), -0.5)
 
+    def test_loadmarker_uvtrack_keyframes(self):
+        """
+        The keyframes and static values set on Markers loaded from
+        '.uv' files are the same as when the keyframes were set one
+        attribute at a time.
+        """
+        cam = lib_utils.create_new_camera()
+        mkr_grp = lib_utils.create_new_marker_group(cam)
+
+        paths = [
+            self.get_data_path('uvtrack', 'test_v1.uv'),
+            self.get_data_path('uvtrack', 'test_v4.uv'),
+            self.get_data_path('uvtrack', 'test_v5_pgroup_camera_many_points.uv'),
+        ]
+        for path in paths:
+            _, mkr_data_list = marker_read.read(path, use_cache=False)
+            self.assertGreater(len(mkr_data_list), 0)
+            mkr_list = marker_read.create_nodes(mkr_data_list, cam=cam, mkr_grp=mkr_grp)
+            self.assertEqual(len(mkr_list), len(mkr_data_list))
+
+            for mkr, mkr_data in zip(mkr_list, mkr_data_list):
+                mkr_node = mkr.get_node()
+                x_times, x_values = mkr_data.get_x().get_times_and_values()
+                y_times, y_values = mkr_data.get_y().get_times_and_values()
+                mkr_x = keyframedata.KeyframeData()
+                mkr_y = keyframedata.KeyframeData()
+                mkr_x.set_times_and_values(x_times, [v - 0.5 for v in x_values])
+                mkr_y.set_times_and_values(y_times, [v - 0.5 for v in y_values])
+                expected = [
+                    ('translateX', _get_baseline_keyframes(mkr_x)),
+                    ('translateY', _get_baseline_keyframes(mkr_y)),
+                    (
+                        'enable',
+                        _get_baseline_keyframes(
+                            mkr_data.get_enable(),
+                            before_value=False,
+                            after_value=False,
+                            reduce_keys=True,
+                        ),
+                    ),
+                    (
+                        'weight',
+                        _get_baseline_keyframes(
+                            mkr_data.get_weight(), reduce_keys=True
+                        ),
+                    ),
+                ]
+                for attr_name, (times, values, is_static) in expected:
+                    node_attr = mkr_node + '.' + attr_name
+                    anim_curves = anim_utils.get_anim_curves_from_nodes([node_attr])
+                    if is_static is True:
+                        self.assertEqual(len(anim_curves), 0)
+                        value = maya.cmds.getAttr(node_attr)
+                        self.assertAlmostEqual(value, values[0])
+                        continue
+                    self.assertEqual(len(anim_curves), 1)
+                    key_times = maya.cmds.keyframe(
+                        node_attr, query=True, timeChange=True
+                    )
+                    key_values = maya.cmds.keyframe(
+                        node_attr, query=True, valueChange=True
+                    )
+                    self.assertEqual(key_times, [float(t) for t in times])
+                    for key_value, value in zip(key_values, values):
+                        self.assertAlmostEqual(key_value, value)
+
+        # None is not a keyframe value.
+        node_attr = mkr_list[0].get_node() + '.weight'
+        maya.cmds.setAttr(node_attr, lock=False)
+        self.assertRaises(
+            ValueError,
+            anim_utils.create_anim_curves_apitwo,
+            [node_attr],
+            [[1, 2]],
+            [[1.0, None]],
+        )
+        self.assertRaises(
+            ValueError,
+            anim_utils.set_static_plug_values_apitwo,
+            [node_attr],
+            [None],
+        )
+        return
+
     def test_loadmarker_tdetxt_format(self):
         """
         Test loading markers using the 3DEqualizer '.txt' format.
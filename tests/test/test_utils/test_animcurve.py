@@ -0,0 +1,175 @@
+# Copyright (C) 2026 David Cattermole.
+#
+# This file is part of mmSolver.
+#
+# mmSolver is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# mmSolver is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with mmSolver.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""
+Test functions for animCurve utilities module.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import unittest
+
+import maya.cmds
+
+import test.test_utils.utilsutils as test_utils
+import mmSolver.utils.animcurve as anim_utils
+
+
+# @unittest.skip
+class TestAnimCurve(test_utils.UtilsTestCase):
+    """
+    Test animcurve module.
+    """
+
+    def test_evaluate_plug_over_times_apitwo_ui_units(self):
+        """
+        Evaluated values in user interface units must match
+        'maya.cmds.getAttr', with non-default units.
+        """
+        times = list(range(1, 11))
+        linear_unit = maya.cmds.currentUnit(query=True, linear=True)
+        angle_unit = maya.cmds.currentUnit(query=True, angle=True)
+        maya.cmds.currentUnit(linear='mm', angle='deg')
+        try:
+            node = maya.cmds.createNode('transform')
+            # Animated, static and unitless attributes.
+            for attr in ['translateX', 'rotateY', 'scaleX']:
+                node_attr = node + '.' + attr
+                maya.cmds.setKeyframe(node_attr, time=1, value=-2.5)
+                maya.cmds.setKeyframe(node_attr, time=10, value=42.0)
+            maya.cmds.setAttr(node + '.translateZ', 7.0)
+            maya.cmds.setAttr(node + '.rotateZ', 30.0)
+
+            for attr in [
+                'translateX',
+                'rotateY',
+                'scaleX',
+                'translateZ',
+                'rotateZ',
+            ]:
+                node_attr = node + '.' + attr
+                values = anim_utils.evaluate_plug_over_times_apitwo(
+                    node_attr, times, ui_units=True
+                )
+                self.assertEqual(len(values), len(times))
+                for t, v in zip(times, values):
+                    expected = maya.cmds.getAttr(node_attr, time=t)
+                    self.assertAlmostEqual(v, expected, msg=node_attr)
+
+            # Internal units are returned by default.
+            values = anim_utils.evaluate_plug_over_times_apitwo(
+                node + '.translateZ', times
+            )
+            self.assertAlmostEqual(values[0], 0.7)
+        finally:
+            maya.cmds.currentUnit(linear=linear_unit, angle=angle_unit)
+        return
+
+    def test_evaluate_plug_over_times_apitwo_compound_connection(self):
+        """
+        Child plugs of a connected compound plug, and computed output
+        plugs, must be evaluated at each time, not queried once.
+        """
+        times = list(range(1, 11))
+        src_node = maya.cmds.createNode('transform')
+        maya.cmds.setKeyframe(src_node, attribute='translateX', time=1, value=-3.0)
+        maya.cmds.setKeyframe(src_node, attribute='translateX', time=10, value=5.0)
+        maya.cmds.setKeyframe(src_node, attribute='rotateY', time=1, value=0.0)
+        maya.cmds.setKeyframe(src_node, attribute='rotateY', time=10, value=90.0)
+
+        decompose_node = maya.cmds.createNode('decomposeMatrix')
+        dst_node = maya.cmds.createNode('transform')
+        maya.cmds.connectAttr(
+            src_node + '.worldMatrix[0]', decompose_node + '.inputMatrix'
+        )
+        maya.cmds.connectAttr(
+            decompose_node + '.outputTranslate', dst_node + '.translate'
+        )
+        maya.cmds.connectAttr(decompose_node + '.outputRotate', dst_node + '.rotate')
+
+        for node_attr in [
+            dst_node + '.translateX',
+            dst_node + '.rotateY',
+            decompose_node + '.outputTranslateX',
+        ]:
+            values = anim_utils.evaluate_plug_over_times_apitwo(
+                node_attr, times, ui_units=True
+            )
+            self.assertEqual(len(values), len(times))
+            for t, v in zip(times, values):
+                expected = maya.cmds.getAttr(node_attr, time=t)
+                self.assertAlmostEqual(v, expected, msg=node_attr)
+            self.assertNotAlmostEqual(values[0], values[-1], msg=node_attr)
+        return
+
+    def test_set_static_plug_values_apitwo(self):
+        """
+        Only animCurves connected directly to the plugs are deleted,
+        and the changes can be undone.
+        """
+        node = maya.cmds.createNode('transform')
+        maya.cmds.setKeyframe(node, attribute='translateX', time=1, value=-3.0)
+        maya.cmds.setKeyframe(node, attribute='translateX', time=10, value=5.0)
+        anim_curves = maya.cmds.listConnections(node + '.translateX', type='animCurve')
+        self.assertEqual(len(anim_curves), 1)
+        anim_curve = anim_curves[0]
+        maya.cmds.setAttr(node + '.translateY', lock=True)
+
+        # A shared animCurve connected through a pairBlend.
+        shared_node = maya.cmds.createNode('transform')
+        shared_curve = maya.cmds.createNode('animCurveTL')
+        maya.cmds.setKeyframe(shared_curve, time=1, value=1.0)
+        maya.cmds.setKeyframe(shared_curve, time=10, value=2.0)
+        pair_blend = maya.cmds.createNode('pairBlend')
+        maya.cmds.connectAttr(shared_curve + '.output', pair_blend + '.inTranslateX1')
+        maya.cmds.connectAttr(
+            pair_blend + '.outTranslateX', shared_node + '.translateX'
+        )
+
+        maya.cmds.undoInfo(openChunk=True)
+        try:
+            anim_utils.set_static_plug_values_apitwo(
+                [node + '.translateX', node + '.translateY'], [0.5, 2.0]
+            )
+        finally:
+            maya.cmds.undoInfo(closeChunk=True)
+        self.assertFalse(maya.cmds.objExists(anim_curve))
+        self.assertAlmostEqual(maya.cmds.getAttr(node + '.translateX'), 0.5)
+        self.assertAlmostEqual(maya.cmds.getAttr(node + '.translateY'), 2.0)
+        self.assertTrue(maya.cmds.getAttr(node + '.translateY', lock=True))
+
+        maya.cmds.undo()
+        self.assertTrue(maya.cmds.objExists(anim_curve))
+        self.assertAlmostEqual(maya.cmds.getAttr(node + '.translateX', time=10), 5.0)
+        self.assertAlmostEqual(maya.cmds.getAttr(node + '.translateY'), 0.0)
+        self.assertTrue(maya.cmds.getAttr(node + '.translateY', lock=True))
+
+        # The plug is driven by the pairBlend, so it cannot be set.
+        self.assertRaises(
+            RuntimeError,
+            anim_utils.set_static_plug_values_apitwo,
+            [shared_node + '.translateX'],
+            [1.0],
+        )
+        self.assertTrue(maya.cmds.objExists(shared_curve))
+        return
+
+
+if __name__ == '__main__':
+    prog = unittest.main()
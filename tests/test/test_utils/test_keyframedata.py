@@ -0,0 +1,79 @@
+# Copyright (C) 2026 David Cattermole.
+#
+# This file is part of mmSolver.
+#
+# mmSolver is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# mmSolver is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with mmSolver.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""
+Test functions for the KeyframeData class.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import unittest
+
+import test.test_utils.utilsutils as test_utils
+import mmSolver.utils.loadfile.keyframedata as keyframedata
+
+
+# @unittest.skip
+class TestKeyframeData(test_utils.UtilsTestCase):
+    def test_set_value(self):
+        x = keyframedata.KeyframeData()
+        self.assertEqual(x.get_length(), 0)
+        self.assertIs(x.get_start_frame(), None)
+        self.assertIs(x.get_end_frame(), None)
+        self.assertIs(x.get_value(1), None)
+
+        # Increasing frames are appended.
+        x.set_value(1, 0.5)
+        x.set_value(2, 0.6)
+        x.set_value(5, 0.9)
+
+        # Out of order and overwritten frames.
+        x.set_value(0, 0.4)
+        x.set_value(2, 0.7)
+
+        self.assertEqual(x.get_length(), 4)
+        self.assertEqual(x.get_start_frame(), 0)
+        self.assertEqual(x.get_end_frame(), 5)
+        self.assertEqual(x.get_times(), [0, 1, 2, 5])
+        self.assertEqual(x.get_values(), [0.4, 0.5, 0.7, 0.9])
+        self.assertEqual(x.get_raw_data(), {'0': 0.4, '1': 0.5, '2': 0.7, '5': 0.9})
+
+    def test_get_value_closest_frame(self):
+        x = keyframedata.KeyframeData(data={'10': 1.0, '20': 2.0})
+        self.assertEqual(x.get_value(10), 1.0)
+        self.assertEqual(x.get_value(0), 1.0)
+        self.assertEqual(x.get_value(14), 1.0)
+        self.assertEqual(x.get_value(15), 1.0)
+        self.assertEqual(x.get_value(16), 2.0)
+        self.assertEqual(x.get_value(30), 2.0)
+
+    def test_set_times_and_values(self):
+        x = keyframedata.KeyframeData()
+        x.set_times_and_values([3, 1, 2], [0.3, 0.1, 0.2])
+        self.assertEqual(x.get_keyframe_values(), [(1, 0.1), (2, 0.2), (3, 0.3)])
+
+        y = keyframedata.KeyframeData(data=x.get_raw_data())
+        self.assertEqual(x.get_times_and_values(), y.get_times_and_values())
+
+        with self.assertRaises(ValueError):
+            x.set_times_and_values([1, 2], [0.0])
+
+
+if __name__ == '__main__':
+    prog = unittest.main()
@@ -526,6 +526,130 @@ class TestNodeAffects(test_utils.UtilsTestCase):
         self.assertIn(cam_shp, all_nodes)
         self.assertEqual(len(all_nodes), 6)
 
+    def test_marker_multiple_frames_cache(self):
+        """
+        Test affects with multiple frames, sharing a cache between
+        calls gives the same plugs as not using a cache.
+        """
+        (
+            cam_tfm,
+            cam_shp,
+            mkr_bnd_a_tfm,
+            mkr_bnd_b_tfm,
+        ) = self.setup_scene_marker_multiple_frames()
+        mkr_a_tfm, bnd_a_tfm = mkr_bnd_a_tfm
+        mkr_b_tfm, bnd_b_tfm = mkr_bnd_b_tfm
+
+        cache = nodeaffects.AffectsCache()
+        for frames in [[1, 2], [3, 4], [1, 2, 3, 4]]:
+            for mkr_tfm, bnd_tfm in [mkr_bnd_a_tfm, mkr_bnd_b_tfm]:
+                mkr_plugs = nodeaffects.find_plugs_affected_by_marker(
+                    mkr_tfm, cam_tfm, frames=frames
+                )
+                mkr_cache_plugs = nodeaffects.find_plugs_affected_by_marker(
+                    mkr_tfm, cam_tfm, frames=frames, cache=cache
+                )
+                self.assertEqual(set(mkr_plugs), set(mkr_cache_plugs))
+
+                bnd_plugs = nodeaffects.find_plugs_affecting_bundle(
+                    bnd_tfm, mkr_tfm, None, frames=frames
+                )
+                bnd_cache_plugs = nodeaffects.find_plugs_affecting_bundle(
+                    bnd_tfm, mkr_tfm, None, frames=frames, cache=cache
+                )
+                self.assertEqual(set(bnd_plugs), set(bnd_cache_plugs))
+
+        tfm_plugs = nodeaffects.find_plugs_affecting_transform(mkr_a_tfm, cam_tfm)
+        tfm_cache_plugs = nodeaffects.find_plugs_affecting_transform(
+            mkr_a_tfm, cam_tfm, cache=cache
+        )
+        self.assertEqual(set(tfm_plugs), set(tfm_cache_plugs))
+
+        cache.clear()
+        tfm_cache_plugs = nodeaffects.find_plugs_affecting_transform(
+            mkr_a_tfm, cam_tfm, cache=cache
+        )
+        self.assertEqual(set(tfm_plugs), set(tfm_cache_plugs))
+
+    def test_marker_attr_mapping(self):
+        rows = [[2, 0], [], [1, 1]]
+        mapping = nodeaffects.MarkerAttrMapping.from_rows(3, rows)
+        self.assertEqual(mapping.get_num_markers(), 3)
+        self.assertEqual(mapping.get_num_attrs(), 3)
+        self.assertEqual(list(mapping.get_indptr()), [0, 2, 2, 3])
+        self.assertEqual(list(mapping.get_indices()), [0, 2, 1])
+        self.assertEqual(mapping.get_attr_indices(0), [0, 2])
+        self.assertEqual(mapping.get_attr_indices(1), [])
+        self.assertTrue(mapping.is_affected(2, 1))
+        self.assertFalse(mapping.is_affected(2, 0))
+        expected = [
+            [True, False, True],
+            [False, False, False],
+            [False, True, False],
+        ]
+        self.assertEqual(mapping.to_dense(), expected)
+
+    def test_sort_into_hierarchy_groups(self):
+        """
+        Two independent hierarchies are split into two blocks, sorted
+        with the top-level (root) attributes first.
+        """
+        cam_tfm, cam_shp = self.create_camera('cam')
+
+        top_a = maya.cmds.createNode('transform', name='top_a')
+        top_a = node_utils.get_long_name(top_a)
+        bnd_a_tfm, bnd_a_shp = self.create_bundle('bundle_a', parent=top_a)
+
+        top_b = maya.cmds.createNode('transform', name='top_b')
+        top_b = node_utils.get_long_name(top_b)
+        bnd_b_tfm, bnd_b_shp = self.create_bundle('bundle_b', parent=top_b)
+
+        mkr_a_tfm, mkr_a_shp = self.create_marker('marker_a', cam_tfm, bnd_a_tfm)
+        mkr_b_tfm, mkr_b_shp = self.create_marker('marker_b', cam_tfm, bnd_b_tfm)
+
+        mkr_list = [
+            (mkr_b_tfm, cam_shp, bnd_b_tfm),
+            (mkr_a_tfm, cam_shp, bnd_a_tfm),
+        ]
+        attr_list = [
+            bnd_b_tfm + '.translateX',
+            top_a + '.translateX',
+            bnd_a_tfm + '.translateX',
+            top_b + '.rotateY',
+        ]
+        blocks = nodeaffects.sort_into_hierarchy_groups(mkr_list, attr_list)
+        self.assertEqual(len(blocks), 2)
+
+        # Both blocks have a root node attribute, so the ordering
+        # follows the attribute list.
+        self.assertEqual(blocks[0], ([0], [0, 3]))
+        self.assertEqual(blocks[1], ([1], [1, 2]))
+
+        # Only child nodes in the first block, so it is solved last.
+        attr_list = [
+            bnd_b_tfm + '.translateX',
+            top_a + '.translateX',
+            bnd_a_tfm + '.translateX',
+        ]
+        blocks = nodeaffects.sort_into_hierarchy_groups(mkr_list, attr_list)
+        self.assertEqual(len(blocks), 2)
+        self.assertEqual(blocks[0], ([1], [1, 2]))
+        self.assertEqual(blocks[1], ([0], [0]))
+
+        # The first block is only driven by a DG node, so it is
+        # solved after the child nodes in the DAG hierarchy.
+        mult_node = maya.cmds.createNode('multDoubleLinear')
+        maya.cmds.connectAttr(mult_node + '.output', top_b + '.translateX')
+        attr_list = [
+            mult_node + '.input1',
+            top_a + '.translateX',
+            bnd_a_tfm + '.translateX',
+        ]
+        blocks = nodeaffects.sort_into_hierarchy_groups(mkr_list, attr_list)
+        self.assertEqual(len(blocks), 2)
+        self.assertEqual(blocks[0], ([1], [1, 2]))
+        self.assertEqual(blocks[1], ([0], [0]))
+
     # def test_find_plugs_affecting_transform_rig_rivet(self):
     #     """
     #     A transform node parented under a 'rivet.mel' rivet.
@@ -23,9 +23,11 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import random
 import unittest
 
 import test.test_utils.utilsutils as test_utils
+import mmSolver.utils.constant as const
 import mmSolver.utils.smooth as smooth_utils
 
 
@@ -294,6 +296,55 @@ class TestSmooth(test_utils.UtilsTestCase):
             self.assertApproxEqual(x_neg[i], v)
         return
 
+    def test_smooth_batch(self):
+        """
+        Smoothing many curves at once must give the same result as
+        smoothing each curve individually.
+        """
+        data = [list(DATA_ONE), list(DATA_FOUR)]
+        for smooth_type in const.SMOOTH_TYPES:
+            x = smooth_utils.smooth_batch(smooth_type, data, 2.0)
+            self.assertEqual(len(x), len(data))
+            for curve, new_curve in zip(data, x):
+                y = smooth_utils.smooth(smooth_type, list(curve), 2.0)
+                self.assertEqual(len(new_curve), len(y))
+                for a, b in zip(list(new_curve), list(y)):
+                    self.assertApproxEqual(a, b)
+
+        with self.assertRaises(ValueError):
+            smooth_utils.smooth_batch('not a smooth type', data, 2.0)
+        return
+
+    @unittest.skipIf(smooth_utils.np is None, 'numpy is not available.')
+    def test_smooth_batch_long_curves(self):
+        """
+        Compare the standard python and numpy smoothing backends on
+        long curves.
+        """
+        np = smooth_utils.np
+        frame_count = 10000
+        curve_count = 4
+        width = 5.0
+        rng = random.Random(42)
+        data = [
+            [rng.uniform(-1.0, 1.0) for _ in range(frame_count)]
+            for _ in range(curve_count)
+        ]
+
+        raw_funcs = {
+            const.SMOOTH_TYPE_AVERAGE: smooth_utils._average_smooth_raw,
+            const.SMOOTH_TYPE_GAUSSIAN: smooth_utils._gaussian_smooth_raw,
+            const.SMOOTH_TYPE_FOURIER: smooth_utils._fourier_smooth_raw,
+        }
+        for smooth_type in const.SMOOTH_TYPES:
+            raw_func = raw_funcs[smooth_type]
+            raw_result = [raw_func(list(curve), width) for curve in data]
+            numpy_result = smooth_utils.smooth_batch(smooth_type, data, width)
+            raw_result = np.real(np.array(raw_result))
+            self.assertEqual(raw_result.shape, numpy_result.shape)
+            self.assertTrue(np.allclose(raw_result, numpy_result))
+        return
+
 
 if __name__ == '__main__':
     prog = unittest.main()
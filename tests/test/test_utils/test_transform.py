@@ -23,6 +23,7 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import math
 import unittest
 
 import test.test_utils.utilsutils as test_utils
@@ -31,6 +32,7 @@ import maya.cmds
 import maya.api.OpenMaya as OpenMaya2
 import maya.debug.closeness as closeness
 
+import mmSolver.utils.animcurve as animcurve_utils
 import mmSolver.utils.node as node_utils
 import mmSolver.utils.transform as mod
 
@@ -464,6 +466,85 @@ class TestTransform(test_utils.UtilsTestCase):
         # TODO: Create other matrices with values.
         return
 
+    def test_decompose_matrix_array(self):
+        # Matrices with rotation, scale and shear (decomposed by Maya).
+        components_list = [
+            ([1.0, 2.0, 3.0], [10.0, 20.0, 30.0], [1.0, 1.0, 1.0], [0.0, 0.0, 0.0]),
+            ([-4.0, 5.0, 0.5], [170.0, -60.0, 95.0], [2.0, 0.5, 1.5], [0.0, 0.0, 0.0]),
+            ([0.0, 0.0, 0.0], [-170.0, 60.0, -95.0], [1.0, 2.0, 3.0], [0.2, 0.0, 0.0]),
+        ]
+        for rotate_order in ['xyz', 'zxy', 'yxz']:
+            rotate_order_api = mod.ROTATE_ORDER_STR_TO_APITWO_CONSTANT[rotate_order]
+            rotate_order_euler = getattr(
+                OpenMaya2.MEulerRotation, 'k' + rotate_order.upper()
+            )
+            matrices = []
+            expected_list = []
+            prv_rot = None
+            for translate, rotate, scale, shear in components_list:
+                tfm_matrix = OpenMaya2.MTransformationMatrix()
+                tfm_matrix.setTranslation(
+                    OpenMaya2.MVector(translate), OpenMaya2.MSpace.kWorld
+                )
+                rx, ry, rz = [math.radians(x) for x in rotate]
+                tfm_matrix.reorderRotation(rotate_order_api)
+                tfm_matrix.setRotation(
+                    OpenMaya2.MEulerRotation(rx, ry, rz, rotate_order_euler)
+                )
+                tfm_matrix.setScale(scale, OpenMaya2.MSpace.kWorld)
+                tfm_matrix.setShear(shear, OpenMaya2.MSpace.kWorld)
+                matrices.append(list(tfm_matrix.asMatrix()))
+
+                expected = mod.decompose_matrix(tfm_matrix, prv_rot)
+                prv_rot = expected[3:6]
+                expected_list.append(expected)
+
+            values_list = mod.decompose_matrix_array(
+                matrices, rotate_order=rotate_order
+            )
+            self.assertEqual(len(values_list), len(expected_list))
+            for values, expected in zip(values_list, expected_list):
+                for value, expected_value in zip(values, expected):
+                    self.assertAlmostEqual(value, expected_value, places=6)
+        return
+
+    def test_euler_filter_values_boundary(self):
+        """
+        Changes of exactly +/-180 degrees must be filtered the same as
+        calling 'euler_filter_value' on each value in order.
+        """
+
+        def euler_filter_sequential(values, prev_value):
+            new_values = []
+            for value in values:
+                if prev_value is not None:
+                    value = animcurve_utils.euler_filter_value(prev_value, value)
+                new_values.append(value)
+                prev_value = value
+            return new_values
+
+        values = animcurve_utils.euler_filter_values([170.0, -170.0, 10.0])
+        self.assertEqual([float(v) for v in values], [170.0, 190.0, 10.0])
+
+        values_list = [
+            [170.0, -170.0, 10.0],
+            [-170.0, 170.0, -10.0],
+            [0.0, 180.0, 0.0, -180.0, 0.0],
+            [0.0, 540.0, 0.0, -540.0, 180.0],
+            [90.0, -90.0, 90.0, -90.0],
+            [179.0, -179.0, 1.0, 181.0, -359.0],
+        ]
+        for values in values_list:
+            for prev_value in [None, 0.0, 180.0, -180.0, 350.0]:
+                expected = euler_filter_sequential(values, prev_value)
+                filtered = animcurve_utils.euler_filter_values(
+                    values, prev_value=prev_value
+                )
+                self.assertEqual(len(filtered), len(expected))
+                for value, expected_value in zip(filtered, expected):
+                    self.assertAlmostEqual(value, expected_value, msg=values)
+        return
+
     def test_set_transform_values(self):
         start_frame = 1001
         end_frame = 1101
@@ -769,6 +850,55 @@ class TestTransform(test_utils.UtilsTestCase):
         tfm_matrix_cache.get_node_attr_matrix(tfm_node, attr_name, times)
         return
 
+    @unittest.skipIf(mod.np is None, 'NumPy is not available.')
+    def test_TransformMatrixCache_array(self):
+        start_frame = 1001
+        end_frame = 1101
+        times = list(range(start_frame, end_frame))
+        node = maya.cmds.createNode('transform')
+        maya.cmds.setKeyframe(node, attribute='translateX', time=start_frame, value=-1)
+        maya.cmds.setKeyframe(node, attribute='translateX', time=end_frame, value=1)
+        tfm_node = mod.TransformNode(node=node)
+        tfm_matrix_cache = mod.TransformMatrixCache()
+        tfm_matrix_cache.add_node(tfm_node, times)
+        tfm_matrix_cache.process()
+        self.assertEqual(tfm_matrix_cache.get_times(), times)
+
+        attr_name = 'worldMatrix[0]'
+        query_times = [start_frame, end_frame - 1, end_frame + 1]
+        matrices = tfm_matrix_cache.get_node_attr(tfm_node, attr_name, query_times)
+        values = tfm_matrix_cache.get_node_attr_array(tfm_node, attr_name, query_times)
+        self.assertEqual(values.shape, (3, 16))
+        self.assertEqual(list(values[0]), list(matrices[0]))
+        self.assertEqual(list(values[1]), list(matrices[1]))
+        self.assertIsNone(matrices[2])
+        self.assertTrue(all(mod.np.isnan(values[2])))
+        self.assertAlmostEqual(values[0][12], -1.0)
+
+        # Nodes and times added after processing are not evaluated
+        # until the cache is processed again.
+        new_times = [end_frame, end_frame + 1]
+        node_b = maya.cmds.createNode('transform')
+        tfm_node_b = mod.TransformNode(node=node_b)
+        tfm_matrix_cache.add_node(tfm_node_b, new_times)
+        self.assertEqual(tfm_matrix_cache.get_times(), times)
+        values = tfm_matrix_cache.get_node_attr_array(tfm_node, attr_name, new_times)
+        self.assertTrue(mod.np.isnan(values).all())
+        values = tfm_matrix_cache.get_node_attr_array(tfm_node_b, attr_name, times)
+        self.assertTrue(mod.np.isnan(values).all())
+        matrices = tfm_matrix_cache.get_node_attr(tfm_node_b, attr_name, new_times)
+        self.assertEqual(matrices, [None, None])
+
+        # All node attributes are evaluated at all times.
+        tfm_matrix_cache.process()
+        all_times = times + new_times
+        self.assertEqual(tfm_matrix_cache.get_times(), all_times)
+        values = tfm_matrix_cache.get_node_attr_array(tfm_node, attr_name, all_times)
+        self.assertFalse(mod.np.isnan(values).any())
+        values = tfm_matrix_cache.get_node_attr_array(tfm_node_b, attr_name, all_times)
+        self.assertFalse(mod.np.isnan(values).any())
+        return
+
 
 if __name__ == '__main__':
     prog = unittest.main()